@@ -32,5 +32,7 @@ execSync(`cp ${docsSchemaPath} ${clientLibsPath}/fern/openapi/openapi.json`, { s
 
 console.log("Generating Python client");
 execSync(`cd ${clientLibsPath} && pnpm fern generate`, { stdio: "inherit" });
+// Makes the generated types load on first use, which Fern has no option for
+execSync(`python3 ${clientLibsPath}/python/scripts/lazy_api_client.py`, { stdio: "inherit" });
 
 console.log("Done!");
@@ -5,6 +5,18 @@ import * as Sentry from "@sentry/nextjs";
 
 import { v1ApiRouter } from "~/server/api/external/v1Api/router";
 import { createOpenApiContext } from "~/server/api/external/openApiTrpc";
+import {
+  ACCEPTED_REQUEST_ENCODINGS,
+  RequestBodyError,
+  readJsonBody,
+} from "~/server/api/external/requestBody";
+
+// Bodies are parsed by readJsonBody so that compressed requests are supported
+export const config = {
+  api: {
+    bodyParser: false,
+  },
+};
 
 const openApiHandler = createOpenApiNextHandler({
   router: v1ApiRouter,
@@ -16,6 +28,17 @@ const handler = async (req: NextApiRequest, res: NextApiResponse) => {
   // Setup CORS
   await cors(req, res);
 
+  res.setHeader("Accept-Encoding", ACCEPTED_REQUEST_ENCODINGS);
+
+  try {
+    req.body = await readJsonBody(req);
+  } catch (error) {
+    if (error instanceof RequestBodyError) {
+      return res.status(error.statusCode).json({ message: error.message });
+    }
+    throw error;
+  }
+
   return openApiHandler(req, res);
 };
 
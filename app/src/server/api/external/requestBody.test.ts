@@ -0,0 +1,98 @@
+import { createServer, type Server } from "http";
+import { type AddressInfo } from "net";
+import { type NextApiRequest } from "next";
+import { afterAll, beforeAll, describe, expect, it } from "vitest";
+import zlib from "zlib";
+
+import { MAX_BODY_BYTES, RequestBodyError, readJsonBody } from "./requestBody";
+
+// Responds the way the /api/v1 handler does, so the tests see what clients receive
+let server: Server;
+let url: string;
+
+beforeAll(async () => {
+  server = createServer((req, res) => {
+    readJsonBody(req as NextApiRequest)
+      .then((body) => {
+        res.writeHead(200, { "content-type": "application/json" });
+        res.end(JSON.stringify({ body }));
+      })
+      .catch((error) => {
+        const statusCode = error instanceof RequestBodyError ? error.statusCode : 500;
+        res.writeHead(statusCode, { "content-type": "application/json" });
+        res.end(JSON.stringify({ message: (error as Error).message }));
+      });
+  });
+  await new Promise<void>((resolve) => server.listen(0, "127.0.0.1", resolve));
+  url = `http://127.0.0.1:${(server.address() as AddressInfo).port}/api/v1/report`;
+});
+
+afterAll(() => {
+  server.close();
+});
+
+const jsonHeaders = { "content-type": "application/json" };
+
+const chunkedBody = (chunks: number, chunkSize: number) => {
+  let sent = 0;
+  return new ReadableStream<Uint8Array>({
+    pull(controller) {
+      if (sent++ === chunks) return controller.close();
+      controller.enqueue(new Uint8Array(chunkSize).fill(32));
+    },
+  });
+};
+
+describe("readJsonBody", () => {
+  it("parses plain and compressed bodies", async () => {
+    const body = JSON.stringify({ hello: "world" });
+    let response = await fetch(url, { method: "POST", headers: jsonHeaders, body });
+    expect(await response.json()).toEqual({ body: { hello: "world" } });
+
+    response = await fetch(url, {
+      method: "POST",
+      headers: { ...jsonHeaders, "content-encoding": "gzip" },
+      body: zlib.gzipSync(body),
+    });
+    expect(await response.json()).toEqual({ body: { hello: "world" } });
+  });
+
+  it("answers bodies over the limit with a 413", async () => {
+    const response = await fetch(url, {
+      method: "POST",
+      headers: jsonHeaders,
+      body: " ".repeat(MAX_BODY_BYTES + 1),
+    });
+    expect(response.status).toBe(413);
+    expect(await response.json()).toEqual({ message: "Request body too large" });
+  });
+
+  it("answers chunked bodies over the limit with a 413", async () => {
+    const response = await fetch(url, {
+      method: "POST",
+      headers: jsonHeaders,
+      body: chunkedBody(40, 64 * 1024),
+      duplex: "half",
+    } as RequestInit);
+    expect(response.status).toBe(413);
+  });
+
+  it("answers compressed bodies that expand past the limit with a 413", async () => {
+    const response = await fetch(url, {
+      method: "POST",
+      headers: { ...jsonHeaders, "content-encoding": "gzip" },
+      body: zlib.gzipSync(" ".repeat(MAX_BODY_BYTES + 1)),
+    });
+    expect(response.status).toBe(413);
+  });
+
+  it("keeps serving the connection after rejecting a body", async () => {
+    await fetch(url, {
+      method: "POST",
+      headers: jsonHeaders,
+      body: " ".repeat(2 * MAX_BODY_BYTES),
+    });
+    const response = await fetch(url, { method: "POST", headers: jsonHeaders, body: "{}" });
+    expect(response.status).toBe(200);
+  });
+});
@@ -0,0 +1,116 @@
+import { type IncomingMessage } from "http";
+import { type NextApiRequest } from "next";
+import zlib from "zlib";
+
+// Matches the default size limit of the Next.js body parser. Applied to the
+// decompressed body so that small compressed bodies can't expand without bound.
+export const MAX_BODY_BYTES = 1024 * 1024;
+
+// /report/batch takes up to 500 calls, which easily add up to more than 1MB.
+// Kept in sync with MAX_REPORT_BATCH_BYTES in the Python client.
+export const REPORT_BATCH_MAX_BODY_BYTES = 4 * 1024 * 1024;
+
+const maxBodyBytesByPath: Record<string, number> = {
+  "/api/v1/report/batch": REPORT_BATCH_MAX_BODY_BYTES,
+};
+
+export const maxBodyBytes = (url: string | undefined): number => {
+  const path = (url ?? "").split("?")[0]?.replace(/\/+$/, "") ?? "";
+  return maxBodyBytesByPath[path] ?? MAX_BODY_BYTES;
+};
+
+type Decompressor = (buffer: Buffer, options: zlib.ZlibOptions) => Buffer;
+
+const decompressors: Record<string, Decompressor> = {
+  gzip: zlib.gunzipSync,
+  deflate: zlib.inflateSync,
+};
+
+// zstd is only available in newer versions of Node
+const zstdDecompressSync = (zlib as unknown as { zstdDecompressSync?: Decompressor })
+  .zstdDecompressSync;
+if (zstdDecompressSync) decompressors.zstd = zstdDecompressSync;
+
+// Advertised on responses (RFC 7694) so that clients know which request
+// encodings they can use
+export const ACCEPTED_REQUEST_ENCODINGS = Object.keys(decompressors).join(", ");
+
+export class RequestBodyError extends Error {
+  constructor(
+    public statusCode: number,
+    message: string,
+  ) {
+    super(message);
+  }
+}
+
+// Rejects bodies over `maxBytes` as soon as that's known. The rest of the body is
+// read and discarded rather than the connection closed, so that the client
+// receives the 413 response.
+const readRawBody = (req: IncomingMessage, maxBytes: number): Promise<Buffer> =>
+  new Promise((resolve, reject) => {
+    const tooLarge = () => new RequestBodyError(413, "Request body too large");
+
+    if (Number(req.headers["content-length"]) > maxBytes) {
+      req.resume();
+      reject(tooLarge());
+      return;
+    }
+
+    let chunks: Buffer[] | null = [];
+    let size = 0;
+    req.on("data", (chunk: Buffer) => {
+      if (!chunks) return;
+      size += chunk.length;
+      if (size > maxBytes) {
+        chunks = null;
+        reject(tooLarge());
+        return;
+      }
+      chunks.push(chunk);
+    });
+    req.on("end", () => {
+      if (chunks) resolve(Buffer.concat(chunks));
+    });
+    req.on("error", (err) => reject(err));
+  });
+
+const decompress = (
+  body: Buffer,
+  contentEncoding: string | undefined,
+  maxBytes: number,
+): Buffer => {
+  const encoding = contentEncoding?.trim().toLowerCase();
+  if (!encoding || encoding === "identity") return body;
+
+  const decompressor = decompressors[encoding];
+  if (!decompressor) {
+    throw new RequestBodyError(415, `Unsupported Content-Encoding: ${encoding}`);
+  }
+  try {
+    return decompressor(body, { maxOutputLength: maxBytes });
+  } catch (error) {
+    if ((error as { code?: string }).code === "ERR_BUFFER_TOO_LARGE") {
+      throw new RequestBodyError(413, "Request body too large");
+    }
+    throw new RequestBodyError(400, `Invalid ${encoding} request body`);
+  }
+};
+
+// Reads a JSON request body, decompressing it according to its Content-Encoding
+export const readJsonBody = async (req: NextApiRequest): Promise<unknown> => {
+  const maxBytes = maxBodyBytes(req.url);
+  const raw = decompress(
+    await readRawBody(req, maxBytes),
+    req.headers["content-encoding"],
+    maxBytes,
+  );
+  if (raw.length === 0 || !req.headers["content-type"]?.includes("application/json")) {
+    return undefined;
+  }
+  try {
+    return JSON.parse(raw.toString("utf8")) as unknown;
+  } catch {
+    throw new RequestBodyError(400, "Invalid JSON");
+  }
+};
@@ -0,0 +1,62 @@
+import { chunk } from "lodash-es";
+import { z } from "zod";
+
+import { openApiProtectedProc } from "../../openApiTrpc";
+import { requireWriteKey } from "../helpers";
+import { recordReport, reportInput } from "./report.procedure";
+
+// Calls recorded at the same time by a single request
+const RECORD_CONCURRENCY = 20;
+
+export const reportBatch = openApiProtectedProc
+  .meta({
+    openapi: {
+      method: "POST",
+      path: "/report/batch",
+      description:
+        "Report up to 500 API calls in a single request. Each call is recorded independently and its outcome is returned in `results`, in the same order as `calls`.",
+      protect: true,
+    },
+  })
+  .input(
+    z.object({
+      calls: z.array(reportInput).min(1).max(500),
+    }),
+  )
+  .output(
+    z.object({
+      results: z.array(
+        z.object({
+          index: z.number(),
+          status: z.union([z.literal("ok"), z.literal("error")]),
+          errorMessage: z.string().optional(),
+        }),
+      ),
+    }),
+  )
+  .mutation(async ({ input, ctx }) => {
+    await requireWriteKey(ctx);
+
+    // Recorded a few at a time so that one batch can't take every connection in
+    // the database pool
+    const results: { index: number; status: "ok" | "error"; errorMessage?: string }[] = [];
+    for (const calls of chunk(
+      input.calls.map((call, index) => ({ call, index })),
+      RECORD_CONCURRENCY,
+    )) {
+      results.push(
+        ...(await Promise.all(
+          calls.map(async ({ call, index }) => {
+            try {
+              await recordReport(ctx.key.projectId, call);
+              return { index, status: "ok" as const };
+            } catch (e) {
+              return { index, status: "error" as const, errorMessage: (e as Error).message };
+            }
+          }),
+        )),
+      );
+    }
+
+    return { results };
+  });
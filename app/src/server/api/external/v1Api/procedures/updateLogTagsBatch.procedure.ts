@@ -0,0 +1,147 @@
+import { TRPCError } from "@trpc/server";
+import { v4 as uuidv4 } from "uuid";
+import { z } from "zod";
+
+import { kysely } from "~/server/db";
+import { parseTags } from "~/server/utils/parseTags";
+import { recordTagNames } from "~/utils/recordRequest";
+import { openApiProtectedProc } from "../../openApiTrpc";
+import { requireWriteKey } from "../helpers";
+
+// Keeps each insert well under Postgres' limit of 65535 bind parameters
+const INSERT_CHUNK_SIZE = 5000;
+
+export const updateLogTagsBatch = openApiProtectedProc
+  .meta({
+    openapi: {
+      method: "POST",
+      path: "/logs/update-tags/batch",
+      description:
+        "Update tags for up to 1000 logged calls in a single request, each identified by its `completionId`. Updates are applied in order, so later updates to the same call take precedence.",
+      protect: true,
+    },
+  })
+  .input(
+    z.object({
+      updates: z
+        .array(
+          z.object({
+            completionId: z.string(),
+            tags: z
+              .record(z.union([z.string(), z.number(), z.boolean(), z.null()]))
+              .describe(
+                'Tags to set on the call. Set a tag to null to remove it. Eg { "label": "positive", "reviewed": true }',
+              ),
+          }),
+        )
+        .min(1)
+        .max(1000),
+    }),
+  )
+  .output(z.object({ matchedLogs: z.number() }))
+  .mutation(async ({ input, ctx }) => {
+    await requireWriteKey(ctx);
+
+    const updates = input.updates.map((update, index) => {
+      try {
+        return { completionId: update.completionId, tags: parseTags(update.tags, true) };
+      } catch (e) {
+        throw new TRPCError({
+          message: `Failed to parse tags of update ${index}: ${(e as Error).message}`,
+          code: "BAD_REQUEST",
+        });
+      }
+    });
+
+    const completionIds = [...new Set(updates.map((update) => update.completionId))];
+    const loggedCalls = await kysely
+      .selectFrom("LoggedCall")
+      .where("projectId", "=", ctx.key.projectId)
+      .where("completionId", "in", completionIds)
+      .select(["id", "completionId"])
+      .execute();
+
+    const loggedCallIdsByCompletionId = new Map<string, string[]>();
+    for (const loggedCall of loggedCalls) {
+      if (!loggedCall.completionId) continue;
+      const ids = loggedCallIdsByCompletionId.get(loggedCall.completionId) ?? [];
+      ids.push(loggedCall.id);
+      loggedCallIdsByCompletionId.set(loggedCall.completionId, ids);
+    }
+
+    // Resolve the final value of every (logged call, tag) pair first, since a single
+    // upsert can't touch the same row twice
+    let matchedLogs = 0;
+    const finalTags = new Map<
+      string,
+      { loggedCallId: string; name: string; value: string | null }
+    >();
+    for (const update of updates) {
+      const loggedCallIds = loggedCallIdsByCompletionId.get(update.completionId) ?? [];
+      matchedLogs += loggedCallIds.length;
+      for (const loggedCallId of loggedCallIds) {
+        for (const [name, value] of Object.entries(update.tags)) {
+          finalTags.set(`${loggedCallId}:${name}`, { loggedCallId, name, value });
+        }
+      }
+    }
+
+    if (loggedCalls.length) {
+      await kysely
+        .updateTable("LoggedCall")
+        .set({ updatedAt: new Date() })
+        .where("id", "in", loggedCalls.map((loggedCall) => loggedCall.id))
+        .execute();
+    }
+
+    const loggedCallIdsByTagToDelete = new Map<string, string[]>();
+    const dataToInsert: {
+      id: string;
+      name: string;
+      value: string;
+      projectId: string;
+      loggedCallId: string;
+    }[] = [];
+    for (const { loggedCallId, name, value } of finalTags.values()) {
+      if (value === null) {
+        const ids = loggedCallIdsByTagToDelete.get(name) ?? [];
+        ids.push(loggedCallId);
+        loggedCallIdsByTagToDelete.set(name, ids);
+      } else {
+        dataToInsert.push({
+          id: uuidv4(),
+          name,
+          value,
+          projectId: ctx.key.projectId,
+          loggedCallId,
+        });
+      }
+    }
+
+    for (const [name, loggedCallIds] of loggedCallIdsByTagToDelete) {
+      await kysely
+        .deleteFrom("LoggedCallTag")
+        .where("name", "=", name)
+        .where("loggedCallId", "in", loggedCallIds)
+        .execute();
+    }
+
+    for (let i = 0; i < dataToInsert.length; i += INSERT_CHUNK_SIZE) {
+      await kysely
+        .insertInto("LoggedCallTag")
+        .columns(["name", "value", "projectId", "loggedCallId"])
+        .values(dataToInsert.slice(i, i + INSERT_CHUNK_SIZE))
+        .onConflict((oc) =>
+          oc.columns(["loggedCallId", "name"]).doUpdateSet((eb) => ({
+            value: eb.ref("excluded.value"),
+          })),
+        )
+        .execute();
+    }
+
+    if (dataToInsert.length) {
+      await recordTagNames(ctx.key.projectId, [...new Set(dataToInsert.map((row) => row.name))]);
+    }
+
+    return { matchedLogs };
+  });
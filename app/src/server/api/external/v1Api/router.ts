@@ -3,8 +3,10 @@ import { checkCache } from "./procedures/checkCache.procedure";
 import { createChatCompletion } from "./procedures/createChatCompletion.procedure";
 import { localTestingOnlyGetLatestLoggedCall } from "./procedures/localTestingOnlyGetLatestLoggedCall.procedure";
 import { report } from "./procedures/report.procedure";
+import { reportBatch } from "./procedures/reportBatch.procedure";
 import { unstableDatasetCreate } from "./procedures/unstableDatasetCreate.procedure";
 import { updateLogTags } from "./procedures/updateLogTags.procedure";
+import { updateLogTagsBatch } from "./procedures/updateLogTagsBatch.procedure";
 import { unstableDatasetEntryCreate } from "./procedures/unstableDatasetEntryCreate.procedure";
 import { unstableFinetuneCreate } from "./procedures/unstableFinetuneCreate.procedure";
 import { unstableFinetuneGet } from "./procedures/unstableFinetuneGet.procedure";
@@ -13,7 +15,9 @@ export const v1ApiRouter = createOpenApiRouter({
   checkCache,
   createChatCompletion,
   report,
+  reportBatch,
   updateLogTags,
+  updateLogTagsBatch,
   localTestingOnlyGetLatestLoggedCall,
   unstableDatasetCreate,
   unstableDatasetEntryCreate,
@@ -0,0 +1,100 @@
+"""
+Compares the cost of converting a ChatCompletion into the JSON payload we
+report to OpenPipe, before and after the single-pass serializer.
+
+Usage: python -m benchmarks.bench_chat_completion_json
+"""
+
+import json
+import timeit
+from typing import Any, Dict, List, Union
+
+from openai.types.chat import ChatCompletion
+
+from openpipe.shared import get_chat_completion_json
+
+
+def legacy_get_chat_completion_json(completion: ChatCompletion) -> Dict:
+    """The encode/pretty-print/decode implementation used before the fast path."""
+    include_null_fields = {"content"}
+
+    def serialize(data: Any) -> Union[Dict, List]:
+        if isinstance(data, list) or isinstance(data, tuple):
+            return [serialize(item) for item in data]
+
+        if hasattr(data, "__dict__"):
+            data = data.__dict__
+            return {
+                key: serialize(value)
+                if isinstance(value, (list, tuple, Dict))
+                else value
+                for key, value in data.items()
+                if value is not None or key in include_null_fields
+            }
+
+        return data
+
+    return json.loads(json.dumps(completion, default=serialize, indent=4))
+
+
+def make_completion(num_choices: int, content_length: int, num_tool_calls: int):
+    return ChatCompletion(
+        id="chatcmpl-123",
+        object="chat.completion",
+        created=1704449593,
+        model="gpt-3.5-turbo-0613",
+        choices=[
+            {
+                "index": index,
+                "finish_reason": "stop",
+                "message": {
+                    "role": "assistant",
+                    "content": "x" * content_length if content_length else None,
+                    "tool_calls": [
+                        {
+                            "id": f"call_{i}",
+                            "type": "function",
+                            "function": {
+                                "name": "get_weather",
+                                "arguments": '{"city": "Paris"}',
+                            },
+                        }
+                        for i in range(num_tool_calls)
+                    ]
+                    or None,
+                },
+            }
+            for index in range(num_choices)
+        ],
+        usage={"prompt_tokens": 100, "completion_tokens": 200, "total_tokens": 300},
+    )
+
+
+CASES = {
+    "short content": make_completion(1, 200, 0),
+    "4k-token content": make_completion(1, 16000, 0),
+    "tool calls": make_completion(1, 0, 5),
+    "many choices": make_completion(8, 2000, 2),
+}
+
+
+def main(number: int = 2000) -> None:
+    for name, completion in CASES.items():
+        assert get_chat_completion_json(completion) == legacy_get_chat_completion_json(
+            completion
+        )
+        legacy = timeit.timeit(
+            lambda: legacy_get_chat_completion_json(completion), number=number
+        )
+        current = timeit.timeit(
+            lambda: get_chat_completion_json(completion), number=number
+        )
+        print(
+            f"{name:>18}: legacy {legacy / number * 1e6:8.1f} us"
+            f"  current {current / number * 1e6:8.1f} us"
+            f"  ({legacy / current:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
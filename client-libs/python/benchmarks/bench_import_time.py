@@ -0,0 +1,54 @@
+"""
+Measures how long importing the OpenPipe client takes in a fresh interpreter,
+which is paid on every cold start of a serverless function.
+
+Usage: python -m benchmarks.bench_import_time [--runs N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    "import openpipe": "import openpipe",
+    "OpenPipe client": "from openpipe import OpenPipe",
+    "OpenAI wrapper": "from openpipe import OpenAI",
+    "openai alone": "import openai",
+    # Everything `import openpipe` used to import eagerly
+    "all generated types": "from openpipe.api_client import *",
+}
+
+TIMER = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def time_import(statement: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(statement=statement)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    for name, statement in STATEMENTS.items():
+        seconds = time_import(statement, args.runs)
+        print(f"{name:>20}: {seconds * 1000:7.1f} ms  ({statement})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compares the cost of encoding report request bodies with the generated client's
+jsonable_encoder and with openpipe.json_encoder, which caches its per-type
+dispatch.
+
+Usage: python -m benchmarks.bench_jsonable_encoder
+"""
+
+import timeit
+from typing import Dict
+
+from openpipe.api_client import ReportBatchRequestCallsItem
+from openpipe.api_client.core.jsonable_encoder import (
+    jsonable_encoder as generated_jsonable_encoder,
+)
+from openpipe.json_encoder import jsonable_encoder
+
+
+def make_call(num_messages: int, content_length: int, num_tools: int) -> Dict:
+    return {
+        "requestedAt": 1704449592000,
+        "receivedAt": 1704449593000,
+        "reqPayload": {
+            "model": "gpt-3.5-turbo-0613",
+            "temperature": 0,
+            "messages": [
+                {
+                    "role": "user" if i % 2 == 0 else "assistant",
+                    "content": "x" * content_length,
+                }
+                for i in range(num_messages)
+            ],
+            "tools": [
+                {
+                    "type": "function",
+                    "function": {
+                        "name": f"tool_{i}",
+                        "parameters": {
+                            "type": "object",
+                            "properties": {
+                                "city": {"type": "string"},
+                                "days": {"type": "integer", "minimum": 1},
+                            },
+                            "required": ["city"],
+                        },
+                    },
+                }
+                for i in range(num_tools)
+            ],
+        },
+        "respPayload": {
+            "id": "chatcmpl-123",
+            "object": "chat.completion",
+            "created": 1704449593,
+            "model": "gpt-3.5-turbo-0613",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "x" * content_length},
+                }
+            ],
+            "usage": {
+                "prompt_tokens": 100,
+                "completion_tokens": 200,
+                "total_tokens": 300,
+            },
+        },
+        "statusCode": 200,
+        "tags": {"prompt_id": "counting", "$sdk": "python"},
+    }
+
+
+def make_batch(num_calls: int) -> Dict:
+    return {
+        "calls": [
+            ReportBatchRequestCallsItem(
+                requested_at=1704449592000,
+                req_payload=make_call(20, 200, 5)["reqPayload"],
+                resp_payload=make_call(20, 200, 5)["respPayload"],
+                status_code=200,
+                tags={"prompt_id": "counting"},
+            )
+            for _ in range(num_calls)
+        ]
+    }
+
+
+CASES = {
+    "short chat": (make_call(2, 200, 0), 2000),
+    "long chat": (make_call(200, 2000, 0), 200),
+    "many tools": (make_call(10, 200, 50), 200),
+    "batch of 100 models": (make_batch(100), 20),
+}
+
+
+def main() -> None:
+    for name, (payload, number) in CASES.items():
+        assert jsonable_encoder(payload) == generated_jsonable_encoder(payload)
+        generated = timeit.timeit(
+            lambda: generated_jsonable_encoder(payload), number=number
+        )
+        current = timeit.timeit(lambda: jsonable_encoder(payload), number=number)
+        print(
+            f"{name:>19}: generated {generated / number * 1e6:9.1f} us"
+            f"  openpipe {current / number * 1e6:9.1f} us"
+            f"  ({generated / current:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
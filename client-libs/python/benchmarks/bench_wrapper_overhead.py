@@ -0,0 +1,418 @@
+"""
+Measures the per-call overhead the OpenPipe wrappers add on top of the plain
+OpenAI clients. OpenAI and OpenPipe are both replaced by in-process mock
+servers (httpx.MockTransport), so the numbers only reflect client-side work.
+
+Covers non-streaming, streaming and error responses for the sync and async
+clients at several concurrency levels, payload sizes and chunk counts, and
+writes the results to a JSON file. Each scenario is warmed up, then measured
+several times alternating between the plain and wrapped clients, and the
+median of the runs is kept. Pass a previous results file with --baseline to
+fail when the overhead regresses.
+
+Usage: python -m benchmarks.bench_wrapper_overhead [--quick] [--output FILE]
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import version
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+import openai
+
+import openpipe
+
+DEFAULT_ITERATIONS = 100
+DEFAULT_REPEATS = 5
+# Calls made on each client before measuring, to fill caches and connection pools
+WARMUP_ITERATIONS = 10
+MIN_ITERATIONS = 5
+
+REQUEST = {
+    "model": "gpt-3.5-turbo",
+    "messages": [{"role": "system", "content": "count to 3"}],
+}
+
+
+def completion_payload(content_length: int) -> Dict[str, Any]:
+    return {
+        "id": "chatcmpl-123",
+        "object": "chat.completion",
+        "created": 1704449593,
+        "model": "gpt-3.5-turbo-0613",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": "x" * content_length},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 11, "completion_tokens": 8, "total_tokens": 19},
+    }
+
+
+def stream_body(content_length: int, num_chunks: int) -> bytes:
+    chunk_fields = {
+        "id": "chatcmpl-123",
+        "object": "chat.completion.chunk",
+        "created": 1704449593,
+        "model": "gpt-3.5-turbo-0613",
+    }
+    part = "x" * max(1, content_length // num_chunks)
+    events = [
+        {
+            **chunk_fields,
+            "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}}],
+        }
+    ]
+    events += [
+        {**chunk_fields, "choices": [{"index": 0, "delta": {"content": part}}]}
+        for _ in range(num_chunks)
+    ]
+    events.append(
+        {
+            **chunk_fields,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        }
+    )
+    lines = [f"data: {json.dumps(event)}\n\n" for event in events]
+    lines.append("data: [DONE]\n\n")
+    return "".join(lines).encode("utf-8")
+
+
+def openai_handler(
+    path: str, content_length: int, num_chunks: int
+) -> Callable[[httpx.Request], httpx.Response]:
+    # Responses are built once so that the mock server costs the same for every call
+    if path == "error":
+        error = {"error": {"message": "bad request", "type": "invalid_request_error"}}
+        return lambda request: httpx.Response(400, json=error)
+    if path == "streaming":
+        body = stream_body(content_length, num_chunks)
+        headers = {"content-type": "text/event-stream"}
+        return lambda request: httpx.Response(200, headers=headers, content=body)
+    body = json.dumps(completion_payload(content_length)).encode("utf-8")
+    headers = {"content-type": "application/json"}
+    return lambda request: httpx.Response(200, headers=headers, content=body)
+
+
+def openpipe_handler(request: httpx.Request) -> httpx.Response:
+    body = json.loads(request.content)
+    if "calls" in body:
+        results = [{"index": i, "status": "ok"} for i in range(len(body["calls"]))]
+        return httpx.Response(200, json={"results": results})
+    return httpx.Response(200, json={"status": "ok"})
+
+
+def make_client(kind: str, wrapped: bool, handler: Callable) -> Any:
+    is_async = kind == "async"
+    transport = httpx.MockTransport(handler)
+    http_client = (
+        httpx.AsyncClient(transport=transport)
+        if is_async
+        else httpx.Client(transport=transport)
+    )
+    options = dict(
+        api_key="test-key",
+        base_url="https://openai.bench/v1",
+        max_retries=0,
+        http_client=http_client,
+    )
+    if not wrapped:
+        return (openai.AsyncOpenAI if is_async else openai.OpenAI)(**options)
+
+    client = (openpipe.AsyncOpenAI if is_async else openpipe.OpenAI)(
+        **options, openpipe={"api_key": "test-key"}
+    )
+    reporting_transport = httpx.MockTransport(openpipe_handler)
+    client.openpipe_reporting_client.base_client._client_wrapper.httpx_client = (
+        httpx.AsyncClient(transport=reporting_transport)
+        if is_async
+        else httpx.Client(transport=reporting_transport)
+    )
+    return client
+
+
+def call_sync(client: Any, path: str) -> None:
+    try:
+        completion = client.chat.completions.create(
+            **REQUEST, stream=path == "streaming"
+        )
+        if path == "streaming":
+            for _ in completion:
+                pass
+    except openai.OpenAIError:
+        if path != "error":
+            raise
+
+
+async def call_async(client: Any, path: str) -> None:
+    try:
+        completion = await client.chat.completions.create(
+            **REQUEST, stream=path == "streaming"
+        )
+        if path == "streaming":
+            async for _ in completion:
+                pass
+    except openai.OpenAIError:
+        if path != "error":
+            raise
+
+
+def run_sync(client: Any, path: str, iterations: int, concurrency: int) -> List[float]:
+    def timed_call(_) -> float:
+        start = time.perf_counter()
+        call_sync(client, path)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(timed_call, range(iterations)))
+
+
+async def run_async(
+    client: Any, path: str, iterations: int, concurrency: int
+) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed_call() -> float:
+        async with semaphore:
+            start = time.perf_counter()
+            await call_async(client, path)
+            return time.perf_counter() - start
+
+    return list(await asyncio.gather(*[timed_call() for _ in range(iterations)]))
+
+
+def summarize(runs: List[Dict[str, Any]], flush: float) -> Dict[str, Any]:
+    """Medians across runs, so that a run disturbed by e.g. GC doesn't skew them."""
+
+    def median_of(stat: Callable[[Dict[str, Any]], float]) -> float:
+        return statistics.median(stat(run) for run in runs)
+
+    def percentile(latencies: List[float], q: float) -> float:
+        return sorted(latencies)[int(len(latencies) * q)]
+
+    return {
+        "mean_us": median_of(lambda run: statistics.mean(run["latencies"])) * 1e6,
+        "p50_us": median_of(lambda run: percentile(run["latencies"], 0.5)) * 1e6,
+        "p95_us": median_of(lambda run: percentile(run["latencies"], 0.95)) * 1e6,
+        "calls_per_second": median_of(
+            lambda run: len(run["latencies"]) / run["elapsed"]
+        ),
+        "flush_seconds": flush,
+    }
+
+
+def measure(
+    kind: str,
+    path: str,
+    iterations: int,
+    repeats: int,
+    concurrency: int,
+    content_length: int,
+    num_chunks: int,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Returns the timings of the plain and wrapped clients."""
+    handler = openai_handler(path, content_length, num_chunks)
+    warmup = max(WARMUP_ITERATIONS, concurrency)
+
+    if kind == "async":
+
+        async def run() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+            clients = [make_client(kind, wrapped, handler) for wrapped in (False, True)]
+            runs: List[List[Dict[str, Any]]] = [[], []]
+            try:
+                for client in clients:
+                    await run_async(client, path, warmup, concurrency)
+                # Alternate between the clients so that drift affects both alike
+                for _ in range(repeats):
+                    for client, client_runs in zip(clients, runs):
+                        start = time.perf_counter()
+                        latencies = await run_async(
+                            client, path, iterations, concurrency
+                        )
+                        client_runs.append(
+                            {
+                                "latencies": latencies,
+                                "elapsed": time.perf_counter() - start,
+                            }
+                        )
+                flush_start = time.perf_counter()
+                await clients[1].flush()
+                flush = time.perf_counter() - flush_start
+            finally:
+                for client in clients:
+                    await client.close()
+            return summarize(runs[0], 0.0), summarize(runs[1], flush)
+
+        return asyncio.run(run())
+
+    clients = [make_client(kind, wrapped, handler) for wrapped in (False, True)]
+    runs = [[], []]
+    try:
+        for client in clients:
+            run_sync(client, path, warmup, concurrency)
+        for _ in range(repeats):
+            for client, client_runs in zip(clients, runs):
+                start = time.perf_counter()
+                latencies = run_sync(client, path, iterations, concurrency)
+                client_runs.append(
+                    {"latencies": latencies, "elapsed": time.perf_counter() - start}
+                )
+        flush_start = time.perf_counter()
+        clients[1].flush()
+        flush = time.perf_counter() - flush_start
+    finally:
+        # Also stops the wrapper's report queue, so threads don't pile up across scenarios
+        for client in clients:
+            client.close()
+    return summarize(runs[0], 0.0), summarize(runs[1], flush)
+
+
+def scenario_iterations(iterations: int, num_chunks: int) -> int:
+    # Streams with many chunks take far longer per call, so fewer calls are needed
+    # for the same measurement time
+    return max(MIN_ITERATIONS, iterations * 10 // max(10, num_chunks))
+
+
+def scenarios(quick: bool):
+    concurrencies = [1, 8] if quick else [1, 8, 32]
+    content_lengths = [100, 10000] if quick else [100, 10000, 100000]
+    chunk_counts = [10, 100] if quick else [10, 100, 1000]
+
+    for kind in ["sync", "async"]:
+        for concurrency in concurrencies:
+            for content_length in content_lengths:
+                yield kind, "non_streaming", concurrency, content_length, 0
+                for num_chunks in chunk_counts:
+                    yield kind, "streaming", concurrency, content_length, num_chunks
+            yield kind, "error", concurrency, 0, 0
+
+
+def scenario_name(result: Dict[str, Any]) -> str:
+    return (
+        f"{result['client']}/{result['path']}/c{result['concurrency']}"
+        f"/b{result['content_length']}/n{result['num_chunks']}"
+    )
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline_path: str, max_regression: float
+) -> List[str]:
+    """Returns the scenarios whose overhead grew by more than `max_regression`."""
+    with open(baseline_path) as f:
+        baseline = {scenario_name(r): r for r in json.load(f)["results"]}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(scenario_name(result))
+        if previous is None:
+            continue
+        # Ignore sub-10µs noise on scenarios where the wrapper costs next to nothing
+        allowed = max(
+            previous["overhead_us"] * (1 + max_regression),
+            previous["overhead_us"] + 10,
+        )
+        if result["overhead_us"] > allowed:
+            regressions.append(
+                f"{scenario_name(result)}: {previous['overhead_us']:.0f}µs -> "
+                f"{result['overhead_us']:.0f}µs"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=DEFAULT_ITERATIONS,
+        help="Calls per run, scaled down for streams with many chunks",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=DEFAULT_REPEATS,
+        help="Runs per scenario; the median run is reported",
+    )
+    parser.add_argument("--quick", action="store_true", help="Fewer scenarios")
+    parser.add_argument("--output", default="bench-wrapper-overhead.json")
+    parser.add_argument("--baseline", help="Results file to compare against")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Allowed relative growth of the overhead before failing",
+    )
+    args = parser.parse_args()
+
+    results = []
+    for kind, path, concurrency, content_length, num_chunks in scenarios(args.quick):
+        iterations = scenario_iterations(args.iterations, num_chunks)
+        raw, wrapped = measure(
+            kind,
+            path,
+            iterations,
+            args.repeats,
+            concurrency,
+            content_length,
+            num_chunks,
+        )
+        result = {
+            "client": kind,
+            "path": path,
+            "concurrency": concurrency,
+            "content_length": content_length,
+            "num_chunks": num_chunks,
+            "iterations": iterations,
+            "repeats": args.repeats,
+            "raw": raw,
+            "wrapped": wrapped,
+            "overhead_us": wrapped["mean_us"] - raw["mean_us"],
+            "overhead_ratio": wrapped["mean_us"] / raw["mean_us"],
+        }
+        results.append(result)
+        print(
+            f"{scenario_name(result):<36} raw {raw['mean_us']:9.0f}µs  "
+            f"wrapped {wrapped['mean_us']:9.0f}µs  "
+            f"overhead {result['overhead_us']:8.0f}µs ({result['overhead_ratio']:.2f}x)",
+            flush=True,
+        )
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "metadata": {
+                    "timestamp": time.time(),
+                    "python": sys.version.split()[0],
+                    "platform": platform.platform(),
+                    "openai": version("openai"),
+                    "openpipe": version("openpipe"),
+                    "httpx": version("httpx"),
+                },
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"\nWrote {args.output}", flush=True)
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.max_regression)
+        if regressions:
+            print("\nOverhead regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
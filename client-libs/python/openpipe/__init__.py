@@ -1,6 +1,59 @@
-# Import everything from the module
-from openai import *
-from .openai_sync_wrapper import OpenAIWrapper as OpenAI
-from .openai_async_wrapper import AsyncOpenAIWrapper as AsyncOpenAI
+import importlib
+import typing
 
-from .client import OpenPipe, AsyncOpenPipe
+if typing.TYPE_CHECKING:
+    # Import everything from the module
+    from openai import *
+    from .openai_sync_wrapper import OpenAIWrapper as OpenAI
+    from .openai_async_wrapper import AsyncOpenAIWrapper as AsyncOpenAI
+
+    from .client import OpenPipe, AsyncOpenPipe
+    from .dataset_upload import DatasetUploadError
+    from .http_clients import configure_connection_pools
+    from .compression import configure_request_compression
+    from .resilience import configure_request_resilience, CircuitOpenError
+    from .instrumentation import Instrumentation, OpenTelemetryInstrumentation
+
+# Exports of the package, with the module and name they're defined under. Modules
+# are imported on first access, so that e.g. `from openpipe import OpenPipe`
+# doesn't import openai.
+_EXPORTS = {
+    "OpenAI": (".openai_sync_wrapper", "OpenAIWrapper"),
+    "AsyncOpenAI": (".openai_async_wrapper", "AsyncOpenAIWrapper"),
+    "OpenPipe": (".client", "OpenPipe"),
+    "AsyncOpenPipe": (".client", "AsyncOpenPipe"),
+    "DatasetUploadError": (".dataset_upload", "DatasetUploadError"),
+    "configure_connection_pools": (".http_clients", "configure_connection_pools"),
+    "configure_request_compression": (
+        ".compression",
+        "configure_request_compression",
+    ),
+    "configure_request_resilience": (".resilience", "configure_request_resilience"),
+    "CircuitOpenError": (".resilience", "CircuitOpenError"),
+    "Instrumentation": (".instrumentation", "Instrumentation"),
+    "OpenTelemetryInstrumentation": (
+        ".instrumentation",
+        "OpenTelemetryInstrumentation",
+    ),
+}
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name in _EXPORTS:
+        module, attribute = _EXPORTS[name]
+        value = getattr(importlib.import_module(module, __name__), attribute)
+    else:
+        # Everything else exported by openai is available from openpipe too
+        openai = importlib.import_module("openai")
+        if name == "__all__":
+            value = [*openai.__all__, *_EXPORTS]
+        elif name in openai.__all__:
+            value = getattr(openai, name)
+        else:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted({*globals(), *__getattr__("__all__")})
@@ -1,142 +1,317 @@
 # This file was auto-generated by Fern from our API Definition.
 
-from .types import (
-    CheckCacheResponse,
-    CreateChatCompletionRequestFunctionCall,
-    CreateChatCompletionRequestFunctionCallName,
-    CreateChatCompletionRequestFunctionsItem,
-    CreateChatCompletionRequestMessagesItem,
-    CreateChatCompletionRequestMessagesItemAssistant,
-    CreateChatCompletionRequestMessagesItemAssistantContent,
-    CreateChatCompletionRequestMessagesItemAssistantFunctionCall,
-    CreateChatCompletionRequestMessagesItemAssistantToolCallsItem,
-    CreateChatCompletionRequestMessagesItemAssistantToolCallsItemFunction,
-    CreateChatCompletionRequestMessagesItemFunction,
-    CreateChatCompletionRequestMessagesItemFunctionContent,
-    CreateChatCompletionRequestMessagesItemSystem,
-    CreateChatCompletionRequestMessagesItemTool,
-    CreateChatCompletionRequestMessagesItemUser,
-    CreateChatCompletionRequestMessagesItemUserContent,
-    CreateChatCompletionRequestMessagesItemUserContentItem,
-    CreateChatCompletionRequestMessagesItemUserContentItemImageUrl,
-    CreateChatCompletionRequestMessagesItemUserContentItemImageUrlImageUrl,
-    CreateChatCompletionRequestMessagesItemUserContentItemImageUrlImageUrlDetail,
-    CreateChatCompletionRequestMessagesItemUserContentItemText,
-    CreateChatCompletionRequestMessagesItemUserContentItem_ImageUrl,
-    CreateChatCompletionRequestMessagesItemUserContentItem_Text,
-    CreateChatCompletionRequestMessagesItem_Assistant,
-    CreateChatCompletionRequestMessagesItem_Function,
-    CreateChatCompletionRequestMessagesItem_System,
-    CreateChatCompletionRequestMessagesItem_Tool,
-    CreateChatCompletionRequestMessagesItem_User,
-    CreateChatCompletionRequestReqPayload,
-    CreateChatCompletionRequestReqPayloadFunctionCall,
-    CreateChatCompletionRequestReqPayloadFunctionCallName,
-    CreateChatCompletionRequestReqPayloadFunctionsItem,
-    CreateChatCompletionRequestReqPayloadMessagesItem,
-    CreateChatCompletionRequestReqPayloadMessagesItemAssistant,
-    CreateChatCompletionRequestReqPayloadMessagesItemAssistantContent,
-    CreateChatCompletionRequestReqPayloadMessagesItemAssistantFunctionCall,
-    CreateChatCompletionRequestReqPayloadMessagesItemAssistantToolCallsItem,
-    CreateChatCompletionRequestReqPayloadMessagesItemAssistantToolCallsItemFunction,
-    CreateChatCompletionRequestReqPayloadMessagesItemFunction,
-    CreateChatCompletionRequestReqPayloadMessagesItemFunctionContent,
-    CreateChatCompletionRequestReqPayloadMessagesItemSystem,
-    CreateChatCompletionRequestReqPayloadMessagesItemTool,
-    CreateChatCompletionRequestReqPayloadMessagesItemUser,
-    CreateChatCompletionRequestReqPayloadMessagesItemUserContent,
-    CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem,
-    CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrl,
-    CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrlImageUrl,
-    CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrlImageUrlDetail,
-    CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemText,
-    CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem_ImageUrl,
-    CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem_Text,
-    CreateChatCompletionRequestReqPayloadMessagesItem_Assistant,
-    CreateChatCompletionRequestReqPayloadMessagesItem_Function,
-    CreateChatCompletionRequestReqPayloadMessagesItem_System,
-    CreateChatCompletionRequestReqPayloadMessagesItem_Tool,
-    CreateChatCompletionRequestReqPayloadMessagesItem_User,
-    CreateChatCompletionRequestReqPayloadResponseFormat,
-    CreateChatCompletionRequestReqPayloadResponseFormatType,
-    CreateChatCompletionRequestReqPayloadToolChoice,
-    CreateChatCompletionRequestReqPayloadToolChoiceFunction,
-    CreateChatCompletionRequestReqPayloadToolChoiceFunctionFunction,
-    CreateChatCompletionRequestReqPayloadToolsItem,
-    CreateChatCompletionRequestReqPayloadToolsItemFunction,
-    CreateChatCompletionRequestResponseFormat,
-    CreateChatCompletionRequestResponseFormatType,
-    CreateChatCompletionRequestToolChoice,
-    CreateChatCompletionRequestToolChoiceFunction,
-    CreateChatCompletionRequestToolChoiceFunctionFunction,
-    CreateChatCompletionRequestToolsItem,
-    CreateChatCompletionRequestToolsItemFunction,
-    CreateChatCompletionResponse,
-    CreateChatCompletionResponseChoices,
-    CreateChatCompletionResponseChoicesChoicesItem,
-    CreateChatCompletionResponseChoicesChoicesItemFinishReason,
-    CreateChatCompletionResponseChoicesChoicesItemLogprobs,
-    CreateChatCompletionResponseChoicesChoicesItemLogprobsContentItem,
-    CreateChatCompletionResponseChoicesChoicesItemLogprobsContentItemTopLogprobsItem,
-    CreateChatCompletionResponseChoicesChoicesItemMessage,
-    CreateChatCompletionResponseChoicesChoicesItemMessageContent,
-    CreateChatCompletionResponseChoicesChoicesItemMessageFunctionCall,
-    CreateChatCompletionResponseChoicesChoicesItemMessageToolCallsItem,
-    CreateChatCompletionResponseChoicesChoicesItemMessageToolCallsItemFunction,
-    CreateChatCompletionResponseChoicesUsage,
-    LocalTestingOnlyGetLatestLoggedCallResponse,
-    ReportRequestTagsValue,
-    ReportResponse,
-    ReportResponseStatus,
-    UnstableDatasetCreateResponse,
-    UnstableDatasetEntryCreateRequestEntriesItem,
-    UnstableDatasetEntryCreateRequestEntriesItemFunctionCall,
-    UnstableDatasetEntryCreateRequestEntriesItemFunctionCallName,
-    UnstableDatasetEntryCreateRequestEntriesItemFunctionsItem,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItem,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistant,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantContent,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantFunctionCall,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantToolCallsItem,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantToolCallsItemFunction,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemFunction,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemFunctionContent,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemSystem,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemTool,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUser,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContent,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrl,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrlImageUrl,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrlImageUrlDetail,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemText,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem_ImageUrl,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem_Text,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Assistant,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Function,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_System,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Tool,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_User,
-    UnstableDatasetEntryCreateRequestEntriesItemResponseFormat,
-    UnstableDatasetEntryCreateRequestEntriesItemResponseFormatType,
-    UnstableDatasetEntryCreateRequestEntriesItemSplit,
-    UnstableDatasetEntryCreateRequestEntriesItemToolChoice,
-    UnstableDatasetEntryCreateRequestEntriesItemToolChoiceFunction,
-    UnstableDatasetEntryCreateRequestEntriesItemToolChoiceFunctionFunction,
-    UnstableDatasetEntryCreateRequestEntriesItemToolsItem,
-    UnstableDatasetEntryCreateRequestEntriesItemToolsItemFunction,
-    UnstableDatasetEntryCreateResponse,
-    UnstableDatasetEntryCreateResponseErrorsItem,
-    UnstableFinetuneCreateRequestBaseModel,
-    UnstableFinetuneCreateResponse,
-    UnstableFinetuneGetResponse,
-    UnstableFinetuneGetResponseStatus,
-    UpdateLogTagsRequestFiltersItem,
-    UpdateLogTagsRequestFiltersItemEquals,
-    UpdateLogTagsRequestTagsValue,
-    UpdateLogTagsResponse,
-)
-from .environment import OpenPipeApiEnvironment
+# Submodules are only imported when one of their exports is first used, since
+# importing every type up front is a large part of the time taken by `import openpipe`.
+
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+    from .types import (
+        CheckCacheResponse,
+        CreateChatCompletionRequestFunctionCall,
+        CreateChatCompletionRequestFunctionCallName,
+        CreateChatCompletionRequestFunctionsItem,
+        CreateChatCompletionRequestMessagesItem,
+        CreateChatCompletionRequestMessagesItemAssistant,
+        CreateChatCompletionRequestMessagesItemAssistantContent,
+        CreateChatCompletionRequestMessagesItemAssistantFunctionCall,
+        CreateChatCompletionRequestMessagesItemAssistantToolCallsItem,
+        CreateChatCompletionRequestMessagesItemAssistantToolCallsItemFunction,
+        CreateChatCompletionRequestMessagesItemFunction,
+        CreateChatCompletionRequestMessagesItemFunctionContent,
+        CreateChatCompletionRequestMessagesItemSystem,
+        CreateChatCompletionRequestMessagesItemTool,
+        CreateChatCompletionRequestMessagesItemUser,
+        CreateChatCompletionRequestMessagesItemUserContent,
+        CreateChatCompletionRequestMessagesItemUserContentItem,
+        CreateChatCompletionRequestMessagesItemUserContentItemImageUrl,
+        CreateChatCompletionRequestMessagesItemUserContentItemImageUrlImageUrl,
+        CreateChatCompletionRequestMessagesItemUserContentItemImageUrlImageUrlDetail,
+        CreateChatCompletionRequestMessagesItemUserContentItemText,
+        CreateChatCompletionRequestMessagesItemUserContentItem_ImageUrl,
+        CreateChatCompletionRequestMessagesItemUserContentItem_Text,
+        CreateChatCompletionRequestMessagesItem_Assistant,
+        CreateChatCompletionRequestMessagesItem_Function,
+        CreateChatCompletionRequestMessagesItem_System,
+        CreateChatCompletionRequestMessagesItem_Tool,
+        CreateChatCompletionRequestMessagesItem_User,
+        CreateChatCompletionRequestReqPayload,
+        CreateChatCompletionRequestReqPayloadFunctionCall,
+        CreateChatCompletionRequestReqPayloadFunctionCallName,
+        CreateChatCompletionRequestReqPayloadFunctionsItem,
+        CreateChatCompletionRequestReqPayloadMessagesItem,
+        CreateChatCompletionRequestReqPayloadMessagesItemAssistant,
+        CreateChatCompletionRequestReqPayloadMessagesItemAssistantContent,
+        CreateChatCompletionRequestReqPayloadMessagesItemAssistantFunctionCall,
+        CreateChatCompletionRequestReqPayloadMessagesItemAssistantToolCallsItem,
+        CreateChatCompletionRequestReqPayloadMessagesItemAssistantToolCallsItemFunction,
+        CreateChatCompletionRequestReqPayloadMessagesItemFunction,
+        CreateChatCompletionRequestReqPayloadMessagesItemFunctionContent,
+        CreateChatCompletionRequestReqPayloadMessagesItemSystem,
+        CreateChatCompletionRequestReqPayloadMessagesItemTool,
+        CreateChatCompletionRequestReqPayloadMessagesItemUser,
+        CreateChatCompletionRequestReqPayloadMessagesItemUserContent,
+        CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem,
+        CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrl,
+        CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrlImageUrl,
+        CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrlImageUrlDetail,
+        CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemText,
+        CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem_ImageUrl,
+        CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem_Text,
+        CreateChatCompletionRequestReqPayloadMessagesItem_Assistant,
+        CreateChatCompletionRequestReqPayloadMessagesItem_Function,
+        CreateChatCompletionRequestReqPayloadMessagesItem_System,
+        CreateChatCompletionRequestReqPayloadMessagesItem_Tool,
+        CreateChatCompletionRequestReqPayloadMessagesItem_User,
+        CreateChatCompletionRequestReqPayloadResponseFormat,
+        CreateChatCompletionRequestReqPayloadResponseFormatType,
+        CreateChatCompletionRequestReqPayloadToolChoice,
+        CreateChatCompletionRequestReqPayloadToolChoiceFunction,
+        CreateChatCompletionRequestReqPayloadToolChoiceFunctionFunction,
+        CreateChatCompletionRequestReqPayloadToolsItem,
+        CreateChatCompletionRequestReqPayloadToolsItemFunction,
+        CreateChatCompletionRequestResponseFormat,
+        CreateChatCompletionRequestResponseFormatType,
+        CreateChatCompletionRequestToolChoice,
+        CreateChatCompletionRequestToolChoiceFunction,
+        CreateChatCompletionRequestToolChoiceFunctionFunction,
+        CreateChatCompletionRequestToolsItem,
+        CreateChatCompletionRequestToolsItemFunction,
+        CreateChatCompletionResponse,
+        CreateChatCompletionResponseChoices,
+        CreateChatCompletionResponseChoicesChoicesItem,
+        CreateChatCompletionResponseChoicesChoicesItemFinishReason,
+        CreateChatCompletionResponseChoicesChoicesItemLogprobs,
+        CreateChatCompletionResponseChoicesChoicesItemLogprobsContentItem,
+        CreateChatCompletionResponseChoicesChoicesItemLogprobsContentItemTopLogprobsItem,
+        CreateChatCompletionResponseChoicesChoicesItemMessage,
+        CreateChatCompletionResponseChoicesChoicesItemMessageContent,
+        CreateChatCompletionResponseChoicesChoicesItemMessageFunctionCall,
+        CreateChatCompletionResponseChoicesChoicesItemMessageToolCallsItem,
+        CreateChatCompletionResponseChoicesChoicesItemMessageToolCallsItemFunction,
+        CreateChatCompletionResponseChoicesUsage,
+        LocalTestingOnlyGetLatestLoggedCallResponse,
+        ReportBatchRequestCallsItem,
+        ReportBatchRequestCallsItemTagsValue,
+        ReportBatchResponse,
+        ReportBatchResponseResultsItem,
+        ReportBatchResponseResultsItemStatus,
+        ReportRequestTagsValue,
+        ReportResponse,
+        ReportResponseStatus,
+        UnstableDatasetCreateResponse,
+        UnstableDatasetEntryCreateRequestEntriesItem,
+        UnstableDatasetEntryCreateRequestEntriesItemFunctionCall,
+        UnstableDatasetEntryCreateRequestEntriesItemFunctionCallName,
+        UnstableDatasetEntryCreateRequestEntriesItemFunctionsItem,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItem,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistant,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantContent,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantFunctionCall,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantToolCallsItem,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantToolCallsItemFunction,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemFunction,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemFunctionContent,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemSystem,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemTool,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUser,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContent,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrl,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrlImageUrl,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrlImageUrlDetail,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemText,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem_ImageUrl,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem_Text,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Assistant,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Function,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_System,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Tool,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_User,
+        UnstableDatasetEntryCreateRequestEntriesItemResponseFormat,
+        UnstableDatasetEntryCreateRequestEntriesItemResponseFormatType,
+        UnstableDatasetEntryCreateRequestEntriesItemSplit,
+        UnstableDatasetEntryCreateRequestEntriesItemToolChoice,
+        UnstableDatasetEntryCreateRequestEntriesItemToolChoiceFunction,
+        UnstableDatasetEntryCreateRequestEntriesItemToolChoiceFunctionFunction,
+        UnstableDatasetEntryCreateRequestEntriesItemToolsItem,
+        UnstableDatasetEntryCreateRequestEntriesItemToolsItemFunction,
+        UnstableDatasetEntryCreateResponse,
+        UnstableDatasetEntryCreateResponseErrorsItem,
+        UnstableFinetuneCreateRequestBaseModel,
+        UnstableFinetuneCreateResponse,
+        UnstableFinetuneGetResponse,
+        UnstableFinetuneGetResponseStatus,
+        UpdateLogTagsBatchRequestUpdatesItem,
+        UpdateLogTagsBatchRequestUpdatesItemTagsValue,
+        UpdateLogTagsBatchResponse,
+        UpdateLogTagsRequestFiltersItem,
+        UpdateLogTagsRequestFiltersItemEquals,
+        UpdateLogTagsRequestTagsValue,
+        UpdateLogTagsResponse,
+    )
+    from .environment import OpenPipeApiEnvironment
+
+_EXPORTS = {
+    "CheckCacheResponse": ".types",
+    "CreateChatCompletionRequestFunctionCall": ".types",
+    "CreateChatCompletionRequestFunctionCallName": ".types",
+    "CreateChatCompletionRequestFunctionsItem": ".types",
+    "CreateChatCompletionRequestMessagesItem": ".types",
+    "CreateChatCompletionRequestMessagesItemAssistant": ".types",
+    "CreateChatCompletionRequestMessagesItemAssistantContent": ".types",
+    "CreateChatCompletionRequestMessagesItemAssistantFunctionCall": ".types",
+    "CreateChatCompletionRequestMessagesItemAssistantToolCallsItem": ".types",
+    "CreateChatCompletionRequestMessagesItemAssistantToolCallsItemFunction": ".types",
+    "CreateChatCompletionRequestMessagesItemFunction": ".types",
+    "CreateChatCompletionRequestMessagesItemFunctionContent": ".types",
+    "CreateChatCompletionRequestMessagesItemSystem": ".types",
+    "CreateChatCompletionRequestMessagesItemTool": ".types",
+    "CreateChatCompletionRequestMessagesItemUser": ".types",
+    "CreateChatCompletionRequestMessagesItemUserContent": ".types",
+    "CreateChatCompletionRequestMessagesItemUserContentItem": ".types",
+    "CreateChatCompletionRequestMessagesItemUserContentItemImageUrl": ".types",
+    "CreateChatCompletionRequestMessagesItemUserContentItemImageUrlImageUrl": ".types",
+    "CreateChatCompletionRequestMessagesItemUserContentItemImageUrlImageUrlDetail": ".types",
+    "CreateChatCompletionRequestMessagesItemUserContentItemText": ".types",
+    "CreateChatCompletionRequestMessagesItemUserContentItem_ImageUrl": ".types",
+    "CreateChatCompletionRequestMessagesItemUserContentItem_Text": ".types",
+    "CreateChatCompletionRequestMessagesItem_Assistant": ".types",
+    "CreateChatCompletionRequestMessagesItem_Function": ".types",
+    "CreateChatCompletionRequestMessagesItem_System": ".types",
+    "CreateChatCompletionRequestMessagesItem_Tool": ".types",
+    "CreateChatCompletionRequestMessagesItem_User": ".types",
+    "CreateChatCompletionRequestReqPayload": ".types",
+    "CreateChatCompletionRequestReqPayloadFunctionCall": ".types",
+    "CreateChatCompletionRequestReqPayloadFunctionCallName": ".types",
+    "CreateChatCompletionRequestReqPayloadFunctionsItem": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItem": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemAssistant": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemAssistantContent": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemAssistantFunctionCall": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemAssistantToolCallsItem": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemAssistantToolCallsItemFunction": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemFunction": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemFunctionContent": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemSystem": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemTool": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUser": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUserContent": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrl": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrlImageUrl": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrlImageUrlDetail": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemText": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem_ImageUrl": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem_Text": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItem_Assistant": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItem_Function": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItem_System": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItem_Tool": ".types",
+    "CreateChatCompletionRequestReqPayloadMessagesItem_User": ".types",
+    "CreateChatCompletionRequestReqPayloadResponseFormat": ".types",
+    "CreateChatCompletionRequestReqPayloadResponseFormatType": ".types",
+    "CreateChatCompletionRequestReqPayloadToolChoice": ".types",
+    "CreateChatCompletionRequestReqPayloadToolChoiceFunction": ".types",
+    "CreateChatCompletionRequestReqPayloadToolChoiceFunctionFunction": ".types",
+    "CreateChatCompletionRequestReqPayloadToolsItem": ".types",
+    "CreateChatCompletionRequestReqPayloadToolsItemFunction": ".types",
+    "CreateChatCompletionRequestResponseFormat": ".types",
+    "CreateChatCompletionRequestResponseFormatType": ".types",
+    "CreateChatCompletionRequestToolChoice": ".types",
+    "CreateChatCompletionRequestToolChoiceFunction": ".types",
+    "CreateChatCompletionRequestToolChoiceFunctionFunction": ".types",
+    "CreateChatCompletionRequestToolsItem": ".types",
+    "CreateChatCompletionRequestToolsItemFunction": ".types",
+    "CreateChatCompletionResponse": ".types",
+    "CreateChatCompletionResponseChoices": ".types",
+    "CreateChatCompletionResponseChoicesChoicesItem": ".types",
+    "CreateChatCompletionResponseChoicesChoicesItemFinishReason": ".types",
+    "CreateChatCompletionResponseChoicesChoicesItemLogprobs": ".types",
+    "CreateChatCompletionResponseChoicesChoicesItemLogprobsContentItem": ".types",
+    "CreateChatCompletionResponseChoicesChoicesItemLogprobsContentItemTopLogprobsItem": ".types",
+    "CreateChatCompletionResponseChoicesChoicesItemMessage": ".types",
+    "CreateChatCompletionResponseChoicesChoicesItemMessageContent": ".types",
+    "CreateChatCompletionResponseChoicesChoicesItemMessageFunctionCall": ".types",
+    "CreateChatCompletionResponseChoicesChoicesItemMessageToolCallsItem": ".types",
+    "CreateChatCompletionResponseChoicesChoicesItemMessageToolCallsItemFunction": ".types",
+    "CreateChatCompletionResponseChoicesUsage": ".types",
+    "LocalTestingOnlyGetLatestLoggedCallResponse": ".types",
+    "ReportBatchRequestCallsItem": ".types",
+    "ReportBatchRequestCallsItemTagsValue": ".types",
+    "ReportBatchResponse": ".types",
+    "ReportBatchResponseResultsItem": ".types",
+    "ReportBatchResponseResultsItemStatus": ".types",
+    "ReportRequestTagsValue": ".types",
+    "ReportResponse": ".types",
+    "ReportResponseStatus": ".types",
+    "UnstableDatasetCreateResponse": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItem": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemFunctionCall": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemFunctionCallName": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemFunctionsItem": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItem": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistant": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantContent": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantFunctionCall": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantToolCallsItem": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantToolCallsItemFunction": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemFunction": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemFunctionContent": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemSystem": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemTool": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUser": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContent": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrl": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrlImageUrl": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrlImageUrlDetail": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemText": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem_ImageUrl": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem_Text": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Assistant": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Function": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_System": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Tool": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_User": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemResponseFormat": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemResponseFormatType": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemSplit": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemToolChoice": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemToolChoiceFunction": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemToolChoiceFunctionFunction": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemToolsItem": ".types",
+    "UnstableDatasetEntryCreateRequestEntriesItemToolsItemFunction": ".types",
+    "UnstableDatasetEntryCreateResponse": ".types",
+    "UnstableDatasetEntryCreateResponseErrorsItem": ".types",
+    "UnstableFinetuneCreateRequestBaseModel": ".types",
+    "UnstableFinetuneCreateResponse": ".types",
+    "UnstableFinetuneGetResponse": ".types",
+    "UnstableFinetuneGetResponseStatus": ".types",
+    "UpdateLogTagsBatchRequestUpdatesItem": ".types",
+    "UpdateLogTagsBatchRequestUpdatesItemTagsValue": ".types",
+    "UpdateLogTagsBatchResponse": ".types",
+    "UpdateLogTagsRequestFiltersItem": ".types",
+    "UpdateLogTagsRequestFiltersItemEquals": ".types",
+    "UpdateLogTagsRequestTagsValue": ".types",
+    "UpdateLogTagsResponse": ".types",
+    "OpenPipeApiEnvironment": ".environment",
+}
+
+
+def __getattr__(name: str) -> typing.Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted([*globals(), *_EXPORTS])
+
 
 __all__ = [
     "CheckCacheResponse",
@@ -224,6 +399,11 @@ __all__ = [
     "CreateChatCompletionResponseChoicesUsage",
     "LocalTestingOnlyGetLatestLoggedCallResponse",
     "OpenPipeApiEnvironment",
+    "ReportBatchRequestCallsItem",
+    "ReportBatchRequestCallsItemTagsValue",
+    "ReportBatchResponse",
+    "ReportBatchResponseResultsItem",
+    "ReportBatchResponseResultsItemStatus",
     "ReportRequestTagsValue",
     "ReportResponse",
     "ReportResponseStatus",
@@ -270,6 +450,9 @@ __all__ = [
     "UnstableFinetuneCreateResponse",
     "UnstableFinetuneGetResponse",
     "UnstableFinetuneGetResponseStatus",
+    "UpdateLogTagsBatchRequestUpdatesItem",
+    "UpdateLogTagsBatchRequestUpdatesItemTagsValue",
+    "UpdateLogTagsBatchResponse",
     "UpdateLogTagsRequestFiltersItem",
     "UpdateLogTagsRequestFiltersItemEquals",
     "UpdateLogTagsRequestTagsValue",
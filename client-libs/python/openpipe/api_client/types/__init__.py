@@ -1,285 +1,459 @@
 # This file was auto-generated by Fern from our API Definition.
 
-from .check_cache_response import CheckCacheResponse
-from .create_chat_completion_request_function_call import CreateChatCompletionRequestFunctionCall
-from .create_chat_completion_request_function_call_name import CreateChatCompletionRequestFunctionCallName
-from .create_chat_completion_request_functions_item import CreateChatCompletionRequestFunctionsItem
-from .create_chat_completion_request_messages_item import (
-    CreateChatCompletionRequestMessagesItem,
-    CreateChatCompletionRequestMessagesItem_Assistant,
-    CreateChatCompletionRequestMessagesItem_Function,
-    CreateChatCompletionRequestMessagesItem_System,
-    CreateChatCompletionRequestMessagesItem_Tool,
-    CreateChatCompletionRequestMessagesItem_User,
-)
-from .create_chat_completion_request_messages_item_assistant import CreateChatCompletionRequestMessagesItemAssistant
-from .create_chat_completion_request_messages_item_assistant_content import (
-    CreateChatCompletionRequestMessagesItemAssistantContent,
-)
-from .create_chat_completion_request_messages_item_assistant_function_call import (
-    CreateChatCompletionRequestMessagesItemAssistantFunctionCall,
-)
-from .create_chat_completion_request_messages_item_assistant_tool_calls_item import (
-    CreateChatCompletionRequestMessagesItemAssistantToolCallsItem,
-)
-from .create_chat_completion_request_messages_item_assistant_tool_calls_item_function import (
-    CreateChatCompletionRequestMessagesItemAssistantToolCallsItemFunction,
-)
-from .create_chat_completion_request_messages_item_function import CreateChatCompletionRequestMessagesItemFunction
-from .create_chat_completion_request_messages_item_function_content import (
-    CreateChatCompletionRequestMessagesItemFunctionContent,
-)
-from .create_chat_completion_request_messages_item_system import CreateChatCompletionRequestMessagesItemSystem
-from .create_chat_completion_request_messages_item_tool import CreateChatCompletionRequestMessagesItemTool
-from .create_chat_completion_request_messages_item_user import CreateChatCompletionRequestMessagesItemUser
-from .create_chat_completion_request_messages_item_user_content import (
-    CreateChatCompletionRequestMessagesItemUserContent,
-)
-from .create_chat_completion_request_messages_item_user_content_item import (
-    CreateChatCompletionRequestMessagesItemUserContentItem,
-    CreateChatCompletionRequestMessagesItemUserContentItem_ImageUrl,
-    CreateChatCompletionRequestMessagesItemUserContentItem_Text,
-)
-from .create_chat_completion_request_messages_item_user_content_item_image_url import (
-    CreateChatCompletionRequestMessagesItemUserContentItemImageUrl,
-)
-from .create_chat_completion_request_messages_item_user_content_item_image_url_image_url import (
-    CreateChatCompletionRequestMessagesItemUserContentItemImageUrlImageUrl,
-)
-from .create_chat_completion_request_messages_item_user_content_item_image_url_image_url_detail import (
-    CreateChatCompletionRequestMessagesItemUserContentItemImageUrlImageUrlDetail,
-)
-from .create_chat_completion_request_messages_item_user_content_item_text import (
-    CreateChatCompletionRequestMessagesItemUserContentItemText,
-)
-from .create_chat_completion_request_req_payload import CreateChatCompletionRequestReqPayload
-from .create_chat_completion_request_req_payload_function_call import CreateChatCompletionRequestReqPayloadFunctionCall
-from .create_chat_completion_request_req_payload_function_call_name import (
-    CreateChatCompletionRequestReqPayloadFunctionCallName,
-)
-from .create_chat_completion_request_req_payload_functions_item import (
-    CreateChatCompletionRequestReqPayloadFunctionsItem,
-)
-from .create_chat_completion_request_req_payload_messages_item import (
-    CreateChatCompletionRequestReqPayloadMessagesItem,
-    CreateChatCompletionRequestReqPayloadMessagesItem_Assistant,
-    CreateChatCompletionRequestReqPayloadMessagesItem_Function,
-    CreateChatCompletionRequestReqPayloadMessagesItem_System,
-    CreateChatCompletionRequestReqPayloadMessagesItem_Tool,
-    CreateChatCompletionRequestReqPayloadMessagesItem_User,
-)
-from .create_chat_completion_request_req_payload_messages_item_assistant import (
-    CreateChatCompletionRequestReqPayloadMessagesItemAssistant,
-)
-from .create_chat_completion_request_req_payload_messages_item_assistant_content import (
-    CreateChatCompletionRequestReqPayloadMessagesItemAssistantContent,
-)
-from .create_chat_completion_request_req_payload_messages_item_assistant_function_call import (
-    CreateChatCompletionRequestReqPayloadMessagesItemAssistantFunctionCall,
-)
-from .create_chat_completion_request_req_payload_messages_item_assistant_tool_calls_item import (
-    CreateChatCompletionRequestReqPayloadMessagesItemAssistantToolCallsItem,
-)
-from .create_chat_completion_request_req_payload_messages_item_assistant_tool_calls_item_function import (
-    CreateChatCompletionRequestReqPayloadMessagesItemAssistantToolCallsItemFunction,
-)
-from .create_chat_completion_request_req_payload_messages_item_function import (
-    CreateChatCompletionRequestReqPayloadMessagesItemFunction,
-)
-from .create_chat_completion_request_req_payload_messages_item_function_content import (
-    CreateChatCompletionRequestReqPayloadMessagesItemFunctionContent,
-)
-from .create_chat_completion_request_req_payload_messages_item_system import (
-    CreateChatCompletionRequestReqPayloadMessagesItemSystem,
-)
-from .create_chat_completion_request_req_payload_messages_item_tool import (
-    CreateChatCompletionRequestReqPayloadMessagesItemTool,
-)
-from .create_chat_completion_request_req_payload_messages_item_user import (
-    CreateChatCompletionRequestReqPayloadMessagesItemUser,
-)
-from .create_chat_completion_request_req_payload_messages_item_user_content import (
-    CreateChatCompletionRequestReqPayloadMessagesItemUserContent,
-)
-from .create_chat_completion_request_req_payload_messages_item_user_content_item import (
-    CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem,
-    CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem_ImageUrl,
-    CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem_Text,
-)
-from .create_chat_completion_request_req_payload_messages_item_user_content_item_image_url import (
-    CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrl,
-)
-from .create_chat_completion_request_req_payload_messages_item_user_content_item_image_url_image_url import (
-    CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrlImageUrl,
-)
-from .create_chat_completion_request_req_payload_messages_item_user_content_item_image_url_image_url_detail import (
-    CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrlImageUrlDetail,
-)
-from .create_chat_completion_request_req_payload_messages_item_user_content_item_text import (
-    CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemText,
-)
-from .create_chat_completion_request_req_payload_response_format import (
-    CreateChatCompletionRequestReqPayloadResponseFormat,
-)
-from .create_chat_completion_request_req_payload_response_format_type import (
-    CreateChatCompletionRequestReqPayloadResponseFormatType,
-)
-from .create_chat_completion_request_req_payload_tool_choice import CreateChatCompletionRequestReqPayloadToolChoice
-from .create_chat_completion_request_req_payload_tool_choice_function import (
-    CreateChatCompletionRequestReqPayloadToolChoiceFunction,
-)
-from .create_chat_completion_request_req_payload_tool_choice_function_function import (
-    CreateChatCompletionRequestReqPayloadToolChoiceFunctionFunction,
-)
-from .create_chat_completion_request_req_payload_tools_item import CreateChatCompletionRequestReqPayloadToolsItem
-from .create_chat_completion_request_req_payload_tools_item_function import (
-    CreateChatCompletionRequestReqPayloadToolsItemFunction,
-)
-from .create_chat_completion_request_response_format import CreateChatCompletionRequestResponseFormat
-from .create_chat_completion_request_response_format_type import CreateChatCompletionRequestResponseFormatType
-from .create_chat_completion_request_tool_choice import CreateChatCompletionRequestToolChoice
-from .create_chat_completion_request_tool_choice_function import CreateChatCompletionRequestToolChoiceFunction
-from .create_chat_completion_request_tool_choice_function_function import (
-    CreateChatCompletionRequestToolChoiceFunctionFunction,
-)
-from .create_chat_completion_request_tools_item import CreateChatCompletionRequestToolsItem
-from .create_chat_completion_request_tools_item_function import CreateChatCompletionRequestToolsItemFunction
-from .create_chat_completion_response import CreateChatCompletionResponse
-from .create_chat_completion_response_choices import CreateChatCompletionResponseChoices
-from .create_chat_completion_response_choices_choices_item import CreateChatCompletionResponseChoicesChoicesItem
-from .create_chat_completion_response_choices_choices_item_finish_reason import (
-    CreateChatCompletionResponseChoicesChoicesItemFinishReason,
-)
-from .create_chat_completion_response_choices_choices_item_logprobs import (
-    CreateChatCompletionResponseChoicesChoicesItemLogprobs,
-)
-from .create_chat_completion_response_choices_choices_item_logprobs_content_item import (
-    CreateChatCompletionResponseChoicesChoicesItemLogprobsContentItem,
-)
-from .create_chat_completion_response_choices_choices_item_logprobs_content_item_top_logprobs_item import (
-    CreateChatCompletionResponseChoicesChoicesItemLogprobsContentItemTopLogprobsItem,
-)
-from .create_chat_completion_response_choices_choices_item_message import (
-    CreateChatCompletionResponseChoicesChoicesItemMessage,
-)
-from .create_chat_completion_response_choices_choices_item_message_content import (
-    CreateChatCompletionResponseChoicesChoicesItemMessageContent,
-)
-from .create_chat_completion_response_choices_choices_item_message_function_call import (
-    CreateChatCompletionResponseChoicesChoicesItemMessageFunctionCall,
-)
-from .create_chat_completion_response_choices_choices_item_message_tool_calls_item import (
-    CreateChatCompletionResponseChoicesChoicesItemMessageToolCallsItem,
-)
-from .create_chat_completion_response_choices_choices_item_message_tool_calls_item_function import (
-    CreateChatCompletionResponseChoicesChoicesItemMessageToolCallsItemFunction,
-)
-from .create_chat_completion_response_choices_usage import CreateChatCompletionResponseChoicesUsage
-from .local_testing_only_get_latest_logged_call_response import LocalTestingOnlyGetLatestLoggedCallResponse
-from .report_request_tags_value import ReportRequestTagsValue
-from .report_response import ReportResponse
-from .report_response_status import ReportResponseStatus
-from .unstable_dataset_create_response import UnstableDatasetCreateResponse
-from .unstable_dataset_entry_create_request_entries_item import UnstableDatasetEntryCreateRequestEntriesItem
-from .unstable_dataset_entry_create_request_entries_item_function_call import (
-    UnstableDatasetEntryCreateRequestEntriesItemFunctionCall,
-)
-from .unstable_dataset_entry_create_request_entries_item_function_call_name import (
-    UnstableDatasetEntryCreateRequestEntriesItemFunctionCallName,
-)
-from .unstable_dataset_entry_create_request_entries_item_functions_item import (
-    UnstableDatasetEntryCreateRequestEntriesItemFunctionsItem,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItem,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Assistant,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Function,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_System,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Tool,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_User,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item_assistant import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistant,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item_assistant_content import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantContent,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item_assistant_function_call import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantFunctionCall,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item_assistant_tool_calls_item import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantToolCallsItem,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item_assistant_tool_calls_item_function import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantToolCallsItemFunction,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item_function import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemFunction,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item_function_content import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemFunctionContent,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item_system import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemSystem,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item_tool import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemTool,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item_user import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUser,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item_user_content import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContent,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem_ImageUrl,
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem_Text,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item_image_url import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrl,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item_image_url_image_url import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrlImageUrl,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item_image_url_image_url_detail import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrlImageUrlDetail,
-)
-from .unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item_text import (
-    UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemText,
-)
-from .unstable_dataset_entry_create_request_entries_item_response_format import (
-    UnstableDatasetEntryCreateRequestEntriesItemResponseFormat,
-)
-from .unstable_dataset_entry_create_request_entries_item_response_format_type import (
-    UnstableDatasetEntryCreateRequestEntriesItemResponseFormatType,
-)
-from .unstable_dataset_entry_create_request_entries_item_split import UnstableDatasetEntryCreateRequestEntriesItemSplit
-from .unstable_dataset_entry_create_request_entries_item_tool_choice import (
-    UnstableDatasetEntryCreateRequestEntriesItemToolChoice,
-)
-from .unstable_dataset_entry_create_request_entries_item_tool_choice_function import (
-    UnstableDatasetEntryCreateRequestEntriesItemToolChoiceFunction,
-)
-from .unstable_dataset_entry_create_request_entries_item_tool_choice_function_function import (
-    UnstableDatasetEntryCreateRequestEntriesItemToolChoiceFunctionFunction,
-)
-from .unstable_dataset_entry_create_request_entries_item_tools_item import (
-    UnstableDatasetEntryCreateRequestEntriesItemToolsItem,
-)
-from .unstable_dataset_entry_create_request_entries_item_tools_item_function import (
-    UnstableDatasetEntryCreateRequestEntriesItemToolsItemFunction,
-)
-from .unstable_dataset_entry_create_response import UnstableDatasetEntryCreateResponse
-from .unstable_dataset_entry_create_response_errors_item import UnstableDatasetEntryCreateResponseErrorsItem
-from .unstable_finetune_create_request_base_model import UnstableFinetuneCreateRequestBaseModel
-from .unstable_finetune_create_response import UnstableFinetuneCreateResponse
-from .unstable_finetune_get_response import UnstableFinetuneGetResponse
-from .unstable_finetune_get_response_status import UnstableFinetuneGetResponseStatus
-from .update_log_tags_request_filters_item import UpdateLogTagsRequestFiltersItem
-from .update_log_tags_request_filters_item_equals import UpdateLogTagsRequestFiltersItemEquals
-from .update_log_tags_request_tags_value import UpdateLogTagsRequestTagsValue
-from .update_log_tags_response import UpdateLogTagsResponse
+# Submodules are only imported when one of their exports is first used, since
+# importing every type up front is a large part of the time taken by `import openpipe`.
+
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+    from .check_cache_response import CheckCacheResponse
+    from .create_chat_completion_request_function_call import CreateChatCompletionRequestFunctionCall
+    from .create_chat_completion_request_function_call_name import CreateChatCompletionRequestFunctionCallName
+    from .create_chat_completion_request_functions_item import CreateChatCompletionRequestFunctionsItem
+    from .create_chat_completion_request_messages_item import (
+        CreateChatCompletionRequestMessagesItem,
+        CreateChatCompletionRequestMessagesItem_Assistant,
+        CreateChatCompletionRequestMessagesItem_Function,
+        CreateChatCompletionRequestMessagesItem_System,
+        CreateChatCompletionRequestMessagesItem_Tool,
+        CreateChatCompletionRequestMessagesItem_User,
+    )
+    from .create_chat_completion_request_messages_item_assistant import CreateChatCompletionRequestMessagesItemAssistant
+    from .create_chat_completion_request_messages_item_assistant_content import (
+        CreateChatCompletionRequestMessagesItemAssistantContent,
+    )
+    from .create_chat_completion_request_messages_item_assistant_function_call import (
+        CreateChatCompletionRequestMessagesItemAssistantFunctionCall,
+    )
+    from .create_chat_completion_request_messages_item_assistant_tool_calls_item import (
+        CreateChatCompletionRequestMessagesItemAssistantToolCallsItem,
+    )
+    from .create_chat_completion_request_messages_item_assistant_tool_calls_item_function import (
+        CreateChatCompletionRequestMessagesItemAssistantToolCallsItemFunction,
+    )
+    from .create_chat_completion_request_messages_item_function import CreateChatCompletionRequestMessagesItemFunction
+    from .create_chat_completion_request_messages_item_function_content import (
+        CreateChatCompletionRequestMessagesItemFunctionContent,
+    )
+    from .create_chat_completion_request_messages_item_system import CreateChatCompletionRequestMessagesItemSystem
+    from .create_chat_completion_request_messages_item_tool import CreateChatCompletionRequestMessagesItemTool
+    from .create_chat_completion_request_messages_item_user import CreateChatCompletionRequestMessagesItemUser
+    from .create_chat_completion_request_messages_item_user_content import (
+        CreateChatCompletionRequestMessagesItemUserContent,
+    )
+    from .create_chat_completion_request_messages_item_user_content_item import (
+        CreateChatCompletionRequestMessagesItemUserContentItem,
+        CreateChatCompletionRequestMessagesItemUserContentItem_ImageUrl,
+        CreateChatCompletionRequestMessagesItemUserContentItem_Text,
+    )
+    from .create_chat_completion_request_messages_item_user_content_item_image_url import (
+        CreateChatCompletionRequestMessagesItemUserContentItemImageUrl,
+    )
+    from .create_chat_completion_request_messages_item_user_content_item_image_url_image_url import (
+        CreateChatCompletionRequestMessagesItemUserContentItemImageUrlImageUrl,
+    )
+    from .create_chat_completion_request_messages_item_user_content_item_image_url_image_url_detail import (
+        CreateChatCompletionRequestMessagesItemUserContentItemImageUrlImageUrlDetail,
+    )
+    from .create_chat_completion_request_messages_item_user_content_item_text import (
+        CreateChatCompletionRequestMessagesItemUserContentItemText,
+    )
+    from .create_chat_completion_request_req_payload import CreateChatCompletionRequestReqPayload
+    from .create_chat_completion_request_req_payload_function_call import CreateChatCompletionRequestReqPayloadFunctionCall
+    from .create_chat_completion_request_req_payload_function_call_name import (
+        CreateChatCompletionRequestReqPayloadFunctionCallName,
+    )
+    from .create_chat_completion_request_req_payload_functions_item import (
+        CreateChatCompletionRequestReqPayloadFunctionsItem,
+    )
+    from .create_chat_completion_request_req_payload_messages_item import (
+        CreateChatCompletionRequestReqPayloadMessagesItem,
+        CreateChatCompletionRequestReqPayloadMessagesItem_Assistant,
+        CreateChatCompletionRequestReqPayloadMessagesItem_Function,
+        CreateChatCompletionRequestReqPayloadMessagesItem_System,
+        CreateChatCompletionRequestReqPayloadMessagesItem_Tool,
+        CreateChatCompletionRequestReqPayloadMessagesItem_User,
+    )
+    from .create_chat_completion_request_req_payload_messages_item_assistant import (
+        CreateChatCompletionRequestReqPayloadMessagesItemAssistant,
+    )
+    from .create_chat_completion_request_req_payload_messages_item_assistant_content import (
+        CreateChatCompletionRequestReqPayloadMessagesItemAssistantContent,
+    )
+    from .create_chat_completion_request_req_payload_messages_item_assistant_function_call import (
+        CreateChatCompletionRequestReqPayloadMessagesItemAssistantFunctionCall,
+    )
+    from .create_chat_completion_request_req_payload_messages_item_assistant_tool_calls_item import (
+        CreateChatCompletionRequestReqPayloadMessagesItemAssistantToolCallsItem,
+    )
+    from .create_chat_completion_request_req_payload_messages_item_assistant_tool_calls_item_function import (
+        CreateChatCompletionRequestReqPayloadMessagesItemAssistantToolCallsItemFunction,
+    )
+    from .create_chat_completion_request_req_payload_messages_item_function import (
+        CreateChatCompletionRequestReqPayloadMessagesItemFunction,
+    )
+    from .create_chat_completion_request_req_payload_messages_item_function_content import (
+        CreateChatCompletionRequestReqPayloadMessagesItemFunctionContent,
+    )
+    from .create_chat_completion_request_req_payload_messages_item_system import (
+        CreateChatCompletionRequestReqPayloadMessagesItemSystem,
+    )
+    from .create_chat_completion_request_req_payload_messages_item_tool import (
+        CreateChatCompletionRequestReqPayloadMessagesItemTool,
+    )
+    from .create_chat_completion_request_req_payload_messages_item_user import (
+        CreateChatCompletionRequestReqPayloadMessagesItemUser,
+    )
+    from .create_chat_completion_request_req_payload_messages_item_user_content import (
+        CreateChatCompletionRequestReqPayloadMessagesItemUserContent,
+    )
+    from .create_chat_completion_request_req_payload_messages_item_user_content_item import (
+        CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem,
+        CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem_ImageUrl,
+        CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem_Text,
+    )
+    from .create_chat_completion_request_req_payload_messages_item_user_content_item_image_url import (
+        CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrl,
+    )
+    from .create_chat_completion_request_req_payload_messages_item_user_content_item_image_url_image_url import (
+        CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrlImageUrl,
+    )
+    from .create_chat_completion_request_req_payload_messages_item_user_content_item_image_url_image_url_detail import (
+        CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrlImageUrlDetail,
+    )
+    from .create_chat_completion_request_req_payload_messages_item_user_content_item_text import (
+        CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemText,
+    )
+    from .create_chat_completion_request_req_payload_response_format import (
+        CreateChatCompletionRequestReqPayloadResponseFormat,
+    )
+    from .create_chat_completion_request_req_payload_response_format_type import (
+        CreateChatCompletionRequestReqPayloadResponseFormatType,
+    )
+    from .create_chat_completion_request_req_payload_tool_choice import CreateChatCompletionRequestReqPayloadToolChoice
+    from .create_chat_completion_request_req_payload_tool_choice_function import (
+        CreateChatCompletionRequestReqPayloadToolChoiceFunction,
+    )
+    from .create_chat_completion_request_req_payload_tool_choice_function_function import (
+        CreateChatCompletionRequestReqPayloadToolChoiceFunctionFunction,
+    )
+    from .create_chat_completion_request_req_payload_tools_item import CreateChatCompletionRequestReqPayloadToolsItem
+    from .create_chat_completion_request_req_payload_tools_item_function import (
+        CreateChatCompletionRequestReqPayloadToolsItemFunction,
+    )
+    from .create_chat_completion_request_response_format import CreateChatCompletionRequestResponseFormat
+    from .create_chat_completion_request_response_format_type import CreateChatCompletionRequestResponseFormatType
+    from .create_chat_completion_request_tool_choice import CreateChatCompletionRequestToolChoice
+    from .create_chat_completion_request_tool_choice_function import CreateChatCompletionRequestToolChoiceFunction
+    from .create_chat_completion_request_tool_choice_function_function import (
+        CreateChatCompletionRequestToolChoiceFunctionFunction,
+    )
+    from .create_chat_completion_request_tools_item import CreateChatCompletionRequestToolsItem
+    from .create_chat_completion_request_tools_item_function import CreateChatCompletionRequestToolsItemFunction
+    from .create_chat_completion_response import CreateChatCompletionResponse
+    from .create_chat_completion_response_choices import CreateChatCompletionResponseChoices
+    from .create_chat_completion_response_choices_choices_item import CreateChatCompletionResponseChoicesChoicesItem
+    from .create_chat_completion_response_choices_choices_item_finish_reason import (
+        CreateChatCompletionResponseChoicesChoicesItemFinishReason,
+    )
+    from .create_chat_completion_response_choices_choices_item_logprobs import (
+        CreateChatCompletionResponseChoicesChoicesItemLogprobs,
+    )
+    from .create_chat_completion_response_choices_choices_item_logprobs_content_item import (
+        CreateChatCompletionResponseChoicesChoicesItemLogprobsContentItem,
+    )
+    from .create_chat_completion_response_choices_choices_item_logprobs_content_item_top_logprobs_item import (
+        CreateChatCompletionResponseChoicesChoicesItemLogprobsContentItemTopLogprobsItem,
+    )
+    from .create_chat_completion_response_choices_choices_item_message import (
+        CreateChatCompletionResponseChoicesChoicesItemMessage,
+    )
+    from .create_chat_completion_response_choices_choices_item_message_content import (
+        CreateChatCompletionResponseChoicesChoicesItemMessageContent,
+    )
+    from .create_chat_completion_response_choices_choices_item_message_function_call import (
+        CreateChatCompletionResponseChoicesChoicesItemMessageFunctionCall,
+    )
+    from .create_chat_completion_response_choices_choices_item_message_tool_calls_item import (
+        CreateChatCompletionResponseChoicesChoicesItemMessageToolCallsItem,
+    )
+    from .create_chat_completion_response_choices_choices_item_message_tool_calls_item_function import (
+        CreateChatCompletionResponseChoicesChoicesItemMessageToolCallsItemFunction,
+    )
+    from .create_chat_completion_response_choices_usage import CreateChatCompletionResponseChoicesUsage
+    from .local_testing_only_get_latest_logged_call_response import LocalTestingOnlyGetLatestLoggedCallResponse
+    from .report_batch_request_calls_item import ReportBatchRequestCallsItem
+    from .report_batch_request_calls_item_tags_value import ReportBatchRequestCallsItemTagsValue
+    from .report_batch_response import ReportBatchResponse
+    from .report_batch_response_results_item import ReportBatchResponseResultsItem
+    from .report_batch_response_results_item_status import ReportBatchResponseResultsItemStatus
+    from .report_request_tags_value import ReportRequestTagsValue
+    from .report_response import ReportResponse
+    from .report_response_status import ReportResponseStatus
+    from .unstable_dataset_create_response import UnstableDatasetCreateResponse
+    from .unstable_dataset_entry_create_request_entries_item import UnstableDatasetEntryCreateRequestEntriesItem
+    from .unstable_dataset_entry_create_request_entries_item_function_call import (
+        UnstableDatasetEntryCreateRequestEntriesItemFunctionCall,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_function_call_name import (
+        UnstableDatasetEntryCreateRequestEntriesItemFunctionCallName,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_functions_item import (
+        UnstableDatasetEntryCreateRequestEntriesItemFunctionsItem,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItem,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Assistant,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Function,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_System,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Tool,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_User,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item_assistant import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistant,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item_assistant_content import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantContent,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item_assistant_function_call import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantFunctionCall,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item_assistant_tool_calls_item import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantToolCallsItem,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item_assistant_tool_calls_item_function import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantToolCallsItemFunction,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item_function import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemFunction,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item_function_content import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemFunctionContent,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item_system import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemSystem,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item_tool import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemTool,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item_user import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUser,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item_user_content import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContent,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem_ImageUrl,
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem_Text,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item_image_url import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrl,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item_image_url_image_url import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrlImageUrl,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item_image_url_image_url_detail import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrlImageUrlDetail,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item_text import (
+        UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemText,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_response_format import (
+        UnstableDatasetEntryCreateRequestEntriesItemResponseFormat,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_response_format_type import (
+        UnstableDatasetEntryCreateRequestEntriesItemResponseFormatType,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_split import UnstableDatasetEntryCreateRequestEntriesItemSplit
+    from .unstable_dataset_entry_create_request_entries_item_tool_choice import (
+        UnstableDatasetEntryCreateRequestEntriesItemToolChoice,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_tool_choice_function import (
+        UnstableDatasetEntryCreateRequestEntriesItemToolChoiceFunction,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_tool_choice_function_function import (
+        UnstableDatasetEntryCreateRequestEntriesItemToolChoiceFunctionFunction,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_tools_item import (
+        UnstableDatasetEntryCreateRequestEntriesItemToolsItem,
+    )
+    from .unstable_dataset_entry_create_request_entries_item_tools_item_function import (
+        UnstableDatasetEntryCreateRequestEntriesItemToolsItemFunction,
+    )
+    from .unstable_dataset_entry_create_response import UnstableDatasetEntryCreateResponse
+    from .unstable_dataset_entry_create_response_errors_item import UnstableDatasetEntryCreateResponseErrorsItem
+    from .unstable_finetune_create_request_base_model import UnstableFinetuneCreateRequestBaseModel
+    from .unstable_finetune_create_response import UnstableFinetuneCreateResponse
+    from .unstable_finetune_get_response import UnstableFinetuneGetResponse
+    from .unstable_finetune_get_response_status import UnstableFinetuneGetResponseStatus
+    from .update_log_tags_batch_request_updates_item import UpdateLogTagsBatchRequestUpdatesItem
+    from .update_log_tags_batch_request_updates_item_tags_value import UpdateLogTagsBatchRequestUpdatesItemTagsValue
+    from .update_log_tags_batch_response import UpdateLogTagsBatchResponse
+    from .update_log_tags_request_filters_item import UpdateLogTagsRequestFiltersItem
+    from .update_log_tags_request_filters_item_equals import UpdateLogTagsRequestFiltersItemEquals
+    from .update_log_tags_request_tags_value import UpdateLogTagsRequestTagsValue
+    from .update_log_tags_response import UpdateLogTagsResponse
+
+_EXPORTS = {
+    "CheckCacheResponse": ".check_cache_response",
+    "CreateChatCompletionRequestFunctionCall": ".create_chat_completion_request_function_call",
+    "CreateChatCompletionRequestFunctionCallName": ".create_chat_completion_request_function_call_name",
+    "CreateChatCompletionRequestFunctionsItem": ".create_chat_completion_request_functions_item",
+    "CreateChatCompletionRequestMessagesItem": ".create_chat_completion_request_messages_item",
+    "CreateChatCompletionRequestMessagesItem_Assistant": ".create_chat_completion_request_messages_item",
+    "CreateChatCompletionRequestMessagesItem_Function": ".create_chat_completion_request_messages_item",
+    "CreateChatCompletionRequestMessagesItem_System": ".create_chat_completion_request_messages_item",
+    "CreateChatCompletionRequestMessagesItem_Tool": ".create_chat_completion_request_messages_item",
+    "CreateChatCompletionRequestMessagesItem_User": ".create_chat_completion_request_messages_item",
+    "CreateChatCompletionRequestMessagesItemAssistant": ".create_chat_completion_request_messages_item_assistant",
+    "CreateChatCompletionRequestMessagesItemAssistantContent": ".create_chat_completion_request_messages_item_assistant_content",
+    "CreateChatCompletionRequestMessagesItemAssistantFunctionCall": ".create_chat_completion_request_messages_item_assistant_function_call",
+    "CreateChatCompletionRequestMessagesItemAssistantToolCallsItem": ".create_chat_completion_request_messages_item_assistant_tool_calls_item",
+    "CreateChatCompletionRequestMessagesItemAssistantToolCallsItemFunction": ".create_chat_completion_request_messages_item_assistant_tool_calls_item_function",
+    "CreateChatCompletionRequestMessagesItemFunction": ".create_chat_completion_request_messages_item_function",
+    "CreateChatCompletionRequestMessagesItemFunctionContent": ".create_chat_completion_request_messages_item_function_content",
+    "CreateChatCompletionRequestMessagesItemSystem": ".create_chat_completion_request_messages_item_system",
+    "CreateChatCompletionRequestMessagesItemTool": ".create_chat_completion_request_messages_item_tool",
+    "CreateChatCompletionRequestMessagesItemUser": ".create_chat_completion_request_messages_item_user",
+    "CreateChatCompletionRequestMessagesItemUserContent": ".create_chat_completion_request_messages_item_user_content",
+    "CreateChatCompletionRequestMessagesItemUserContentItem": ".create_chat_completion_request_messages_item_user_content_item",
+    "CreateChatCompletionRequestMessagesItemUserContentItem_ImageUrl": ".create_chat_completion_request_messages_item_user_content_item",
+    "CreateChatCompletionRequestMessagesItemUserContentItem_Text": ".create_chat_completion_request_messages_item_user_content_item",
+    "CreateChatCompletionRequestMessagesItemUserContentItemImageUrl": ".create_chat_completion_request_messages_item_user_content_item_image_url",
+    "CreateChatCompletionRequestMessagesItemUserContentItemImageUrlImageUrl": ".create_chat_completion_request_messages_item_user_content_item_image_url_image_url",
+    "CreateChatCompletionRequestMessagesItemUserContentItemImageUrlImageUrlDetail": ".create_chat_completion_request_messages_item_user_content_item_image_url_image_url_detail",
+    "CreateChatCompletionRequestMessagesItemUserContentItemText": ".create_chat_completion_request_messages_item_user_content_item_text",
+    "CreateChatCompletionRequestReqPayload": ".create_chat_completion_request_req_payload",
+    "CreateChatCompletionRequestReqPayloadFunctionCall": ".create_chat_completion_request_req_payload_function_call",
+    "CreateChatCompletionRequestReqPayloadFunctionCallName": ".create_chat_completion_request_req_payload_function_call_name",
+    "CreateChatCompletionRequestReqPayloadFunctionsItem": ".create_chat_completion_request_req_payload_functions_item",
+    "CreateChatCompletionRequestReqPayloadMessagesItem": ".create_chat_completion_request_req_payload_messages_item",
+    "CreateChatCompletionRequestReqPayloadMessagesItem_Assistant": ".create_chat_completion_request_req_payload_messages_item",
+    "CreateChatCompletionRequestReqPayloadMessagesItem_Function": ".create_chat_completion_request_req_payload_messages_item",
+    "CreateChatCompletionRequestReqPayloadMessagesItem_System": ".create_chat_completion_request_req_payload_messages_item",
+    "CreateChatCompletionRequestReqPayloadMessagesItem_Tool": ".create_chat_completion_request_req_payload_messages_item",
+    "CreateChatCompletionRequestReqPayloadMessagesItem_User": ".create_chat_completion_request_req_payload_messages_item",
+    "CreateChatCompletionRequestReqPayloadMessagesItemAssistant": ".create_chat_completion_request_req_payload_messages_item_assistant",
+    "CreateChatCompletionRequestReqPayloadMessagesItemAssistantContent": ".create_chat_completion_request_req_payload_messages_item_assistant_content",
+    "CreateChatCompletionRequestReqPayloadMessagesItemAssistantFunctionCall": ".create_chat_completion_request_req_payload_messages_item_assistant_function_call",
+    "CreateChatCompletionRequestReqPayloadMessagesItemAssistantToolCallsItem": ".create_chat_completion_request_req_payload_messages_item_assistant_tool_calls_item",
+    "CreateChatCompletionRequestReqPayloadMessagesItemAssistantToolCallsItemFunction": ".create_chat_completion_request_req_payload_messages_item_assistant_tool_calls_item_function",
+    "CreateChatCompletionRequestReqPayloadMessagesItemFunction": ".create_chat_completion_request_req_payload_messages_item_function",
+    "CreateChatCompletionRequestReqPayloadMessagesItemFunctionContent": ".create_chat_completion_request_req_payload_messages_item_function_content",
+    "CreateChatCompletionRequestReqPayloadMessagesItemSystem": ".create_chat_completion_request_req_payload_messages_item_system",
+    "CreateChatCompletionRequestReqPayloadMessagesItemTool": ".create_chat_completion_request_req_payload_messages_item_tool",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUser": ".create_chat_completion_request_req_payload_messages_item_user",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUserContent": ".create_chat_completion_request_req_payload_messages_item_user_content",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem": ".create_chat_completion_request_req_payload_messages_item_user_content_item",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem_ImageUrl": ".create_chat_completion_request_req_payload_messages_item_user_content_item",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUserContentItem_Text": ".create_chat_completion_request_req_payload_messages_item_user_content_item",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrl": ".create_chat_completion_request_req_payload_messages_item_user_content_item_image_url",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrlImageUrl": ".create_chat_completion_request_req_payload_messages_item_user_content_item_image_url_image_url",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemImageUrlImageUrlDetail": ".create_chat_completion_request_req_payload_messages_item_user_content_item_image_url_image_url_detail",
+    "CreateChatCompletionRequestReqPayloadMessagesItemUserContentItemText": ".create_chat_completion_request_req_payload_messages_item_user_content_item_text",
+    "CreateChatCompletionRequestReqPayloadResponseFormat": ".create_chat_completion_request_req_payload_response_format",
+    "CreateChatCompletionRequestReqPayloadResponseFormatType": ".create_chat_completion_request_req_payload_response_format_type",
+    "CreateChatCompletionRequestReqPayloadToolChoice": ".create_chat_completion_request_req_payload_tool_choice",
+    "CreateChatCompletionRequestReqPayloadToolChoiceFunction": ".create_chat_completion_request_req_payload_tool_choice_function",
+    "CreateChatCompletionRequestReqPayloadToolChoiceFunctionFunction": ".create_chat_completion_request_req_payload_tool_choice_function_function",
+    "CreateChatCompletionRequestReqPayloadToolsItem": ".create_chat_completion_request_req_payload_tools_item",
+    "CreateChatCompletionRequestReqPayloadToolsItemFunction": ".create_chat_completion_request_req_payload_tools_item_function",
+    "CreateChatCompletionRequestResponseFormat": ".create_chat_completion_request_response_format",
+    "CreateChatCompletionRequestResponseFormatType": ".create_chat_completion_request_response_format_type",
+    "CreateChatCompletionRequestToolChoice": ".create_chat_completion_request_tool_choice",
+    "CreateChatCompletionRequestToolChoiceFunction": ".create_chat_completion_request_tool_choice_function",
+    "CreateChatCompletionRequestToolChoiceFunctionFunction": ".create_chat_completion_request_tool_choice_function_function",
+    "CreateChatCompletionRequestToolsItem": ".create_chat_completion_request_tools_item",
+    "CreateChatCompletionRequestToolsItemFunction": ".create_chat_completion_request_tools_item_function",
+    "CreateChatCompletionResponse": ".create_chat_completion_response",
+    "CreateChatCompletionResponseChoices": ".create_chat_completion_response_choices",
+    "CreateChatCompletionResponseChoicesChoicesItem": ".create_chat_completion_response_choices_choices_item",
+    "CreateChatCompletionResponseChoicesChoicesItemFinishReason": ".create_chat_completion_response_choices_choices_item_finish_reason",
+    "CreateChatCompletionResponseChoicesChoicesItemLogprobs": ".create_chat_completion_response_choices_choices_item_logprobs",
+    "CreateChatCompletionResponseChoicesChoicesItemLogprobsContentItem": ".create_chat_completion_response_choices_choices_item_logprobs_content_item",
+    "CreateChatCompletionResponseChoicesChoicesItemLogprobsContentItemTopLogprobsItem": ".create_chat_completion_response_choices_choices_item_logprobs_content_item_top_logprobs_item",
+    "CreateChatCompletionResponseChoicesChoicesItemMessage": ".create_chat_completion_response_choices_choices_item_message",
+    "CreateChatCompletionResponseChoicesChoicesItemMessageContent": ".create_chat_completion_response_choices_choices_item_message_content",
+    "CreateChatCompletionResponseChoicesChoicesItemMessageFunctionCall": ".create_chat_completion_response_choices_choices_item_message_function_call",
+    "CreateChatCompletionResponseChoicesChoicesItemMessageToolCallsItem": ".create_chat_completion_response_choices_choices_item_message_tool_calls_item",
+    "CreateChatCompletionResponseChoicesChoicesItemMessageToolCallsItemFunction": ".create_chat_completion_response_choices_choices_item_message_tool_calls_item_function",
+    "CreateChatCompletionResponseChoicesUsage": ".create_chat_completion_response_choices_usage",
+    "LocalTestingOnlyGetLatestLoggedCallResponse": ".local_testing_only_get_latest_logged_call_response",
+    "ReportBatchRequestCallsItem": ".report_batch_request_calls_item",
+    "ReportBatchRequestCallsItemTagsValue": ".report_batch_request_calls_item_tags_value",
+    "ReportBatchResponse": ".report_batch_response",
+    "ReportBatchResponseResultsItem": ".report_batch_response_results_item",
+    "ReportBatchResponseResultsItemStatus": ".report_batch_response_results_item_status",
+    "ReportRequestTagsValue": ".report_request_tags_value",
+    "ReportResponse": ".report_response",
+    "ReportResponseStatus": ".report_response_status",
+    "UnstableDatasetCreateResponse": ".unstable_dataset_create_response",
+    "UnstableDatasetEntryCreateRequestEntriesItem": ".unstable_dataset_entry_create_request_entries_item",
+    "UnstableDatasetEntryCreateRequestEntriesItemFunctionCall": ".unstable_dataset_entry_create_request_entries_item_function_call",
+    "UnstableDatasetEntryCreateRequestEntriesItemFunctionCallName": ".unstable_dataset_entry_create_request_entries_item_function_call_name",
+    "UnstableDatasetEntryCreateRequestEntriesItemFunctionsItem": ".unstable_dataset_entry_create_request_entries_item_functions_item",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItem": ".unstable_dataset_entry_create_request_entries_item_messages_item",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Assistant": ".unstable_dataset_entry_create_request_entries_item_messages_item",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Function": ".unstable_dataset_entry_create_request_entries_item_messages_item",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_System": ".unstable_dataset_entry_create_request_entries_item_messages_item",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_Tool": ".unstable_dataset_entry_create_request_entries_item_messages_item",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItem_User": ".unstable_dataset_entry_create_request_entries_item_messages_item",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistant": ".unstable_dataset_entry_create_request_entries_item_messages_item_assistant",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantContent": ".unstable_dataset_entry_create_request_entries_item_messages_item_assistant_content",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantFunctionCall": ".unstable_dataset_entry_create_request_entries_item_messages_item_assistant_function_call",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantToolCallsItem": ".unstable_dataset_entry_create_request_entries_item_messages_item_assistant_tool_calls_item",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemAssistantToolCallsItemFunction": ".unstable_dataset_entry_create_request_entries_item_messages_item_assistant_tool_calls_item_function",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemFunction": ".unstable_dataset_entry_create_request_entries_item_messages_item_function",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemFunctionContent": ".unstable_dataset_entry_create_request_entries_item_messages_item_function_content",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemSystem": ".unstable_dataset_entry_create_request_entries_item_messages_item_system",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemTool": ".unstable_dataset_entry_create_request_entries_item_messages_item_tool",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUser": ".unstable_dataset_entry_create_request_entries_item_messages_item_user",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContent": ".unstable_dataset_entry_create_request_entries_item_messages_item_user_content",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem": ".unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem_ImageUrl": ".unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItem_Text": ".unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrl": ".unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item_image_url",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrlImageUrl": ".unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item_image_url_image_url",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemImageUrlImageUrlDetail": ".unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item_image_url_image_url_detail",
+    "UnstableDatasetEntryCreateRequestEntriesItemMessagesItemUserContentItemText": ".unstable_dataset_entry_create_request_entries_item_messages_item_user_content_item_text",
+    "UnstableDatasetEntryCreateRequestEntriesItemResponseFormat": ".unstable_dataset_entry_create_request_entries_item_response_format",
+    "UnstableDatasetEntryCreateRequestEntriesItemResponseFormatType": ".unstable_dataset_entry_create_request_entries_item_response_format_type",
+    "UnstableDatasetEntryCreateRequestEntriesItemSplit": ".unstable_dataset_entry_create_request_entries_item_split",
+    "UnstableDatasetEntryCreateRequestEntriesItemToolChoice": ".unstable_dataset_entry_create_request_entries_item_tool_choice",
+    "UnstableDatasetEntryCreateRequestEntriesItemToolChoiceFunction": ".unstable_dataset_entry_create_request_entries_item_tool_choice_function",
+    "UnstableDatasetEntryCreateRequestEntriesItemToolChoiceFunctionFunction": ".unstable_dataset_entry_create_request_entries_item_tool_choice_function_function",
+    "UnstableDatasetEntryCreateRequestEntriesItemToolsItem": ".unstable_dataset_entry_create_request_entries_item_tools_item",
+    "UnstableDatasetEntryCreateRequestEntriesItemToolsItemFunction": ".unstable_dataset_entry_create_request_entries_item_tools_item_function",
+    "UnstableDatasetEntryCreateResponse": ".unstable_dataset_entry_create_response",
+    "UnstableDatasetEntryCreateResponseErrorsItem": ".unstable_dataset_entry_create_response_errors_item",
+    "UnstableFinetuneCreateRequestBaseModel": ".unstable_finetune_create_request_base_model",
+    "UnstableFinetuneCreateResponse": ".unstable_finetune_create_response",
+    "UnstableFinetuneGetResponse": ".unstable_finetune_get_response",
+    "UnstableFinetuneGetResponseStatus": ".unstable_finetune_get_response_status",
+    "UpdateLogTagsBatchRequestUpdatesItem": ".update_log_tags_batch_request_updates_item",
+    "UpdateLogTagsBatchRequestUpdatesItemTagsValue": ".update_log_tags_batch_request_updates_item_tags_value",
+    "UpdateLogTagsBatchResponse": ".update_log_tags_batch_response",
+    "UpdateLogTagsRequestFiltersItem": ".update_log_tags_request_filters_item",
+    "UpdateLogTagsRequestFiltersItemEquals": ".update_log_tags_request_filters_item_equals",
+    "UpdateLogTagsRequestTagsValue": ".update_log_tags_request_tags_value",
+    "UpdateLogTagsResponse": ".update_log_tags_response",
+}
+
+
+def __getattr__(name: str) -> typing.Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted([*globals(), *_EXPORTS])
+
 
 __all__ = [
     "CheckCacheResponse",
@@ -366,6 +540,11 @@ __all__ = [
     "CreateChatCompletionResponseChoicesChoicesItemMessageToolCallsItemFunction",
     "CreateChatCompletionResponseChoicesUsage",
     "LocalTestingOnlyGetLatestLoggedCallResponse",
+    "ReportBatchRequestCallsItem",
+    "ReportBatchRequestCallsItemTagsValue",
+    "ReportBatchResponse",
+    "ReportBatchResponseResultsItem",
+    "ReportBatchResponseResultsItemStatus",
     "ReportRequestTagsValue",
     "ReportResponse",
     "ReportResponseStatus",
@@ -412,6 +591,9 @@ __all__ = [
     "UnstableFinetuneCreateResponse",
     "UnstableFinetuneGetResponse",
     "UnstableFinetuneGetResponseStatus",
+    "UpdateLogTagsBatchRequestUpdatesItem",
+    "UpdateLogTagsBatchRequestUpdatesItemTagsValue",
+    "UpdateLogTagsBatchResponse",
     "UpdateLogTagsRequestFiltersItem",
     "UpdateLogTagsRequestFiltersItemEquals",
     "UpdateLogTagsRequestTagsValue",
@@ -0,0 +1,44 @@
+# This file was auto-generated by Fern from our API Definition.
+
+import datetime as dt
+import typing
+
+from ..core.datetime_utils import serialize_datetime
+from .report_batch_request_calls_item_tags_value import ReportBatchRequestCallsItemTagsValue
+
+try:
+    import pydantic.v1 as pydantic  # type: ignore
+except ImportError:
+    import pydantic  # type: ignore
+
+
+class ReportBatchRequestCallsItem(pydantic.BaseModel):
+    requested_at: typing.Optional[float] = pydantic.Field(
+        alias="requestedAt", description="Unix timestamp in milliseconds"
+    )
+    received_at: typing.Optional[float] = pydantic.Field(
+        alias="receivedAt", description="Unix timestamp in milliseconds"
+    )
+    req_payload: typing.Optional[typing.Any] = pydantic.Field(alias="reqPayload")
+    resp_payload: typing.Optional[typing.Any] = pydantic.Field(alias="respPayload")
+    status_code: typing.Optional[float] = pydantic.Field(alias="statusCode", description="HTTP status code of response")
+    error_message: typing.Optional[str] = pydantic.Field(
+        alias="errorMessage", description="User-friendly error message"
+    )
+    tags: typing.Optional[typing.Dict[str, ReportBatchRequestCallsItemTagsValue]] = pydantic.Field(
+        description='Extra tags to attach to the call for filtering. Eg { "userId": "123", "promptId": "populate-title" }'
+    )
+
+    def json(self, **kwargs: typing.Any) -> str:
+        kwargs_with_defaults: typing.Any = {"by_alias": True, "exclude_unset": True, **kwargs}
+        return super().json(**kwargs_with_defaults)
+
+    def dict(self, **kwargs: typing.Any) -> typing.Dict[str, typing.Any]:
+        kwargs_with_defaults: typing.Any = {"by_alias": True, "exclude_unset": True, **kwargs}
+        return super().dict(**kwargs_with_defaults)
+
+    class Config:
+        frozen = True
+        smart_union = True
+        allow_population_by_field_name = True
+        json_encoders = {dt.datetime: serialize_datetime}
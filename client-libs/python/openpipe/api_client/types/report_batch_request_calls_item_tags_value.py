@@ -0,0 +1,9 @@
+# This file was auto-generated by Fern from our API Definition.
+
+import typing
+
+import typing_extensions
+
+ReportBatchRequestCallsItemTagsValue = typing.Union[
+    str, float, bool, typing.Optional[typing_extensions.Literal["null"]]
+]
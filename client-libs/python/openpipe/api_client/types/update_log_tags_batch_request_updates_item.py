@@ -0,0 +1,33 @@
+# This file was auto-generated by Fern from our API Definition.
+
+import datetime as dt
+import typing
+
+from ..core.datetime_utils import serialize_datetime
+from .update_log_tags_batch_request_updates_item_tags_value import UpdateLogTagsBatchRequestUpdatesItemTagsValue
+
+try:
+    import pydantic.v1 as pydantic  # type: ignore
+except ImportError:
+    import pydantic  # type: ignore
+
+
+class UpdateLogTagsBatchRequestUpdatesItem(pydantic.BaseModel):
+    completion_id: str = pydantic.Field(alias="completionId")
+    tags: typing.Dict[str, UpdateLogTagsBatchRequestUpdatesItemTagsValue] = pydantic.Field(
+        description='Tags to set on the call. Set a tag to null to remove it. Eg { "label": "positive", "reviewed": true }'
+    )
+
+    def json(self, **kwargs: typing.Any) -> str:
+        kwargs_with_defaults: typing.Any = {"by_alias": True, "exclude_unset": True, **kwargs}
+        return super().json(**kwargs_with_defaults)
+
+    def dict(self, **kwargs: typing.Any) -> typing.Dict[str, typing.Any]:
+        kwargs_with_defaults: typing.Any = {"by_alias": True, "exclude_unset": True, **kwargs}
+        return super().dict(**kwargs_with_defaults)
+
+    class Config:
+        frozen = True
+        smart_union = True
+        allow_population_by_field_name = True
+        json_encoders = {dt.datetime: serialize_datetime}
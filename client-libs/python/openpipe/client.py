@@ -1,28 +1,217 @@
+import asyncio
+import functools
+import json
+import threading
 import typing
 import os
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from importlib.metadata import version
+from json.decoder import JSONDecodeError
+
+import httpx
 
 from .api_client.client import (
     OpenPipeApi,
     AsyncOpenPipeApi,
     ReportResponse,
     ReportRequestTagsValue,
+    ReportBatchRequestCallsItem,
+    ReportBatchResponse,
     UpdateLogTagsRequestFiltersItem,
     UpdateLogTagsRequestTagsValue,
     UpdateLogTagsResponse,
+    UpdateLogTagsBatchRequestUpdatesItem,
+    UpdateLogTagsBatchResponse,
+    UnstableDatasetEntryCreateResponse,
+)
+from .api_client import ReportBatchResponseResultsItem
+from .api_client.core.api_error import ApiError
+from .json_encoder import jsonable_encoder
+from .http_clients import get_http_client, get_async_http_client
+from .resilience import client_timeout
+from .dataset_upload import (
+    DatasetEntries,
+    DEFAULT_UPLOAD_PARALLELISM,
+    MAX_UPLOAD_BATCH_ENTRIES,
+    DEFAULT_UPLOAD_BATCH_BYTES,
+    DEFAULT_UPLOAD_ATTEMPTS,
+    upload_dataset_entries,
+    upload_dataset_entries_async,
 )
 
 OMIT = typing.cast(typing.Any, ...)
 
 DEFAULT_BASE_URL = "https://app.openpipe.ai/api/v1"
 
+# Maximum number of calls the API accepts in a single /report/batch request
+MAX_REPORT_BATCH_SIZE = 500
+# Maximum size of a /report/batch body the API accepts, before compression. Kept
+# in sync with REPORT_BATCH_MAX_BODY_BYTES in the server's requestBody.ts.
+MAX_REPORT_BATCH_BYTES = 4 * 1024 * 1024
+# Room for the {"calls": [...]} around the encoded calls
+_REPORT_BATCH_ENVELOPE_BYTES = 64
+# Servers that predate the 413 reset the connection instead when a body is too
+# large, so a reset while sending a body at least this large counts as a 413
+_RESET_AS_TOO_LARGE_BYTES = 1024 * 1024
+_RESET_ERRORS = (httpx.WriteError, httpx.ReadError, httpx.RemoteProtocolError)
+
+# Maximum number of updates the API accepts in a single /logs/update-tags/batch request
+MAX_UPDATE_TAGS_BATCH_SIZE = 1000
+# Requests are also split before their bodies reach this size, well under the
+# server's 1MB limit
+MAX_UPDATE_TAGS_BATCH_BYTES = 512 * 1024
+DEFAULT_UPDATE_TAGS_PARALLELISM = 4
+
+ReportCall = typing.Union[ReportBatchRequestCallsItem, typing.Dict[str, typing.Any]]
+# Called with the seconds spent encoding a reported call, and its encoded size
+OnReportEncoded = typing.Callable[[float, int], None]
+
+TagUpdate = typing.Union[
+    UpdateLogTagsBatchRequestUpdatesItem,
+    typing.Tuple[str, typing.Dict[str, UpdateLogTagsRequestTagsValue]],
+]
+
+
+@functools.lru_cache(maxsize=None)
+def _sdk_version() -> str:
+    # Reading the package metadata takes a scan of sys.path, so only do it once
+    return version("openpipe")
+
 
 def add_sdk_info(tags):
     tags["$sdk"] = "python"
-    tags["$sdk.version"] = version("openpipe")
+    tags["$sdk.version"] = _sdk_version()
     return tags
 
 
+def _encode_report_call(call: ReportCall) -> bytes:
+    if not isinstance(call, ReportBatchRequestCallsItem):
+        call = ReportBatchRequestCallsItem(
+            **{**call, "tags": add_sdk_info(call.get("tags") or {})}
+        )
+    return json.dumps(jsonable_encoder(call)).encode()
+
+
+def _batch_report_calls(
+    calls: typing.Sequence[ReportCall],
+    on_encoded: typing.Optional[typing.Callable[[int, float, int], None]] = None,
+) -> typing.List[typing.List[bytes]]:
+    """
+    Encodes each call once, and groups the encoded calls into request bodies.
+    `on_encoded` is called with the index of each call, the seconds spent
+    encoding it and its encoded size.
+    """
+    batches: typing.List[typing.List[bytes]] = []
+    batch: typing.List[bytes] = []
+    batch_bytes = _REPORT_BATCH_ENVELOPE_BYTES
+    for index, call in enumerate(calls):
+        started = time.perf_counter()
+        encoded = _encode_report_call(call)
+        if on_encoded is not None:
+            on_encoded(index, time.perf_counter() - started, len(encoded))
+        # The size the call takes up in the body, plus the ", " separating it
+        size = len(encoded) + 2
+        if batch and (
+            len(batch) == MAX_REPORT_BATCH_SIZE
+            or batch_bytes + size > MAX_REPORT_BATCH_BYTES
+        ):
+            batches.append(batch)
+            batch = []
+            batch_bytes = _REPORT_BATCH_ENVELOPE_BYTES
+        batch.append(encoded)
+        batch_bytes += size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _report_batch_body(batch: typing.List[bytes]) -> bytes:
+    return b'{"calls": [' + b", ".join(batch) + b"]}"
+
+
+def _encode_report(
+    on_encoded: typing.Optional[OnReportEncoded], **fields: typing.Any
+) -> bytes:
+    started = time.perf_counter()
+    body = _encode_report_call(
+        {name: value for name, value in fields.items() if value is not OMIT}
+    )
+    if on_encoded is not None:
+        on_encoded(time.perf_counter() - started, len(body))
+    return body
+
+
+ResponseT = typing.TypeVar("ResponseT", ReportResponse, ReportBatchResponse)
+
+
+def _parse_report_response(
+    response: httpx.Response, response_type: typing.Type[ResponseT]
+) -> ResponseT:
+    if 200 <= response.status_code < 300:
+        return response_type.parse_obj(response.json())
+    try:
+        body = response.json()
+    except JSONDecodeError:
+        raise ApiError(status_code=response.status_code, body=response.text)
+    raise ApiError(status_code=response.status_code, body=body)
+
+
+def _too_large_results(
+    batch: typing.List[bytes],
+) -> ReportBatchResponse:
+    return ReportBatchResponse(
+        results=[
+            ReportBatchResponseResultsItem(
+                index=i, status="error", errorMessage="Request body too large"
+            )
+            for i in range(len(batch))
+        ]
+    )
+
+
+def _merge_report_batch_responses(
+    responses: typing.List[ReportBatchResponse],
+) -> ReportBatchResponse:
+    if len(responses) == 1:
+        return responses[0]
+
+    results = []
+    offset = 0
+    for response in responses:
+        for result in response.results:
+            results.append(result.copy(update={"index": result.index + offset}))
+        offset += len(response.results)
+    return ReportBatchResponse(results=results)
+
+
+def _batch_tag_updates(
+    updates: typing.Iterable[TagUpdate],
+) -> typing.Iterator[typing.List[UpdateLogTagsBatchRequestUpdatesItem]]:
+    batch: typing.List[UpdateLogTagsBatchRequestUpdatesItem] = []
+    batch_bytes = 0
+    for update in updates:
+        if not isinstance(update, UpdateLogTagsBatchRequestUpdatesItem):
+            completion_id, tags = update
+            update = UpdateLogTagsBatchRequestUpdatesItem(
+                completion_id=completion_id, tags=tags
+            )
+        # Close enough to the encoded size, without encoding the update twice
+        size = len(update.completion_id) + len(json.dumps(update.tags)) + 32
+        if batch and (
+            len(batch) == MAX_UPDATE_TAGS_BATCH_SIZE
+            or batch_bytes + size > MAX_UPDATE_TAGS_BATCH_BYTES
+        ):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(update)
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
 class OpenPipe:
     base_client: OpenPipeApi
 
@@ -33,8 +222,14 @@ class OpenPipe:
         timeout: typing.Union[float, None] = None,
     ) -> None:
         self.base_client = OpenPipeApi(
-            token="", base_url=DEFAULT_BASE_URL, timeout=timeout
+            token="",
+            base_url=DEFAULT_BASE_URL,
+            timeout=timeout,
+            httpx_client=get_http_client(DEFAULT_BASE_URL),
         )
+        # Applied to requests by the transport, since the generated client always
+        # passes its own timeout
+        self.timeout = timeout
         # set API key
         if os.environ.get("OPENPIPE_API_KEY"):
             self.base_client._client_wrapper._token = os.environ["OPENPIPE_API_KEY"]
@@ -46,6 +241,9 @@ class OpenPipe:
             self.base_client._client_wrapper._base_url = os.environ["OPENPIPE_BASE_URL"]
         if base_url:
             self.base_client._client_wrapper._base_url = base_url
+        self.base_client._client_wrapper.httpx_client = get_http_client(
+            self.base_client._client_wrapper._base_url
+        )
 
     @property
     def api_key(self) -> typing.Union[str, None]:
@@ -69,6 +267,9 @@ class OpenPipe:
         """Property setter for base_url."""
         if value is not None:
             self.base_client._client_wrapper._base_url = value
+            self.base_client._client_wrapper.httpx_client = get_http_client(
+                self.base_client._client_wrapper._base_url
+            )
 
     def report(
         self,
@@ -80,15 +281,82 @@ class OpenPipe:
         status_code: typing.Optional[float] = OMIT,
         error_message: typing.Optional[str] = OMIT,
         tags: typing.Optional[typing.Dict[str, ReportRequestTagsValue]] = {},
+        on_encoded: typing.Optional[OnReportEncoded] = None,
     ) -> ReportResponse:
-        return self.base_client.report(
+        """
+        Reports a call. `on_encoded` is called with the seconds spent encoding
+        the call and the size of the encoded call.
+        """
+        body = _encode_report(
+            on_encoded,
             requested_at=requested_at,
             received_at=received_at,
             req_payload=req_payload,
             resp_payload=resp_payload,
             status_code=status_code,
             error_message=error_message,
-            tags=add_sdk_info(tags),
+            tags=tags,
+        )
+        with client_timeout(self.timeout):
+            response = self._post_report("report", body)
+        return _parse_report_response(response, ReportResponse)
+
+    def report_batch(
+        self,
+        calls: typing.Sequence[ReportCall],
+        on_encoded: typing.Optional[typing.Callable[[int, float, int], None]] = None,
+    ) -> ReportBatchResponse:
+        """
+        Reports many calls at once. Each call accepts the same fields as `report`.
+        Calls are split into requests of at most 500 calls and 4MB, and the
+        per-call results are returned in the same order as `calls`. A call too
+        large to be sent on its own gets an error result. `on_encoded` is called
+        with the index of each call, the seconds spent encoding it and its
+        encoded size.
+        """
+        with client_timeout(self.timeout):
+            return _merge_report_batch_responses(
+                [
+                    self._send_report_batch(batch)
+                    for batch in _batch_report_calls(calls, on_encoded)
+                ]
+            )
+
+    def _send_report_batch(self, batch: typing.List[bytes]) -> ReportBatchResponse:
+        body = _report_batch_body(batch)
+        try:
+            response = self._post_report("report/batch", body)
+            return _parse_report_response(response, ReportBatchResponse)
+        except ApiError as e:
+            if e.status_code != 413:
+                raise
+        except _RESET_ERRORS:
+            if len(body) < _RESET_AS_TOO_LARGE_BYTES:
+                raise
+        if len(batch) == 1:
+            return _too_large_results(batch)
+        # The server's limit is lower than ours, so send each half on its own
+        half = len(batch) // 2
+        return _merge_report_batch_responses(
+            [
+                self._send_report_batch(batch[:half]),
+                self._send_report_batch(batch[half:]),
+            ]
+        )
+
+    def _post_report(self, path: str, body: bytes) -> httpx.Response:
+        # Calls are encoded before they are sent, so the body is posted as is
+        # rather than through `base_client`, which would encode them again
+        client_wrapper = self.base_client._client_wrapper
+        return client_wrapper.httpx_client.request(
+            "POST",
+            urllib.parse.urljoin(f"{client_wrapper.get_base_url()}/", path),
+            content=body,
+            headers={
+                **client_wrapper.get_headers(),
+                "Content-Type": "application/json",
+            },
+            timeout=240,
         )
 
     def update_log_tags(
@@ -97,7 +365,116 @@ class OpenPipe:
         filters: typing.List[UpdateLogTagsRequestFiltersItem],
         tags: typing.Dict[str, UpdateLogTagsRequestTagsValue],
     ) -> UpdateLogTagsResponse:
-        return self.base_client.update_log_tags(filters=filters, tags=tags)
+        with client_timeout(self.timeout):
+            return self.base_client.update_log_tags(filters=filters, tags=tags)
+
+    def update_log_tags_batch(
+        self,
+        updates: typing.Iterable[TagUpdate],
+        *,
+        max_parallelism: int = DEFAULT_UPDATE_TAGS_PARALLELISM,
+        on_progress: typing.Optional[typing.Callable[[int, int], None]] = None,
+    ) -> UpdateLogTagsBatchResponse:
+        """
+        Updates the tags of many logged calls, each identified by its completion ID.
+        Updates are split into requests of at most 1000 and sent from up to
+        `max_parallelism` threads. `updates` is consumed lazily, so it can be a
+        generator over millions of calls.
+
+        Args:
+        - updates (Iterable): `(completion_id, tags)` pairs. Set a tag to None to remove it.
+        - max_parallelism (int): Maximum number of requests in flight.
+        - on_progress (Callable[[int, int], None]): Called after each request with the
+          number of updates sent and logs matched so far.
+
+        Returns:
+        - UpdateLogTagsBatchResponse: The total number of logs matched.
+        """
+        batches = _batch_tag_updates(updates)
+        lock = threading.Lock()
+        failed = threading.Event()
+        progress = {"sent": 0, "matched": 0}
+
+        def worker() -> None:
+            while not failed.is_set():
+                with lock:
+                    batch = next(batches, None)
+                if batch is None:
+                    return
+                try:
+                    with client_timeout(self.timeout):
+                        resp = self.base_client.update_log_tags_batch(updates=batch)
+                except BaseException:
+                    # Stop the other workers instead of sending the rest of the updates
+                    failed.set()
+                    raise
+                with lock:
+                    progress["sent"] += len(batch)
+                    progress["matched"] += int(resp.matched_logs)
+                    if on_progress is not None:
+                        on_progress(progress["sent"], progress["matched"])
+
+        with ThreadPoolExecutor(max_workers=max_parallelism) as executor:
+            futures = [executor.submit(worker) for _ in range(max_parallelism)]
+        for future in futures:
+            future.result()
+
+        return UpdateLogTagsBatchResponse(matched_logs=progress["matched"])
+
+    def upload_dataset_entries(
+        self,
+        archive_id: str,
+        entries: DatasetEntries,
+        *,
+        checkpoint_path: typing.Optional[str] = None,
+        max_parallelism: int = DEFAULT_UPLOAD_PARALLELISM,
+        max_batch_entries: int = MAX_UPLOAD_BATCH_ENTRIES,
+        max_batch_bytes: int = DEFAULT_UPLOAD_BATCH_BYTES,
+        max_attempts: int = DEFAULT_UPLOAD_ATTEMPTS,
+        on_progress: typing.Optional[typing.Callable[[int, int], None]] = None,
+    ) -> UnstableDatasetEntryCreateResponse:
+        """
+        Uploads dataset entries to an archive without loading them all into memory.
+        Entries are read from a JSONL file (lines are sent as they are, without being
+        parsed) or any iterable of dicts, and sent in requests of up to 100 entries
+        with up to `max_parallelism` requests in flight. Requests are retried when
+        they fail to connect or are rate limited. Other failures (timeouts, server
+        errors) stop the upload rather than risk creating the entries twice, since
+        the server may have created them already.
+
+        Args:
+        - archive_id (str): The archive to add the entries to.
+        - entries (str | PathLike | Iterable): Path of a JSONL file, or an iterable of entries.
+        - checkpoint_path (str): File recording which entries were uploaded. If the
+          upload fails, calling again with the same file resumes after the last
+          uploaded batch. Removed once the upload completes.
+        - max_parallelism (int): Maximum number of requests in flight.
+        - max_batch_entries (int): Maximum number of entries per request.
+        - max_batch_bytes (int): Maximum size of a request body.
+        - max_attempts (int): Attempts per request before the upload fails.
+        - on_progress (Callable[[int, int], None]): Called after each request with the
+          number of entries uploaded and created so far.
+
+        Returns:
+        - UnstableDatasetEntryCreateResponse: The number of entries created, and the
+          entries that were rejected, indexed from the start of `entries`.
+
+        Raises:
+        - DatasetUploadError: A request failed. Its `acknowledged` attribute is the
+          number of entries uploaded before the failure.
+        """
+        with client_timeout(self.timeout):
+            return upload_dataset_entries(
+                self.base_client,
+                archive_id,
+                entries,
+                checkpoint_path=checkpoint_path,
+                max_parallelism=max_parallelism,
+                max_batch_entries=max_batch_entries,
+                max_batch_bytes=max_batch_bytes,
+                max_attempts=max_attempts,
+                on_progress=on_progress,
+            )
 
 
 class AsyncOpenPipe:
@@ -110,8 +487,14 @@ class AsyncOpenPipe:
         timeout: typing.Union[float, None] = None,
     ) -> None:
         self.base_client = AsyncOpenPipeApi(
-            token="", base_url=DEFAULT_BASE_URL, timeout=timeout
+            token="",
+            base_url=DEFAULT_BASE_URL,
+            timeout=timeout,
+            httpx_client=get_async_http_client(DEFAULT_BASE_URL),
         )
+        # Applied to requests by the transport, since the generated client always
+        # passes its own timeout
+        self.timeout = timeout
         # set API key
         if os.environ.get("OPENPIPE_API_KEY"):
             self.base_client._client_wrapper._token = os.environ["OPENPIPE_API_KEY"]
@@ -123,6 +506,9 @@ class AsyncOpenPipe:
             self.base_client._client_wrapper._base_url = os.environ["OPENPIPE_BASE_URL"]
         if base_url:
             self.base_client._client_wrapper._base_url = base_url
+        self.base_client._client_wrapper.httpx_client = get_async_http_client(
+            self.base_client._client_wrapper._base_url
+        )
 
     @property
     def api_key(self) -> typing.Union[str, None]:
@@ -146,6 +532,9 @@ class AsyncOpenPipe:
         """Property setter for base_url."""
         if value is not None:
             self.base_client._client_wrapper._base_url = value
+            self.base_client._client_wrapper.httpx_client = get_async_http_client(
+                self.base_client._client_wrapper._base_url
+            )
 
     async def report(
         self,
@@ -157,15 +546,84 @@ class AsyncOpenPipe:
         status_code: typing.Optional[float] = OMIT,
         error_message: typing.Optional[str] = OMIT,
         tags: typing.Optional[typing.Dict[str, ReportRequestTagsValue]] = {},
+        on_encoded: typing.Optional[OnReportEncoded] = None,
     ) -> ReportResponse:
-        return await self.base_client.report(
+        """
+        Reports a call. `on_encoded` is called with the seconds spent encoding
+        the call and the size of the encoded call.
+        """
+        body = _encode_report(
+            on_encoded,
             requested_at=requested_at,
             received_at=received_at,
             req_payload=req_payload,
             resp_payload=resp_payload,
             status_code=status_code,
             error_message=error_message,
-            tags=add_sdk_info(tags),
+            tags=tags,
+        )
+        with client_timeout(self.timeout):
+            response = await self._post_report("report", body)
+        return _parse_report_response(response, ReportResponse)
+
+    async def report_batch(
+        self,
+        calls: typing.Sequence[ReportCall],
+        on_encoded: typing.Optional[typing.Callable[[int, float, int], None]] = None,
+    ) -> ReportBatchResponse:
+        """
+        Reports many calls at once. Each call accepts the same fields as `report`.
+        Calls are split into requests of at most 500 calls and 4MB, and the
+        per-call results are returned in the same order as `calls`. A call too
+        large to be sent on its own gets an error result. `on_encoded` is called
+        with the index of each call, the seconds spent encoding it and its
+        encoded size.
+        """
+        with client_timeout(self.timeout):
+            return _merge_report_batch_responses(
+                [
+                    await self._send_report_batch(batch)
+                    for batch in _batch_report_calls(calls, on_encoded)
+                ]
+            )
+
+    async def _send_report_batch(
+        self, batch: typing.List[bytes]
+    ) -> ReportBatchResponse:
+        body = _report_batch_body(batch)
+        try:
+            response = await self._post_report("report/batch", body)
+            return _parse_report_response(response, ReportBatchResponse)
+        except ApiError as e:
+            if e.status_code != 413:
+                raise
+        except _RESET_ERRORS:
+            if len(body) < _RESET_AS_TOO_LARGE_BYTES:
+                raise
+        if len(batch) == 1:
+            return _too_large_results(batch)
+        # The server's limit is lower than ours, so send each half on its own
+        half = len(batch) // 2
+        return _merge_report_batch_responses(
+            [
+                await self._send_report_batch(batch[:half]),
+                await self._send_report_batch(batch[half:]),
+            ]
+        )
+
+    async def _post_report(self, path: str, body: bytes) -> httpx.Response:
+        # Calls are encoded before they are sent, so the body is posted as is
+        # rather than through `base_client`, which would encode them again
+        client_wrapper = self.base_client._client_wrapper
+        return await client_wrapper.httpx_client.request(
+            "POST",
+            urllib.parse.urljoin(f"{client_wrapper.get_base_url()}/", path),
+            content=body,
+            headers={
+                **client_wrapper.get_headers(),
+                "Content-Type": "application/json",
+            },
+            timeout=240,
         )
 
     async def update_log_tags(
@@ -174,4 +632,106 @@ class AsyncOpenPipe:
         filters: typing.List[UpdateLogTagsRequestFiltersItem],
         tags: typing.Dict[str, UpdateLogTagsRequestTagsValue],
     ) -> UpdateLogTagsResponse:
-        return await self.base_client.update_log_tags(filters=filters, tags=tags)
+        with client_timeout(self.timeout):
+            return await self.base_client.update_log_tags(filters=filters, tags=tags)
+
+    async def update_log_tags_batch(
+        self,
+        updates: typing.Iterable[TagUpdate],
+        *,
+        max_parallelism: int = DEFAULT_UPDATE_TAGS_PARALLELISM,
+        on_progress: typing.Optional[typing.Callable[[int, int], None]] = None,
+    ) -> UpdateLogTagsBatchResponse:
+        """
+        Updates the tags of many logged calls, each identified by its completion ID.
+        Updates are split into requests of at most 1000, with up to
+        `max_parallelism` requests in flight. `updates` is consumed lazily, so it
+        can be a generator over millions of calls.
+
+        Args:
+        - updates (Iterable): `(completion_id, tags)` pairs. Set a tag to None to remove it.
+        - max_parallelism (int): Maximum number of requests in flight.
+        - on_progress (Callable[[int, int], None]): Called after each request with the
+          number of updates sent and logs matched so far.
+
+        Returns:
+        - UpdateLogTagsBatchResponse: The total number of logs matched.
+        """
+        batches = _batch_tag_updates(updates)
+        progress = {"sent": 0, "matched": 0}
+
+        async def worker() -> None:
+            # Workers share the iterator, which is safe since `next` never awaits
+            for batch in batches:
+                with client_timeout(self.timeout):
+                    resp = await self.base_client.update_log_tags_batch(updates=batch)
+                progress["sent"] += len(batch)
+                progress["matched"] += int(resp.matched_logs)
+                if on_progress is not None:
+                    on_progress(progress["sent"], progress["matched"])
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(max_parallelism)]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            # Stop the other workers instead of sending the rest of the updates
+            for task in workers:
+                task.cancel()
+            raise
+
+        return UpdateLogTagsBatchResponse(matched_logs=progress["matched"])
+
+    async def upload_dataset_entries(
+        self,
+        archive_id: str,
+        entries: DatasetEntries,
+        *,
+        checkpoint_path: typing.Optional[str] = None,
+        max_parallelism: int = DEFAULT_UPLOAD_PARALLELISM,
+        max_batch_entries: int = MAX_UPLOAD_BATCH_ENTRIES,
+        max_batch_bytes: int = DEFAULT_UPLOAD_BATCH_BYTES,
+        max_attempts: int = DEFAULT_UPLOAD_ATTEMPTS,
+        on_progress: typing.Optional[typing.Callable[[int, int], None]] = None,
+    ) -> UnstableDatasetEntryCreateResponse:
+        """
+        Uploads dataset entries to an archive without loading them all into memory.
+        Entries are read from a JSONL file (lines are sent as they are, without being
+        parsed) or any iterable of dicts, and sent in requests of up to 100 entries
+        with up to `max_parallelism` requests in flight. Requests are retried when
+        they fail to connect or are rate limited. Other failures (timeouts, server
+        errors) stop the upload rather than risk creating the entries twice, since
+        the server may have created them already.
+
+        Args:
+        - archive_id (str): The archive to add the entries to.
+        - entries (str | PathLike | Iterable): Path of a JSONL file, or an iterable of entries.
+        - checkpoint_path (str): File recording which entries were uploaded. If the
+          upload fails, calling again with the same file resumes after the last
+          uploaded batch. Removed once the upload completes.
+        - max_parallelism (int): Maximum number of requests in flight.
+        - max_batch_entries (int): Maximum number of entries per request.
+        - max_batch_bytes (int): Maximum size of a request body.
+        - max_attempts (int): Attempts per request before the upload fails.
+        - on_progress (Callable[[int, int], None]): Called after each request with the
+          number of entries uploaded and created so far.
+
+        Returns:
+        - UnstableDatasetEntryCreateResponse: The number of entries created, and the
+          entries that were rejected, indexed from the start of `entries`.
+
+        Raises:
+        - DatasetUploadError: A request failed. Its `acknowledged` attribute is the
+          number of entries uploaded before the failure.
+        """
+        with client_timeout(self.timeout):
+            return await upload_dataset_entries_async(
+                self.base_client,
+                archive_id,
+                entries,
+                checkpoint_path=checkpoint_path,
+                max_parallelism=max_parallelism,
+                max_batch_entries=max_batch_entries,
+                max_batch_bytes=max_batch_bytes,
+                max_attempts=max_attempts,
+                on_progress=on_progress,
+            )
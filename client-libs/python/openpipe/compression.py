@@ -0,0 +1,161 @@
+import gzip
+import threading
+from typing import Dict, FrozenSet, Optional, Tuple
+
+import httpx
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Endpoints whose request bodies are compressed once the server accepts it
+COMPRESSED_PATHS = (
+    "/report",
+    "/report/batch",
+    "/logs/update-tags",
+    "/logs/update-tags/batch",
+    "/unstable/dataset-entry/create",
+)
+# Bodies smaller than this aren't worth compressing
+DEFAULT_MIN_BYTES = 1024
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_ZSTD_LEVEL = 3
+
+_enabled = True
+_min_bytes = DEFAULT_MIN_BYTES
+
+_lock = threading.Lock()
+# Request encodings each origin advertised through the Accept-Encoding response
+# header (RFC 7694). Bodies are sent uncompressed until the server advertises one.
+_accepted_encodings: Dict[str, FrozenSet[str]] = {}
+
+
+def configure_request_compression(
+    *, enabled: Optional[bool] = None, min_bytes: Optional[int] = None
+) -> None:
+    """
+    Configures compression of the bodies sent to the `report`, `report_batch`,
+    `update_log_tags` and `unstable_dataset_entry_create` endpoints. Compression is only used once
+    the server has advertised that it accepts it. zstd is preferred over gzip
+    when the `zstandard` package is installed.
+
+    Args:
+    - enabled (bool): Whether to compress request bodies. Defaults to True.
+    - min_bytes (int): Bodies smaller than this are sent uncompressed.
+    """
+    global _enabled, _min_bytes
+    if enabled is not None:
+        _enabled = enabled
+    if min_bytes is not None:
+        _min_bytes = min_bytes
+
+
+def _origin(url: httpx.URL) -> str:
+    return f"{url.scheme}://{url.netloc.decode('ascii')}"
+
+
+def _choose_encoding(request: httpx.Request) -> Optional[str]:
+    if not _enabled or request.method != "POST":
+        return None
+    if "content-encoding" in request.headers:
+        return None
+    if not request.url.path.rstrip("/").endswith(COMPRESSED_PATHS):
+        return None
+
+    accepted = _accepted_encodings.get(_origin(request.url), frozenset())
+    if zstandard is not None and "zstd" in accepted:
+        return "zstd"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def _compress(request: httpx.Request, encoding: str) -> Optional[httpx.Request]:
+    body = request.read()
+    if len(body) < _min_bytes:
+        return None
+
+    if encoding == "zstd":
+        compressed = zstandard.ZstdCompressor(level=DEFAULT_ZSTD_LEVEL).compress(body)
+    else:
+        compressed = gzip.compress(body, compresslevel=DEFAULT_GZIP_LEVEL)
+
+    headers = request.headers.copy()
+    headers["Content-Encoding"] = encoding
+    headers["Content-Length"] = str(len(compressed))
+    return httpx.Request(
+        request.method,
+        request.url,
+        headers=headers,
+        content=compressed,
+        extensions=request.extensions,
+    )
+
+
+def _record_accepted_encodings(
+    request: httpx.Request, response: httpx.Response
+) -> None:
+    header = response.headers.get("accept-encoding")
+    if header is None and response.status_code != 415:
+        return
+
+    accepted = frozenset(
+        value.split(";")[0].strip().lower()
+        for value in (header or "").split(",")
+        if value.strip()
+    )
+    origin = _origin(request.url)
+    if _accepted_encodings.get(origin) != accepted:
+        with _lock:
+            _accepted_encodings[origin] = accepted
+
+
+def _prepare(request: httpx.Request) -> Tuple[httpx.Request, bool]:
+    encoding = _choose_encoding(request)
+    compressed = _compress(request, encoding) if encoding is not None else None
+    if compressed is None:
+        return request, False
+    return compressed, True
+
+
+class CompressingTransport(httpx.BaseTransport):
+    """Wraps a transport, compressing request bodies the server accepts compressed."""
+
+    def __init__(self, transport: httpx.BaseTransport) -> None:
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        prepared, compressed = _prepare(request)
+        response = self._transport.handle_request(prepared)
+        _record_accepted_encodings(request, response)
+
+        if compressed and response.status_code == 415:
+            # The server stopped accepting this encoding; send the body as is
+            response.close()
+            response = self._transport.handle_request(request)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncCompressingTransport(httpx.AsyncBaseTransport):
+    """Async version of `CompressingTransport`."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        prepared, compressed = _prepare(request)
+        response = await self._transport.handle_async_request(prepared)
+        _record_accepted_encodings(request, response)
+
+        if compressed and response.status_code == 415:
+            # The server stopped accepting this encoding; send the body as is
+            await response.aclose()
+            response = await self._transport.handle_async_request(request)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,408 @@
+import asyncio
+import contextvars
+import json
+import os
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from json.decoder import JSONDecodeError
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import httpx
+
+from .api_client.client import OpenPipeApi, AsyncOpenPipeApi
+from .api_client.core.api_error import ApiError
+from .json_encoder import jsonable_encoder
+from .resilience import RETRIED_BY_CALLER, UNSENT_ERRORS
+from .api_client import (
+    UnstableDatasetEntryCreateResponse,
+    UnstableDatasetEntryCreateResponseErrorsItem,
+)
+
+# Maximum number of entries the API accepts in a single request
+MAX_UPLOAD_BATCH_ENTRIES = 100
+# Batches are closed before their body reaches this size, under the server's 1MB limit
+DEFAULT_UPLOAD_BATCH_BYTES = 768 * 1024
+DEFAULT_UPLOAD_PARALLELISM = 4
+# Attempts per batch before the upload fails. Creating entries isn't idempotent,
+# so only failures where the server can't have created them are retried.
+DEFAULT_UPLOAD_ATTEMPTS = 4
+_RETRY_BASE_DELAY = 0.5
+
+DatasetEntries = Union[str, "os.PathLike[str]", Iterable[Any]]
+
+
+class DatasetUploadError(Exception):
+    """
+    Raised when a batch of entries couldn't be uploaded. Entries before
+    `acknowledged` were uploaded; pass the same `checkpoint_path` again to
+    resume from there.
+    """
+
+    def __init__(self, message: str, acknowledged: int) -> None:
+        super().__init__(message)
+        self.acknowledged = acknowledged
+
+
+class _Batch:
+    __slots__ = ("start", "count", "end_offset", "body")
+
+    def __init__(
+        self, start: int, count: int, end_offset: Optional[int], body: bytes
+    ) -> None:
+        # Index of the first entry in the batch, across the whole upload
+        self.start = start
+        self.count = count
+        # Byte offset just past the batch in the source file, if reading from one
+        self.end_offset = end_offset
+        self.body = body
+
+
+def _encode_entry(entry: Any) -> bytes:
+    if isinstance(entry, bytes):
+        return entry.strip()
+    if isinstance(entry, str):
+        return entry.strip().encode("utf-8")
+    if isinstance(entry, dict):
+        return json.dumps(entry, separators=(",", ":")).encode("utf-8")
+    return json.dumps(jsonable_encoder(entry), separators=(",", ":")).encode("utf-8")
+
+
+def _read_entries(
+    entries: DatasetEntries, skip: int, offset: Optional[int]
+) -> Iterator[Tuple[int, bytes, Optional[int]]]:
+    """
+    Yields the index of each entry and the entry as JSON, with the byte offset
+    just past it when reading a file. Lines of a JSONL file are sent as they are,
+    without being parsed.
+    """
+    if not isinstance(entries, (str, os.PathLike)):
+        for index, entry in enumerate(entries):
+            if index >= skip:
+                yield index, _encode_entry(entry), None
+        return
+
+    with open(entries, "rb") as f:
+        index = 0
+        position = 0
+        if offset is not None:
+            f.seek(offset)
+            position = offset
+            index = skip
+        for line in f:
+            position += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            if index >= skip:
+                yield index, line, position
+            index += 1
+
+
+def _skip_finished(
+    entries: Iterator[Tuple[int, bytes, Optional[int]]],
+    finished: List[Tuple[int, int, Optional[int]]],
+) -> Iterator[Tuple[int, bytes, Optional[int]]]:
+    """Drops the entries of batches a previous run finished out of order."""
+    ranges = iter(finished)
+    current = next(ranges, None)
+    for index, entry, offset in entries:
+        while current is not None and index >= current[1]:
+            current = next(ranges, None)
+        if current is None or index < current[0]:
+            yield index, entry, offset
+
+
+def _batch_entries(
+    archive_id: str,
+    entries: Iterator[Tuple[int, bytes, Optional[int]]],
+    max_entries: int,
+    max_bytes: int,
+) -> Iterator[_Batch]:
+    prefix = b'{"archiveId":' + json.dumps(archive_id).encode("utf-8") + b',"entries":['
+    suffix = b"]}"
+    parts: List[bytes] = []
+    start = 0
+    size = len(prefix) + len(suffix)
+    end_offset = None
+    for index, entry, offset in entries:
+        # Batches don't span skipped entries, so that their errors can be mapped
+        # back to the index of the entry
+        if parts and (
+            index != start + len(parts)
+            or len(parts) == max_entries
+            or size + len(entry) + 1 > max_bytes
+        ):
+            yield _Batch(
+                start, len(parts), end_offset, prefix + b",".join(parts) + suffix
+            )
+            parts = []
+            size = len(prefix) + len(suffix)
+        if not parts:
+            start = index
+        parts.append(entry)
+        size += len(entry) + 1
+        end_offset = offset
+    if parts:
+        yield _Batch(start, len(parts), end_offset, prefix + b",".join(parts) + suffix)
+
+
+class _UploadState:
+    """
+    Tracks acknowledged batches. Batches can finish out of order, so the
+    checkpoint records the entries every batch before has also finished up to,
+    and the ranges of entries finished past them, which a resumed upload skips.
+    """
+
+    def __init__(self, archive_id: str, checkpoint_path: Optional[str]) -> None:
+        self.archive_id = archive_id
+        self.checkpoint_path = checkpoint_path
+        self.acknowledged = 0
+        self.offset: Optional[int] = None
+        # (start, end, end_offset) of the batches finished past `acknowledged`
+        self.finished: List[Tuple[int, int, Optional[int]]] = []
+        self.created_entries = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.failed = threading.Event()
+        self.lock = threading.Lock()
+
+        if checkpoint_path is not None and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as f:
+                checkpoint = json.load(f)
+            if checkpoint["archive_id"] != archive_id:
+                raise ValueError(
+                    f"Checkpoint {checkpoint_path} belongs to archive {checkpoint['archive_id']}"
+                )
+            self.acknowledged = checkpoint["acknowledged"]
+            self.offset = checkpoint["offset"]
+            self.finished = [tuple(r) for r in checkpoint.get("finished", [])]
+            self.created_entries = checkpoint["created_entries"]
+            self.errors = checkpoint["errors"]
+
+    def acknowledge(self, batch: _Batch, response: Dict[str, Any]) -> None:
+        with self.lock:
+            # Counted as soon as the batch is checkpointed, since a resumed upload
+            # won't send it again
+            self.created_entries += int(response["createdEntries"])
+            self.errors.extend(
+                {
+                    "index": batch.start + int(error["index"]),
+                    "message": error["message"],
+                }
+                for error in response["errors"]
+            )
+            self.finished.append(
+                (batch.start, batch.start + batch.count, batch.end_offset)
+            )
+            self.finished.sort(key=lambda r: r[0])
+            while self.finished and self.finished[0][0] == self.acknowledged:
+                _, self.acknowledged, self.offset = self.finished.pop(0)
+            self._save()
+
+    def _save(self) -> None:
+        if self.checkpoint_path is None:
+            return
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "archive_id": self.archive_id,
+                    "acknowledged": self.acknowledged,
+                    "offset": self.offset,
+                    "finished": self.finished,
+                    "created_entries": self.created_entries,
+                    "errors": self.errors,
+                },
+                f,
+            )
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def complete(self) -> UnstableDatasetEntryCreateResponse:
+        # A finished upload starts from scratch the next time it's run
+        if self.checkpoint_path is not None and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        return UnstableDatasetEntryCreateResponse(
+            created_entries=self.created_entries,
+            errors=[
+                UnstableDatasetEntryCreateResponseErrorsItem(**error)
+                for error in sorted(self.errors, key=lambda error: error["index"])
+            ],
+        )
+
+    def error(self, e: BaseException) -> DatasetUploadError:
+        return DatasetUploadError(
+            f"Failed to upload dataset entries after entry {self.acknowledged}: {e}",
+            self.acknowledged,
+        )
+
+
+def _is_retryable(e: BaseException) -> bool:
+    # A timeout or 5xx may come after the entries were created, and sending them
+    # again would add them twice
+    if isinstance(e, ApiError):
+        return e.status_code == 429
+    return isinstance(e, UNSENT_ERRORS)
+
+
+def _request_args(client_wrapper: Any, body: bytes) -> Dict[str, Any]:
+    return dict(
+        method="POST",
+        url=urllib.parse.urljoin(
+            f"{client_wrapper.get_base_url()}/", "unstable/dataset-entry/create"
+        ),
+        content=body,
+        headers={**client_wrapper.get_headers(), "Content-Type": "application/json"},
+        timeout=240,
+        # Failures are retried by the upload, up to `max_attempts`
+        extensions={RETRIED_BY_CALLER: True},
+    )
+
+
+def _parse_response(response: httpx.Response) -> Dict[str, Any]:
+    if 200 <= response.status_code < 300:
+        return response.json()
+    try:
+        response_json = response.json()
+    except JSONDecodeError:
+        raise ApiError(status_code=response.status_code, body=response.text)
+    raise ApiError(status_code=response.status_code, body=response_json)
+
+
+def _prepare(
+    archive_id: str,
+    entries: DatasetEntries,
+    checkpoint_path: Optional[str],
+    max_batch_entries: int,
+    max_batch_bytes: int,
+) -> Tuple[_UploadState, Iterator[_Batch]]:
+    state = _UploadState(archive_id, checkpoint_path)
+    batches = _batch_entries(
+        archive_id,
+        # A copy, since the state drops ranges as the upload catches up to them
+        _skip_finished(
+            _read_entries(entries, state.acknowledged, state.offset),
+            list(state.finished),
+        ),
+        min(max_batch_entries, MAX_UPLOAD_BATCH_ENTRIES),
+        max_batch_bytes,
+    )
+    return state, batches
+
+
+def upload_dataset_entries(
+    client: OpenPipeApi,
+    archive_id: str,
+    entries: DatasetEntries,
+    *,
+    checkpoint_path: Optional[str] = None,
+    max_parallelism: int = DEFAULT_UPLOAD_PARALLELISM,
+    max_batch_entries: int = MAX_UPLOAD_BATCH_ENTRIES,
+    max_batch_bytes: int = DEFAULT_UPLOAD_BATCH_BYTES,
+    max_attempts: int = DEFAULT_UPLOAD_ATTEMPTS,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> UnstableDatasetEntryCreateResponse:
+    state, batches = _prepare(
+        archive_id, entries, checkpoint_path, max_batch_entries, max_batch_bytes
+    )
+    client_wrapper = client._client_wrapper
+    first_error: List[BaseException] = []
+
+    def send(batch: _Batch) -> Dict[str, Any]:
+        attempt = 1
+        while True:
+            try:
+                return _parse_response(
+                    client_wrapper.httpx_client.request(
+                        **_request_args(client_wrapper, batch.body)
+                    )
+                )
+            except Exception as e:
+                if attempt >= max_attempts or not _is_retryable(e):
+                    raise
+            time.sleep(_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            attempt += 1
+
+    def worker() -> None:
+        while not state.failed.is_set():
+            try:
+                with state.lock:
+                    batch = next(batches, None)
+                if batch is None:
+                    return
+                state.acknowledge(batch, send(batch))
+            except Exception as e:
+                # Stop the other workers, so that the checkpoint stays close to
+                # the failed batch
+                with state.lock:
+                    first_error.append(e)
+                state.failed.set()
+                return
+            if on_progress is not None:
+                on_progress(state.acknowledged, state.created_entries)
+
+    with ThreadPoolExecutor(max_workers=max_parallelism) as executor:
+        for _ in range(max_parallelism):
+            # Keeps the timeout of the client calling us
+            executor.submit(contextvars.copy_context().run, worker)
+
+    if first_error:
+        raise state.error(first_error[0]) from first_error[0]
+    return state.complete()
+
+
+async def upload_dataset_entries_async(
+    client: AsyncOpenPipeApi,
+    archive_id: str,
+    entries: DatasetEntries,
+    *,
+    checkpoint_path: Optional[str] = None,
+    max_parallelism: int = DEFAULT_UPLOAD_PARALLELISM,
+    max_batch_entries: int = MAX_UPLOAD_BATCH_ENTRIES,
+    max_batch_bytes: int = DEFAULT_UPLOAD_BATCH_BYTES,
+    max_attempts: int = DEFAULT_UPLOAD_ATTEMPTS,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> UnstableDatasetEntryCreateResponse:
+    state, batches = _prepare(
+        archive_id, entries, checkpoint_path, max_batch_entries, max_batch_bytes
+    )
+    client_wrapper = client._client_wrapper
+
+    async def send(batch: _Batch) -> Dict[str, Any]:
+        attempt = 1
+        while True:
+            try:
+                return _parse_response(
+                    await client_wrapper.httpx_client.request(
+                        **_request_args(client_wrapper, batch.body)
+                    )
+                )
+            except Exception as e:
+                if attempt >= max_attempts or not _is_retryable(e):
+                    raise
+            await asyncio.sleep(_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            attempt += 1
+
+    async def worker() -> None:
+        # Workers share the iterator, which is safe since `next` never awaits
+        while not state.failed.is_set():
+            batch = next(batches, None)
+            if batch is None:
+                return
+            try:
+                state.acknowledge(batch, await send(batch))
+            except Exception:
+                # Other workers finish the batches they're sending, so that
+                # those are checkpointed, but don't start new ones
+                state.failed.set()
+                raise
+            if on_progress is not None:
+                on_progress(state.acknowledged, state.created_entries)
+
+    results = await asyncio.gather(
+        *(worker() for _ in range(max_parallelism)), return_exceptions=True
+    )
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        raise state.error(errors[0]) from errors[0]
+    return state.complete()
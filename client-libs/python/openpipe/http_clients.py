@@ -0,0 +1,219 @@
+import asyncio
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from .compression import CompressingTransport, AsyncCompressingTransport
+from .resilience import ResilientTransport, AsyncResilientTransport
+
+# Pool settings applied to shared clients created after `configure_connection_pools`
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+# Completion requests from every OpenAI wrapper in the process share one pool per
+# host, and streamed completions hold their connection for the whole stream, so
+# those pools are sized for many wrappers rather than one
+DEFAULT_OPENAI_MAX_CONNECTIONS = 1000
+DEFAULT_OPENAI_MAX_KEEPALIVE_CONNECTIONS = 100
+# Seconds an idle connection is kept open for reuse
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+_lock = threading.Lock()
+_limits = httpx.Limits(
+    max_connections=DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections=DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+)
+_openai_limits = httpx.Limits(
+    max_connections=DEFAULT_OPENAI_MAX_CONNECTIONS,
+    max_keepalive_connections=DEFAULT_OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+)
+_http2 = False
+
+# Pools are keyed by (origin, whether they carry OpenAI completion requests)
+_sync_clients: Dict[Tuple[str, bool], "_SharedClient"] = {}
+_async_clients: Dict[Tuple[str, bool], "_SharedAsyncClient"] = {}
+# Async connections can't be reused across event loops, so each loop gets its own pool
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, bool], httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def configure_connection_pools(
+    *,
+    max_connections: Optional[int] = None,
+    max_keepalive_connections: Optional[int] = None,
+    openai_max_connections: Optional[int] = None,
+    openai_max_keepalive_connections: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None,
+    http2: Optional[bool] = None,
+) -> None:
+    """
+    Configures the connection pools shared by every OpenPipe client and OpenAI
+    wrapper in the process. Only affects pools created after the call, so it
+    should be called before constructing any clients.
+
+    The limits apply to all clients in the process together, not to each client.
+
+    Args:
+    - max_connections (int): Maximum number of open connections to OpenPipe per base URL.
+    - max_keepalive_connections (int): Maximum number of idle connections to OpenPipe kept alive per base URL.
+    - openai_max_connections (int): Maximum number of open connections per base URL for
+      completion requests made by OpenAI wrappers.
+    - openai_max_keepalive_connections (int): Maximum number of idle connections kept
+      alive per base URL for completion requests made by OpenAI wrappers.
+    - keepalive_expiry (float): Seconds an idle connection is kept alive.
+    - http2 (bool): Whether to negotiate HTTP/2. Requires `pip install httpx[http2]`.
+    """
+    global _limits, _openai_limits, _http2
+    with _lock:
+        _limits = _update_limits(
+            _limits, max_connections, max_keepalive_connections, keepalive_expiry
+        )
+        _openai_limits = _update_limits(
+            _openai_limits,
+            openai_max_connections,
+            openai_max_keepalive_connections,
+            keepalive_expiry,
+        )
+        if http2 is not None:
+            _http2 = http2
+
+
+def _update_limits(
+    limits: httpx.Limits,
+    max_connections: Optional[int],
+    max_keepalive_connections: Optional[int],
+    keepalive_expiry: Optional[float],
+) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=limits.max_connections
+        if max_connections is None
+        else max_connections,
+        max_keepalive_connections=limits.max_keepalive_connections
+        if max_keepalive_connections is None
+        else max_keepalive_connections,
+        keepalive_expiry=limits.keepalive_expiry
+        if keepalive_expiry is None
+        else keepalive_expiry,
+    )
+
+
+def _pool_key(base_url: str) -> str:
+    # Connections are only reusable within an origin, so that's what pools are keyed by
+    url = httpx.URL(str(base_url))
+    return f"{url.scheme}://{url.netloc.decode('ascii')}"
+
+
+class _SharedClient(httpx.Client):
+    # Shared clients live for the lifetime of the process. Closing one would break
+    # every other client using the same pool, so `close` is a no-op.
+    def close(self) -> None:
+        pass
+
+
+class _SharedAsyncClient(httpx.AsyncClient):
+    """
+    Handle passed to async clients in place of a real `httpx.AsyncClient`.
+    Requests are sent through the pool belonging to the running event loop.
+    """
+
+    def __init__(self, key: Tuple[str, bool]) -> None:
+        # Skip creating a transport (and its SSL context) that would never be used
+        super().__init__(transport=httpx.AsyncBaseTransport(), trust_env=False)
+        self._pool_key = key
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        return await _get_loop_client(self._pool_key).send(request, **kwargs)
+
+    async def aclose(self) -> None:
+        pass
+
+
+def get_http_client(base_url: str) -> httpx.Client:
+    """
+    Returns the process-wide `httpx.Client` used to call the OpenPipe API at the
+    origin of `base_url`. Requests are compressed and retried.
+    """
+    return _get_sync_client((_pool_key(base_url), False))
+
+
+def get_openai_http_client(base_url: str) -> httpx.Client:
+    """
+    Returns the process-wide `httpx.Client` used for completion requests to the
+    origin of `base_url`. Requests are sent as is; the OpenAI client retries them.
+    """
+    return _get_sync_client((_pool_key(base_url), True))
+
+
+def get_async_http_client(base_url: str) -> httpx.AsyncClient:
+    """
+    Async version of `get_http_client`. Can be called outside of a running event loop.
+    """
+    return _get_async_client((_pool_key(base_url), False))
+
+
+def get_async_openai_http_client(base_url: str) -> httpx.AsyncClient:
+    """
+    Async version of `get_openai_http_client`. Can be called outside of a running
+    event loop.
+    """
+    return _get_async_client((_pool_key(base_url), True))
+
+
+def _get_sync_client(key: Tuple[str, bool]) -> httpx.Client:
+    client = _sync_clients.get(key)
+    if client is None:
+        with _lock:
+            client = _sync_clients.get(key)
+            if client is None:
+                _, openai = key
+                if openai:
+                    transport = httpx.HTTPTransport(limits=_openai_limits, http2=_http2)
+                else:
+                    transport = ResilientTransport(
+                        CompressingTransport(
+                            httpx.HTTPTransport(limits=_limits, http2=_http2)
+                        )
+                    )
+                client = _SharedClient(transport=transport, follow_redirects=True)
+                _sync_clients[key] = client
+    return client
+
+
+def _get_async_client(key: Tuple[str, bool]) -> httpx.AsyncClient:
+    client = _async_clients.get(key)
+    if client is None:
+        with _lock:
+            client = _async_clients.get(key)
+            if client is None:
+                client = _SharedAsyncClient(key)
+                _async_clients[key] = client
+    return client
+
+
+def _get_loop_client(key: Tuple[str, bool]) -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _loop_clients.get(loop)
+        if clients is None:
+            clients = {}
+            _loop_clients[loop] = clients
+        client = clients.get(key)
+        if client is None:
+            _, openai = key
+            if openai:
+                transport = httpx.AsyncHTTPTransport(
+                    limits=_openai_limits, http2=_http2
+                )
+            else:
+                transport = AsyncResilientTransport(
+                    AsyncCompressingTransport(
+                        httpx.AsyncHTTPTransport(limits=_limits, http2=_http2)
+                    )
+                )
+            client = httpx.AsyncClient(transport=transport, follow_redirects=True)
+            clients[key] = client
+    return client
@@ -0,0 +1,250 @@
+import time
+from typing import Any, Dict, Optional
+
+# Span names used by OpenTelemetryInstrumentation
+CALL_SPAN_NAME = "openai.chat.completions.create"
+REPORT_SPAN_NAME = "openpipe.report"
+
+
+class CallMetrics:
+    """
+    Timings of a single completion made through a wrapped client. Durations are
+    in seconds since the call started, and are None until they've been measured.
+    Instances are passed to every `Instrumentation` hook, and filled in as the
+    call progresses.
+    """
+
+    __slots__ = (
+        "instrumentation",
+        "model",
+        "stream",
+        "started_at",
+        "upstream_latency",
+        "time_to_first_chunk",
+        "chunks",
+        "max_chunk_gap",
+        "stream_stats",
+        "duration",
+        "status_code",
+        "error",
+        "state",
+        "_last_chunk_at",
+    )
+
+    def __init__(self, instrumentation: "Instrumentation", kwargs: Dict[str, Any]):
+        self.instrumentation = instrumentation
+        self.model: str = kwargs.get("model", "")
+        self.stream = bool(kwargs.get("stream"))
+        self.started_at = time.perf_counter()
+        # Until the response (or for streams, its headers) was received
+        self.upstream_latency: Optional[float] = None
+        self.time_to_first_chunk: Optional[float] = None
+        self.chunks = 0
+        # Longest wait between two chunks, which includes time the caller spent
+        # between reading them
+        self.max_chunk_gap: Optional[float] = None
+        # For streams that were read, see ChatCompletionAccumulator.get_stream_stats
+        self.stream_stats: Optional[Dict[str, Any]] = None
+        # Until the call was reported, or the stream was fully read
+        self.duration: Optional[float] = None
+        self.status_code: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        # Free for instrumentation to keep its own state in, e.g. a span
+        self.state: Any = None
+        self._last_chunk_at: Optional[float] = None
+        instrumentation.call_started(self)
+
+    def upstream_responded(self) -> None:
+        now = time.perf_counter()
+        self.upstream_latency = now - self.started_at
+        self._last_chunk_at = now
+        self.instrumentation.upstream_responded(self)
+
+    def chunk_received(self) -> None:
+        now = time.perf_counter()
+        gap = now - self._last_chunk_at
+        self._last_chunk_at = now
+        self.chunks += 1
+        if self.chunks == 1:
+            self.time_to_first_chunk = now - self.started_at
+        elif self.max_chunk_gap is None or gap > self.max_chunk_gap:
+            self.max_chunk_gap = gap
+        self.instrumentation.chunk_received(self, gap)
+
+    def report_encoded(self, seconds: float, report_bytes: int) -> None:
+        self.instrumentation.payload_serialized(self, seconds, report_bytes)
+
+    def report_enqueued(self, seconds: float) -> None:
+        self.instrumentation.report_enqueued(self, seconds)
+
+    def finish(
+        self,
+        status_code: Optional[int] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self.started_at
+        self.status_code = status_code
+        self.error = error
+        self.instrumentation.call_finished(self)
+
+
+class Instrumentation:
+    """
+    Hooks called at each stage of a completion made through a wrapped client, and
+    when queued reports are sent. Every hook does nothing by default; override the
+    ones you need. Hooks are called on the thread (or event loop) making the call,
+    unless noted otherwise, so they should return quickly.
+
+    Pass an instance as the `instrumentation` option of the client:
+    `OpenAI(openpipe={"instrumentation": MyInstrumentation()})`.
+    """
+
+    def call_started(self, call: CallMetrics) -> None:
+        """Called before the request is sent to the model."""
+
+    def upstream_responded(self, call: CallMetrics) -> None:
+        """Called once the response arrived, or for streams, its headers."""
+
+    def chunk_received(self, call: CallMetrics, gap: float) -> None:
+        """Called for each streamed chunk, with the seconds since the previous one."""
+
+    def payload_serialized(
+        self, call: CallMetrics, seconds: float, report_bytes: int
+    ) -> None:
+        """
+        Called once the call was encoded to be reported to OpenPipe, with the time
+        encoding took and the size of the encoded call, as sent. Only called for
+        calls that are reported. With background reporting, calls are encoded on
+        the background thread (or task) sending them, and calls held by a
+        sampling reservoir are only reported when its interval ends, so this is
+        usually called after `call_finished`.
+        """
+
+    def report_enqueued(self, call: CallMetrics, seconds: float) -> None:
+        """
+        Called with the time spent handing the report to OpenPipe: queueing it
+        with background reporting, or sending it without.
+        """
+
+    def call_finished(self, call: CallMetrics) -> None:
+        """
+        Called once the call was reported, or failed. For streams, that's once the
+        stream was fully read.
+        """
+
+    def reports_sent(
+        self, count: int, seconds: float, error: Optional[BaseException]
+    ) -> None:
+        """Called after background reporting sent a batch of `count` reports."""
+
+
+def start_call(
+    instrumentation: Optional[Instrumentation], kwargs: Dict[str, Any]
+) -> Optional[CallMetrics]:
+    """Starts measuring a call, unless no instrumentation was configured."""
+    if instrumentation is None:
+        return None
+    return CallMetrics(instrumentation, kwargs)
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    Records each call as an OpenTelemetry span, with the timings of the call as
+    attributes and events, and each batch of reports sent in the background as a
+    span of its own. Requires `pip install opentelemetry-api`.
+
+    Args:
+    - tracer (Tracer): The tracer spans are created with. Defaults to the
+      "openpipe" tracer of the global tracer provider.
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        if tracer is None:
+            from opentelemetry import trace
+
+            tracer = trace.get_tracer("openpipe")
+        self.tracer = tracer
+
+    def call_started(self, call: CallMetrics) -> None:
+        call.state = self.tracer.start_span(
+            CALL_SPAN_NAME,
+            attributes={
+                "gen_ai.system": "openai",
+                "gen_ai.request.model": call.model,
+                "openpipe.stream": call.stream,
+            },
+        )
+
+    def upstream_responded(self, call: CallMetrics) -> None:
+        call.state.add_event("upstream_response")
+
+    def chunk_received(self, call: CallMetrics, gap: float) -> None:
+        if call.chunks == 1:
+            call.state.add_event("first_chunk")
+
+    def payload_serialized(
+        self, call: CallMetrics, seconds: float, report_bytes: int
+    ) -> None:
+        if call.duration is not None:
+            # Encoded after the span ended, in the background or by a reservoir
+            return
+        call.state.set_attributes(
+            {
+                "openpipe.serialization_ms": seconds * 1000,
+                "openpipe.report_bytes": report_bytes,
+            }
+        )
+
+    def report_enqueued(self, call: CallMetrics, seconds: float) -> None:
+        if call.duration is not None:
+            return
+        call.state.set_attribute("openpipe.report_enqueue_ms", seconds * 1000)
+
+    def call_finished(self, call: CallMetrics) -> None:
+        span = call.state
+        attributes = {
+            "openpipe.upstream_latency_ms": call.upstream_latency,
+            "openpipe.time_to_first_chunk_ms": call.time_to_first_chunk,
+            "openpipe.max_chunk_gap_ms": call.max_chunk_gap,
+        }
+        span.set_attributes(
+            {
+                name: value * 1000
+                for name, value in attributes.items()
+                if value is not None
+            }
+        )
+        if call.stream:
+            span.set_attribute("openpipe.chunks", call.chunks)
+        stats = call.stream_stats
+        if stats is not None and stats["tokens_per_second"] is not None:
+            span.set_attribute("openpipe.tokens_per_second", stats["tokens_per_second"])
+        if call.status_code is not None:
+            span.set_attribute("http.status_code", call.status_code)
+        if call.error is not None:
+            _set_error(span, call.error)
+        span.end()
+
+    def reports_sent(
+        self, count: int, seconds: float, error: Optional[BaseException]
+    ) -> None:
+        end_time = time.time_ns()
+        span = self.tracer.start_span(
+            REPORT_SPAN_NAME,
+            start_time=end_time - int(seconds * 1e9),
+            attributes={"openpipe.reports": count},
+        )
+        if error is not None:
+            _set_error(span, error)
+        span.end(end_time=end_time)
+
+
+def _set_error(span: Any, error: BaseException) -> None:
+    span.record_exception(error)
+    try:
+        from opentelemetry.trace import Status, StatusCode
+    except ImportError:
+        return
+    span.set_status(Status(StatusCode.ERROR, str(error)))
@@ -0,0 +1,190 @@
+"""
+A faster version of the generated client's `jsonable_encoder`, used to encode
+the request bodies this package builds itself (report batches, spooled
+reports, dataset entries). It produces the same output, including the
+precedence of custom encoders and datetimes being encoded as dates.
+
+The checks deciding how a value is encoded only depend on its type, so the
+handler chosen for each type is cached, and values of the plain JSON types are
+copied without a lookup.
+"""
+
+import dataclasses
+import datetime as dt
+from collections import defaultdict
+from enum import Enum
+from pathlib import PurePath
+from types import GeneratorType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import pydantic.v1 as pydantic  # type: ignore
+except ImportError:
+    import pydantic  # type: ignore
+
+
+def generate_encoders_by_class_tuples(
+    type_encoder_map: Dict[Any, Callable[[Any], Any]]
+) -> Dict[Callable[[Any], Any], Tuple[Any, ...]]:
+    encoders_by_class_tuples: Dict[Callable[[Any], Any], Tuple[Any, ...]] = defaultdict(
+        tuple
+    )
+    for type_, encoder in type_encoder_map.items():
+        encoders_by_class_tuples[encoder] += (type_,)
+    return encoders_by_class_tuples
+
+
+encoders_by_class_tuples = generate_encoders_by_class_tuples(
+    pydantic.json.ENCODERS_BY_TYPE
+)
+
+# Values of these exact types are returned as they are
+_PRIMITIVE_TYPES = frozenset((str, int, float, bool, type(None)))
+_SEQUENCE_TYPES = (list, set, frozenset, GeneratorType, tuple)
+
+# Encoders are cached per set of custom encoders, which in practice is one per model class
+_MAX_CACHED_ENCODERS = 256
+
+
+def _identity(obj: Any) -> Any:
+    return obj
+
+
+def _encode_enum(obj: Enum) -> Any:
+    return obj.value
+
+
+def _overrides_primitives(custom_encoder: Dict[Any, Callable[[Any], Any]]) -> bool:
+    for encoder_type in custom_encoder:
+        try:
+            if any(
+                issubclass(primitive, encoder_type) for primitive in _PRIMITIVE_TYPES
+            ):
+                return True
+        except TypeError:
+            continue
+    return False
+
+
+class _Encoder:
+    def __init__(self, custom_encoder: Dict[Any, Callable[[Any], Any]]) -> None:
+        self.custom_encoder = custom_encoder
+        self.handlers: Dict[type, Callable[[Any], Any]] = {}
+        # A custom encoder for a primitive type or one of its bases (e.g. `object`) takes precedence
+        self.copy_primitives = not _overrides_primitives(custom_encoder)
+
+    def encode(self, obj: Any) -> Any:
+        handler = self.handlers.get(type(obj))
+        if handler is None:
+            handler = self._resolve(obj)
+            # Classes themselves can be dataclasses, so handlers for them depend on the instance
+            if not isinstance(obj, type):
+                self.handlers[type(obj)] = handler
+        return handler(obj)
+
+    def _resolve(self, obj: Any) -> Callable[[Any], Any]:
+        custom_encoder = self.custom_encoder
+        if custom_encoder:
+            if type(obj) in custom_encoder:
+                return custom_encoder[type(obj)]
+            else:
+                for encoder_type, encoder_instance in custom_encoder.items():
+                    if isinstance(obj, encoder_type):
+                        return encoder_instance
+        if isinstance(obj, pydantic.BaseModel):
+            return self._encode_model
+        if dataclasses.is_dataclass(obj):
+            return self._encode_dataclass
+        if isinstance(obj, Enum):
+            return _encode_enum
+        if isinstance(obj, PurePath):
+            return str
+        if isinstance(obj, (str, int, float, type(None))):
+            return _identity
+        # Also applies to datetimes, since they are dates
+        if isinstance(obj, dt.date):
+            return str
+        if isinstance(obj, dict):
+            return self._encode_dict
+        if isinstance(obj, _SEQUENCE_TYPES):
+            return self._encode_sequence
+
+        if type(obj) in pydantic.json.ENCODERS_BY_TYPE:
+            return pydantic.json.ENCODERS_BY_TYPE[type(obj)]
+        for encoder, classes_tuple in encoders_by_class_tuples.items():
+            if isinstance(obj, classes_tuple):
+                return encoder
+
+        return self._encode_fallback
+
+    def _encode_model(self, obj: Any) -> Any:
+        encoder = getattr(obj.__config__, "json_encoders", {})
+        if self.custom_encoder:
+            encoder.update(self.custom_encoder)
+        obj_dict = obj.dict(by_alias=True)
+        if "__root__" in obj_dict:
+            obj_dict = obj_dict["__root__"]
+        return _get_encoder(encoder).encode(obj_dict)
+
+    def _encode_dataclass(self, obj: Any) -> Any:
+        return self.encode(dataclasses.asdict(obj))
+
+    def _encode_dict(self, obj: Dict[Any, Any]) -> Dict[Any, Any]:
+        if not self.copy_primitives:
+            return {self.encode(key): self.encode(value) for key, value in obj.items()}
+        encode = self.encode
+        encoded_dict = {}
+        for key, value in obj.items():
+            if type(key) not in _PRIMITIVE_TYPES:
+                key = encode(key)
+            if type(value) not in _PRIMITIVE_TYPES:
+                value = encode(value)
+            encoded_dict[key] = value
+        return encoded_dict
+
+    def _encode_sequence(self, obj: Any) -> List[Any]:
+        if not self.copy_primitives:
+            return [self.encode(item) for item in obj]
+        encode = self.encode
+        return [
+            item if type(item) in _PRIMITIVE_TYPES else encode(item) for item in obj
+        ]
+
+    def _encode_fallback(self, obj: Any) -> Any:
+        try:
+            data = dict(obj)
+        except Exception as e:
+            errors: List[Exception] = []
+            errors.append(e)
+            try:
+                data = vars(obj)
+            except Exception as e:
+                errors.append(e)
+                raise ValueError(errors) from e
+        return self.encode(data)
+
+
+_encoders: Dict[Any, _Encoder] = {}
+
+
+def _get_encoder(custom_encoder: Dict[Any, Callable[[Any], Any]]) -> _Encoder:
+    try:
+        key = tuple(custom_encoder.items())
+        encoder = _encoders.get(key)
+    except TypeError:
+        # Unhashable custom encoders can't be cached
+        return _Encoder(custom_encoder)
+    if encoder is None:
+        if len(_encoders) >= _MAX_CACHED_ENCODERS:
+            _encoders.clear()
+        # Keep a copy, since callers (and model configs) may mutate their dict later
+        encoder = _encoders[key] = _Encoder(dict(custom_encoder))
+    return encoder
+
+
+def jsonable_encoder(
+    obj: Any, custom_encoder: Optional[Dict[Any, Callable[[Any], Any]]] = None
+) -> Any:
+    if type(obj) in _PRIMITIVE_TYPES and not custom_encoder:
+        return obj
+    return _get_encoder(custom_encoder or {}).encode(obj)
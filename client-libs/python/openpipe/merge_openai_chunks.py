@@ -1,4 +1,6 @@
-from typing import Any, Optional, cast
+import io
+import time
+from typing import Any, Dict, List, Optional, cast
 from openai.types.chat import (
     ChatCompletion,
     ChatCompletionChunk,
@@ -91,3 +93,233 @@ def merge_openai_chunks(
             )
     base.choices = base_choices
     return base
+
+
+class _ToolCallBuilder:
+    __slots__ = ("id", "name", "arguments")
+
+    def __init__(self) -> None:
+        self.id: Optional[str] = None
+        self.name = ""
+        self.arguments = io.StringIO()
+
+
+class _ChoiceBuilder:
+    __slots__ = (
+        "content",
+        "function_name",
+        "function_arguments",
+        "tool_calls",
+        "finish_reason",
+        "logprobs",
+        "chunks",
+    )
+
+    def __init__(self) -> None:
+        # None until a delta carries the field, so that absent and empty stay distinct
+        self.content: Optional[io.StringIO] = None
+        self.function_name: Optional[str] = None
+        self.function_arguments: Optional[io.StringIO] = None
+        self.tool_calls: Dict[int, _ToolCallBuilder] = {}
+        self.finish_reason: Optional[str] = None
+        self.logprobs: Optional[List[Dict[str, Any]]] = None
+        self.chunks = 0
+
+
+class ChatCompletionAccumulator:
+    """
+    Assembles a streamed chat completion from its chunks.
+
+    Only what the completion is made of is kept: the text and argument
+    fragments of each choice and tool call (written to string buffers, so a
+    stream costs roughly the size of its text), finish reasons, logprobs and
+    usage. Chunks themselves aren't retained, and the completion is only
+    assembled when `get_completion_json` or `get_completion` is called.
+
+    The time the first chunk arrived and the number of chunks of each choice
+    are recorded too, for `get_stream_stats`.
+    """
+
+    def __init__(self) -> None:
+        self.first_chunk_at: Optional[int] = None
+        self._content_chunks = 0
+        self._id: Optional[str] = None
+        self._created = 0
+        self._model = ""
+        self._system_fingerprint: Optional[str] = None
+        self._usage: Optional[Dict[str, Any]] = None
+        self._choices: Dict[int, _ChoiceBuilder] = {}
+
+    def add(self, chunk: ChatCompletionChunk) -> None:
+        if self._id is None:
+            self.first_chunk_at = int(time.time() * 1000)
+            self._id = chunk.id
+            self._created = chunk.created
+            self._model = chunk.model
+            self._system_fingerprint = chunk.system_fingerprint
+
+        # Only sent by newer API versions, on the last chunk of the stream
+        usage = getattr(chunk, "usage", None)
+        if usage is not None:
+            self._usage = usage.model_dump(exclude_none=True)
+
+        for choice in chunk.choices:
+            builder = self._choices.get(choice.index)
+            if builder is None:
+                builder = self._choices[choice.index] = _ChoiceBuilder()
+            builder.chunks += 1
+
+            if choice.finish_reason:
+                builder.finish_reason = choice.finish_reason
+
+            if choice.logprobs is not None and choice.logprobs.content:
+                if builder.logprobs is None:
+                    builder.logprobs = []
+                builder.logprobs.extend(
+                    logprob.model_dump(exclude_none=True)
+                    for logprob in choice.logprobs.content
+                )
+
+            delta = choice.delta
+            if delta is None:
+                continue
+
+            if delta.content or delta.function_call or delta.tool_calls:
+                self._content_chunks += 1
+
+            if delta.content is not None:
+                if builder.content is None:
+                    builder.content = io.StringIO()
+                builder.content.write(delta.content)
+
+            if delta.function_call:
+                if builder.function_arguments is None:
+                    builder.function_name = ""
+                    builder.function_arguments = io.StringIO()
+                if delta.function_call.name:
+                    builder.function_name += delta.function_call.name
+                if delta.function_call.arguments:
+                    builder.function_arguments.write(delta.function_call.arguments)
+
+            if delta.tool_calls:
+                for tool_call_delta in delta.tool_calls:
+                    tool_call = builder.tool_calls.get(tool_call_delta.index)
+                    if tool_call is None:
+                        tool_call = builder.tool_calls[
+                            tool_call_delta.index
+                        ] = _ToolCallBuilder()
+                    if tool_call_delta.id:
+                        tool_call.id = tool_call_delta.id
+                    if tool_call_delta.function:
+                        if tool_call_delta.function.name:
+                            tool_call.name += tool_call_delta.function.name
+                        if tool_call_delta.function.arguments:
+                            tool_call.arguments.write(
+                                tool_call_delta.function.arguments
+                            )
+
+    def get_completion_json(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the completion assembled so far in the format of
+        `get_chat_completion_json`, or None if no chunks were added.
+        """
+        if self._id is None:
+            return None
+
+        choices = []
+        for index in sorted(self._choices):
+            builder = self._choices[index]
+
+            message: Dict[str, Any] = {
+                "content": builder.content.getvalue()
+                if builder.content is not None
+                else None,
+                "role": "assistant",
+            }
+            if builder.function_arguments is not None:
+                message["function_call"] = {
+                    "arguments": builder.function_arguments.getvalue(),
+                    "name": builder.function_name,
+                }
+            if builder.tool_calls:
+                message["tool_calls"] = [
+                    {
+                        "id": tool_call.id or "",
+                        "function": {
+                            "arguments": tool_call.arguments.getvalue(),
+                            "name": tool_call.name,
+                        },
+                        "type": "function",
+                    }
+                    for _, tool_call in sorted(builder.tool_calls.items())
+                ]
+
+            choice: Dict[str, Any] = {
+                # Choice requires a finish_reason, so fall back to "length"
+                # for streams that ended without providing one.
+                "finish_reason": builder.finish_reason or "length",
+                "index": index,
+            }
+            if builder.logprobs is not None:
+                choice["logprobs"] = {"content": builder.logprobs}
+            choice["message"] = message
+            choices.append(choice)
+
+        completion: Dict[str, Any] = {
+            "id": self._id,
+            "choices": choices,
+            "created": self._created,
+            "model": self._model,
+            "object": "chat.completion",
+        }
+        if self._system_fingerprint is not None:
+            completion["system_fingerprint"] = self._system_fingerprint
+        if self._usage is not None:
+            completion["usage"] = self._usage
+        return completion
+
+    def get_stream_stats(
+        self, requested_at: int, received_at: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Returns the timings of the stream, or None if no chunks were added.
+
+        Args:
+        - requested_at (int): When the stream was requested, in ms since the epoch.
+        - received_at (int): When the stream ended, in ms since the epoch.
+
+        Returns:
+        - first_chunk_at (int): When the first chunk arrived, in ms since the epoch.
+        - time_to_first_chunk_ms (int): How long the first chunk took to arrive.
+        - choice_chunks (Dict[int, int]): The number of chunks of each choice.
+        - completion_tokens (int): From the usage of the stream if it has one,
+          otherwise estimated as the number of chunks carrying content, since
+          OpenAI streams a token per chunk.
+        - tokens_per_second (float | None): The rate tokens arrived at after the
+          first chunk, or None if every chunk arrived in the same millisecond.
+        """
+        if self.first_chunk_at is None:
+            return None
+
+        completion_tokens = self._content_chunks
+        if self._usage is not None and "completion_tokens" in self._usage:
+            completion_tokens = self._usage["completion_tokens"]
+        generation_ms = received_at - self.first_chunk_at
+        return {
+            "first_chunk_at": self.first_chunk_at,
+            "time_to_first_chunk_ms": self.first_chunk_at - requested_at,
+            "choice_chunks": {
+                index: self._choices[index].chunks for index in sorted(self._choices)
+            },
+            "completion_tokens": completion_tokens,
+            "tokens_per_second": completion_tokens * 1000 / generation_ms
+            if generation_ms > 0
+            else None,
+        }
+
+    def get_completion(self) -> Optional[ChatCompletion]:
+        """Returns the completion assembled so far, or None if no chunks were added."""
+        completion = self.get_completion_json()
+        if completion is None:
+            return None
+        return ChatCompletion(**completion)
@@ -6,36 +6,181 @@ from openai.types.chat import ChatCompletion, ChatCompletionChunk
 from openai._streaming import AsyncStream
 from openai._base_client import DEFAULT_MAX_RETRIES
 
+import asyncio
 import time
 import json
-from typing import Union, Mapping, Optional, Dict
+from typing import Any, Callable, Union, Mapping, Optional, Dict, Set
 import httpx
 
-from .merge_openai_chunks import merge_openai_chunks
+from .merge_openai_chunks import ChatCompletionAccumulator
 from .shared import (
     report_async,
+    schedule_report,
     get_extra_headers,
     configure_openpipe_clients,
+    _should_log_request,
+    once,
+    with_stream_stats,
+    get_openpipe_base_url,
+    get_openai_base_url,
     get_chat_completion_json,
 )
 
+from .http_clients import get_async_openai_http_client
 from .client import AsyncOpenPipe
+from .report_queue import AsyncReportTasks
+from .report_spool import ReportSpool
+from .sampling import SamplingPolicy
+from .single_flight import SingleFlight
+from .instrumentation import Instrumentation, CallMetrics, start_call
+from .response_cache import (
+    ResponseCache,
+    create_response_cache,
+    get_cache_key,
+    completion_from_cache,
+    replay_async_stream,
+)
 from .api_client.core.api_error import ApiError
 
 
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
 class AsyncCompletionsWrapper(AsyncCompletions):
     openpipe_report_client: AsyncOpenPipe
     openpipe_completions_client: OriginalAsyncOpenAI
+    openpipe_report_tasks: Optional[AsyncReportTasks]
+    openpipe_report_spool: Optional[ReportSpool]
+    openpipe_sampling_policy: Optional[SamplingPolicy]
+    openpipe_response_cache: Optional[ResponseCache]
+    openpipe_single_flight: Optional[SingleFlight]
+    openpipe_instrumentation: Optional[Instrumentation]
 
     def __init__(
         self,
         client: OriginalAsyncOpenAI,
         openpipe_report_client: AsyncOpenPipe,
         openpipe_completions_client: OriginalAsyncOpenAI,
+        openpipe_report_tasks: Optional[AsyncReportTasks] = None,
+        openpipe_report_spool: Optional[ReportSpool] = None,
+        openpipe_sampling_policy: Optional[SamplingPolicy] = None,
+        openpipe_response_cache: Optional[ResponseCache] = None,
+        openpipe_single_flight: Optional[SingleFlight] = None,
+        openpipe_instrumentation: Optional[Instrumentation] = None,
     ) -> None:
         super().__init__(client)
         self.openpipe_report_client = openpipe_report_client
         self.openpipe_completions_client = openpipe_completions_client
+        self.openpipe_report_tasks = openpipe_report_tasks
+        self.openpipe_report_spool = openpipe_report_spool
+        self.openpipe_sampling_policy = openpipe_sampling_policy
+        self.openpipe_response_cache = openpipe_response_cache
+        self.openpipe_single_flight = openpipe_single_flight
+        self.openpipe_instrumentation = openpipe_instrumentation
+        # Reports released from a reservoir without background reporting
+        self.openpipe_held_reports: Set[asyncio.Task] = set()
+
+    def _should_sample(self, create_kwargs, openpipe_options) -> bool:
+        if not _should_log_request(self.openpipe_report_client, openpipe_options):
+            return False
+        policy = self.openpipe_sampling_policy
+        return policy is None or policy.should_sample_request(
+            create_kwargs, openpipe_options
+        )
+
+    async def _report(
+        self,
+        openpipe_options,
+        sampled: bool,
+        resp_payload: Callable[[], Any],
+        call: Optional[CallMetrics] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Reports a call that was sampled. `resp_payload` is only called once the
+        call is certain to be reported, so unreported calls are never serialized.
+        """
+        if not sampled:
+            return
+        policy = self.openpipe_sampling_policy
+        if policy is not None and not policy.should_report_status(
+            kwargs.get("status_code")
+        ):
+            return
+        on_encoded = None if call is None else call.report_encoded
+
+        if policy is None or policy.reservoir_size is None:
+            payload = resp_payload()
+            started = time.perf_counter()
+            if self.openpipe_report_tasks is not None:
+                schedule_report(
+                    self.openpipe_report_tasks,
+                    openpipe_options,
+                    resp_payload=payload,
+                    on_encoded=on_encoded,
+                    **kwargs,
+                )
+            else:
+                await report_async(
+                    configured_client=self.openpipe_report_client,
+                    openpipe_options=openpipe_options,
+                    spool=self.openpipe_report_spool,
+                    resp_payload=payload,
+                    on_encoded=on_encoded,
+                    **kwargs,
+                )
+            if call is not None:
+                call.report_enqueued(time.perf_counter() - started)
+            return
+
+        loop = asyncio.get_running_loop()
+
+        def schedule(payload):
+            started = time.perf_counter()
+            if self.openpipe_report_tasks is not None:
+                schedule_report(
+                    self.openpipe_report_tasks,
+                    openpipe_options,
+                    resp_payload=payload,
+                    on_encoded=on_encoded,
+                    **kwargs,
+                )
+            else:
+                task = loop.create_task(
+                    report_async(
+                        configured_client=self.openpipe_report_client,
+                        openpipe_options=openpipe_options,
+                        spool=self.openpipe_report_spool,
+                        resp_payload=payload,
+                        on_encoded=on_encoded,
+                        **kwargs,
+                    )
+                )
+                self.openpipe_held_reports.add(task)
+                task.add_done_callback(self.openpipe_held_reports.discard)
+            if call is not None:
+                call.report_enqueued(time.perf_counter() - started)
+
+        def send():
+            # Reservoirs are released from the policy's timer thread, and the
+            # report has to be scheduled on the loop the call was made on
+            payload = resp_payload()
+            if _running_loop() is loop:
+                schedule(payload)
+            elif loop.is_closed() or not loop.is_running():
+                raise RuntimeError(
+                    "the event loop of a sampled call stopped before it was "
+                    "reported. Await client.flush() before the loop exits."
+                )
+            else:
+                loop.call_soon_threadsafe(schedule, payload)
+
+        # Calls held in a reservoir are reported when its interval ends
+        policy.offer(openpipe_options, send)
 
     async def create(
         self, *args, **kwargs
@@ -52,64 +197,125 @@ class AsyncCompletionsWrapper(AsyncCompletions):
                 **kwargs, extra_headers=extra_headers
             )
 
+        cache = self.openpipe_response_cache
+        cache_key = None
+        if (
+            cache is not None
+            and openpipe_options.get("response_cache", True)
+            and cache.is_cacheable(kwargs)
+        ):
+            cache_key = get_cache_key(
+                kwargs, self._client.base_url, self._client.organization
+            )
+            cached = cache.lookup(cache_key)
+            if cached is not None:
+                # Cached responses never reach the model, so they aren't reported
+                if kwargs.get("stream"):
+                    return replay_async_stream(cached)
+                return completion_from_cache(cached)
+
+        # Decide whether to report the call before making it, so that calls
+        # that won't be reported are never serialized
+        sampled = self._should_sample(kwargs, openpipe_options)
+        call = start_call(self.openpipe_instrumentation, kwargs)
+
+        flight = None
+        single_flight = self.openpipe_single_flight
+        if single_flight is not None and single_flight.is_eligible(kwargs):
+            flight = single_flight.join_async(kwargs)
+            if not flight.leader:
+                # The call this request joined is cached and reported by its leader
+                cache_key = None
+                sampled = False
+
         try:
-            chat_completion = await super().create(*args, **kwargs)
+            if flight is None:
+                chat_completion = await super().create(*args, **kwargs)
+            else:
+                upstream = super().create
+                chat_completion = await flight.run(lambda: upstream(*args, **kwargs))
+            if call is not None:
+                call.upstream_responded()
 
             if isinstance(chat_completion, AsyncStream):
 
                 async def _gen():
-                    assembled_completion = None
+                    accumulator = ChatCompletionAccumulator()
+                    completed = False
+                    error = None
                     try:
                         async for chunk in chat_completion:
-                            assembled_completion = merge_openai_chunks(
-                                assembled_completion, chunk
-                            )
+                            if call is not None:
+                                call.chunk_received()
+                            accumulator.add(chunk)
                             yield chunk
+                        completed = True
+                    except Exception as e:
+                        error = e
+                        raise
                     finally:
                         try:
                             # This block will always execute when the generator exits.
                             # This ensures that cleanup and reporting operations are performed regardless of how the generator terminates.
                             received_at = int(time.time() * 1000)
-                            await report_async(
-                                configured_client=self.openpipe_report_client,
-                                openpipe_options=openpipe_options,
+                            stream_stats = accumulator.get_stream_stats(
+                                requested_at, received_at
+                            )
+                            if call is not None:
+                                call.stream_stats = stream_stats
+                            resp_payload = once(accumulator.get_completion_json)
+                            # Only complete responses are worth replaying
+                            if completed and cache_key is not None:
+                                cache.store(cache_key, resp_payload())
+
+                            await self._report(
+                                with_stream_stats(openpipe_options, stream_stats),
+                                sampled,
+                                call=call,
                                 requested_at=requested_at,
                                 received_at=received_at,
                                 req_payload=kwargs,
-                                resp_payload=get_chat_completion_json(
-                                    assembled_completion
-                                ),
+                                resp_payload=resp_payload,
                                 status_code=200,
                             )
                         except Exception as e:
                             # Ignore any errors that occur while reporting
                             pass
+                        if call is not None:
+                            call.finish(200 if completed else None, error)
 
                 return _gen()
             else:
                 received_at = int(time.time() * 1000)
+                resp_payload = once(lambda: get_chat_completion_json(chat_completion))
+                if cache_key is not None:
+                    cache.store(cache_key, resp_payload())
 
-                await report_async(
-                    configured_client=self.openpipe_report_client,
-                    openpipe_options=openpipe_options,
+                await self._report(
+                    openpipe_options,
+                    sampled,
+                    call=call,
                     requested_at=requested_at,
                     received_at=received_at,
                     req_payload=kwargs,
-                    resp_payload=get_chat_completion_json(chat_completion),
+                    resp_payload=resp_payload,
                     status_code=200,
                 )
+                if call is not None:
+                    call.finish(200)
             return chat_completion
         except Exception as e:
             received_at = int(time.time() * 1000)
 
             if isinstance(e, OpenAIError):
-                await report_async(
-                    configured_client=self.openpipe_report_client,
-                    openpipe_options=openpipe_options,
+                await self._report(
+                    openpipe_options,
+                    sampled,
+                    call=call,
                     requested_at=requested_at,
                     received_at=received_at,
                     req_payload=kwargs,
-                    resp_payload=e.response.json(),
+                    resp_payload=e.response.json,
                     error_message=e.response.json()["error"]["message"],
                     status_code=e.__dict__["status_code"],
                 )
@@ -125,18 +331,23 @@ class AsyncCompletionsWrapper(AsyncCompletions):
                 except:
                     pass
 
-                await report_async(
-                    configured_client=self.openpipe_report_client,
-                    openpipe_options=openpipe_options,
+                await self._report(
+                    openpipe_options,
+                    sampled,
+                    call=call,
                     requested_at=requested_at,
                     received_at=received_at,
                     req_payload=kwargs,
-                    resp_payload=error_content,
+                    resp_payload=lambda: error_content,
                     error_message=error_message,
                     status_code=e.status_code,
                 )
+                if call is not None:
+                    call.finish(e.status_code, e)
                 raise Exception(error_message)
 
+            if call is not None:
+                call.finish(getattr(e, "status_code", None), e)
             raise e
 
 
@@ -146,10 +357,24 @@ class AsyncChatWrapper(AsyncChat):
         client: OriginalAsyncOpenAI,
         openpipe_report_client: AsyncOpenPipe,
         openpipe_completions_client: OriginalAsyncOpenAI,
+        openpipe_report_tasks: Optional[AsyncReportTasks] = None,
+        openpipe_report_spool: Optional[ReportSpool] = None,
+        openpipe_sampling_policy: Optional[SamplingPolicy] = None,
+        openpipe_response_cache: Optional[ResponseCache] = None,
+        openpipe_single_flight: Optional[SingleFlight] = None,
+        openpipe_instrumentation: Optional[Instrumentation] = None,
     ) -> None:
         super().__init__(client)
         self.completions = AsyncCompletionsWrapper(
-            client, openpipe_report_client, openpipe_completions_client
+            client,
+            openpipe_report_client,
+            openpipe_completions_client,
+            openpipe_report_tasks,
+            openpipe_report_spool,
+            openpipe_sampling_policy,
+            openpipe_response_cache,
+            openpipe_single_flight,
+            openpipe_instrumentation,
         )
 
 
@@ -157,12 +382,18 @@ class AsyncOpenAIWrapper(OriginalAsyncOpenAI):
     chat: AsyncChatWrapper
     openpipe_reporting_client: AsyncOpenPipe
     openpipe_completions_client: OriginalAsyncOpenAI
+    openpipe_report_tasks: Optional[AsyncReportTasks]
+    openpipe_report_spool: Optional[ReportSpool]
+    openpipe_sampling_policy: Optional[SamplingPolicy]
+    openpipe_response_cache: Optional[ResponseCache]
+    openpipe_single_flight: Optional[SingleFlight]
+    openpipe_instrumentation: Optional[Instrumentation]
 
     # Support auto-complete
     def __init__(
         self,
         *,
-        openpipe: Optional[Dict[str, str]] = None,
+        openpipe: Optional[Dict[str, Any]] = None,
         api_key: Union[str, None] = None,
         organization: Union[str, None] = None,
         base_url: Union[str, httpx.URL, None] = None,
@@ -181,7 +412,9 @@ class AsyncOpenAIWrapper(OriginalAsyncOpenAI):
             max_retries=max_retries,
             default_headers=default_headers,
             default_query=default_query,
-            http_client=http_client,
+            # Reuse the process-wide connection pool unless a client was provided
+            http_client=http_client
+            or get_async_openai_http_client(get_openai_base_url(base_url)),
             _strict_response_validation=_strict_response_validation,
         )
 
@@ -194,13 +427,68 @@ class AsyncOpenAIWrapper(OriginalAsyncOpenAI):
             max_retries=max_retries,
             default_headers=default_headers,
             default_query=default_query,
-            http_client=http_client,
+            http_client=http_client
+            or get_async_openai_http_client(get_openpipe_base_url(openpipe)),
             _strict_response_validation=_strict_response_validation,
         )
         configure_openpipe_clients(
             self.openpipe_reporting_client, self.openpipe_completions_client, openpipe
         )
 
+        # Reports are sent as background tasks unless explicitly disabled
+        self.openpipe_sampling_policy = SamplingPolicy.from_options(
+            (openpipe or {}).get("sampling")
+        )
+        self.openpipe_response_cache = create_response_cache(
+            (openpipe or {}).get("response_cache")
+        )
+        self.openpipe_single_flight = SingleFlight.from_options(
+            (openpipe or {}).get("single_flight")
+        )
+        self.openpipe_instrumentation = (openpipe or {}).get("instrumentation")
+
+        self.openpipe_report_spool = None
+        if (openpipe or {}).get("spool"):
+            self.openpipe_report_spool = ReportSpool(**openpipe["spool"])
+
+        self.openpipe_report_tasks = None
+        if (openpipe or {}).get("background_reporting", True):
+            self.openpipe_report_tasks = AsyncReportTasks(
+                self.openpipe_reporting_client,
+                spool=self.openpipe_report_spool,
+                instrumentation=self.openpipe_instrumentation,
+                **((openpipe or {}).get("report_tasks") or {}),
+            )
+
         self.chat = AsyncChatWrapper(
-            self, self.openpipe_reporting_client, self.openpipe_completions_client
+            self,
+            self.openpipe_reporting_client,
+            self.openpipe_completions_client,
+            self.openpipe_report_tasks,
+            self.openpipe_report_spool,
+            self.openpipe_sampling_policy,
+            self.openpipe_response_cache,
+            self.openpipe_single_flight,
+            self.openpipe_instrumentation,
         )
+
+    async def flush(self) -> None:
+        """
+        Waits until all pending OpenPipe reports have been sent, including calls
+        held in a sampling reservoir whose interval hasn't ended yet.
+        """
+        if self.openpipe_sampling_policy is not None:
+            self.openpipe_sampling_policy.flush()
+        if self.openpipe_report_tasks is not None:
+            await self.openpipe_report_tasks.flush()
+        held = self.chat.completions.openpipe_held_reports
+        if held:
+            await asyncio.gather(*held, return_exceptions=True)
+
+    async def close(self) -> None:
+        await self.flush()
+        await super().close()
+
+    async def aclose(self) -> None:
+        """Sends pending OpenPipe reports and closes the underlying HTTP client."""
+        await self.close()
@@ -8,34 +8,129 @@ from openai._base_client import DEFAULT_MAX_RETRIES
 
 import time
 import json
-from typing import Union, Mapping, Optional, Dict
+from typing import Any, Callable, Union, Mapping, Optional, Dict
 import httpx
 
-from .merge_openai_chunks import merge_openai_chunks
+from .merge_openai_chunks import ChatCompletionAccumulator
 from .shared import (
     report,
+    enqueue_report,
     get_extra_headers,
     get_chat_completion_json,
     configure_openpipe_clients,
+    _should_log_request,
+    once,
+    with_stream_stats,
+    get_openpipe_base_url,
+    get_openai_base_url,
 )
 
+from .http_clients import get_openai_http_client
 from .client import OpenPipe
+from .report_queue import ReportQueue, get_report_queue
+from .report_spool import ReportSpool
+from .sampling import SamplingPolicy
+from .single_flight import SingleFlight
+from .instrumentation import Instrumentation, CallMetrics, start_call
+from .response_cache import (
+    ResponseCache,
+    create_response_cache,
+    get_cache_key,
+    completion_from_cache,
+    replay_stream,
+)
 from .api_client.core.api_error import ApiError
 
 
 class CompletionsWrapper(Completions):
     openpipe_reporting_client: OpenPipe
     openpipe_completions_client: OriginalOpenAI
+    openpipe_report_queue: Optional[ReportQueue]
+    openpipe_report_spool: Optional[ReportSpool]
+    openpipe_sampling_policy: Optional[SamplingPolicy]
+    openpipe_response_cache: Optional[ResponseCache]
+    openpipe_single_flight: Optional[SingleFlight]
+    openpipe_instrumentation: Optional[Instrumentation]
 
     def __init__(
         self,
         client: OriginalOpenAI,
         openpipe_reporting_client: OpenPipe,
         openpipe_completions_client: OriginalOpenAI,
+        openpipe_report_queue: Optional[ReportQueue] = None,
+        openpipe_report_spool: Optional[ReportSpool] = None,
+        openpipe_sampling_policy: Optional[SamplingPolicy] = None,
+        openpipe_response_cache: Optional[ResponseCache] = None,
+        openpipe_single_flight: Optional[SingleFlight] = None,
+        openpipe_instrumentation: Optional[Instrumentation] = None,
     ) -> None:
         super().__init__(client)
         self.openpipe_reporting_client = openpipe_reporting_client
         self.openpipe_completions_client = openpipe_completions_client
+        self.openpipe_report_queue = openpipe_report_queue
+        self.openpipe_report_spool = openpipe_report_spool
+        self.openpipe_sampling_policy = openpipe_sampling_policy
+        self.openpipe_response_cache = openpipe_response_cache
+        self.openpipe_single_flight = openpipe_single_flight
+        self.openpipe_instrumentation = openpipe_instrumentation
+
+    def _should_sample(self, create_kwargs, openpipe_options) -> bool:
+        if not _should_log_request(self.openpipe_reporting_client, openpipe_options):
+            return False
+        policy = self.openpipe_sampling_policy
+        return policy is None or policy.should_sample_request(
+            create_kwargs, openpipe_options
+        )
+
+    def _report(
+        self,
+        openpipe_options,
+        sampled: bool,
+        resp_payload: Callable[[], Any],
+        call: Optional[CallMetrics] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Reports a call that was sampled. `resp_payload` is only called once the
+        call is certain to be reported, so unreported calls are never serialized.
+        """
+        if not sampled:
+            return
+        policy = self.openpipe_sampling_policy
+        if policy is not None and not policy.should_report_status(
+            kwargs.get("status_code")
+        ):
+            return
+        on_encoded = None if call is None else call.report_encoded
+
+        def send():
+            payload = resp_payload()
+            started = time.perf_counter()
+            if self.openpipe_report_queue is not None:
+                enqueue_report(
+                    self.openpipe_report_queue,
+                    openpipe_options,
+                    resp_payload=payload,
+                    on_encoded=on_encoded,
+                    **kwargs,
+                )
+            else:
+                report(
+                    configured_client=self.openpipe_reporting_client,
+                    openpipe_options=openpipe_options,
+                    spool=self.openpipe_report_spool,
+                    resp_payload=payload,
+                    on_encoded=on_encoded,
+                    **kwargs,
+                )
+            if call is not None:
+                call.report_enqueued(time.perf_counter() - started)
+
+        if policy is None:
+            send()
+        else:
+            # Calls held in a reservoir are reported when its interval ends
+            policy.offer(openpipe_options, send)
 
     def create(
         self, *args, **kwargs
@@ -52,57 +147,121 @@ class CompletionsWrapper(Completions):
                 **kwargs, extra_headers=extra_headers
             )
 
+        cache = self.openpipe_response_cache
+        cache_key = None
+        if (
+            cache is not None
+            and openpipe_options.get("response_cache", True)
+            and cache.is_cacheable(kwargs)
+        ):
+            cache_key = get_cache_key(
+                kwargs, self._client.base_url, self._client.organization
+            )
+            cached = cache.lookup(cache_key)
+            if cached is not None:
+                # Cached responses never reach the model, so they aren't reported
+                if kwargs.get("stream"):
+                    return replay_stream(cached)
+                return completion_from_cache(cached)
+
+        # Decide whether to report the call before making it, so that calls
+        # that won't be reported are never serialized
+        sampled = self._should_sample(kwargs, openpipe_options)
+        call = start_call(self.openpipe_instrumentation, kwargs)
+
+        flight = None
+        single_flight = self.openpipe_single_flight
+        if single_flight is not None and single_flight.is_eligible(kwargs):
+            flight = single_flight.join(kwargs)
+            if not flight.leader:
+                # The call this request joined is cached and reported by its leader
+                cache_key = None
+                sampled = False
+
         try:
-            chat_completion = super().create(*args, **kwargs)
+            if flight is None:
+                chat_completion = super().create(*args, **kwargs)
+            else:
+                upstream = super().create
+                chat_completion = flight.run(lambda: upstream(*args, **kwargs))
+            if call is not None:
+                call.upstream_responded()
 
             if isinstance(chat_completion, Stream):
 
                 def _gen():
-                    assembled_completion = None
-                    for chunk in chat_completion:
-                        assembled_completion = merge_openai_chunks(
-                            assembled_completion, chunk
-                        )
+                    accumulator = ChatCompletionAccumulator()
+                    try:
+                        for chunk in chat_completion:
+                            if call is not None:
+                                call.chunk_received()
+                            accumulator.add(chunk)
 
-                        yield chunk
+                            yield chunk
 
-                    received_at = int(time.time() * 1000)
+                        received_at = int(time.time() * 1000)
+                        stream_stats = accumulator.get_stream_stats(
+                            requested_at, received_at
+                        )
+                        if call is not None:
+                            call.stream_stats = stream_stats
+                        resp_payload = once(accumulator.get_completion_json)
+                        if cache_key is not None:
+                            cache.store(cache_key, resp_payload())
 
-                    report(
-                        configured_client=self.openpipe_reporting_client,
-                        openpipe_options=openpipe_options,
-                        requested_at=requested_at,
-                        received_at=received_at,
-                        req_payload=kwargs,
-                        resp_payload=get_chat_completion_json(assembled_completion),
-                        status_code=200,
-                    )
+                        self._report(
+                            with_stream_stats(openpipe_options, stream_stats),
+                            sampled,
+                            call=call,
+                            requested_at=requested_at,
+                            received_at=received_at,
+                            req_payload=kwargs,
+                            resp_payload=resp_payload,
+                            status_code=200,
+                        )
+                        if call is not None:
+                            call.finish(200)
+                    except Exception as e:
+                        if call is not None:
+                            call.finish(error=e)
+                        raise
+                    finally:
+                        # The stream was closed before it was fully read
+                        if call is not None:
+                            call.finish()
 
                 return _gen()
             else:
                 received_at = int(time.time() * 1000)
+                resp_payload = once(lambda: get_chat_completion_json(chat_completion))
+                if cache_key is not None:
+                    cache.store(cache_key, resp_payload())
 
-                report(
-                    configured_client=self.openpipe_reporting_client,
-                    openpipe_options=openpipe_options,
+                self._report(
+                    openpipe_options,
+                    sampled,
+                    call=call,
                     requested_at=requested_at,
                     received_at=received_at,
                     req_payload=kwargs,
-                    resp_payload=get_chat_completion_json(chat_completion),
+                    resp_payload=resp_payload,
                     status_code=200,
                 )
+                if call is not None:
+                    call.finish(200)
             return chat_completion
         except Exception as e:
             received_at = int(time.time() * 1000)
 
             if isinstance(e, OpenAIError):
-                report(
-                    configured_client=self.openpipe_reporting_client,
-                    openpipe_options=openpipe_options,
+                self._report(
+                    openpipe_options,
+                    sampled,
+                    call=call,
                     requested_at=requested_at,
                     received_at=received_at,
                     req_payload=kwargs,
-                    resp_payload=e.response.json(),
+                    resp_payload=e.response.json,
                     error_message=e.response.json()["error"]["message"],
                     status_code=e.__dict__["status_code"],
                 )
@@ -118,18 +277,23 @@ class CompletionsWrapper(Completions):
                 except:
                     pass
 
-                report(
-                    configured_client=self.openpipe_reporting_client,
-                    openpipe_options=openpipe_options,
+                self._report(
+                    openpipe_options,
+                    sampled,
+                    call=call,
                     requested_at=requested_at,
                     received_at=received_at,
                     req_payload=kwargs,
-                    resp_payload=error_content,
+                    resp_payload=lambda: error_content,
                     error_message=error_message,
                     status_code=e.status_code,
                 )
+                if call is not None:
+                    call.finish(e.status_code, e)
                 raise Exception(error_message)
 
+            if call is not None:
+                call.finish(getattr(e, "status_code", None), e)
             raise e
 
 
@@ -139,10 +303,24 @@ class ChatWrapper(Chat):
         client: OriginalOpenAI,
         openpipe_reporting_client: OpenPipe,
         openpipe_completions_client: OriginalOpenAI,
+        openpipe_report_queue: Optional[ReportQueue] = None,
+        openpipe_report_spool: Optional[ReportSpool] = None,
+        openpipe_sampling_policy: Optional[SamplingPolicy] = None,
+        openpipe_response_cache: Optional[ResponseCache] = None,
+        openpipe_single_flight: Optional[SingleFlight] = None,
+        openpipe_instrumentation: Optional[Instrumentation] = None,
     ) -> None:
         super().__init__(client)
         self.completions = CompletionsWrapper(
-            client, openpipe_reporting_client, openpipe_completions_client
+            client,
+            openpipe_reporting_client,
+            openpipe_completions_client,
+            openpipe_report_queue,
+            openpipe_report_spool,
+            openpipe_sampling_policy,
+            openpipe_response_cache,
+            openpipe_single_flight,
+            openpipe_instrumentation,
         )
 
 
@@ -150,12 +328,18 @@ class OpenAIWrapper(OriginalOpenAI):
     chat: ChatWrapper
     openpipe_reporting_client: OpenPipe
     openpipe_completions_client: OriginalOpenAI
+    openpipe_report_queue: Optional[ReportQueue]
+    openpipe_report_spool: Optional[ReportSpool]
+    openpipe_sampling_policy: Optional[SamplingPolicy]
+    openpipe_response_cache: Optional[ResponseCache]
+    openpipe_single_flight: Optional[SingleFlight]
+    openpipe_instrumentation: Optional[Instrumentation]
 
     # Support auto-complete
     def __init__(
         self,
         *,
-        openpipe: Optional[Dict[str, str]] = None,
+        openpipe: Optional[Dict[str, Any]] = None,
         api_key: Union[str, None] = None,
         organization: Union[str, None] = None,
         base_url: Union[str, httpx.URL, None] = None,
@@ -174,7 +358,9 @@ class OpenAIWrapper(OriginalOpenAI):
             max_retries=max_retries,
             default_headers=default_headers,
             default_query=default_query,
-            http_client=http_client,
+            # Reuse the process-wide connection pool unless a client was provided
+            http_client=http_client
+            or get_openai_http_client(get_openai_base_url(base_url)),
             _strict_response_validation=_strict_response_validation,
         )
 
@@ -187,13 +373,66 @@ class OpenAIWrapper(OriginalOpenAI):
             max_retries=max_retries,
             default_headers=default_headers,
             default_query=default_query,
-            http_client=http_client,
+            http_client=http_client
+            or get_openai_http_client(get_openpipe_base_url(openpipe)),
             _strict_response_validation=_strict_response_validation,
         )
         configure_openpipe_clients(
             self.openpipe_reporting_client, self.openpipe_completions_client, openpipe
         )
 
+        # Reports are sent from a background thread unless explicitly disabled
+        self.openpipe_sampling_policy = SamplingPolicy.from_options(
+            (openpipe or {}).get("sampling")
+        )
+        self.openpipe_response_cache = create_response_cache(
+            (openpipe or {}).get("response_cache")
+        )
+        self.openpipe_single_flight = SingleFlight.from_options(
+            (openpipe or {}).get("single_flight")
+        )
+        self.openpipe_instrumentation = (openpipe or {}).get("instrumentation")
+
+        self.openpipe_report_spool = None
+        self.openpipe_report_queue = None
+        if (openpipe or {}).get("background_reporting", True):
+            # Shared with every wrapper reporting to the same place, so reports
+            # are sent through the queue's client
+            self.openpipe_report_queue = get_report_queue(
+                self.openpipe_reporting_client,
+                spool=(openpipe or {}).get("spool"),
+                instrumentation=self.openpipe_instrumentation,
+                **((openpipe or {}).get("report_queue") or {}),
+            )
+            self.openpipe_reporting_client = self.openpipe_report_queue.client
+            self.openpipe_report_spool = self.openpipe_report_queue.spool
+        elif (openpipe or {}).get("spool"):
+            self.openpipe_report_spool = ReportSpool(**openpipe["spool"])
+
         self.chat = ChatWrapper(
-            self, self.openpipe_reporting_client, self.openpipe_completions_client
+            self,
+            self.openpipe_reporting_client,
+            self.openpipe_completions_client,
+            self.openpipe_report_queue,
+            self.openpipe_report_spool,
+            self.openpipe_sampling_policy,
+            self.openpipe_response_cache,
+            self.openpipe_single_flight,
+            self.openpipe_instrumentation,
         )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until all pending OpenPipe reports have been sent.
+        Returns False if the timeout expired first.
+        """
+        if self.openpipe_report_queue is None:
+            return True
+        return self.openpipe_report_queue.flush(timeout)
+
+    def close(self) -> None:
+        if self.openpipe_sampling_policy is not None:
+            self.openpipe_sampling_policy.flush()
+        # The queue is shared with other wrappers, so it's only closed at exit
+        self.flush()
+        super().close()
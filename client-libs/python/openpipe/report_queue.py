@@ -0,0 +1,464 @@
+import asyncio
+import atexit
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from .client import OpenPipe, AsyncOpenPipe, MAX_REPORT_BATCH_SIZE, OnReportEncoded
+from .report_spool import ReportSpool
+from .instrumentation import Instrumentation
+
+DEFAULT_MAX_QUEUE_SIZE = 10000
+DEFAULT_MAX_BATCH_SIZE = MAX_REPORT_BATCH_SIZE
+# Seconds to wait for a batch to fill up before sending what we have
+DEFAULT_FLUSH_INTERVAL = 0.05
+# Seconds the worker thread stays alive without any reports before exiting
+DEFAULT_IDLE_TIMEOUT = 30.0
+# Seconds to spend sending outstanding reports when the interpreter exits
+DEFAULT_EXIT_TIMEOUT = 5.0
+# Maximum number of reports sent at once by AsyncReportTasks
+DEFAULT_MAX_CONCURRENCY = 10
+# Maximum number of reports AsyncReportTasks holds waiting for a concurrency slot
+DEFAULT_MAX_PENDING = DEFAULT_MAX_QUEUE_SIZE
+
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_BLOCK = "block"
+
+# A queued report, and what to call once it was encoded to be sent
+QueuedReport = Tuple[Dict[str, Any], Optional[OnReportEncoded]]
+
+_live_queues: "weakref.WeakSet[ReportQueue]" = weakref.WeakSet()
+# Queues shared by OpenAI wrappers, by the API they report to and their options
+_shared_queues: Dict[Tuple[Any, ...], "ReportQueue"] = {}
+_shared_queues_lock = threading.Lock()
+
+
+class ReportQueue:
+    """
+    Bounded in-memory queue of reports that are sent to OpenPipe from a
+    background thread, so that completions don't wait on the reporting request.
+    Queued reports are sent together through `OpenPipe.report_batch`.
+
+    Args:
+    - client (OpenPipe): The client used to send reports.
+    - max_queue_size (int): Maximum number of reports held in memory.
+    - max_batch_size (int): Maximum number of reports sent together.
+    - flush_interval (float): Seconds to wait for a batch to fill up.
+    - overflow (str): "drop_oldest" to discard the oldest report when the queue
+      is full, or "block" to make the caller wait for space.
+    - block_timeout (float | None): When overflow is "block", how long to wait
+      for space before dropping the new report. None waits indefinitely.
+    - spool (ReportSpool | None): Where reports that fail to send, or are still
+      queued when the queue is closed, are written so they can be sent later.
+    - instrumentation (Instrumentation | None): Told how long each batch took
+      to send.
+    """
+
+    def __init__(
+        self,
+        client: OpenPipe,
+        *,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        overflow: str = OVERFLOW_DROP_OLDEST,
+        block_timeout: Optional[float] = None,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        spool: Optional[ReportSpool] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> None:
+        if overflow not in (OVERFLOW_DROP_OLDEST, OVERFLOW_BLOCK):
+            raise ValueError(
+                f"overflow must be '{OVERFLOW_DROP_OLDEST}' or '{OVERFLOW_BLOCK}'"
+            )
+
+        self.client = client
+        self.max_queue_size = max(1, max_queue_size)
+        self.max_batch_size = max(1, max_batch_size)
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.idle_timeout = idle_timeout
+        self.spool = spool
+        self.instrumentation = instrumentation
+        self.dropped = 0
+
+        self._items: Deque[QueuedReport] = deque()
+        self._in_flight = 0
+        self._flush_requested = False
+        self._closed = False
+        self._worker: Optional[threading.Thread] = None
+        self._replay_thread: Optional[threading.Thread] = None
+
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._drained = threading.Condition(self._lock)
+
+        _live_queues.add(self)
+
+    def put(
+        self, report: Dict[str, Any], on_encoded: Optional[OnReportEncoded] = None
+    ) -> bool:
+        """
+        Adds a report to the queue. Returns False if the report was dropped.
+        `on_encoded` is called from the background thread once the report was
+        encoded to be sent, with the seconds it took and its encoded size.
+        """
+        with self._lock:
+            if self._closed:
+                self.dropped += 1
+                return False
+
+            if len(self._items) >= self.max_queue_size:
+                if self.overflow == OVERFLOW_BLOCK:
+                    has_space = self._not_full.wait_for(
+                        lambda: len(self._items) < self.max_queue_size or self._closed,
+                        self.block_timeout,
+                    )
+                    if not has_space or self._closed:
+                        self.dropped += 1
+                        return False
+                else:
+                    self._items.popleft()
+                    self.dropped += 1
+
+            self._items.append((report, on_encoded))
+            self._ensure_worker()
+            self._not_empty.notify()
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until every queued report has been sent, along with any spooled
+        reports being replayed. Returns False if the timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            if self._items:
+                self._flush_requested = True
+                self._ensure_worker()
+                self._not_empty.notify()
+            drained = self._drained.wait_for(
+                lambda: not self._items and self._in_flight == 0, timeout
+            )
+            replay_thread = self._replay_thread
+        if replay_thread is not None:
+            replay_thread.join(
+                None if deadline is None else max(0, deadline - time.monotonic())
+            )
+            drained = drained and not replay_thread.is_alive()
+        return drained
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Sends outstanding reports and stops accepting new ones."""
+        drained = self.flush(timeout)
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+            pending = (
+                [report for report, _ in self._items] if self.spool is not None else []
+            )
+            if pending:
+                self._items.clear()
+        if pending:
+            # Keep the reports we ran out of time to send
+            self.spool.append(pending)
+        if self.spool is not None:
+            self.spool.close()
+        return drained
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _ensure_worker(self) -> None:
+        # Must be called with the lock held
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._run, name="openpipe-report-queue", daemon=True
+            )
+            self._worker.start()
+
+    def _next_batch(self) -> Optional[List[QueuedReport]]:
+        with self._lock:
+            has_items = self._not_empty.wait_for(
+                lambda: self._items or self._closed, self.idle_timeout
+            )
+            if not has_items or not self._items:
+                # Let the thread exit; a new one is started on the next put
+                self._worker = None
+                return None
+
+            # Give the batch a chance to fill up before sending it
+            deadline = time.monotonic() + self.flush_interval
+            while (
+                len(self._items) < self.max_batch_size
+                and not self._flush_requested
+                and not self._closed
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._not_empty.wait(remaining)
+
+            batch_size = min(len(self._items), self.max_batch_size)
+            batch = [self._items.popleft() for _ in range(batch_size)]
+            self._in_flight = batch_size
+            self._not_full.notify_all()
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            try:
+                self._send(batch)
+            finally:
+                with self._lock:
+                    self._in_flight = 0
+                    if not self._items:
+                        self._flush_requested = False
+                        self._drained.notify_all()
+
+    def _send(self, queued: List[QueuedReport]) -> None:
+        batch = [report for report, _ in queued]
+
+        def on_encoded(index: int, seconds: float, size: int) -> None:
+            callback = queued[index][1]
+            if callback is not None:
+                callback(seconds, size)
+
+        started = time.perf_counter()
+        try:
+            response = self.client.report_batch(batch, on_encoded)
+        except Exception as e:
+            # We don't want to break client apps if our API is down for some reason
+            print(f"Error reporting to OpenPipe: {e}")
+            if self.instrumentation is not None:
+                self.instrumentation.reports_sent(
+                    len(batch), time.perf_counter() - started, e
+                )
+            if self.spool is not None:
+                self.spool.append(batch)
+            return
+        if self.instrumentation is not None:
+            self.instrumentation.reports_sent(
+                len(batch), time.perf_counter() - started, None
+            )
+
+        for result in response.results:
+            if result.status == "error":
+                print(f"Error reporting to OpenPipe: {result.error_message}")
+
+        # OpenPipe is reachable again, so send what was spooled during the outage
+        if self.spool is not None and self.spool.replay_due():
+            self._start_replay()
+
+    def _start_replay(self) -> None:
+        # Replayed from another thread so new reports aren't held up behind it
+        with self._lock:
+            if self._replay_thread is not None and self._replay_thread.is_alive():
+                return
+            self._replay_thread = threading.Thread(
+                target=self._replay, name="openpipe-report-replay", daemon=True
+            )
+            self._replay_thread.start()
+
+    def _replay(self) -> None:
+        try:
+            self.spool.replay(self.client)
+        except Exception as e:
+            print(f"Error replaying reports to OpenPipe: {e}")
+
+
+def get_report_queue(
+    client: OpenPipe,
+    *,
+    spool: Optional[Dict[str, Any]] = None,
+    instrumentation: Optional[Instrumentation] = None,
+    **options: Any,
+) -> ReportQueue:
+    """
+    Returns the process-wide `ReportQueue` for the base URL and API key of
+    `client`, creating it with `client` on first use. Wrappers created with the
+    same options share the queue and its worker thread, the way they share
+    connection pools, so apps creating a wrapper per request don't pile up
+    threads. Shared queues are closed when the interpreter exits.
+
+    Args:
+    - client (OpenPipe): The client reports are sent with if the queue is created.
+    - spool (dict | None): Arguments for the `ReportSpool` of the queue.
+    - instrumentation (Instrumentation | None): Passed to the queue.
+    - options: Other arguments for `ReportQueue`.
+    """
+    key = (
+        client.base_url,
+        client.api_key,
+        tuple(sorted((spool or {}).items())),
+        # The queue holds on to the instrumentation, so its id isn't reused
+        id(instrumentation),
+        tuple(sorted(options.items())),
+    )
+    with _shared_queues_lock:
+        report_queue = _shared_queues.get(key)
+        if report_queue is None:
+            report_queue = ReportQueue(
+                client,
+                spool=ReportSpool(**spool) if spool else None,
+                instrumentation=instrumentation,
+                **options,
+            )
+            _shared_queues[key] = report_queue
+    return report_queue
+
+
+class AsyncReportTasks:
+    """
+    Sends reports to OpenPipe as background tasks on the running event loop, so
+    that async completions don't wait on the reporting request. Tasks are tracked
+    until they finish so they can be awaited with `flush` before shutdown.
+
+    Args:
+    - client (AsyncOpenPipe): The client used to send reports.
+    - max_concurrency (int): Maximum number of reports sent at once.
+    - max_pending (int): Maximum number of reports waiting to be sent. Once
+      reached, the oldest waiting report is spooled, or dropped without a spool.
+    - spool (ReportSpool | None): Where reports that fail to send, or don't fit
+      in `max_pending`, are written so they can be sent later.
+    - instrumentation (Instrumentation | None): Told how long each report took
+      to send.
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenPipe,
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        spool: Optional[ReportSpool] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> None:
+        self.client = client
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_pending = max(1, max_pending)
+        self.spool = spool
+        self.instrumentation = instrumentation
+        self.dropped = 0
+
+        self._tasks: Set[asyncio.Task] = set()
+        self._replay_task: Optional[asyncio.Task] = None
+        # Semaphores are bound to the loop they are first used on
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # Tasks still waiting for a semaphore, oldest first, with their reports
+        self._waiting: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def schedule(
+        self, report: Dict[str, Any], on_encoded: Optional[OnReportEncoded] = None
+    ) -> asyncio.Task:
+        """
+        Starts sending a report in the background. Must be called from a coroutine.
+        `on_encoded` is called once the report was encoded to be sent, with the
+        seconds it took and its encoded size.
+        """
+        loop = asyncio.get_running_loop()
+        waiting = self._waiting.get(loop)
+        if waiting is None:
+            waiting = OrderedDict()
+            self._waiting[loop] = waiting
+        if len(waiting) >= self.max_pending:
+            oldest, oldest_report = waiting.popitem(last=False)
+            oldest.cancel()
+            if self.spool is not None:
+                self._track(loop.create_task(self._spool([oldest_report])))
+            else:
+                self.dropped += 1
+
+        task = loop.create_task(self._send(report, on_encoded))
+        waiting[task] = report
+        # In case the task is cancelled before it gets a semaphore
+        task.add_done_callback(lambda task: waiting.pop(task, None))
+        self._track(task)
+        return task
+
+    async def flush(self) -> None:
+        """Waits until every report scheduled on the current loop has been sent."""
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [task for task in self._tasks if task.get_loop() is loop]
+            if not pending:
+                return
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    def _track(self, task: asyncio.Task) -> None:
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _spool(self, reports: List[Dict[str, Any]]) -> None:
+        # Writing to disk would block the loop
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.spool.append, reports
+        )
+
+    async def _send(
+        self, report: Dict[str, Any], on_encoded: Optional[OnReportEncoded]
+    ) -> None:
+        async with self._semaphore():
+            self._waiting[asyncio.get_running_loop()].pop(asyncio.current_task(), None)
+            started = time.perf_counter()
+            try:
+                await self.client.report(**report, on_encoded=on_encoded)
+            except Exception as e:
+                # We don't want to break client apps if our API is down for some reason
+                print(f"Error reporting to OpenPipe: {e}")
+                if self.instrumentation is not None:
+                    self.instrumentation.reports_sent(
+                        1, time.perf_counter() - started, e
+                    )
+                if self.spool is not None:
+                    await self._spool([report])
+                return
+            if self.instrumentation is not None:
+                self.instrumentation.reports_sent(
+                    1, time.perf_counter() - started, None
+                )
+
+        # OpenPipe is reachable again, so send what was spooled during the outage
+        if self.spool is not None and self.spool.replay_due():
+            self._start_replay()
+
+    def _start_replay(self) -> None:
+        # Replayed as its own task so it doesn't take up a concurrency slot
+        if self._replay_task is not None and not self._replay_task.done():
+            return
+        self._replay_task = asyncio.get_running_loop().create_task(self._replay())
+        self._track(self._replay_task)
+
+    async def _replay(self) -> None:
+        try:
+            await self.spool.replay_async(self.client)
+        except Exception as e:
+            print(f"Error replaying reports to OpenPipe: {e}")
+
+
+def _flush_live_queues() -> None:
+    for report_queue in list(_live_queues):
+        report_queue.close(timeout=DEFAULT_EXIT_TIMEOUT)
+
+
+atexit.register(_flush_live_queues)
@@ -0,0 +1,360 @@
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .api_client.core.api_error import ApiError
+from .json_encoder import jsonable_encoder
+from .client import OpenPipe, AsyncOpenPipe, MAX_REPORT_BATCH_SIZE
+
+FSYNC_ALWAYS = "always"
+FSYNC_INTERVAL = "interval"
+FSYNC_NEVER = "never"
+
+# Segments are sealed and a new one started once they grow past this size
+DEFAULT_SEGMENT_MAX_BYTES = 16 * 1024 * 1024
+# Reports are dropped instead of spooled once the spool grows past this size
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+# With the "interval" policy, seconds between fsyncs of the active segment
+DEFAULT_FSYNC_INTERVAL = 1.0
+# Minimum seconds between checks of the spool directory for segments to replay
+DEFAULT_REPLAY_INTERVAL = 30.0
+
+# Subdirectory batches the API rejected are moved to, so they don't block replays
+DEAD_LETTER_DIRECTORY = "dead-letter"
+
+# 4xx responses that aren't about the batch (auth failures may be fixed by a new
+# API key), so its reports are kept for the next replay
+_TRANSIENT_CLIENT_ERRORS = {401, 403, 408, 429}
+
+_OPEN_SUFFIX = ".open"
+_SEALED_SUFFIX = ".jsonl"
+_CLAIMED_SUFFIX = ".claimed-"
+
+
+def _is_rejected(error: Exception) -> bool:
+    """Whether the API refused the batch itself, so sending it again would fail too."""
+    if not isinstance(error, ApiError) or error.status_code is None:
+        return False
+    return (
+        400 <= error.status_code < 500
+        and error.status_code not in _TRANSIENT_CLIENT_ERRORS
+    )
+
+
+def _pid_alive(pid: int) -> bool:
+    # Signal 0 means CTRL_C_EVENT on Windows, so assume the owner is alive there
+    if pid == os.getpid() or os.name == "nt":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class ReportSpool:
+    """
+    Write-ahead spool of reports that couldn't be sent to OpenPipe. Reports are
+    appended as JSON lines to segment files in `directory` and sent again in bulk
+    through `OpenPipe.report_batch` once OpenPipe is reachable. Batches the API
+    rejects with a 4xx error are moved to `directory/dead-letter` so they don't
+    hold up the rest. Several processes may share the same directory.
+
+    Args:
+    - directory (str): Directory the segment files are written to. Created if missing.
+    - fsync (str): "always" to fsync after every append, "interval" to fsync at
+      most every `fsync_interval` seconds, or "never" to leave it to the OS.
+    - fsync_interval (float): Seconds between fsyncs with the "interval" policy.
+    - segment_max_bytes (int): Size after which a segment is sealed and a new one started.
+    - max_bytes (int): Size after which new reports are dropped instead of spooled.
+    - replay_interval (float): Minimum seconds between automatic replays.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        fsync: str = FSYNC_INTERVAL,
+        fsync_interval: float = DEFAULT_FSYNC_INTERVAL,
+        segment_max_bytes: int = DEFAULT_SEGMENT_MAX_BYTES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        replay_interval: float = DEFAULT_REPLAY_INTERVAL,
+    ) -> None:
+        if fsync not in (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_NEVER):
+            raise ValueError(
+                f"fsync must be '{FSYNC_ALWAYS}', '{FSYNC_INTERVAL}' or '{FSYNC_NEVER}'"
+            )
+
+        self.directory = directory
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.segment_max_bytes = segment_max_bytes
+        self.max_bytes = max_bytes
+        self.replay_interval = replay_interval
+        self.dropped = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._replay_lock = threading.Lock()
+        self._file = None
+        self._path: Optional[str] = None
+        self._last_fsync = 0.0
+        # Check for segments left behind by earlier runs on the first replay
+        self._last_replay = 0.0
+        self._size = sum(size for _, size in self._segments())
+
+    def append(self, reports: List[Dict[str, Any]]) -> bool:
+        """Writes reports to the active segment. Returns False if they were dropped."""
+        lines = "".join(
+            json.dumps(jsonable_encoder(report), separators=(",", ":")) + "\n"
+            for report in reports
+        ).encode("utf-8")
+
+        with self._lock:
+            if self._size + len(lines) > self.max_bytes:
+                self.dropped += len(reports)
+                return False
+
+            if self._file is None:
+                self._open_segment()
+            self._file.write(lines)
+            self._file.flush()
+            self._size += len(lines)
+
+            now = time.monotonic()
+            if self.fsync == FSYNC_ALWAYS or (
+                self.fsync == FSYNC_INTERVAL
+                and now - self._last_fsync >= self.fsync_interval
+            ):
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+
+            if self._file.tell() >= self.segment_max_bytes:
+                self._seal_segment()
+        return True
+
+    def replay_due(self) -> bool:
+        """Whether an automatic replay should run now."""
+        return time.monotonic() - self._last_replay >= self.replay_interval
+
+    def replay(self, client: OpenPipe, batch_size: int = MAX_REPORT_BATCH_SIZE) -> int:
+        """
+        Sends every spooled report through `client.report_batch`, oldest first.
+        Stops at the first request that fails for a reason that may go away, and
+        keeps the unsent reports for later.
+
+        Returns:
+        - int: The number of reports that were sent.
+        """
+        if not self._replay_lock.acquire(blocking=False):
+            return 0
+        try:
+            self._last_replay = time.monotonic()
+            sent = 0
+            self._recover_segments()
+            while True:
+                path = self._claim_next_segment()
+                if path is None:
+                    return sent
+                reports = self._read_segment(path)
+                for start in range(0, len(reports), batch_size):
+                    batch = reports[start : start + batch_size]
+                    try:
+                        response = client.report_batch(batch)
+                    except Exception as e:
+                        if not self._handle_failure(path, reports, start, batch, e):
+                            return sent
+                        continue
+                    self._log_errors(response)
+                    sent += len(batch)
+                self._remove_segment(path)
+        finally:
+            self._replay_lock.release()
+
+    async def replay_async(
+        self, client: AsyncOpenPipe, batch_size: int = MAX_REPORT_BATCH_SIZE
+    ) -> int:
+        """
+        Same as `replay`, sending reports through `AsyncOpenPipe.report_batch`.
+        The spool files are read and written on the loop's default executor.
+        """
+        if not self._replay_lock.acquire(blocking=False):
+            return 0
+        loop = asyncio.get_running_loop()
+
+        def run(func, *args):
+            return loop.run_in_executor(None, functools.partial(func, *args))
+
+        try:
+            self._last_replay = time.monotonic()
+            sent = 0
+            await run(self._recover_segments)
+            while True:
+                path = await run(self._claim_next_segment)
+                if path is None:
+                    return sent
+                reports = await run(self._read_segment, path)
+                for start in range(0, len(reports), batch_size):
+                    batch = reports[start : start + batch_size]
+                    try:
+                        response = await client.report_batch(batch)
+                    except Exception as e:
+                        handled = await run(
+                            self._handle_failure, path, reports, start, batch, e
+                        )
+                        if not handled:
+                            return sent
+                        continue
+                    self._log_errors(response)
+                    sent += len(batch)
+                await run(self._remove_segment, path)
+        finally:
+            self._replay_lock.release()
+
+    def close(self) -> None:
+        """Seals the active segment so it can be replayed by any process."""
+        with self._lock:
+            self._seal_segment()
+
+    def __len__(self) -> int:
+        """Number of bytes currently spooled."""
+        return self._size
+
+    def _open_segment(self) -> None:
+        # Must be called with the lock held
+        name = f"{time.time_ns():020d}-{os.getpid()}"
+        self._path = os.path.join(self.directory, name + _OPEN_SUFFIX)
+        self._file = open(self._path, "ab")
+
+    def _seal_segment(self) -> None:
+        # Must be called with the lock held
+        if self._file is None:
+            return
+        if self.fsync != FSYNC_NEVER:
+            os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._path, self._path[: -len(_OPEN_SUFFIX)] + _SEALED_SUFFIX)
+        self._file = None
+        self._path = None
+
+    def _segments(self) -> Iterator[Tuple[str, int]]:
+        for entry in os.scandir(self.directory):
+            if entry.is_file():
+                yield entry.path, entry.stat().st_size
+
+    def _recover_segments(self) -> None:
+        with self._lock:
+            self._seal_segment()
+
+        # Recover segments from processes that exited without sealing or replaying them
+        for path, _ in list(self._segments()):
+            name = os.path.basename(path)
+            try:
+                if name.endswith(_OPEN_SUFFIX):
+                    pid = int(name[: -len(_OPEN_SUFFIX)].split("-")[1])
+                    if not _pid_alive(pid):
+                        os.replace(path, path[: -len(_OPEN_SUFFIX)] + _SEALED_SUFFIX)
+                elif _CLAIMED_SUFFIX in name:
+                    sealed, pid = path.split(_CLAIMED_SUFFIX)
+                    if not _pid_alive(int(pid)):
+                        os.replace(path, sealed)
+            except (ValueError, IndexError, FileNotFoundError):
+                continue
+
+    def _claim_next_segment(self) -> Optional[str]:
+        suffix = f"{_CLAIMED_SUFFIX}{os.getpid()}"
+        sealed = sorted(
+            path for path, _ in self._segments() if path.endswith(_SEALED_SUFFIX)
+        )
+        for path in sealed:
+            try:
+                # Renaming is atomic, so only one process can claim a segment
+                os.rename(path, path + suffix)
+            except FileNotFoundError:
+                continue
+            return path + suffix
+        return None
+
+    def _read_segment(self, path: str) -> List[Dict[str, Any]]:
+        reports = []
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    reports.append(json.loads(line))
+                except ValueError:
+                    # A partially written line from a crash; nothing to recover
+                    continue
+        return reports
+
+    def _release_segment(self, path: str, remaining: List[Dict[str, Any]]) -> None:
+        sealed = path.split(_CLAIMED_SUFFIX)[0]
+        tmp_path = sealed + ".tmp"
+        with open(tmp_path, "wb") as f:
+            for report in remaining:
+                f.write(json.dumps(report, separators=(",", ":")).encode("utf-8"))
+                f.write(b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, sealed)
+        removed = os.path.getsize(path) - os.path.getsize(sealed)
+        os.remove(path)
+        with self._lock:
+            self._size = max(0, self._size - removed)
+
+    def _handle_failure(
+        self,
+        path: str,
+        reports: List[Dict[str, Any]],
+        start: int,
+        batch: List[Dict[str, Any]],
+        error: Exception,
+    ) -> bool:
+        """
+        Deals with a batch that failed to replay. Returns True if the replay can
+        go on with the next batch.
+        """
+        if _is_rejected(error):
+            dead_letter_path = self._dead_letter(batch)
+            print(
+                f"OpenPipe rejected {len(batch)} spooled reports ({error}), "
+                f"moved them to {dead_letter_path}"
+            )
+            return True
+        print(f"Error replaying reports to OpenPipe: {error}")
+        self._release_segment(path, reports[start:])
+        return False
+
+    def _dead_letter(self, batch: List[Dict[str, Any]]) -> str:
+        directory = os.path.join(self.directory, DEAD_LETTER_DIRECTORY)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(
+            directory, f"{time.time_ns():020d}-{os.getpid()}{_SEALED_SUFFIX}"
+        )
+        with open(path, "wb") as f:
+            for report in batch:
+                f.write(json.dumps(report, separators=(",", ":")).encode("utf-8"))
+                f.write(b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return path
+
+    def _remove_segment(self, path: str) -> None:
+        size = os.path.getsize(path)
+        os.remove(path)
+        with self._lock:
+            self._size = max(0, self._size - size)
+
+    def _log_errors(self, response) -> None:
+        # Reports rejected by the API would be rejected again, so they aren't kept
+        for result in response.results:
+            if result.status == "error":
+                print(f"Error replaying report to OpenPipe: {result.error_message}")
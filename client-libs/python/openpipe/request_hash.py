@@ -0,0 +1,35 @@
+import hashlib
+import json
+from typing import Any, Dict
+
+# Arguments that change how a request is sent but not what it asks the model for
+_TRANSPORT_ARGS = {"extra_headers", "extra_query", "timeout"}
+
+
+def _default(obj: Any) -> Any:
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(exclude_unset=True)
+    if hasattr(obj, "dict"):
+        return obj.dict(exclude_unset=True)
+    if hasattr(obj, "__dict__"):
+        return vars(obj)
+    return str(obj)
+
+
+def canonical_request(create_kwargs: Dict[str, Any]) -> bytes:
+    """
+    Serializes the arguments of a `chat.completions.create` call so that
+    equivalent requests produce identical bytes, regardless of key order.
+    """
+    return json.dumps(
+        {k: v for k, v in create_kwargs.items() if k not in _TRANSPORT_ARGS},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_default,
+    ).encode("utf-8")
+
+
+def hash_request(create_kwargs: Dict[str, Any]) -> str:
+    """Returns a stable hex digest identifying a `chat.completions.create` call."""
+    return hashlib.sha256(canonical_request(create_kwargs)).hexdigest()
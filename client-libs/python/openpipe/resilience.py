@@ -0,0 +1,402 @@
+import asyncio
+import contextlib
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Deque, Dict, Iterator, Optional, Tuple
+
+import httpx
+
+# OpenPipe API methods, by the path of their endpoint. Chat completions aren't
+# included, since they're sent through the OpenAI client, which has its own
+# timeout and retries.
+API_METHOD_PATHS = {
+    "check_cache": "/check-cache",
+    "report": "/report",
+    "report_batch": "/report/batch",
+    "update_log_tags": "/logs/update-tags",
+    "update_log_tags_batch": "/logs/update-tags/batch",
+    "local_testing_only_get_latest_logged_call": "/local-testing-only-get-latest-logged-call",
+    "unstable_dataset_create": "/unstable/dataset/create",
+    "unstable_dataset_entry_create": "/unstable/dataset-entry/create",
+    "unstable_finetune_create": "/unstable/finetune/create",
+    "unstable_finetune_get": "/unstable/finetune/get",
+}
+# Seconds each method may take. Other methods keep the 240s timeout of the
+# generated client.
+DEFAULT_TIMEOUTS = {
+    "check_cache": 10.0,
+    "report": 10.0,
+    "report_batch": 30.0,
+    "update_log_tags": 60.0,
+    "update_log_tags_batch": 60.0,
+}
+# Connecting shouldn't take long even when a method is allowed to
+DEFAULT_CONNECT_TIMEOUT = 5.0
+
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_RETRY_BASE_DELAY = 0.5
+DEFAULT_RETRY_MAX_DELAY = 8.0
+
+DEFAULT_FAILURE_RATE_THRESHOLD = 0.5
+DEFAULT_MINIMUM_CALLS = 10
+DEFAULT_WINDOW = 30.0
+DEFAULT_COOLDOWN = 30.0
+
+# Methods that can be sent twice without side effects, so any failure is retried
+_IDEMPOTENT_METHODS = {
+    "check_cache",
+    "update_log_tags",
+    "update_log_tags_batch",
+    "local_testing_only_get_latest_logged_call",
+    "unstable_finetune_get",
+}
+_RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Failures where the server can't have received the request, so that other
+# methods can be retried without logging a call twice
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+_CIRCUIT_BREAKER_METHODS = {"report", "report_batch"}
+# Request extension marking requests whose caller retries them itself, so that
+# they're only sent once here rather than multiplying the attempts
+RETRIED_BY_CALLER = "openpipe_retried_by_caller"
+# Longest paths first, so that "/report/batch" isn't mistaken for "/report"
+_SORTED_METHOD_PATHS = sorted(
+    API_METHOD_PATHS.items(), key=lambda item: len(item[1]), reverse=True
+)
+
+_timeouts: Dict[str, float] = {}
+_max_retries = DEFAULT_MAX_RETRIES
+_retry_base_delay = DEFAULT_RETRY_BASE_DELAY
+_retry_max_delay = DEFAULT_RETRY_MAX_DELAY
+_circuit_breaker = True
+_failure_rate_threshold = DEFAULT_FAILURE_RATE_THRESHOLD
+_minimum_calls = DEFAULT_MINIMUM_CALLS
+_window = DEFAULT_WINDOW
+_cooldown = DEFAULT_COOLDOWN
+
+_lock = threading.Lock()
+# Circuit breakers for reports, by origin
+_breakers: Dict[str, "CircuitBreaker"] = {}
+# Timeout passed to the constructor of the OpenPipe client making the request
+_client_timeout: ContextVar[Optional[float]] = ContextVar(
+    "openpipe_client_timeout", default=None
+)
+
+
+def configure_request_resilience(
+    *,
+    timeouts: Optional[Dict[str, float]] = None,
+    max_retries: Optional[int] = None,
+    retry_base_delay: Optional[float] = None,
+    retry_max_delay: Optional[float] = None,
+    circuit_breaker: Optional[bool] = None,
+    failure_rate_threshold: Optional[float] = None,
+    minimum_calls: Optional[int] = None,
+    window: Optional[float] = None,
+    cooldown: Optional[float] = None,
+) -> None:
+    """
+    Configures the timeouts, retries and circuit breaker applied to requests sent
+    to the OpenPipe API by every client in the process.
+
+    Failed requests are retried with exponential backoff and full jitter.
+    Methods without side effects (e.g. `update_log_tags`) are retried after
+    timeouts, connection errors and 429 or 5xx responses. Other methods (e.g.
+    `report`) are only retried when the server can't have processed the
+    request: connection failures and 429 responses.
+
+    The circuit breaker stops reports from being sent for `cooldown` seconds once
+    at least `failure_rate_threshold` of the reports sent in the last `window`
+    seconds failed. A single report is then sent to probe whether OpenPipe has
+    recovered. Reports skipped while the circuit is open raise `CircuitOpenError`,
+    and are spooled or dropped like any other failed report.
+
+    Args:
+    - timeouts (Dict[str, float]): Seconds each method may take, by method name
+      (e.g. `{"report": 5}`). Takes precedence over the `timeout` of the client.
+    - max_retries (int): Retries after the first attempt. Set to 0 to disable retries.
+    - retry_base_delay (float): Maximum delay before the first retry, doubled for each one after.
+    - retry_max_delay (float): Maximum delay before any retry.
+    - circuit_breaker (bool): Whether to stop sending reports while OpenPipe is failing.
+    - failure_rate_threshold (float): Fraction of failed reports that opens the circuit.
+    - minimum_calls (int): Reports sent in the window before the circuit can open.
+    - window (float): Seconds of reports the failure rate is computed over.
+    - cooldown (float): Seconds the circuit stays open.
+    """
+    global _max_retries, _retry_base_delay, _retry_max_delay, _circuit_breaker
+    global _failure_rate_threshold, _minimum_calls, _window, _cooldown
+    if timeouts is not None:
+        unknown = set(timeouts) - set(API_METHOD_PATHS)
+        if unknown:
+            raise ValueError(f"Unknown OpenPipe API methods: {sorted(unknown)}")
+        _timeouts.update(timeouts)
+    if max_retries is not None:
+        _max_retries = max_retries
+    if retry_base_delay is not None:
+        _retry_base_delay = retry_base_delay
+    if retry_max_delay is not None:
+        _retry_max_delay = retry_max_delay
+    if circuit_breaker is not None:
+        _circuit_breaker = circuit_breaker
+    if failure_rate_threshold is not None:
+        _failure_rate_threshold = failure_rate_threshold
+    if minimum_calls is not None:
+        _minimum_calls = minimum_calls
+    if window is not None:
+        _window = window
+    if cooldown is not None:
+        _cooldown = cooldown
+    # Breakers are created again with the new settings
+    with _lock:
+        _breakers.clear()
+
+
+@contextlib.contextmanager
+def client_timeout(timeout: Optional[float]) -> Iterator[None]:
+    """Applies the timeout of an OpenPipe client to the requests sent within the block."""
+    token = _client_timeout.set(timeout)
+    try:
+        yield
+    finally:
+        _client_timeout.reset(token)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of sending a report while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Tracks the outcome of the requests sent in the last `window` seconds, and
+    opens once enough of them failed.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float,
+        minimum_calls: int,
+        window: float,
+        cooldown: float,
+    ) -> None:
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window = window
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """Whether a request may be sent. Lets a single probe through after the cooldown."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._probing = True
+            return True
+
+    def record(self, failed: bool) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._probing:
+                self._probing = False
+                self._opened_at = now if failed else None
+                return
+            if self._opened_at is not None:
+                # Sent before the circuit opened
+                return
+
+            self._outcomes.append((now, failed))
+            self._failures += failed
+            while self._outcomes and self._outcomes[0][0] < now - self.window:
+                self._failures -= self._outcomes.popleft()[1]
+
+            calls = len(self._outcomes)
+            if (
+                failed
+                and calls >= self.minimum_calls
+                and self._failures / calls >= self.failure_rate_threshold
+            ):
+                print(
+                    f"Pausing reports to OpenPipe for {self.cooldown:g}s after "
+                    f"{self._failures} of {calls} failed"
+                )
+                self._opened_at = now
+                self._outcomes.clear()
+                self._failures = 0
+
+
+def _api_method(request: httpx.Request) -> Optional[str]:
+    path = request.url.path.rstrip("/")
+    for method, method_path in _SORTED_METHOD_PATHS:
+        if path.endswith(method_path):
+            return method
+    return None
+
+
+def _get_breaker(request: httpx.Request) -> CircuitBreaker:
+    origin = f"{request.url.scheme}://{request.url.netloc.decode('ascii')}"
+    breaker = _breakers.get(origin)
+    if breaker is None:
+        with _lock:
+            breaker = _breakers.get(origin)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    _failure_rate_threshold, _minimum_calls, _window, _cooldown
+                )
+                _breakers[origin] = breaker
+    return breaker
+
+
+def _apply_timeout(request: httpx.Request, method: str) -> None:
+    timeout = _timeouts.get(method)
+    if timeout is None:
+        timeout = _client_timeout.get()
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUTS.get(method)
+    if timeout is None:
+        return
+    request.extensions["timeout"] = httpx.Timeout(
+        timeout, connect=min(timeout, DEFAULT_CONNECT_TIMEOUT)
+    ).as_dict()
+
+
+def _is_failure(response: Optional[httpx.Response]) -> bool:
+    return response is None or response.status_code in _RETRY_STATUS_CODES
+
+
+def _should_retry(
+    request: httpx.Request,
+    method: str,
+    response: Optional[httpx.Response],
+    error: Optional[Exception],
+) -> bool:
+    if isinstance(error, CircuitOpenError):
+        return False
+    if request.method in ("GET", "HEAD") or method in _IDEMPOTENT_METHODS:
+        return error is not None or response.status_code in _RETRY_STATUS_CODES
+    if error is not None:
+        return isinstance(error, UNSENT_ERRORS)
+    return response.status_code == 429
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+    delay = random.uniform(0, min(_retry_max_delay, _retry_base_delay * 2**attempt))
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after is not None:
+        try:
+            delay = max(delay, min(float(retry_after), _retry_max_delay))
+        except ValueError:
+            # An HTTP date, which isn't worth parsing for delays this short
+            pass
+    return delay
+
+
+class ResilientTransport(httpx.BaseTransport):
+    """
+    Wraps a transport, applying the configured timeouts, retries and circuit
+    breaker to requests sent to the OpenPipe API. Other requests are sent as is.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport) -> None:
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        method = _api_method(request)
+        if method is None:
+            return self._transport.handle_request(request)
+        _apply_timeout(request, method)
+        breaker = (
+            _get_breaker(request)
+            if _circuit_breaker and method in _CIRCUIT_BREAKER_METHODS
+            else None
+        )
+
+        max_retries = 0 if request.extensions.get(RETRIED_BY_CALLER) else _max_retries
+        attempt = 0
+        while True:
+            response, error = None, None
+            if breaker is not None and not breaker.allow():
+                raise CircuitOpenError(
+                    "Reports to OpenPipe are paused after repeated failures",
+                    request=request,
+                )
+            try:
+                response = self._transport.handle_request(request)
+            except Exception as e:
+                error = e
+            finally:
+                if breaker is not None:
+                    breaker.record(_is_failure(response))
+
+            if attempt >= max_retries or not _should_retry(
+                request, method, response, error
+            ):
+                if error is not None:
+                    raise error
+                return response
+            if response is not None:
+                response.close()
+            time.sleep(_retry_delay(attempt, response))
+            attempt += 1
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncResilientTransport(httpx.AsyncBaseTransport):
+    """Async version of `ResilientTransport`."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        method = _api_method(request)
+        if method is None:
+            return await self._transport.handle_async_request(request)
+        _apply_timeout(request, method)
+        breaker = (
+            _get_breaker(request)
+            if _circuit_breaker and method in _CIRCUIT_BREAKER_METHODS
+            else None
+        )
+
+        max_retries = 0 if request.extensions.get(RETRIED_BY_CALLER) else _max_retries
+        attempt = 0
+        while True:
+            response, error = None, None
+            if breaker is not None and not breaker.allow():
+                raise CircuitOpenError(
+                    "Reports to OpenPipe are paused after repeated failures",
+                    request=request,
+                )
+            try:
+                response = await self._transport.handle_async_request(request)
+            except Exception as e:
+                error = e
+            finally:
+                if breaker is not None:
+                    breaker.record(_is_failure(response))
+
+            if attempt >= max_retries or not _should_retry(
+                request, method, response, error
+            ):
+                if error is not None:
+                    raise error
+                return response
+            if response is not None:
+                await response.aclose()
+            await asyncio.sleep(_retry_delay(attempt, response))
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
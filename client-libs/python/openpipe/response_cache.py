@@ -0,0 +1,313 @@
+import abc
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, AsyncIterator, List, Optional, Tuple, Union
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from .request_hash import hash_request
+
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_SQLITE_MAX_ENTRIES = 100000
+
+# Arguments that change how the response is delivered but not its content
+_DELIVERY_ARGS = {"stream"}
+
+
+class ResponseCache(abc.ABC):
+    """
+    Stores chat completions by request so that repeated requests can be answered
+    without calling the model. Subclass and implement `get`, `set` and `clear`
+    to plug in another backend.
+
+    Args:
+    - ttl (float | None): Seconds an entry stays valid. None keeps entries until evicted.
+    - only_deterministic (bool): Only cache requests made with `temperature=0`.
+    """
+
+    def __init__(
+        self, *, ttl: Optional[float] = None, only_deterministic: bool = True
+    ) -> None:
+        self.ttl = ttl
+        self.only_deterministic = only_deterministic
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the completion JSON stored for `key`, if it hasn't expired."""
+
+    @abc.abstractmethod
+    def set(self, key: str, completion: Dict[str, Any]) -> None:
+        """Stores the completion JSON for `key`."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Removes every stored completion."""
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Same as `get`, but a failing backend is treated as a miss."""
+        try:
+            return self.get(key)
+        except Exception as e:
+            # A broken cache shouldn't break completions
+            print(f"Error reading from OpenPipe response cache: {e}")
+            return None
+
+    def store(self, key: str, completion: Dict[str, Any]) -> None:
+        """Same as `set`, but errors from the backend are ignored."""
+        try:
+            self.set(key, completion)
+        except Exception as e:
+            print(f"Error writing to OpenPipe response cache: {e}")
+
+    def is_cacheable(self, create_kwargs: Dict[str, Any]) -> bool:
+        if not self.only_deterministic:
+            return True
+        return create_kwargs.get("temperature") == 0
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+
+class InMemoryResponseCache(ResponseCache):
+    """
+    Least-recently-used cache held in memory.
+
+    Args:
+    - max_entries (int): Maximum number of completions stored.
+    - max_bytes (int | None): Maximum total size of the stored completions.
+    - ttl (float | None): Seconds an entry stays valid.
+    - only_deterministic (bool): Only cache requests made with `temperature=0`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        only_deterministic: bool = True,
+    ) -> None:
+        super().__init__(ttl=ttl, only_deterministic=only_deterministic)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        # key -> (stored_at, size, completion)
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._size = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry[0]):
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key: str, completion: Dict[str, Any]) -> None:
+        # Only measured when a size limit is set, since it means encoding the completion
+        size = len(json.dumps(completion)) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.time(), size, completion)
+            self._size += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._size > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        # Must be called with the lock held
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    Cache stored in a SQLite database, so that it's shared between processes
+    and survives restarts. Evicts the least recently used entries.
+
+    Args:
+    - path (str): Path of the database file.
+    - max_entries (int): Maximum number of completions stored.
+    - ttl (float | None): Seconds an entry stays valid.
+    - only_deterministic (bool): Only cache requests made with `temperature=0`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_entries: int = DEFAULT_SQLITE_MAX_ENTRIES,
+        ttl: Optional[float] = None,
+        only_deterministic: bool = True,
+    ) -> None:
+        super().__init__(ttl=ttl, only_deterministic=only_deterministic)
+        self.path = path
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, completion TEXT NOT NULL, "
+            "stored_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)"
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT completion, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self._expired(row[1]):
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._connection.execute(
+                "UPDATE responses SET used_at = ? WHERE key = ?", (time.time(), key)
+            )
+        return json.loads(row[0])
+
+    def set(self, key: str, completion: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, json.dumps(completion), now, now),
+            )
+            self._connection.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                "ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+def create_response_cache(
+    options: Union[ResponseCache, Dict[str, Any], None]
+) -> Optional[ResponseCache]:
+    """
+    Builds a cache from the "response_cache" key of the `openpipe` options.
+    Accepts a `ResponseCache` instance, or a dict with a "path" key for a SQLite
+    cache and the keyword arguments of the cache class.
+    """
+    if isinstance(options, ResponseCache):
+        return options
+    if not options:
+        return None
+
+    options = dict(options)
+    path = options.pop("path", None)
+    if path is not None:
+        return SQLiteResponseCache(path, **options)
+    return InMemoryResponseCache(**options)
+
+
+def get_cache_key(
+    create_kwargs: Dict[str, Any], base_url: Any, organization: Optional[str]
+) -> str:
+    # The same request sent to another endpoint or organization may be answered
+    # by a different model, so it gets its own entry. Streamed and non-streamed
+    # requests share entries.
+    return hash_request(
+        {
+            "base_url": str(base_url),
+            "organization": organization,
+            "request": hash_request(
+                {k: v for k, v in create_kwargs.items() if k not in _DELIVERY_ARGS}
+            ),
+        }
+    )
+
+
+def completion_from_cache(completion: Dict[str, Any]) -> ChatCompletion:
+    return ChatCompletion(**completion)
+
+
+def synthesize_chunks(completion: Dict[str, Any]) -> List[ChatCompletionChunk]:
+    """Rebuilds a stream of chunks equivalent to a cached completion."""
+    chunk_fields = {
+        "id": completion["id"],
+        "object": "chat.completion.chunk",
+        "created": completion["created"],
+        "model": completion["model"],
+    }
+    if completion.get("system_fingerprint") is not None:
+        chunk_fields["system_fingerprint"] = completion["system_fingerprint"]
+
+    chunks = []
+    for choice in completion["choices"]:
+        message = choice.get("message") or {}
+        delta: Dict[str, Any] = {
+            "role": message.get("role", "assistant"),
+            "content": message.get("content"),
+        }
+        if message.get("function_call"):
+            delta["function_call"] = message["function_call"]
+        if message.get("tool_calls"):
+            delta["tool_calls"] = [
+                {**tool_call, "index": i}
+                for i, tool_call in enumerate(message["tool_calls"])
+            ]
+
+        content_choice: Dict[str, Any] = {"index": choice["index"], "delta": delta}
+        if choice.get("logprobs"):
+            content_choice["logprobs"] = choice["logprobs"]
+        chunks.append(ChatCompletionChunk(**chunk_fields, choices=[content_choice]))
+        chunks.append(
+            ChatCompletionChunk(
+                **chunk_fields,
+                choices=[
+                    {
+                        "index": choice["index"],
+                        "delta": {},
+                        "finish_reason": choice.get("finish_reason"),
+                    }
+                ],
+            )
+        )
+    return chunks
+
+
+def replay_stream(completion: Dict[str, Any]) -> Iterator[ChatCompletionChunk]:
+    yield from synthesize_chunks(completion)
+
+
+async def replay_async_stream(
+    completion: Dict[str, Any]
+) -> AsyncIterator[ChatCompletionChunk]:
+    for chunk in synthesize_chunks(completion):
+        yield chunk
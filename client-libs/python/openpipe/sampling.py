@@ -0,0 +1,223 @@
+import atexit
+import hashlib
+import random
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .request_hash import canonical_request
+
+# Imported for its exit handler, which must be registered before ours
+from . import report_queue as _report_queue  # noqa: F401
+
+DEFAULT_SAMPLE_BY = "prompt_id"
+# Seconds covered by each reservoir before the sampled calls are reported
+DEFAULT_RESERVOIR_INTERVAL = 60.0
+# Seconds a request hash is remembered for deduplication
+DEFAULT_DEDUPE_WINDOW = 3600.0
+DEFAULT_DEDUPE_MAX_ENTRIES = 100000
+
+_live_policies: "weakref.WeakSet[SamplingPolicy]" = weakref.WeakSet()
+
+
+class _Reservoir:
+    __slots__ = ("started_at", "seen", "held")
+
+    def __init__(self, started_at: float) -> None:
+        self.started_at = started_at
+        self.seen = 0
+        self.held: List[Callable[[], None]] = []
+
+
+class SamplingPolicy:
+    """
+    Decides which calls are reported to OpenPipe. Request-level rules are checked
+    before the call is made, so calls that are sampled out are never serialized.
+
+    Args:
+    - rate (float): Fraction of calls reported when no prompt rate applies.
+    - prompt_rates (dict): Fraction of calls reported, by value of the `sample_by` tag.
+    - sample_by (str): Tag used to look up prompt rates and group reservoirs.
+    - reservoir_size (int | None): Report a uniform sample of at most this many
+      calls per `sample_by` tag value in each `reservoir_interval`. The sample is
+      reported from a timer thread when the interval ends.
+    - reservoir_interval (float): Seconds covered by each reservoir.
+    - dedupe (bool): Skip calls whose request is identical to one already reported.
+    - dedupe_window (float): Seconds a request is remembered for deduplication.
+    - dedupe_max_entries (int): Maximum number of requests remembered.
+    - max_payload_bytes (int | None): Skip calls whose request is larger than this.
+    - status_codes (list | None): Only report calls with these status codes.
+    - exclude_status_codes (list | None): Never report calls with these status codes.
+    - seed (int | None): Seed for the random number generator, for reproducible sampling.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float = 1.0,
+        prompt_rates: Optional[Dict[str, float]] = None,
+        sample_by: str = DEFAULT_SAMPLE_BY,
+        reservoir_size: Optional[int] = None,
+        reservoir_interval: float = DEFAULT_RESERVOIR_INTERVAL,
+        dedupe: bool = False,
+        dedupe_window: float = DEFAULT_DEDUPE_WINDOW,
+        dedupe_max_entries: int = DEFAULT_DEDUPE_MAX_ENTRIES,
+        max_payload_bytes: Optional[int] = None,
+        status_codes: Optional[Iterable[int]] = None,
+        exclude_status_codes: Optional[Iterable[int]] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.rate = rate
+        self.prompt_rates = dict(prompt_rates or {})
+        self.sample_by = sample_by
+        self.reservoir_size = reservoir_size
+        self.reservoir_interval = reservoir_interval
+        self.dedupe = dedupe
+        self.dedupe_window = dedupe_window
+        self.dedupe_max_entries = dedupe_max_entries
+        self.max_payload_bytes = max_payload_bytes
+        self.status_codes = set(status_codes) if status_codes is not None else None
+        self.exclude_status_codes = set(exclude_status_codes or ())
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._seen_requests: "OrderedDict[bytes, float]" = OrderedDict()
+        self._reservoirs: Dict[Any, _Reservoir] = {}
+        # Reports the oldest reservoir once its interval ends, so that quiet
+        # prompts don't hold their calls until the next one comes in
+        self._timer: Optional[threading.Timer] = None
+
+        _live_policies.add(self)
+
+    @classmethod
+    def from_options(
+        cls, options: Optional[Dict[str, Any]]
+    ) -> Optional["SamplingPolicy"]:
+        """Builds a policy from the "sampling" key of the `openpipe` options."""
+        if not options:
+            return None
+        return cls(**options)
+
+    def should_sample_request(
+        self, create_kwargs: Dict[str, Any], openpipe_options: Dict[str, Any]
+    ) -> bool:
+        """Applies the rules that only depend on the request. Call before the request is made."""
+        rate = self.prompt_rates.get(self._group(openpipe_options), self.rate)
+        if rate < 1 and self._random.random() >= rate:
+            return False
+
+        if not self.dedupe and self.max_payload_bytes is None:
+            return True
+
+        payload = canonical_request(create_kwargs)
+        if self.max_payload_bytes is not None and len(payload) > self.max_payload_bytes:
+            return False
+
+        if self.dedupe:
+            digest = hashlib.sha256(payload).digest()
+            now = time.monotonic()
+            with self._lock:
+                while self._seen_requests:
+                    oldest, seen_at = next(iter(self._seen_requests.items()))
+                    if now - seen_at < self.dedupe_window:
+                        break
+                    del self._seen_requests[oldest]
+
+                if digest in self._seen_requests:
+                    return False
+                self._seen_requests[digest] = now
+                if len(self._seen_requests) > self.dedupe_max_entries:
+                    self._seen_requests.popitem(last=False)
+        return True
+
+    def should_report_status(self, status_code: Optional[int]) -> bool:
+        """Applies the status code filters. Call once the response has arrived."""
+        if status_code in self.exclude_status_codes:
+            return False
+        return self.status_codes is None or status_code in self.status_codes
+
+    def offer(self, openpipe_options: Dict[str, Any], send: Callable[[], None]) -> None:
+        """
+        Reports a call that passed every other rule. `send` is called right away
+        unless a reservoir is configured, in which case it's held until the end of
+        the interval and only called if the call is part of the final sample.
+        """
+        if self.reservoir_size is None:
+            send()
+            return
+
+        group = self._group(openpipe_options)
+        now = time.monotonic()
+        with self._lock:
+            expired = self._take_expired(now)
+            reservoir = self._reservoirs.get(group)
+            if reservoir is None:
+                reservoir = _Reservoir(now)
+                self._reservoirs[group] = reservoir
+                self._schedule_timer()
+
+            # Algorithm R: every call seen in the interval is equally likely to be kept
+            reservoir.seen += 1
+            if len(reservoir.held) < self.reservoir_size:
+                reservoir.held.append(send)
+            else:
+                index = self._random.randrange(reservoir.seen)
+                if index < self.reservoir_size:
+                    reservoir.held[index] = send
+        self._send_all(expired)
+
+    def flush(self) -> None:
+        """Reports every call held in a reservoir, even if its interval hasn't ended."""
+        with self._lock:
+            held = [send for r in self._reservoirs.values() for send in r.held]
+            self._reservoirs.clear()
+        self._send_all(held)
+
+    def _group(self, openpipe_options: Dict[str, Any]) -> Any:
+        return (openpipe_options.get("tags") or {}).get(self.sample_by)
+
+    def _schedule_timer(self) -> None:
+        # Must be called with the lock held
+        if self._timer is not None or not self._reservoirs:
+            return
+        oldest = min(r.started_at for r in self._reservoirs.values())
+        delay = max(0.0, oldest + self.reservoir_interval - time.monotonic())
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            expired = self._take_expired(time.monotonic())
+            self._schedule_timer()
+        self._send_all(expired)
+
+    def _take_expired(self, now: float) -> List[Callable[[], None]]:
+        # Must be called with the lock held
+        expired = []
+        for group, reservoir in list(self._reservoirs.items()):
+            if now - reservoir.started_at >= self.reservoir_interval:
+                expired.extend(reservoir.held)
+                del self._reservoirs[group]
+        return expired
+
+    def _send_all(self, sends: List[Callable[[], None]]) -> None:
+        for send in sends:
+            try:
+                send()
+            except Exception as e:
+                # We don't want to break client apps if our API is down for some reason
+                print(f"Error reporting to OpenPipe: {e}")
+
+
+def _flush_live_policies() -> None:
+    for policy in list(_live_policies):
+        policy.flush()
+
+
+# Registered after the report queue's exit handler, so it runs first and the
+# held calls still make it into the queue before it's drained
+atexit.register(_flush_live_policies)
@@ -2,9 +2,18 @@ from openai import OpenAI, AsyncOpenAI
 from openai.types.chat import ChatCompletion
 import os
 import json
-from typing import Any, Dict, List, Union
+from typing import Any, Callable, Dict, List, Optional, Union
+import httpx
 
-from .client import OpenPipe, AsyncOpenPipe, add_sdk_info
+from .client import (
+    OpenPipe,
+    AsyncOpenPipe,
+    OnReportEncoded,
+    add_sdk_info,
+    DEFAULT_BASE_URL,
+)
+from .report_queue import ReportQueue, AsyncReportTasks
+from .report_spool import ReportSpool
 
 
 def configure_openpipe_clients(
@@ -30,6 +39,34 @@ def configure_openpipe_clients(
         completions_client.base_url = openpipe_options["base_url"]
 
 
+def get_openpipe_base_url(openpipe_options={}) -> str:
+    """Resolves the OpenPipe base URL the same way `configure_openpipe_clients` does."""
+    return (
+        (openpipe_options or {}).get("base_url")
+        or os.environ.get("OPENPIPE_BASE_URL")
+        or DEFAULT_BASE_URL
+    )
+
+
+def get_openai_base_url(base_url: Union[str, httpx.URL, None] = None) -> str:
+    """Resolves the OpenAI base URL the same way the OpenAI client does."""
+    return str(
+        base_url or os.environ.get("OPENAI_BASE_URL") or "https://api.openai.com/v1"
+    )
+
+
+def once(fn: Callable[[], Any]) -> Callable[[], Any]:
+    """Wraps a function so that it's only called once, returning the same result afterwards."""
+    result = []
+
+    def wrapper():
+        if not result:
+            result.append(fn())
+        return result[0]
+
+    return wrapper
+
+
 def get_extra_headers(create_kwargs, openpipe_options):
     extra_headers = create_kwargs.pop("extra_headers", {})
     # Default to true
@@ -52,6 +89,28 @@ def _get_tags(openpipe_options):
     return add_sdk_info(tags)
 
 
+def with_stream_stats(openpipe_options, stream_stats: Optional[Dict[str, Any]]):
+    """
+    Returns the options with the timings of a streamed completion (from
+    `ChatCompletionAccumulator.get_stream_stats`) added to its tags.
+    """
+    if stream_stats is None:
+        return openpipe_options
+
+    tags = {**(openpipe_options.get("tags") or {})}
+    for name in (
+        "first_chunk_at",
+        "time_to_first_chunk_ms",
+        "completion_tokens",
+        "tokens_per_second",
+    ):
+        if stream_stats[name] is not None:
+            tags[f"$stream.{name}"] = stream_stats[name]
+    for index, chunks in stream_stats["choice_chunks"].items():
+        tags[f"$stream.chunks.{index}"] = chunks
+    return {**openpipe_options, "tags": tags}
+
+
 def _should_log_request(
     configured_client: Union[OpenPipe, AsyncOpenPipe], openpipe_options={}
 ):
@@ -64,6 +123,8 @@ def _should_log_request(
 def report(
     configured_client: OpenPipe,
     openpipe_options={},
+    spool: Optional[ReportSpool] = None,
+    on_encoded: Optional[OnReportEncoded] = None,
     **kwargs,
 ):
     if not _should_log_request(configured_client, openpipe_options):
@@ -73,16 +134,57 @@ def report(
         configured_client.report(
             **kwargs,
             tags=_get_tags(openpipe_options),
+            on_encoded=on_encoded,
         )
     except Exception as e:
         # We don't want to break client apps if our API is down for some reason
         print(f"Error reporting to OpenPipe: {e}")
         print(e)
+        if spool is not None:
+            spool.append([{**kwargs, "tags": _get_tags(openpipe_options)}])
+
+
+def enqueue_report(
+    report_queue: ReportQueue,
+    openpipe_options={},
+    on_encoded: Optional[OnReportEncoded] = None,
+    **kwargs,
+):
+    if not _should_log_request(report_queue.client, openpipe_options):
+        return
+
+    report_queue.put(
+        {
+            **kwargs,
+            "tags": _get_tags(openpipe_options),
+        },
+        on_encoded,
+    )
+
+
+def schedule_report(
+    report_tasks: AsyncReportTasks,
+    openpipe_options={},
+    on_encoded: Optional[OnReportEncoded] = None,
+    **kwargs,
+):
+    if not _should_log_request(report_tasks.client, openpipe_options):
+        return
+
+    report_tasks.schedule(
+        {
+            **kwargs,
+            "tags": _get_tags(openpipe_options),
+        },
+        on_encoded,
+    )
 
 
 async def report_async(
     configured_client: AsyncOpenPipe,
     openpipe_options={},
+    spool: Optional[ReportSpool] = None,
+    on_encoded: Optional[OnReportEncoded] = None,
     **kwargs,
 ):
     if not _should_log_request(configured_client, openpipe_options):
@@ -92,11 +194,42 @@ async def report_async(
         await configured_client.report(
             **kwargs,
             tags=_get_tags(openpipe_options),
+            on_encoded=on_encoded,
         )
     except Exception as e:
         # We don't want to break client apps if our API is down for some reason
         print(f"Error reporting to OpenPipe: {e}")
         print(e)
+        if spool is not None:
+            spool.append([{**kwargs, "tags": _get_tags(openpipe_options)}])
+
+
+# Fields that are reported even when their value is None
+_INCLUDE_NULL_FIELDS = {"content"}
+
+
+def _serialize(data: Any) -> Any:
+    """
+    Converts objects into JSON-compatible values in a single pass.
+    Excludes fields with None values unless specified.
+    """
+    if isinstance(data, (str, int, float, bool)) or data is None:
+        return data
+
+    if isinstance(data, (list, tuple)):
+        return [_serialize(item) for item in data]
+
+    if isinstance(data, dict):
+        return {key: _serialize(value) for key, value in data.items()}
+
+    if hasattr(data, "__dict__"):
+        return {
+            key: _serialize(value)
+            for key, value in data.__dict__.items()
+            if value is not None or key in _INCLUDE_NULL_FIELDS
+        }
+
+    return data
 
 
 def get_chat_completion_json(completion: ChatCompletion) -> Dict:
@@ -110,33 +243,20 @@ def get_chat_completion_json(completion: ChatCompletion) -> Dict:
     Returns:
     - Dict: A JSON object representing the ChatCompletion object.
     """
+    if not hasattr(completion, "model_dump") or not isinstance(
+        getattr(completion, "choices", None), list
+    ):
+        return _serialize(completion)
 
-    include_null_fields = {
-        "content"
-    }  # Set of fields to include even if they have None value
-
-    def serialize(data: Any) -> Union[Dict, List]:
-        """
-        Custom serializer function for objects, arrays, and other types.
-        Excludes fields with None values unless specified.
-        """
-        if isinstance(data, list) or isinstance(data, tuple):
-            # Recursively process each element in the list or tuple
-            return [serialize(item) for item in data]
-
-        if hasattr(data, "__dict__"):
-            # Otherwise, use the __dict__ method to get attributes
-            data = data.__dict__
-            # Filter out None values, except for specified fields
-            return {
-                key: serialize(value)
-                if isinstance(value, (list, tuple, Dict))
-                else value
-                for key, value in data.items()
-                if value is not None or key in include_null_fields
-            }
-
-        return data
+    # Fast path for pydantic v2: let pydantic dump the whole object natively,
+    # then restore the null fields that exclude_none removed.
+    completion_json = completion.model_dump(exclude_none=True)
+    for choice, choice_json in zip(completion.choices, completion_json["choices"]):
+        message = getattr(choice, "message", None)
+        if message is not None and message.content is None:
+            choice_json["message"]["content"] = None
+        logprobs = getattr(choice, "logprobs", None)
+        if logprobs is not None and logprobs.content is None:
+            choice_json["logprobs"]["content"] = None
 
-    # Serialize the object and then load it back as a dictionary
-    return json.loads(json.dumps(completion, default=serialize, indent=4))
+    return completion_json
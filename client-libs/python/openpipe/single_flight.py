@@ -0,0 +1,161 @@
+import asyncio
+import copy
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .request_hash import hash_request
+
+
+def _copy_result(result: Any) -> Any:
+    # Each follower gets its own copy, so that changes one caller makes to its
+    # completion aren't seen by the others
+    if hasattr(result, "model_copy"):
+        return result.model_copy(deep=True)
+    return copy.deepcopy(result)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class Flight:
+    """
+    A caller's handle on a call shared by identical concurrent requests. The
+    first caller (the leader) makes the call; the others wait for its result.
+    """
+
+    def __init__(self, owner: "SingleFlight", key: str, call: _Call, leader: bool):
+        self.leader = leader
+        self._owner = owner
+        self._key = key
+        self._call = call
+
+    def run(self, fn: Callable[[], Any]) -> Any:
+        call = self._call
+        if not self.leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return _copy_result(call.result)
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            self._owner._finish(self._key)
+            call.done.set()
+
+
+class AsyncFlight:
+    """Async version of `Flight`, shared by coroutines running on the same loop."""
+
+    def __init__(
+        self, owner: "SingleFlight", key: str, future: asyncio.Future, leader: bool
+    ):
+        self.leader = leader
+        self._owner = owner
+        self._key = key
+        self._future = future
+
+    async def run(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if self.leader:
+            # Run the call in its own task, so that cancelling the leader
+            # doesn't cancel the call the other callers are waiting on
+            task = asyncio.ensure_future(fn())
+            task.add_done_callback(self._resolve)
+        result = await asyncio.shield(self._future)
+        return result if self.leader else _copy_result(result)
+
+    def _resolve(self, task: asyncio.Future) -> None:
+        self._owner._finish_async(self._key)
+        if task.cancelled():
+            self._future.cancel()
+        elif task.exception() is not None:
+            self._future.set_exception(task.exception())
+        else:
+            self._future.set_result(task.result())
+        # Keep asyncio from warning about an unretrieved exception when every
+        # caller was cancelled before the call finished
+        self._future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+
+class SingleFlight:
+    """
+    Makes concurrent identical requests share one upstream call. Requests are
+    identical when their arguments serialize to the same canonical JSON.
+    Streaming requests are never shared.
+
+    Args:
+    - only_deterministic (bool): Only share requests made with `temperature=0`,
+      since other requests are expected to return different completions.
+    """
+
+    def __init__(self, *, only_deterministic: bool = True) -> None:
+        self.only_deterministic = only_deterministic
+
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        # Futures belong to a loop, so coroutines only share calls within one
+        self._futures: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @classmethod
+    def from_options(cls, options: Any) -> Optional["SingleFlight"]:
+        """Builds a SingleFlight from the "single_flight" key of the `openpipe` options."""
+        if not options:
+            return None
+        if options is True:
+            return cls()
+        return cls(**options)
+
+    def is_eligible(self, create_kwargs: Dict[str, Any]) -> bool:
+        if create_kwargs.get("stream"):
+            return False
+        return not self.only_deterministic or create_kwargs.get("temperature") == 0
+
+    def join(self, create_kwargs: Dict[str, Any]) -> Flight:
+        """Joins the call for an identical request in progress, or starts one."""
+        key = hash_request(create_kwargs)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+        return Flight(self, key, call, leader)
+
+    def join_async(self, create_kwargs: Dict[str, Any]) -> AsyncFlight:
+        """Async version of `join`. Must be called from a coroutine."""
+        key = hash_request(create_kwargs)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            futures = self._futures.get(loop)
+            if futures is None:
+                futures = {}
+                self._futures[loop] = futures
+            future = futures.get(key)
+            leader = future is None
+            if leader:
+                future = loop.create_future()
+                futures[key] = future
+        return AsyncFlight(self, key, future, leader)
+
+    def _finish(self, key: str) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def _finish_async(self, key: str) -> None:
+        with self._lock:
+            futures = self._futures.get(asyncio.get_running_loop())
+            if futures is not None:
+                futures.pop(key, None)
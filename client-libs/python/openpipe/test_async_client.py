@@ -41,6 +41,7 @@ async def test_async_content():
     if not TEST_LAST_LOGGED:
         return
 
+    await client.flush()
     await asyncio.sleep(0.1)
     last_logged = (
         await client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
@@ -62,6 +63,7 @@ async def test_async_content_mistral():
     if not TEST_LAST_LOGGED:
         return
 
+    await client.flush()
     await asyncio.sleep(0.1)
     last_logged = (
         await client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
@@ -85,6 +87,7 @@ async def test_async_function_call():
     if not TEST_LAST_LOGGED:
         return
 
+    await client.flush()
     await asyncio.sleep(0.1)
     last_logged = (
         await client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
@@ -116,6 +119,7 @@ async def test_async_function_call_mistral():
     if not TEST_LAST_LOGGED:
         return
 
+    await client.flush()
     await asyncio.sleep(0.1)
     last_logged = (
         await client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
@@ -152,6 +156,7 @@ async def test_async_tool_calls():
     if not TEST_LAST_LOGGED:
         return
 
+    await client.flush()
     await asyncio.sleep(0.1)
     last_logged = (
         await client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
@@ -190,6 +195,7 @@ async def test_async_tool_calls_mistral():
     if not TEST_LAST_LOGGED:
         return
 
+    await client.flush()
     await asyncio.sleep(0.1)
     last_logged = (
         await client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
@@ -225,6 +231,7 @@ async def test_async_streaming_content():
     if not TEST_LAST_LOGGED:
         return
 
+    await client.flush()
     await asyncio.sleep(0.1)
     last_logged = (
         await client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
@@ -250,6 +257,7 @@ async def test_async_streaming_content_ft_35():
     if not TEST_LAST_LOGGED:
         return
 
+    await client.flush()
     await asyncio.sleep(0.1)
     last_logged = (
         await client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
@@ -278,6 +286,7 @@ async def test_async_streaming_content_ft_35_base_sdk():
     if not TEST_LAST_LOGGED:
         return
 
+    await client.flush()
     await asyncio.sleep(0.1)
     last_logged = (
         await client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
@@ -305,6 +314,7 @@ async def test_async_streaming_function_call():
     if not TEST_LAST_LOGGED:
         return
 
+    await client.flush()
     await asyncio.sleep(0.1)
     last_logged = (
         await client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
@@ -346,6 +356,7 @@ async def test_async_streaming_tool_calls():
     if not TEST_LAST_LOGGED:
         return
 
+    await client.flush()
     await asyncio.sleep(0.1)
     last_logged = (
         await client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
@@ -368,6 +379,7 @@ async def test_async_with_tags():
     if not TEST_LAST_LOGGED:
         return
 
+    await client.flush()
     await asyncio.sleep(0.1)
     last_logged = (
         await client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
@@ -398,6 +410,7 @@ async def test_async_caching():
     if not TEST_LAST_LOGGED:
         return
 
+    await client.flush()
     await asyncio.sleep(0.1)
     last_logged = (
         await client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
@@ -451,6 +464,7 @@ async def test_async_bad_openai_call():
     if not TEST_LAST_LOGGED:
         return
 
+    await client.flush()
     await asyncio.sleep(0.1)
     last_logged = (
         await client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
@@ -477,6 +491,7 @@ async def test_async_bad_openpipe_call():
     if not TEST_LAST_LOGGED:
         return
 
+    await client.flush()
     await asyncio.sleep(0.1)
     last_logged = (
         await client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
@@ -508,6 +523,7 @@ async def test_async_bad_openai_call_base_sdk():
     if not TEST_LAST_LOGGED:
         return
 
+    await client.flush()
     await asyncio.sleep(0.1)
     last_logged = (
         await client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
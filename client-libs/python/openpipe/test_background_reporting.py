@@ -0,0 +1,153 @@
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+
+from . import OpenAI, AsyncOpenAI
+
+completion_payload = {
+    "id": "chatcmpl-123",
+    "object": "chat.completion",
+    "created": 1704449593,
+    "model": "gpt-3.5-turbo-0613",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": "1, 2, 3"},
+            "finish_reason": "stop",
+        }
+    ],
+    "usage": {"prompt_tokens": 11, "completion_tokens": 8, "total_tokens": 19},
+}
+
+
+def openai_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=completion_payload)
+
+
+def slow_report_handler(reported):
+    def handler(request: httpx.Request) -> httpx.Response:
+        time.sleep(0.3)
+        body = json.loads(request.content)
+        reported.extend(body["calls"])
+        return httpx.Response(
+            200,
+            json={
+                "results": [
+                    {"index": i, "status": "ok"} for i in range(len(body["calls"]))
+                ]
+            },
+        )
+
+    return handler
+
+
+def async_slow_report_handler(reported):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.3)
+        reported.append(json.loads(request.content))
+        return httpx.Response(200, json={"status": "ok"})
+
+    return handler
+
+
+def test_sync_wrapper_reports_in_background():
+    reported = []
+    client = OpenAI(
+        api_key="test-key",
+        base_url="https://openai.test/v1",
+        http_client=httpx.Client(transport=httpx.MockTransport(openai_handler)),
+        openpipe={"api_key": "test-key", "base_url": "https://openpipe.test/api/v1"},
+    )
+    client.openpipe_reporting_client.base_client._client_wrapper.httpx_client = (
+        httpx.Client(transport=httpx.MockTransport(slow_report_handler(reported)))
+    )
+
+    start = time.monotonic()
+    completion = client.chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=[{"role": "system", "content": "count to 3"}],
+        openpipe={"tags": {"prompt_id": "background"}},
+    )
+    assert time.monotonic() - start < 0.3
+    assert completion.choices[0].message.content == "1, 2, 3"
+
+    assert client.flush(timeout=5)
+    assert len(reported) == 1
+    assert reported[0]["reqPayload"]["messages"][0]["content"] == "count to 3"
+    assert reported[0]["respPayload"]["choices"][0]["message"]["content"] == "1, 2, 3"
+    assert reported[0]["tags"]["prompt_id"] == "background"
+
+
+def test_sync_wrappers_share_a_report_queue():
+    reported = []
+
+    def make_client(api_key="test-key"):
+        return OpenAI(
+            api_key="test-key",
+            base_url="https://openai.test/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(openai_handler)),
+            openpipe={"api_key": api_key, "base_url": "https://shared.test/api/v1"},
+        )
+
+    def report_handler(request: httpx.Request) -> httpx.Response:
+        calls = json.loads(request.content)["calls"]
+        reported.extend(calls)
+        return httpx.Response(
+            200,
+            json={"results": [{"index": i, "status": "ok"} for i in range(len(calls))]},
+        )
+
+    threads_before = set(threading.enumerate())
+    first = make_client()
+    first.openpipe_reporting_client.base_client._client_wrapper.httpx_client = (
+        httpx.Client(transport=httpx.MockTransport(report_handler))
+    )
+    # Like an app creating a client for each request
+    for _ in range(20):
+        client = make_client()
+        assert client.openpipe_report_queue is first.openpipe_report_queue
+        assert client.openpipe_reporting_client is first.openpipe_reporting_client
+        client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "system", "content": "count to 3"}],
+        )
+        client.close()
+
+    assert len(reported) == 20
+    threads = set(threading.enumerate()) - threads_before
+    assert len([t for t in threads if t.name == "openpipe-report-queue"]) <= 1
+    other_key = make_client(api_key="other-key")
+    assert other_key.openpipe_report_queue is not first.openpipe_report_queue
+
+
+async def test_async_wrapper_reports_in_background():
+    reported = []
+    client = AsyncOpenAI(
+        api_key="test-key",
+        base_url="https://openai.test/v1",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(openai_handler)),
+        openpipe={"api_key": "test-key", "base_url": "https://openpipe.test/api/v1"},
+    )
+    client.openpipe_reporting_client.base_client._client_wrapper.httpx_client = (
+        httpx.AsyncClient(
+            transport=httpx.MockTransport(async_slow_report_handler(reported))
+        )
+    )
+
+    start = time.monotonic()
+    completion = await client.chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=[{"role": "system", "content": "count to 3"}],
+        openpipe={"tags": {"prompt_id": "background"}},
+    )
+    assert time.monotonic() - start < 0.3
+    assert completion.choices[0].message.content == "1, 2, 3"
+    assert reported == []
+
+    await client.aclose()
+    assert len(reported) == 1
+    assert reported[0]["respPayload"]["choices"][0]["message"]["content"] == "1, 2, 3"
+    assert reported[0]["tags"]["prompt_id"] == "background"
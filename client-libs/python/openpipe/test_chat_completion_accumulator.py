@@ -0,0 +1,245 @@
+from functools import reduce
+
+from openai.types.chat import ChatCompletionChunk
+from openai.types import CompletionUsage
+
+from .merge_openai_chunks import ChatCompletionAccumulator, merge_openai_chunks
+from .shared import get_chat_completion_json
+
+
+def make_chunk(choices):
+    return ChatCompletionChunk(
+        id="chatcmpl-123",
+        object="chat.completion.chunk",
+        created=1704449593,
+        model="gpt-3.5-turbo-0613",
+        choices=choices,
+    )
+
+
+def content_chunks(index, parts):
+    chunks = [
+        make_chunk([{"index": index, "delta": {"role": "assistant", "content": ""}}])
+    ]
+    for part in parts:
+        chunks.append(make_chunk([{"index": index, "delta": {"content": part}}]))
+    chunks.append(make_chunk([{"index": index, "delta": {}, "finish_reason": "stop"}]))
+    return chunks
+
+
+def accumulate(chunks):
+    accumulator = ChatCompletionAccumulator()
+    for chunk in chunks:
+        accumulator.add(chunk)
+    return accumulator.get_completion()
+
+
+def test_no_chunks():
+    assert ChatCompletionAccumulator().get_completion() is None
+
+
+def test_matches_merge_openai_chunks_for_content():
+    chunks = content_chunks(0, ["1", ", ", "2", ", ", "3"])
+
+    completion = accumulate(chunks)
+    merged = reduce(merge_openai_chunks, chunks, None)
+
+    assert completion.model_dump() == merged.model_dump()
+    assert completion.choices[0].message.content == "1, 2, 3"
+    assert completion.choices[0].finish_reason == "stop"
+
+
+def test_interleaved_choices():
+    first = content_chunks(0, ["a", "b", "c"])
+    second = content_chunks(1, ["x", "y"])
+    chunks = [chunk for pair in zip(first, second) for chunk in pair]
+    chunks += first[len(second) :]
+
+    completion = accumulate(chunks)
+
+    assert [c.index for c in completion.choices] == [0, 1]
+    assert completion.choices[0].message.content == "abc"
+    assert completion.choices[1].message.content == "xy"
+
+
+def test_parallel_tool_calls():
+    chunks = [
+        make_chunk([{"index": 0, "delta": {"role": "assistant", "content": None}}]),
+        make_chunk(
+            [
+                {
+                    "index": 0,
+                    "delta": {
+                        "tool_calls": [
+                            {
+                                "index": 0,
+                                "id": "call_1",
+                                "type": "function",
+                                "function": {"name": "get_weather", "arguments": ""},
+                            },
+                            {
+                                "index": 1,
+                                "id": "call_2",
+                                "type": "function",
+                                "function": {"name": "get_time", "arguments": ""},
+                            },
+                        ]
+                    },
+                }
+            ]
+        ),
+        make_chunk(
+            [
+                {
+                    "index": 0,
+                    "delta": {
+                        "tool_calls": [
+                            {"index": 1, "function": {"arguments": '{"tz": '}},
+                            {"index": 0, "function": {"arguments": '{"city": '}},
+                        ]
+                    },
+                }
+            ]
+        ),
+        make_chunk(
+            [
+                {
+                    "index": 0,
+                    "delta": {
+                        "tool_calls": [
+                            {"index": 0, "function": {"arguments": '"Paris"}'}},
+                            {"index": 1, "function": {"arguments": '"UTC"}'}},
+                        ]
+                    },
+                }
+            ]
+        ),
+        make_chunk([{"index": 0, "delta": {}, "finish_reason": "tool_calls"}]),
+    ]
+
+    completion = accumulate(chunks)
+    message = completion.choices[0].message
+
+    assert message.content is None
+    assert completion.choices[0].finish_reason == "tool_calls"
+    assert [t.id for t in message.tool_calls] == ["call_1", "call_2"]
+    assert message.tool_calls[0].function.name == "get_weather"
+    assert message.tool_calls[0].function.arguments == '{"city": "Paris"}'
+    assert message.tool_calls[1].function.name == "get_time"
+    assert message.tool_calls[1].function.arguments == '{"tz": "UTC"}'
+
+
+def test_function_call():
+    chunks = [
+        make_chunk(
+            [
+                {
+                    "index": 0,
+                    "delta": {
+                        "role": "assistant",
+                        "function_call": {"name": "get_weather", "arguments": ""},
+                    },
+                }
+            ]
+        ),
+        make_chunk(
+            [{"index": 0, "delta": {"function_call": {"arguments": '{"city": '}}}]
+        ),
+        make_chunk(
+            [{"index": 0, "delta": {"function_call": {"arguments": '"Paris"}'}}}]
+        ),
+        make_chunk([{"index": 0, "delta": {}, "finish_reason": "function_call"}]),
+    ]
+
+    completion = accumulate(chunks)
+    function_call = completion.choices[0].message.function_call
+
+    assert function_call.name == "get_weather"
+    assert function_call.arguments == '{"city": "Paris"}'
+
+
+def test_completion_json_matches_serialized_completion():
+    chunks = content_chunks(0, ["1", ", ", "2"]) + content_chunks(1, ["a"])
+    chunks[1] = make_chunk(
+        [
+            {
+                "index": 0,
+                "delta": {"content": "1"},
+                "logprobs": {
+                    "content": [
+                        {
+                            "token": "1",
+                            "logprob": -0.1,
+                            "bytes": [49],
+                            "top_logprobs": [],
+                        }
+                    ]
+                },
+            }
+        ]
+    )
+    accumulator = ChatCompletionAccumulator()
+    for chunk in chunks:
+        accumulator.add(chunk)
+
+    completion_json = accumulator.get_completion_json()
+
+    assert completion_json == get_chat_completion_json(accumulator.get_completion())
+    assert completion_json["choices"][0]["logprobs"]["content"][0]["token"] == "1"
+
+
+def test_completion_json_keeps_null_content():
+    chunks = [
+        make_chunk([{"index": 0, "delta": {"role": "assistant"}}]),
+        make_chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}]),
+    ]
+
+    accumulator = ChatCompletionAccumulator()
+    for chunk in chunks:
+        accumulator.add(chunk)
+
+    assert accumulator.get_completion_json()["choices"][0]["message"] == {
+        "content": None,
+        "role": "assistant",
+    }
+
+
+def test_completion_json_includes_usage():
+    chunks = content_chunks(0, ["hi"])
+    usage_chunk = make_chunk([])
+    # Chunks only carry usage in newer versions of the openai package
+    object.__setattr__(
+        usage_chunk,
+        "usage",
+        CompletionUsage(prompt_tokens=5, completion_tokens=1, total_tokens=6),
+    )
+    accumulator = ChatCompletionAccumulator()
+    for chunk in chunks + [usage_chunk]:
+        accumulator.add(chunk)
+
+    assert accumulator.get_completion_json()["usage"] == {
+        "prompt_tokens": 5,
+        "completion_tokens": 1,
+        "total_tokens": 6,
+    }
+    assert accumulator.get_completion().usage.total_tokens == 6
+
+
+def test_stream_stats():
+    chunks = content_chunks(0, ["1", ", 2", ", 3"]) + content_chunks(1, ["1"])
+    accumulator = ChatCompletionAccumulator()
+    assert accumulator.get_stream_stats(0, 0) is None
+    for chunk in chunks:
+        accumulator.add(chunk)
+
+    first_chunk_at = accumulator.first_chunk_at
+    stats = accumulator.get_stream_stats(first_chunk_at - 300, first_chunk_at + 2000)
+
+    assert stats == {
+        "first_chunk_at": first_chunk_at,
+        "time_to_first_chunk_ms": 300,
+        "choice_chunks": {0: 5, 1: 3},
+        "completion_tokens": 4,
+        "tokens_per_second": 2.0,
+    }
+    assert accumulator.get_stream_stats(0, first_chunk_at)["tokens_per_second"] is None
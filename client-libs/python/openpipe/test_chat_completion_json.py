@@ -0,0 +1,73 @@
+from openai.types.chat import ChatCompletion
+
+from .shared import get_chat_completion_json
+
+
+def make_completion(message, **choice_fields):
+    return ChatCompletion(
+        id="chatcmpl-123",
+        object="chat.completion",
+        created=1704449593,
+        model="gpt-3.5-turbo-0613",
+        choices=[
+            {"index": 0, "finish_reason": "stop", "message": message, **choice_fields}
+        ],
+    )
+
+
+def test_omits_none_fields():
+    completion = make_completion({"role": "assistant", "content": "1, 2, 3"})
+
+    assert get_chat_completion_json(completion) == {
+        "id": "chatcmpl-123",
+        "object": "chat.completion",
+        "created": 1704449593,
+        "model": "gpt-3.5-turbo-0613",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": "1, 2, 3"},
+            }
+        ],
+    }
+
+
+def test_keeps_null_content():
+    completion = make_completion(
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": "call_1",
+                    "type": "function",
+                    "function": {"name": "get_weather", "arguments": "{}"},
+                }
+            ],
+        },
+        logprobs={"content": None},
+    )
+
+    choice = get_chat_completion_json(completion)["choices"][0]
+
+    assert choice["message"]["content"] is None
+    assert choice["message"]["tool_calls"][0]["function"]["name"] == "get_weather"
+    assert "function_call" not in choice["message"]
+    assert choice["logprobs"] == {"content": None}
+
+
+def test_none_completion():
+    assert get_chat_completion_json(None) is None
+
+
+def test_plain_objects():
+    class Message:
+        def __init__(self):
+            self.role = "assistant"
+            self.content = None
+            self.name = None
+
+    assert get_chat_completion_json({"choices": [Message()]}) == {
+        "choices": [{"role": "assistant", "content": None}]
+    }
@@ -0,0 +1,159 @@
+import gzip
+import json
+
+import httpx
+import pytest
+
+from . import OpenPipe, AsyncOpenPipe
+from . import compression
+from .compression import CompressingTransport, AsyncCompressingTransport
+from .report_queue import ReportQueue
+
+long_completion = {"choices": [{"message": {"content": "1, 2, 3. " * 500}}]}
+
+
+class StandInServer:
+    """Mimics the OpenPipe API's handling of compressed request bodies."""
+
+    def __init__(self, accepted="gzip, deflate"):
+        self.accepted = accepted
+        self.requests = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        headers = {"Accept-Encoding": self.accepted} if self.accepted else {}
+        encoding = request.headers.get("content-encoding")
+        body = request.read()
+        if encoding is not None:
+            if not self.accepted or encoding not in self.accepted:
+                return httpx.Response(415, headers=headers)
+            body = gzip.decompress(body)
+
+        body = json.loads(body)
+        self.requests.append((encoding, body))
+        if "calls" in body:
+            results = [{"index": i, "status": "ok"} for i in range(len(body["calls"]))]
+            return httpx.Response(200, headers=headers, json={"results": results})
+        return httpx.Response(
+            200, headers=headers, json={"status": "ok", "matchedLogs": 1}
+        )
+
+
+@pytest.fixture(autouse=True)
+def reset_negotiation():
+    compression._accepted_encodings.clear()
+    yield
+    compression._accepted_encodings.clear()
+
+
+def sync_client(server, base_url="https://compression.test/api/v1"):
+    client = OpenPipe(api_key="test-key", base_url=base_url)
+    client.base_client._client_wrapper.httpx_client = httpx.Client(
+        transport=CompressingTransport(httpx.MockTransport(server.handle))
+    )
+    return client
+
+
+def report(client):
+    return client.report(
+        requested_at=1,
+        received_at=2,
+        req_payload={},
+        resp_payload=long_completion,
+        status_code=200,
+    )
+
+
+def test_compresses_once_server_accepts_gzip():
+    server = StandInServer()
+    client = sync_client(server)
+
+    report(client)
+    report(client)
+
+    assert [encoding for encoding, _ in server.requests] == [None, "gzip"]
+    assert server.requests[1][1]["respPayload"] == long_completion
+
+
+def test_compresses_queued_report_batches():
+    server = StandInServer()
+    report_queue = ReportQueue(sync_client(server))
+
+    for _ in range(2):
+        report_queue.put(
+            {
+                "requested_at": 1,
+                "received_at": 2,
+                "req_payload": {},
+                "resp_payload": long_completion,
+                "status_code": 200,
+            }
+        )
+        assert report_queue.flush(timeout=5)
+
+    assert [encoding for encoding, _ in server.requests] == [None, "gzip"]
+    assert server.requests[1][1]["calls"][0]["respPayload"] == long_completion
+
+
+def test_never_compresses_without_server_support():
+    server = StandInServer(accepted=None)
+    client = sync_client(server)
+
+    report(client)
+    report(client)
+
+    assert [encoding for encoding, _ in server.requests] == [None, None]
+
+
+def test_falls_back_when_server_rejects_encoding():
+    server = StandInServer()
+    client = sync_client(server)
+    report(client)
+
+    server.accepted = None
+    report(client)
+    report(client)
+
+    assert [encoding for encoding, _ in server.requests] == [None, None, None]
+
+
+def test_small_bodies_are_not_compressed():
+    server = StandInServer()
+    client = sync_client(server)
+
+    client.update_log_tags(filters=[], tags={"a": "b"})
+    client.update_log_tags(filters=[], tags={"a": "b"})
+
+    assert [encoding for encoding, _ in server.requests] == [None, None]
+
+
+def test_compression_can_be_disabled():
+    server = StandInServer()
+    client = sync_client(server)
+    report(client)
+
+    compression.configure_request_compression(enabled=False)
+    try:
+        report(client)
+    finally:
+        compression.configure_request_compression(enabled=True)
+
+    assert [encoding for encoding, _ in server.requests] == [None, None]
+
+
+async def test_async_compression():
+    server = StandInServer()
+    client = AsyncOpenPipe(api_key="test-key", base_url="https://compression.test")
+    client.base_client._client_wrapper.httpx_client = httpx.AsyncClient(
+        transport=AsyncCompressingTransport(httpx.MockTransport(server.handle))
+    )
+
+    for _ in range(2):
+        await client.report(
+            requested_at=1,
+            received_at=2,
+            req_payload={},
+            resp_payload=long_completion,
+            status_code=200,
+        )
+
+    assert [encoding for encoding, _ in server.requests] == [None, "gzip"]
@@ -0,0 +1,322 @@
+import json
+import os
+import threading
+
+import httpx
+import pytest
+
+from . import dataset_upload, resilience
+from .client import OpenPipe, AsyncOpenPipe
+from .dataset_upload import DatasetUploadError, _Batch, _UploadState
+from .resilience import ResilientTransport
+
+
+def make_entry(i, content="hi"):
+    return {
+        "messages": [
+            {"role": "user", "content": f"{content} {i}"},
+            {"role": "assistant", "content": "hello"},
+        ]
+    }
+
+
+def upload_handler(requests, fail_on=None, status_code=400):
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        with lock:
+            requests.append(body)
+        contents = [e["messages"][0]["content"] for e in body["entries"]]
+        if fail_on is not None and fail_on in contents:
+            return httpx.Response(status_code, json={"message": "failed"})
+        # Entries with "bad" in their content are rejected
+        errors = [
+            {"index": i, "message": "invalid entry"}
+            for i, content in enumerate(contents)
+            if "bad" in content
+        ]
+        return httpx.Response(
+            200,
+            json={"createdEntries": len(contents) - len(errors), "errors": errors},
+        )
+
+    return handler
+
+
+def make_client(handler):
+    op_client = OpenPipe(api_key="test-key", base_url="https://openpipe.test/api/v1")
+    op_client.base_client._client_wrapper.httpx_client = httpx.Client(
+        transport=httpx.MockTransport(handler)
+    )
+    return op_client
+
+
+def write_jsonl(path, entries):
+    with open(path, "w") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+        f.write("\n")
+
+
+def test_uploads_jsonl_file_in_batches(tmp_path):
+    path = tmp_path / "entries.jsonl"
+    write_jsonl(
+        path, [make_entry(i, "bad" if i in (5, 130) else "hi") for i in range(250)]
+    )
+    requests = []
+    progress = []
+    op_client = make_client(upload_handler(requests))
+
+    resp = op_client.upload_dataset_entries(
+        "archive-1",
+        str(path),
+        max_parallelism=1,
+        on_progress=lambda uploaded, created: progress.append((uploaded, created)),
+    )
+
+    assert [len(r["entries"]) for r in requests] == [100, 100, 50]
+    assert all(r["archiveId"] == "archive-1" for r in requests)
+    assert requests[2]["entries"][-1] == make_entry(249)
+    assert resp.created_entries == 248
+    assert [(e.index, e.message) for e in resp.errors] == [
+        (5, "invalid entry"),
+        (130, "invalid entry"),
+    ]
+    assert progress == [(100, 99), (200, 198), (250, 248)]
+
+
+def test_splits_batches_by_size():
+    requests = []
+    op_client = make_client(upload_handler(requests))
+
+    resp = op_client.upload_dataset_entries(
+        "archive-1",
+        (make_entry(i, "x" * 10000) for i in range(50)),
+        max_batch_bytes=64 * 1024,
+    )
+
+    assert resp.created_entries == 50
+    assert len(requests) > 1
+    assert all(len(json.dumps(r)) < 64 * 1024 for r in requests)
+
+
+def test_resumes_from_last_acknowledged_batch(tmp_path):
+    path = tmp_path / "entries.jsonl"
+    checkpoint_path = str(tmp_path / "upload.checkpoint")
+    write_jsonl(path, [make_entry(i) for i in range(350)])
+
+    requests = []
+    op_client = make_client(upload_handler(requests, fail_on="hi 250"))
+    with pytest.raises(DatasetUploadError) as e:
+        op_client.upload_dataset_entries(
+            "archive-1", path, checkpoint_path=checkpoint_path, max_parallelism=1
+        )
+    assert e.value.acknowledged == 200
+    assert os.path.exists(checkpoint_path)
+
+    requests = []
+    op_client = make_client(upload_handler(requests))
+    resp = op_client.upload_dataset_entries(
+        "archive-1", path, checkpoint_path=checkpoint_path
+    )
+
+    assert sorted(r["entries"][0]["messages"][0]["content"] for r in requests) == [
+        "hi 200",
+        "hi 300",
+    ]
+    assert resp.created_entries == 350
+    assert not os.path.exists(checkpoint_path)
+
+
+def test_resumes_generators_by_skipping_entries(tmp_path):
+    checkpoint_path = str(tmp_path / "upload.checkpoint")
+
+    requests = []
+    op_client = make_client(upload_handler(requests, fail_on="hi 120"))
+    with pytest.raises(DatasetUploadError):
+        op_client.upload_dataset_entries(
+            "archive-1",
+            (make_entry(i) for i in range(150)),
+            checkpoint_path=checkpoint_path,
+            max_parallelism=1,
+        )
+
+    requests = []
+    op_client = make_client(upload_handler(requests))
+    resp = op_client.upload_dataset_entries(
+        "archive-1",
+        (make_entry(i) for i in range(150)),
+        checkpoint_path=checkpoint_path,
+    )
+
+    assert [len(r["entries"]) for r in requests] == [50]
+    assert requests[0]["entries"][0] == make_entry(100)
+    assert resp.created_entries == 150
+
+
+def test_rejects_checkpoint_of_another_archive(tmp_path):
+    checkpoint_path = str(tmp_path / "upload.checkpoint")
+    state = _UploadState("archive-1", checkpoint_path)
+    state.acknowledge(_Batch(0, 1, None, b""), {"createdEntries": 1, "errors": []})
+
+    with pytest.raises(ValueError):
+        _UploadState("archive-2", checkpoint_path)
+
+
+def test_checkpoint_records_batches_finished_out_of_order(tmp_path):
+    checkpoint_path = str(tmp_path / "upload.checkpoint")
+    state = _UploadState("archive-1", checkpoint_path)
+
+    state.acknowledge(
+        _Batch(100, 100, 2000, b""), {"createdEntries": 100, "errors": []}
+    )
+    assert state.acknowledged == 0
+    with open(checkpoint_path) as f:
+        checkpoint = json.load(f)
+    assert checkpoint["acknowledged"] == 0
+    assert checkpoint["finished"] == [[100, 200, 2000]]
+    assert checkpoint["created_entries"] == 100
+
+    state.acknowledge(_Batch(0, 100, 1000, b""), {"createdEntries": 100, "errors": []})
+    assert state.acknowledged == 200
+    with open(checkpoint_path) as f:
+        checkpoint = json.load(f)
+    assert checkpoint["acknowledged"] == 200
+    assert checkpoint["offset"] == 2000
+    assert checkpoint["finished"] == []
+    assert checkpoint["created_entries"] == 200
+
+
+def test_resume_skips_batches_finished_out_of_order(tmp_path):
+    path = tmp_path / "entries.jsonl"
+    checkpoint_path = str(tmp_path / "upload.checkpoint")
+    write_jsonl(
+        path, [make_entry(i, "bad" if i in (50, 150) else "hi") for i in range(200)]
+    )
+
+    # The first batch fails once the second one has been acknowledged
+    second_acknowledged = threading.Event()
+    requests = []
+    ok_handler = upload_handler(requests)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if b'"hi 0"' in request.content:
+            second_acknowledged.wait(5)
+            return httpx.Response(503, json={"message": "unavailable"})
+        return ok_handler(request)
+
+    def on_progress(uploaded, created):
+        if created:
+            second_acknowledged.set()
+
+    with pytest.raises(DatasetUploadError) as e:
+        make_client(handler).upload_dataset_entries(
+            "archive-1",
+            path,
+            checkpoint_path=checkpoint_path,
+            max_parallelism=2,
+            on_progress=on_progress,
+        )
+    assert e.value.acknowledged == 0
+
+    requests = []
+    resp = make_client(upload_handler(requests)).upload_dataset_entries(
+        "archive-1", path, checkpoint_path=checkpoint_path, max_parallelism=1
+    )
+
+    # Only the entries that weren't created are sent again
+    assert [len(r["entries"]) for r in requests] == [100]
+    assert requests[0]["entries"][0] == make_entry(0)
+    assert resp.created_entries == 198
+    assert [e.index for e in resp.errors] == [50, 150]
+
+
+def test_retries_rate_limits_and_connection_failures(monkeypatch):
+    monkeypatch.setattr(dataset_upload, "_RETRY_BASE_DELAY", 0)
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("connection refused", request=request)
+        if len(attempts) == 2:
+            return httpx.Response(429, json={"message": "slow down"})
+        return httpx.Response(200, json={"createdEntries": 1, "errors": []})
+
+    resp = make_client(handler).upload_dataset_entries("archive-1", [make_entry(0)])
+
+    assert len(attempts) == 3
+    assert resp.created_entries == 1
+
+
+@pytest.mark.parametrize(
+    "failure",
+    [
+        httpx.Response(503, json={"message": "unavailable"}),
+        httpx.ReadTimeout("timed out"),
+    ],
+)
+def test_does_not_retry_failures_after_the_request_was_sent(monkeypatch, failure):
+    # The server may have created the entries before failing
+    monkeypatch.setattr(dataset_upload, "_RETRY_BASE_DELAY", 0)
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if isinstance(failure, Exception):
+            raise failure
+        return failure
+
+    with pytest.raises(DatasetUploadError):
+        make_client(handler).upload_dataset_entries("archive-1", [make_entry(0)])
+
+    assert len(attempts) == 1
+
+
+def test_retries_are_not_multiplied_by_the_transport(monkeypatch):
+    monkeypatch.setattr(dataset_upload, "_RETRY_BASE_DELAY", 0)
+    monkeypatch.setattr(resilience, "_retry_base_delay", 0)
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    op_client = OpenPipe(api_key="test-key", base_url="https://openpipe.test/api/v1")
+    op_client.base_client._client_wrapper.httpx_client = httpx.Client(
+        transport=ResilientTransport(httpx.MockTransport(handler))
+    )
+
+    with pytest.raises(DatasetUploadError):
+        op_client.upload_dataset_entries("archive-1", [make_entry(0)], max_attempts=2)
+
+    assert len(attempts) == 2
+
+
+def test_does_not_retry_client_errors():
+    requests = []
+    op_client = make_client(upload_handler(requests, fail_on="hi 0"))
+
+    with pytest.raises(DatasetUploadError) as e:
+        op_client.upload_dataset_entries("archive-1", [make_entry(0)])
+
+    assert len(requests) == 1
+    assert e.value.acknowledged == 0
+
+
+async def test_async_upload_dataset_entries(tmp_path):
+    path = tmp_path / "entries.jsonl"
+    write_jsonl(path, [make_entry(i) for i in range(250)])
+    requests = []
+    op_client = AsyncOpenPipe(
+        api_key="test-key", base_url="https://openpipe.test/api/v1"
+    )
+    op_client.base_client._client_wrapper.httpx_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(upload_handler(requests))
+    )
+
+    resp = await op_client.upload_dataset_entries("archive-1", path)
+
+    assert sorted(len(r["entries"]) for r in requests) == [50, 100, 100]
+    assert resp.created_entries == 250
@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+import httpx
+
+from . import OpenAI, AsyncOpenAI, OpenPipe, AsyncOpenPipe
+from .compression import CompressingTransport
+from .http_clients import (
+    get_http_client,
+    get_async_http_client,
+    get_openai_http_client,
+    _get_loop_client,
+    DEFAULT_OPENAI_MAX_CONNECTIONS,
+)
+from .resilience import ResilientTransport
+
+
+def test_clients_are_shared_per_origin():
+    assert get_http_client("https://app.openpipe.ai/api/v1") is get_http_client(
+        "https://app.openpipe.ai/other"
+    )
+    assert get_http_client("https://app.openpipe.ai/api/v1") is not get_http_client(
+        "https://api.openai.com/v1"
+    )
+
+
+def test_wrappers_share_pools():
+    first = OpenAI(api_key="test-key", openpipe={"api_key": "test-key"})
+    second = OpenAI(api_key="test-key", openpipe={"api_key": "test-key"})
+    op_client = OpenPipe(api_key="test-key")
+
+    assert first._client is second._client
+    assert first._client is get_openai_http_client("https://api.openai.com/v1")
+    assert (
+        first.openpipe_completions_client._client
+        is second.openpipe_completions_client._client
+    )
+    # Completions don't go through the pool used to call the OpenPipe API
+    assert (
+        first.openpipe_completions_client._client
+        is not op_client.base_client._client_wrapper.httpx_client
+    )
+
+    # Closing one client must not close the shared pool
+    first.close()
+    assert not second.is_closed()
+
+
+def test_openai_pools_use_plain_transport():
+    openai_transport = get_openai_http_client("https://api.openai.com/v1")._transport
+    openpipe_transport = get_http_client("https://app.openpipe.ai/api/v1")._transport
+
+    assert isinstance(openai_transport, httpx.HTTPTransport)
+    assert openai_transport._pool._max_connections == DEFAULT_OPENAI_MAX_CONNECTIONS
+    assert isinstance(openpipe_transport, ResilientTransport)
+    assert isinstance(openpipe_transport._transport, CompressingTransport)
+
+
+async def test_async_openai_pools_use_plain_transport():
+    openai_client = _get_loop_client(("https://api.openai.com", True))
+    openpipe_client = _get_loop_client(("https://app.openpipe.ai", False))
+
+    assert isinstance(openai_client._transport, httpx.AsyncHTTPTransport)
+    assert not isinstance(openpipe_client._transport, httpx.AsyncHTTPTransport)
+
+
+def test_base_url_change_switches_pool():
+    op_client = OpenPipe(api_key="test-key")
+    op_client.base_url = "http://localhost:3000/api/v1"
+
+    assert op_client.base_client._client_wrapper.httpx_client is get_http_client(
+        "http://localhost:3000"
+    )
+
+
+def test_provided_http_client_is_used():
+    http_client = httpx.Client()
+    client = OpenAI(api_key="test-key", http_client=http_client)
+
+    assert client._client is http_client
+    assert client.openpipe_completions_client._client is http_client
+
+
+async def test_async_requests_use_pool_of_running_loop():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"status": "ok"})
+
+    op_client = AsyncOpenPipe(api_key="test-key", base_url="https://pool.test/api/v1")
+    assert op_client.base_client._client_wrapper.httpx_client is get_async_http_client(
+        "https://pool.test"
+    )
+
+    # Swap the transport of this loop's pool to observe the request
+    loop_client = _get_loop_client(("https://pool.test", False))
+    loop_client._transport = httpx.MockTransport(handler)
+
+    await op_client.report(status_code=200, tags={"prompt_id": "pool"})
+
+    assert len(requests) == 1
+    assert json.loads(requests[0].content)["tags"]["prompt_id"] == "pool"
+
+
+def test_async_pools_are_per_loop():
+    async def get_loop_client():
+        return _get_loop_client(("https://api.openai.com", True))
+
+    first = asyncio.run(get_loop_client())
+    second = asyncio.run(get_loop_client())
+
+    assert first is not second
+    assert (
+        AsyncOpenAI(api_key="test-key")._client
+        is AsyncOpenAI(api_key="test-key")._client
+    )
@@ -0,0 +1,56 @@
+import subprocess
+import sys
+
+import openai
+
+import openpipe
+from .client import add_sdk_info
+
+
+def run_python(code):
+    return subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout.split()
+
+
+def test_client_import_is_lazy():
+    loaded = run_python(
+        "import sys\n"
+        "from openpipe import OpenPipe\n"
+        "print('openai' in sys.modules)\n"
+        "print('openpipe.api_client.types.create_chat_completion_response' in sys.modules)\n"
+    )
+
+    assert loaded == ["False", "False"]
+
+
+def test_generated_client_is_lazy():
+    # Fern generates eager imports, which scripts/lazy_api_client.py rewrites.
+    # This fails if the client was regenerated without running it.
+    loaded = run_python(
+        "import sys\n"
+        "def loaded(prefix):\n"
+        "    return any(m.startswith(prefix) for m in sys.modules)\n"
+        "import openpipe.api_client\n"
+        "print(loaded('openpipe.api_client.types.'))\n"
+        "import openpipe.api_client.client\n"
+        "print(loaded('openpipe.api_client.types.create_chat_completion'))\n"
+        "from openpipe.api_client import CreateChatCompletionResponse\n"
+        "print(loaded('openpipe.api_client.types.create_chat_completion'))\n"
+    )
+
+    assert loaded == ["False", "False", "True"]
+
+
+def test_reexports_openai():
+    assert openpipe.OpenAIError is openai.OpenAIError
+    assert openpipe.OpenAI is not openai.OpenAI
+    assert {"OpenAI", "OpenPipe", "OpenAIError"} <= set(openpipe.__all__)
+    assert "OpenPipe" in dir(openpipe)
+
+
+def test_adds_sdk_info():
+    tags = add_sdk_info({"prompt_id": "counting"})
+
+    assert tags["$sdk"] == "python"
+    assert tags["$sdk.version"] == add_sdk_info({})["$sdk.version"]
@@ -0,0 +1,316 @@
+import json
+
+import httpx
+import pytest
+
+from . import OpenAI, AsyncOpenAI, OpenAIError
+from .instrumentation import (
+    Instrumentation,
+    OpenTelemetryInstrumentation,
+    CALL_SPAN_NAME,
+    REPORT_SPAN_NAME,
+)
+
+completion_payload = {
+    "id": "chatcmpl-123",
+    "object": "chat.completion",
+    "created": 1704449593,
+    "model": "gpt-3.5-turbo-0613",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": "positive"},
+            "finish_reason": "stop",
+        }
+    ],
+}
+
+request = {
+    "model": "gpt-3.5-turbo",
+    "messages": [{"role": "system", "content": "classify: this is good"}],
+}
+
+
+def stream_body():
+    chunks = []
+    for content in ["1", ", 2", ", 3"]:
+        chunk = {
+            "id": "chatcmpl-123",
+            "object": "chat.completion.chunk",
+            "created": 1704449593,
+            "model": "gpt-3.5-turbo-0613",
+            "choices": [{"index": 0, "delta": {"content": content}}],
+        }
+        chunks.append(f"data: {json.dumps(chunk)}\n\n")
+    chunks.append("data: [DONE]\n\n")
+    return "".join(chunks).encode()
+
+
+def openai_handler(request: httpx.Request) -> httpx.Response:
+    if json.loads(request.content).get("stream"):
+        return httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, content=stream_body()
+        )
+    return httpx.Response(200, json=completion_payload)
+
+
+def report_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200, json={"status": "ok", "results": [{"index": 0, "status": "ok"}]}
+    )
+
+
+class RecordingInstrumentation(Instrumentation):
+    def __init__(self):
+        self.events = []
+        self.calls = []
+        self.report_bytes = []
+        self.batches = []
+
+    def call_started(self, call):
+        self.events.append("call_started")
+
+    def upstream_responded(self, call):
+        self.events.append("upstream_responded")
+
+    def chunk_received(self, call, gap):
+        self.events.append("chunk_received")
+
+    def payload_serialized(self, call, seconds, report_bytes):
+        self.events.append("payload_serialized")
+        self.report_bytes.append(report_bytes)
+
+    def report_enqueued(self, call, seconds):
+        self.events.append("report_enqueued")
+
+    def call_finished(self, call):
+        self.events.append("call_finished")
+        self.calls.append(call)
+
+    def reports_sent(self, count, seconds, error):
+        self.batches.append((count, error))
+
+
+def make_client(instrumentation, handler=openai_handler, reported=None, **openpipe):
+    client = OpenAI(
+        api_key="test-key",
+        base_url="https://openai.test/v1",
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        openpipe={
+            "api_key": "test-key",
+            "instrumentation": instrumentation,
+            **openpipe,
+        },
+    )
+
+    def recording_handler(request: httpx.Request) -> httpx.Response:
+        if reported is not None:
+            if request.url.path.endswith("/batch"):
+                reported.extend(json.loads(request.content)["calls"])
+            else:
+                reported.append(json.loads(request.content))
+        return report_handler(request)
+
+    client.openpipe_reporting_client.base_client._client_wrapper.httpx_client = (
+        httpx.Client(transport=httpx.MockTransport(recording_handler))
+    )
+    return client
+
+
+def test_sync_hooks():
+    instrumentation = RecordingInstrumentation()
+    reported = []
+    client = make_client(instrumentation, reported=reported)
+
+    client.chat.completions.create(**request)
+    assert client.flush(timeout=5)
+
+    # Reports are encoded on the background thread sending them
+    assert instrumentation.events == [
+        "call_started",
+        "upstream_responded",
+        "report_enqueued",
+        "call_finished",
+        "payload_serialized",
+    ]
+    assert instrumentation.report_bytes == [len(json.dumps(reported[0]))]
+    call = instrumentation.calls[0]
+    assert call.model == "gpt-3.5-turbo"
+    assert call.status_code == 200
+    assert 0 < call.upstream_latency <= call.duration
+    assert instrumentation.batches == [(1, None)]
+
+
+def test_sync_hooks_without_background_reporting():
+    instrumentation = RecordingInstrumentation()
+    reported = []
+    client = make_client(instrumentation, reported=reported, background_reporting=False)
+
+    client.chat.completions.create(**request)
+
+    assert instrumentation.events == [
+        "call_started",
+        "upstream_responded",
+        "payload_serialized",
+        "report_enqueued",
+        "call_finished",
+    ]
+    assert instrumentation.report_bytes == [len(json.dumps(reported[0]))]
+    assert reported[0]["respPayload"]["choices"] == completion_payload["choices"]
+
+
+def test_sync_stream_hooks():
+    instrumentation = RecordingInstrumentation()
+    client = make_client(instrumentation)
+
+    stream = client.chat.completions.create(**request, stream=True)
+    assert instrumentation.events == ["call_started", "upstream_responded"]
+    streamed = "".join(chunk.choices[0].delta.content for chunk in stream)
+
+    assert streamed == "1, 2, 3"
+    assert instrumentation.events.count("chunk_received") == 3
+    assert instrumentation.events[-1] == "call_finished"
+    call = instrumentation.calls[0]
+    assert call.stream and call.chunks == 3
+    assert call.upstream_latency <= call.time_to_first_chunk <= call.duration
+    assert call.max_chunk_gap is not None
+
+
+def test_sync_stream_stats_are_reported():
+    instrumentation = RecordingInstrumentation()
+    reported = []
+    client = make_client(instrumentation, reported=reported)
+
+    for _ in client.chat.completions.create(**request, stream=True):
+        pass
+    assert client.flush(timeout=5)
+
+    stats = instrumentation.calls[0].stream_stats
+    assert stats["choice_chunks"] == {0: 3}
+    assert stats["completion_tokens"] == 3
+    tags = reported[0]["tags"]
+    # Tag values are sent as strings
+    assert tags["$stream.first_chunk_at"] == str(stats["first_chunk_at"])
+    assert tags["$stream.completion_tokens"] == "3"
+    assert tags["$stream.chunks.0"] == "3"
+    assert "$stream.time_to_first_chunk_ms" in tags
+    assert tags["$sdk"] == "python"
+
+
+def test_sync_stream_closed_early():
+    instrumentation = RecordingInstrumentation()
+    client = make_client(instrumentation)
+
+    stream = client.chat.completions.create(**request, stream=True)
+    next(stream)
+    stream.close()
+
+    assert instrumentation.events[-1] == "call_finished"
+    assert instrumentation.calls[0].status_code is None
+
+
+async def test_async_error_hooks():
+    instrumentation = RecordingInstrumentation()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(400, json={"error": {"message": "bad request"}})
+
+    client = AsyncOpenAI(
+        api_key="test-key",
+        base_url="https://openai.test/v1",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        openpipe={"api_key": "test-key", "instrumentation": instrumentation},
+    )
+    client.openpipe_reporting_client.base_client._client_wrapper.httpx_client = (
+        httpx.AsyncClient(transport=httpx.MockTransport(report_handler))
+    )
+
+    with pytest.raises(OpenAIError):
+        await client.chat.completions.create(**request)
+    await client.flush()
+
+    call = instrumentation.calls[0]
+    assert call.status_code == 400
+    assert isinstance(call.error, OpenAIError)
+    assert call.upstream_latency is None
+    assert instrumentation.batches == [(1, None)]
+
+
+class FakeSpan:
+    def __init__(self, name, attributes, start_time=None):
+        self.name = name
+        self.attributes = dict(attributes)
+        self.events = []
+        self.exceptions = []
+        self.ended = False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes):
+        self.attributes.update(attributes)
+
+    def add_event(self, name):
+        self.events.append(name)
+
+    def record_exception(self, error):
+        self.exceptions.append(error)
+
+    def set_status(self, status):
+        pass
+
+    def end(self, end_time=None):
+        self.ended = True
+
+
+class FakeTracer:
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, attributes=None, start_time=None):
+        span = FakeSpan(name, attributes or {}, start_time)
+        self.spans.append(span)
+        return span
+
+
+def test_opentelemetry_spans():
+    tracer = FakeTracer()
+    client = make_client(OpenTelemetryInstrumentation(tracer))
+
+    for _ in client.chat.completions.create(**request, stream=True):
+        pass
+    assert client.flush(timeout=5)
+
+    call_span, report_span = tracer.spans
+    assert call_span.name == CALL_SPAN_NAME and call_span.ended
+    assert call_span.events == ["upstream_response", "first_chunk"]
+    assert call_span.attributes["gen_ai.request.model"] == "gpt-3.5-turbo"
+    assert call_span.attributes["openpipe.chunks"] == 3
+    assert call_span.attributes["http.status_code"] == 200
+    for name in [
+        "openpipe.upstream_latency_ms",
+        "openpipe.time_to_first_chunk_ms",
+        "openpipe.report_enqueue_ms",
+    ]:
+        assert name in call_span.attributes
+    # The call was encoded in the background, after its span ended
+    assert "openpipe.report_bytes" not in call_span.attributes
+    assert report_span.name == REPORT_SPAN_NAME and report_span.ended
+    assert report_span.attributes["openpipe.reports"] == 1
+
+
+def test_opentelemetry_report_size_without_background_reporting():
+    tracer = FakeTracer()
+    reported = []
+    client = make_client(
+        OpenTelemetryInstrumentation(tracer),
+        reported=reported,
+        background_reporting=False,
+    )
+
+    client.chat.completions.create(**request)
+
+    [call_span] = tracer.spans
+    assert call_span.ended
+    assert call_span.attributes["openpipe.report_bytes"] == len(json.dumps(reported[0]))
+    assert call_span.attributes["openpipe.serialization_ms"] >= 0
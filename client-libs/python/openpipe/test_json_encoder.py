@@ -0,0 +1,122 @@
+import dataclasses
+import datetime as dt
+import enum
+import uuid
+from decimal import Decimal
+from pathlib import PurePosixPath
+
+import pytest
+
+from .api_client import ReportBatchRequestCallsItem
+from .api_client.core.jsonable_encoder import (
+    jsonable_encoder as generated_jsonable_encoder,
+)
+from .json_encoder import jsonable_encoder
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+class Role(str, enum.Enum):
+    USER = "user"
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+
+class Plain:
+    def __init__(self):
+        self.name = "plain"
+        self.tags = {"a"}
+
+
+def test_passes_primitives_through():
+    for value in ["hi", 1, 1.5, True, None]:
+        assert jsonable_encoder(value) is value
+
+
+def test_encodes_nested_containers():
+    payload = {
+        "messages": [
+            {"role": Role.USER, "content": "hi"},
+            {"role": "assistant", "content": None},
+        ],
+        "choices": (Color.RED, frozenset([1])),
+        "stop": (item for item in ["a", "b"]),
+        1: dt.date(2024, 1, 5),
+    }
+
+    assert jsonable_encoder(payload) == {
+        "messages": [
+            {"role": "user", "content": "hi"},
+            {"role": "assistant", "content": None},
+        ],
+        "choices": ["red", [1]],
+        "stop": ["a", "b"],
+        1: "2024-01-05",
+    }
+
+
+def test_encodes_other_types():
+    assert jsonable_encoder(dt.datetime(2024, 1, 5, 12, 30)) == "2024-01-05 12:30:00"
+    assert jsonable_encoder(PurePosixPath("/tmp/a")) == "/tmp/a"
+    assert jsonable_encoder(Point(1, 2)) == {"x": 1, "y": 2}
+    assert jsonable_encoder(Decimal("1.5")) == 1.5
+    assert jsonable_encoder(b"abc") == "abc"
+    assert jsonable_encoder(uuid.UUID(int=1)) == "00000000-0000-0000-0000-000000000001"
+    assert jsonable_encoder(Plain()) == {"name": "plain", "tags": ["a"]}
+    with pytest.raises(ValueError):
+        jsonable_encoder(object())
+
+
+def test_encodes_models_by_alias():
+    call = ReportBatchRequestCallsItem(
+        requested_at=1,
+        req_payload={"messages": [{"role": Role.USER, "content": "hi"}]},
+        tags={"prompt_id": "counting"},
+    )
+
+    assert jsonable_encoder({"calls": [call, call]}) == {
+        "calls": [
+            {
+                "requestedAt": 1,
+                "reqPayload": {"messages": [{"role": "user", "content": "hi"}]},
+                "tags": {"prompt_id": "counting"},
+            }
+        ]
+        * 2
+    }
+
+
+def test_custom_encoders_take_precedence():
+    assert jsonable_encoder({"a": 1, "b": Point(1, 2)}, {Point: lambda p: p.x}) == {
+        "a": 1,
+        "b": 1,
+    }
+    # Base classes of the primitive types apply to primitives too
+    assert jsonable_encoder({"a": 1, "b": [2]}, {int: str}) == {"a": "1", "b": ["2"]}
+    assert jsonable_encoder(["a", 1], {object: repr}) == "['a', 1]"
+
+
+def test_same_type_encoded_with_different_custom_encoders():
+    assert jsonable_encoder([Point(1, 2)], {Point: lambda p: p.x}) == [1]
+    assert jsonable_encoder([Point(1, 2)], {Point: lambda p: p.y}) == [2]
+    assert jsonable_encoder([Point(1, 2)]) == [{"x": 1, "y": 2}]
+
+
+def test_matches_the_generated_encoder():
+    payload = {
+        "calls": [
+            ReportBatchRequestCallsItem(requested_at=1, tags={"prompt_id": "a"}),
+            {"role": Role.USER, "at": dt.datetime(2024, 1, 5), "point": Point(1, 2)},
+        ],
+        "path": PurePosixPath("/tmp/a"),
+        "ids": {uuid.UUID(int=1)},
+        "amount": Decimal("1.5"),
+    }
+
+    assert jsonable_encoder(payload) == generated_jsonable_encoder(payload)
@@ -0,0 +1,237 @@
+import json
+
+import httpx
+import pytest
+
+from . import client as client_module
+from .client import OpenPipe, AsyncOpenPipe, MAX_REPORT_BATCH_BYTES
+
+
+def batch_handler(requests):
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body)
+        return httpx.Response(
+            200,
+            json={
+                "results": [
+                    {
+                        "index": i,
+                        "status": "error" if call.get("statusCode") == 500 else "ok",
+                    }
+                    for i, call in enumerate(body["calls"])
+                ]
+            },
+        )
+
+    return handler
+
+
+def test_report_batch_sends_camel_case_calls():
+    requests = []
+    op_client = OpenPipe(api_key="test-key", base_url="https://openpipe.test/api/v1")
+    op_client.base_client._client_wrapper.httpx_client = httpx.Client(
+        transport=httpx.MockTransport(batch_handler(requests))
+    )
+
+    resp = op_client.report_batch(
+        [
+            {
+                "requested_at": 1,
+                "received_at": 2,
+                "req_payload": {"model": "gpt-3.5-turbo"},
+                "resp_payload": None,
+                "status_code": 200,
+                "tags": {"promptId": "batch"},
+            }
+        ]
+    )
+
+    assert [r.status for r in resp.results] == ["ok"]
+    call = requests[0]["calls"][0]
+    assert call["requestedAt"] == 1
+    assert call["receivedAt"] == 2
+    assert call["reqPayload"] == {"model": "gpt-3.5-turbo"}
+    assert call["respPayload"] == None
+    assert "errorMessage" not in call
+    assert call["tags"]["promptId"] == "batch"
+    assert call["tags"]["$sdk"] == "python"
+
+
+def test_report_batch_splits_large_batches():
+    requests = []
+    op_client = OpenPipe(api_key="test-key", base_url="https://openpipe.test/api/v1")
+    op_client.base_client._client_wrapper.httpx_client = httpx.Client(
+        transport=httpx.MockTransport(batch_handler(requests))
+    )
+
+    calls = [{"status_code": 500 if i == 1203 else 200} for i in range(1250)]
+    resp = op_client.report_batch(calls)
+
+    assert [len(r["calls"]) for r in requests] == [500, 500, 250]
+    assert [r.index for r in resp.results] == list(range(1250))
+    assert [r.index for r in resp.results if r.status == "error"] == [1203]
+
+
+def test_report_batch_splits_by_size():
+    requests = []
+    op_client = OpenPipe(api_key="test-key", base_url="https://openpipe.test/api/v1")
+    op_client.base_client._client_wrapper.httpx_client = httpx.Client(
+        transport=httpx.MockTransport(batch_handler(requests))
+    )
+
+    calls = [{"req_payload": {"prompt": "x" * 100_000}} for _ in range(100)]
+    resp = op_client.report_batch(calls)
+
+    assert len(resp.results) == 100
+    assert sum(len(r["calls"]) for r in requests) == 100
+    assert len(requests) == 3
+    assert all(len(json.dumps(r)) <= MAX_REPORT_BATCH_BYTES for r in requests)
+
+
+def test_report_batch_halves_rejected_batches():
+    requests = []
+    ok_handler = batch_handler(requests)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        # Accepts at most 3 calls per request
+        if len(json.loads(request.content)["calls"]) > 3:
+            return httpx.Response(413, json={"message": "Request body too large"})
+        return ok_handler(request)
+
+    op_client = OpenPipe(api_key="test-key", base_url="https://openpipe.test/api/v1")
+    op_client.base_client._client_wrapper.httpx_client = httpx.Client(
+        transport=httpx.MockTransport(handler)
+    )
+
+    resp = op_client.report_batch([{"status_code": 200} for _ in range(10)])
+
+    assert [len(r["calls"]) for r in requests] == [2, 3, 2, 3]
+    assert [r.index for r in resp.results] == list(range(10))
+    assert all(r.status == "ok" for r in resp.results)
+
+
+def test_report_batch_reports_calls_too_large_to_send():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(413, json={"message": "Request body too large"})
+
+    op_client = OpenPipe(api_key="test-key", base_url="https://openpipe.test/api/v1")
+    op_client.base_client._client_wrapper.httpx_client = httpx.Client(
+        transport=httpx.MockTransport(handler)
+    )
+
+    resp = op_client.report_batch([{"status_code": 200}, {"status_code": 200}])
+
+    assert [r.status for r in resp.results] == ["error", "error"]
+    assert resp.results[0].error_message == "Request body too large"
+
+
+def reset_large_bodies(requests, max_bytes):
+    """Resets the connection on bodies over `max_bytes`, like servers before the 413."""
+    ok_handler = batch_handler(requests)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if len(request.content) > max_bytes:
+            raise httpx.WriteError("Connection reset by peer", request=request)
+        return ok_handler(request)
+
+    return handler
+
+
+def test_report_batch_treats_resets_on_large_bodies_as_too_large():
+    requests = []
+    op_client = OpenPipe(api_key="test-key", base_url="https://openpipe.test/api/v1")
+    op_client.base_client._client_wrapper.httpx_client = httpx.Client(
+        transport=httpx.MockTransport(reset_large_bodies(requests, 1_500_000))
+    )
+
+    calls = [{"req_payload": {"prompt": "x" * 400_000}} for _ in range(8)]
+    calls.append({"req_payload": {"prompt": "x" * 2_000_000}})
+    resp = op_client.report_batch(calls)
+
+    assert sum(len(r["calls"]) for r in requests) == 8
+    assert [r.index for r in resp.results] == list(range(9))
+    assert [r.status for r in resp.results] == ["ok"] * 8 + ["error"]
+    assert resp.results[8].error_message == "Request body too large"
+
+
+def test_report_batch_raises_resets_on_small_bodies():
+    op_client = OpenPipe(api_key="test-key", base_url="https://openpipe.test/api/v1")
+    op_client.base_client._client_wrapper.httpx_client = httpx.Client(
+        transport=httpx.MockTransport(reset_large_bodies([], 0))
+    )
+
+    with pytest.raises(httpx.WriteError):
+        op_client.report_batch([{"status_code": 200}, {"status_code": 200}])
+
+
+def test_report_batch_encodes_each_call_once(monkeypatch):
+    encoded = []
+    jsonable_encoder = client_module.jsonable_encoder
+
+    def counting_encoder(obj, *args, **kwargs):
+        encoded.append(obj)
+        return jsonable_encoder(obj, *args, **kwargs)
+
+    monkeypatch.setattr(client_module, "jsonable_encoder", counting_encoder)
+    op_client = OpenPipe(api_key="test-key", base_url="https://openpipe.test/api/v1")
+    op_client.base_client._client_wrapper.httpx_client = httpx.Client(
+        transport=httpx.MockTransport(batch_handler([]))
+    )
+
+    op_client.report_batch([{"status_code": 200} for _ in range(3)])
+
+    assert len(encoded) == 3
+
+
+async def test_async_report_batch():
+    requests = []
+    op_client = AsyncOpenPipe(
+        api_key="test-key", base_url="https://openpipe.test/api/v1"
+    )
+    op_client.base_client._client_wrapper.httpx_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(batch_handler(requests))
+    )
+
+    resp = await op_client.report_batch([{"status_code": 200}, {"status_code": 500}])
+
+    assert [r.status for r in resp.results] == ["ok", "error"]
+    assert len(requests) == 1
+
+
+async def test_async_report_batch_halves_rejected_batches():
+    requests = []
+    ok_handler = batch_handler(requests)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if len(json.loads(request.content)["calls"]) > 1:
+            return httpx.Response(413, json={"message": "Request body too large"})
+        return ok_handler(request)
+
+    op_client = AsyncOpenPipe(
+        api_key="test-key", base_url="https://openpipe.test/api/v1"
+    )
+    op_client.base_client._client_wrapper.httpx_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    )
+
+    resp = await op_client.report_batch([{"status_code": 200} for _ in range(3)])
+
+    assert [r.index for r in resp.results] == [0, 1, 2]
+    assert len(requests) == 3
+
+
+async def test_async_report_batch_treats_resets_on_large_bodies_as_too_large():
+    requests = []
+    op_client = AsyncOpenPipe(
+        api_key="test-key", base_url="https://openpipe.test/api/v1"
+    )
+    op_client.base_client._client_wrapper.httpx_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(reset_large_bodies(requests, 1_500_000))
+    )
+
+    calls = [{"req_payload": {"prompt": "x" * 400_000}} for _ in range(8)]
+    resp = await op_client.report_batch(calls)
+
+    assert [len(r["calls"]) for r in requests] == [2, 2, 2, 2]
+    assert all(r.status == "ok" for r in resp.results)
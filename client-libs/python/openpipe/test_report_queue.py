@@ -0,0 +1,177 @@
+import asyncio
+import threading
+import time
+
+from .api_client.types import ReportBatchResponse
+from .report_queue import ReportQueue, AsyncReportTasks
+
+
+class RecordingClient:
+    api_key = "test-key"
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.reports = []
+        self.batch_sizes = []
+        self.lock = threading.Lock()
+
+    def report_batch(self, calls, on_encoded=None):
+        time.sleep(self.delay)
+        with self.lock:
+            self.reports.extend(calls)
+            self.batch_sizes.append(len(calls))
+        return ReportBatchResponse(
+            results=[{"index": i, "status": "ok"} for i in range(len(calls))]
+        )
+
+
+class FailingClient(RecordingClient):
+    def report_batch(self, calls, on_encoded=None):
+        raise Exception("OpenPipe is down")
+
+
+def test_put_returns_before_report_is_sent():
+    client = RecordingClient(delay=0.2)
+    report_queue = ReportQueue(client)
+
+    start = time.monotonic()
+    report_queue.put({"status_code": 200})
+    assert time.monotonic() - start < 0.1
+
+    assert report_queue.flush(timeout=5)
+    assert client.reports == [{"status_code": 200}]
+
+
+def test_flush_sends_every_report():
+    client = RecordingClient()
+    report_queue = ReportQueue(client, max_batch_size=7, flush_interval=1)
+
+    for i in range(50):
+        report_queue.put({"status_code": i})
+
+    assert report_queue.flush(timeout=5)
+    assert [r["status_code"] for r in client.reports] == list(range(50))
+    assert max(client.batch_sizes) == 7
+    assert len(report_queue) == 0
+
+
+def test_drop_oldest_when_full():
+    client = RecordingClient(delay=0.2)
+    report_queue = ReportQueue(client, max_queue_size=2, max_batch_size=1)
+
+    report_queue.put({"status_code": 0})
+    # Wait for the worker to pick up the first report
+    time.sleep(0.1)
+    for i in range(1, 5):
+        report_queue.put({"status_code": i})
+
+    assert report_queue.flush(timeout=5)
+    assert report_queue.dropped == 2
+    assert [r["status_code"] for r in client.reports] == [0, 3, 4]
+
+
+def test_block_when_full_times_out():
+    client = RecordingClient(delay=0.5)
+    report_queue = ReportQueue(
+        client,
+        max_queue_size=1,
+        max_batch_size=1,
+        overflow="block",
+        block_timeout=0.05,
+    )
+
+    report_queue.put({"status_code": 0})
+    time.sleep(0.1)
+    assert report_queue.put({"status_code": 1})
+    assert not report_queue.put({"status_code": 2})
+    assert report_queue.dropped == 1
+
+    assert report_queue.flush(timeout=5)
+    assert [r["status_code"] for r in client.reports] == [0, 1]
+
+
+def test_reporting_errors_are_swallowed():
+    report_queue = ReportQueue(FailingClient())
+
+    report_queue.put({"status_code": 200})
+
+    assert report_queue.flush(timeout=5)
+
+
+def test_close_rejects_new_reports():
+    client = RecordingClient()
+    report_queue = ReportQueue(client)
+
+    report_queue.put({"status_code": 200})
+    assert report_queue.close(timeout=5)
+    assert not report_queue.put({"status_code": 201})
+    assert len(client.reports) == 1
+
+
+def test_worker_exits_when_idle():
+    client = RecordingClient()
+    report_queue = ReportQueue(client, idle_timeout=0.05)
+
+    report_queue.put({"status_code": 200})
+    assert report_queue.flush(timeout=5)
+    time.sleep(0.2)
+    assert report_queue._worker is None
+
+    report_queue.put({"status_code": 201})
+    assert report_queue.flush(timeout=5)
+    assert len(client.reports) == 2
+
+
+class AsyncRecordingClient:
+    api_key = "test-key"
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.reports = []
+        self.concurrent = 0
+        self.max_concurrent = 0
+
+    async def report(self, on_encoded=None, **kwargs):
+        self.concurrent += 1
+        self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        await asyncio.sleep(self.delay)
+        self.concurrent -= 1
+        self.reports.append(kwargs)
+
+
+async def test_async_schedule_returns_before_report_is_sent():
+    client = AsyncRecordingClient(delay=0.2)
+    report_tasks = AsyncReportTasks(client)
+
+    start = time.monotonic()
+    report_tasks.schedule({"status_code": 200})
+    assert time.monotonic() - start < 0.1
+    assert client.reports == []
+
+    await report_tasks.flush()
+    assert client.reports == [{"status_code": 200}]
+    assert len(report_tasks) == 0
+
+
+async def test_async_concurrency_is_bounded():
+    client = AsyncRecordingClient(delay=0.01)
+    report_tasks = AsyncReportTasks(client, max_concurrency=3)
+
+    for i in range(20):
+        report_tasks.schedule({"status_code": i})
+
+    await report_tasks.flush()
+    assert len(client.reports) == 20
+    assert client.max_concurrent == 3
+
+
+async def test_async_drops_oldest_when_too_many_are_pending():
+    client = AsyncRecordingClient(delay=0.01)
+    report_tasks = AsyncReportTasks(client, max_concurrency=1, max_pending=3)
+
+    for i in range(10):
+        report_tasks.schedule({"status_code": i})
+
+    await report_tasks.flush()
+    assert report_tasks.dropped == 7
+    assert [r["status_code"] for r in client.reports] == [7, 8, 9]
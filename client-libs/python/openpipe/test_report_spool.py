@@ -0,0 +1,186 @@
+import os
+import threading
+
+from .api_client.core.api_error import ApiError
+from .api_client.types import ReportBatchResponse
+from .report_queue import ReportQueue, AsyncReportTasks
+from .report_spool import ReportSpool
+
+
+class RecordingClient:
+    api_key = "test-key"
+
+    def __init__(self, fail_after=None, reject=None):
+        self.fail_after = fail_after
+        # Status code returned for batches containing a report with status_code -1
+        self.reject = reject
+        self.reports = []
+        self.threads = []
+
+    def report_batch(self, calls, on_encoded=None):
+        self.threads.append(threading.current_thread().name)
+        if self.fail_after is not None and len(self.reports) >= self.fail_after:
+            raise Exception("OpenPipe is down")
+        if self.reject is not None and any(c["status_code"] == -1 for c in calls):
+            raise ApiError(status_code=self.reject, body={"message": "Rejected"})
+        self.reports.extend(calls)
+        return ReportBatchResponse(
+            results=[{"index": i, "status": "ok"} for i in range(len(calls))]
+        )
+
+
+def test_replay_sends_spooled_reports_in_order(tmp_path):
+    spool = ReportSpool(str(tmp_path), fsync="always", segment_max_bytes=100)
+    for i in range(10):
+        assert spool.append([{"status_code": i}])
+
+    client = RecordingClient()
+    assert spool.replay(client, batch_size=3) == 10
+    assert [r["status_code"] for r in client.reports] == list(range(10))
+    assert os.listdir(tmp_path) == []
+    assert len(spool) == 0
+
+
+def test_replay_keeps_unsent_reports(tmp_path):
+    spool = ReportSpool(str(tmp_path))
+    spool.append([{"status_code": i} for i in range(5)])
+
+    assert spool.replay(RecordingClient(fail_after=2), batch_size=2) == 2
+
+    client = RecordingClient()
+    assert spool.replay(client) == 3
+    assert [r["status_code"] for r in client.reports] == [2, 3, 4]
+
+
+def test_replay_moves_rejected_batches_aside(tmp_path):
+    spool = ReportSpool(str(tmp_path))
+    spool.append([{"status_code": i} for i in (0, 1, -1, 3, 4)])
+
+    client = RecordingClient(reject=400)
+    assert spool.replay(client, batch_size=2) == 3
+    assert [r["status_code"] for r in client.reports] == [0, 1, 4]
+
+    assert os.listdir(tmp_path) == ["dead-letter"]
+    (dead_letter,) = os.listdir(tmp_path / "dead-letter")
+    with open(tmp_path / "dead-letter" / dead_letter) as f:
+        assert f.read() == '{"status_code":-1}\n{"status_code":3}\n'
+
+    # Dead letters aren't sent again
+    assert spool.replay(RecordingClient()) == 0
+
+
+def test_replay_keeps_reports_on_auth_errors(tmp_path):
+    spool = ReportSpool(str(tmp_path))
+    spool.append([{"status_code": -1}])
+
+    assert spool.replay(RecordingClient(reject=401)) == 0
+    assert spool.replay(RecordingClient()) == 1
+
+
+def test_segments_survive_restart(tmp_path):
+    spool = ReportSpool(str(tmp_path), fsync="never")
+    spool.append([{"status_code": 200}])
+    spool.close()
+
+    restarted = ReportSpool(str(tmp_path))
+    assert len(restarted) > 0
+    client = RecordingClient()
+    assert restarted.replay(client) == 1
+
+
+def test_recovers_segments_of_dead_processes(tmp_path):
+    # A segment left open by a process that no longer exists, with a torn last line
+    with open(tmp_path / f"{1:020d}-{2**22 + 1}.open", "wb") as f:
+        f.write(b'{"status_code":200}\n{"status_co')
+
+    client = RecordingClient()
+    assert ReportSpool(str(tmp_path)).replay(client) == 1
+    assert client.reports == [{"status_code": 200}]
+
+
+def test_max_bytes_drops_reports(tmp_path):
+    spool = ReportSpool(str(tmp_path), max_bytes=30)
+
+    assert spool.append([{"status_code": 200}])
+    assert not spool.append([{"status_code": 201}])
+    assert spool.dropped == 1
+
+
+def test_queue_spools_failed_batches_and_replays_them(tmp_path):
+    spool = ReportSpool(str(tmp_path), replay_interval=0)
+    client = RecordingClient(fail_after=0)
+    report_queue = ReportQueue(client, spool=spool)
+
+    report_queue.put({"status_code": 0})
+    assert report_queue.flush(timeout=5)
+    assert client.reports == []
+
+    # Once OpenPipe is back, the next successful send drains the spool
+    client.fail_after = None
+    report_queue.put({"status_code": 1})
+    assert report_queue.flush(timeout=5)
+    assert sorted(r["status_code"] for r in client.reports) == [0, 1]
+    assert len(spool) == 0
+
+
+def test_queue_replays_from_its_own_thread(tmp_path):
+    spool = ReportSpool(str(tmp_path), replay_interval=0)
+    spool.append([{"status_code": 0}])
+    client = RecordingClient()
+    report_queue = ReportQueue(client, spool=spool)
+
+    report_queue.put({"status_code": 1})
+    assert report_queue.flush(timeout=5)
+
+    assert sorted(r["status_code"] for r in client.reports) == [0, 1]
+    assert client.threads == ["openpipe-report-queue", "openpipe-report-replay"]
+
+
+class AsyncRecordingClient:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.reports = []
+
+    async def report(self, on_encoded=None, **report):
+        if self.fail:
+            raise Exception("OpenPipe is down")
+        self.reports.append(report)
+
+    async def report_batch(self, calls):
+        self.reports.extend(calls)
+        return ReportBatchResponse(
+            results=[{"index": i, "status": "ok"} for i in range(len(calls))]
+        )
+
+
+async def test_async_tasks_spool_failed_reports_and_replay_them(tmp_path):
+    spool = ReportSpool(str(tmp_path), replay_interval=0)
+    client = AsyncRecordingClient(fail=True)
+    tasks = AsyncReportTasks(client, spool=spool)
+
+    tasks.schedule({"status_code": 0})
+    await tasks.flush()
+    assert client.reports == []
+    assert len(spool) > 0
+
+    client.fail = False
+    tasks.schedule({"status_code": 1})
+    await tasks.flush()
+    assert sorted(r["status_code"] for r in client.reports) == [0, 1]
+    assert len(spool) == 0
+
+
+async def test_async_tasks_spool_reports_over_max_pending(tmp_path):
+    spool = ReportSpool(str(tmp_path))
+    client = AsyncRecordingClient()
+    tasks = AsyncReportTasks(client, max_pending=2, spool=spool)
+
+    for i in range(5):
+        tasks.schedule({"status_code": i})
+    await tasks.flush()
+    assert tasks.dropped == 0
+    # The newest reports are sent, and the ones they pushed out are replayed
+    assert [r["status_code"] for r in client.reports[:2]] == [3, 4]
+
+    await spool.replay_async(client)
+    assert sorted(r["status_code"] for r in client.reports) == [0, 1, 2, 3, 4]
@@ -0,0 +1,192 @@
+import httpx
+import pytest
+
+from . import OpenPipe, AsyncOpenPipe
+from . import resilience
+from .api_client.core.api_error import ApiError
+from .resilience import (
+    AsyncResilientTransport,
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientTransport,
+    configure_request_resilience,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(resilience, "_retry_base_delay", 0)
+    monkeypatch.setattr(resilience, "_timeouts", {})
+    monkeypatch.setattr(resilience, "_breakers", {})
+
+
+def sync_client(handler, **kwargs):
+    client = OpenPipe(
+        api_key="test-key", base_url="https://resilience.test/api/v1", **kwargs
+    )
+    client.base_client._client_wrapper.httpx_client = httpx.Client(
+        transport=ResilientTransport(httpx.MockTransport(handler))
+    )
+    return client
+
+
+def report(client):
+    return client.report(requested_at=1, received_at=2, status_code=200)
+
+
+def test_applies_method_timeouts():
+    timeouts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"])
+        return httpx.Response(200, json={"status": "ok", "matchedLogs": 1})
+
+    report(sync_client(handler))
+    report(sync_client(handler, timeout=3))
+    configure_request_resilience(timeouts={"report": 20})
+    report(sync_client(handler, timeout=3))
+    sync_client(handler).update_log_tags(filters=[], tags={})
+
+    assert timeouts == [
+        {"connect": 5.0, "read": 10.0, "write": 10.0, "pool": 10.0},
+        {"connect": 3.0, "read": 3.0, "write": 3.0, "pool": 3.0},
+        {"connect": 5.0, "read": 20.0, "write": 20.0, "pool": 20.0},
+        {"connect": 5.0, "read": 60.0, "write": 60.0, "pool": 60.0},
+    ]
+
+
+def test_rejects_unknown_methods():
+    with pytest.raises(ValueError):
+        configure_request_resilience(timeouts={"reprot": 5})
+
+
+def test_retries_idempotent_methods_after_server_errors():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if len(attempts) == 1:
+            raise httpx.ReadTimeout("timed out", request=request)
+        if len(attempts) == 2:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"matchedLogs": 1})
+
+    resp = sync_client(handler).update_log_tags(filters=[], tags={"a": "b"})
+
+    assert len(attempts) == 3
+    assert resp.matched_logs == 1
+
+
+def test_only_retries_reports_the_server_did_not_process():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        if len(attempts) == 2:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(500, json={"message": "failed"})
+
+    with pytest.raises(ApiError):
+        report(sync_client(handler))
+
+    assert len(attempts) == 3
+
+    attempts.clear()
+
+    def timeout_handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    with pytest.raises(httpx.ReadTimeout):
+        report(sync_client(timeout_handler))
+
+    # The report may have been logged before the response timed out
+    assert len(attempts) == 1
+
+
+def test_circuit_opens_after_failure_rate_threshold(monkeypatch):
+    monkeypatch.setattr(resilience, "_max_retries", 0)
+    monkeypatch.setattr(resilience, "_minimum_calls", 4)
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        return httpx.Response(503)
+
+    client = sync_client(handler)
+    for _ in range(4):
+        with pytest.raises(ApiError):
+            report(client)
+    with pytest.raises(CircuitOpenError):
+        report(client)
+
+    assert len(attempts) == 4
+    # Other methods aren't affected
+    with pytest.raises(ApiError):
+        client.update_log_tags(filters=[], tags={})
+
+
+def test_circuit_probes_after_cooldown(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(
+        failure_rate_threshold=0.5, minimum_calls=2, window=10, cooldown=30
+    )
+
+    breaker.record(False)
+    breaker.record(True)
+    assert breaker.is_open
+    assert not breaker.allow()
+
+    now[0] = 31
+    assert breaker.allow()
+    # Only a single probe is sent
+    assert not breaker.allow()
+    breaker.record(True)
+    assert not breaker.allow()
+
+    now[0] = 62
+    assert breaker.allow()
+    breaker.record(False)
+    assert not breaker.is_open
+    assert breaker.allow()
+
+
+def test_failures_outside_window_are_forgotten(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(
+        failure_rate_threshold=0.5, minimum_calls=2, window=10, cooldown=30
+    )
+
+    breaker.record(True)
+    now[0] = 11
+    breaker.record(False)
+    breaker.record(False)
+    breaker.record(True)
+
+    assert not breaker.is_open
+
+
+async def test_async_retries_and_timeouts():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.extensions["timeout"]["read"])
+        if len(attempts) == 1:
+            return httpx.Response(502)
+        return httpx.Response(200, json={"matchedLogs": 2})
+
+    client = AsyncOpenPipe(
+        api_key="test-key", base_url="https://resilience.test/api/v1", timeout=7
+    )
+    client.base_client._client_wrapper.httpx_client = httpx.AsyncClient(
+        transport=AsyncResilientTransport(httpx.MockTransport(handler))
+    )
+
+    resp = await client.update_log_tags(filters=[], tags={"a": "b"})
+
+    assert attempts == [7, 7]
+    assert resp.matched_logs == 2
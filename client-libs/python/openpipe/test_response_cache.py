@@ -0,0 +1,164 @@
+import json
+
+import httpx
+import pytest
+
+from . import OpenAI, AsyncOpenAI
+from .merge_openai_chunks import ChatCompletionAccumulator
+from .response_cache import (
+    InMemoryResponseCache,
+    ResponseCache,
+    SQLiteResponseCache,
+    synthesize_chunks,
+)
+
+completion_payload = {
+    "id": "chatcmpl-123",
+    "object": "chat.completion",
+    "created": 1704449593,
+    "model": "gpt-3.5-turbo-0613",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": "1, 2, 3"},
+            "finish_reason": "stop",
+        }
+    ],
+    "usage": {"prompt_tokens": 11, "completion_tokens": 8, "total_tokens": 19},
+}
+
+request = {
+    "model": "gpt-3.5-turbo",
+    "messages": [{"role": "system", "content": "count to 3"}],
+    "temperature": 0,
+}
+
+
+def counting_transport(requests):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json=completion_payload)
+
+    return httpx.MockTransport(handler)
+
+
+def test_lru_eviction():
+    cache = InMemoryResponseCache(max_entries=2)
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    cache.get("a")
+    cache.set("c", {"n": 3})
+
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_ttl_and_size_eviction():
+    cache = InMemoryResponseCache(ttl=0)
+    cache.set("a", {"n": 1})
+    assert cache.get("a") is None
+
+    cache = InMemoryResponseCache(max_bytes=12)
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    assert cache.get("a") is None
+    assert cache.get("b") == {"n": 2}
+    cache.set("c", {"n": "x" * 100})
+    assert cache.get("c") is None
+
+
+def test_sqlite_cache_persists_and_evicts(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = SQLiteResponseCache(path, max_entries=2)
+    for key in ["a", "b", "c"]:
+        cache.set(key, {"key": key})
+    cache.close()
+
+    reopened = SQLiteResponseCache(path)
+    assert reopened.get("a") is None
+    assert reopened.get("c") == {"key": "c"}
+
+
+def test_synthesized_chunks_rebuild_the_completion():
+    accumulator = ChatCompletionAccumulator()
+    for chunk in synthesize_chunks(completion_payload):
+        accumulator.add(chunk)
+
+    completion = accumulator.get_completion()
+    assert completion.choices[0].message.content == "1, 2, 3"
+    assert completion.choices[0].finish_reason == "stop"
+
+
+def test_wrapper_serves_repeated_requests_from_cache():
+    requests = []
+    client = OpenAI(
+        api_key="test-key",
+        base_url="https://openai.test/v1",
+        http_client=httpx.Client(transport=counting_transport(requests)),
+        openpipe={"response_cache": {"max_entries": 10}},
+    )
+
+    first = client.chat.completions.create(**request)
+    second = client.chat.completions.create(**request)
+    stream = client.chat.completions.create(**request, stream=True)
+    streamed = "".join(chunk.choices[0].delta.content or "" for chunk in stream)
+
+    assert len(requests) == 1
+    assert second.choices[0].message.content == first.choices[0].message.content
+    assert streamed == "1, 2, 3"
+
+    # Non-deterministic requests and per-call opt outs go to the model
+    client.chat.completions.create(**{**request, "temperature": 1})
+    client.chat.completions.create(**request, openpipe={"response_cache": False})
+    assert len(requests) == 3
+
+
+async def test_async_wrapper_serves_repeated_requests_from_cache():
+    requests = []
+    client = AsyncOpenAI(
+        api_key="test-key",
+        base_url="https://openai.test/v1",
+        http_client=httpx.AsyncClient(transport=counting_transport(requests)),
+        openpipe={"response_cache": InMemoryResponseCache()},
+    )
+
+    await client.chat.completions.create(**request)
+    completion = await client.chat.completions.create(**request)
+    stream = await client.chat.completions.create(**request, stream=True)
+    streamed = "".join([c.choices[0].delta.content or "" async for c in stream])
+
+    assert len(requests) == 1
+    assert completion.choices[0].message.content == "1, 2, 3"
+    assert streamed == "1, 2, 3"
+
+
+def test_entries_are_separate_per_endpoint_and_organization():
+    requests = []
+    cache = InMemoryResponseCache()
+
+    def client(base_url, organization=None):
+        return OpenAI(
+            api_key="test-key",
+            organization=organization,
+            base_url=base_url,
+            http_client=httpx.Client(transport=counting_transport(requests)),
+            openpipe={"response_cache": cache},
+        )
+
+    client("https://openai.test/v1").chat.completions.create(**request)
+    client("https://openai.test/v1").chat.completions.create(**request)
+    client("https://azure.test/v1").chat.completions.create(**request)
+    client("https://openai.test/v1", "org-2").chat.completions.create(**request)
+
+    assert len(requests) == 3
+    assert len(cache) == 3
+
+
+def test_caches_must_implement_the_backend_methods():
+    class PartialCache(ResponseCache):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialCache()
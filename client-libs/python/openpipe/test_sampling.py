@@ -0,0 +1,196 @@
+import asyncio
+import threading
+
+import httpx
+
+from . import OpenAI, AsyncOpenAI
+from . import openai_sync_wrapper
+from .sampling import SamplingPolicy
+
+completion_payload = {
+    "id": "chatcmpl-123",
+    "object": "chat.completion",
+    "created": 1704449593,
+    "model": "gpt-3.5-turbo-0613",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": "1, 2, 3"},
+            "finish_reason": "stop",
+        }
+    ],
+}
+
+
+def request(content="count to 3"):
+    return {
+        "model": "gpt-3.5-turbo",
+        "messages": [{"role": "system", "content": content}],
+    }
+
+
+def tagged(prompt_id):
+    return {"tags": {"prompt_id": prompt_id}}
+
+
+def test_prompt_rates():
+    policy = SamplingPolicy(rate=1.0, prompt_rates={"noisy": 0.1}, seed=1)
+
+    noisy = sum(
+        policy.should_sample_request(request(), tagged("noisy")) for _ in range(1000)
+    )
+    assert 50 < noisy < 150
+    assert all(
+        policy.should_sample_request(request(), tagged("rare")) for _ in range(100)
+    )
+
+
+def test_dedupe_ignores_key_order_and_transport_args():
+    policy = SamplingPolicy(dedupe=True)
+
+    assert policy.should_sample_request(request(), {})
+    reordered = {"messages": request()["messages"], "model": "gpt-3.5-turbo"}
+    assert not policy.should_sample_request(
+        {**reordered, "extra_headers": {"x": "y"}}, {}
+    )
+    assert policy.should_sample_request(request("count to 4"), {})
+
+
+def test_dedupe_window():
+    policy = SamplingPolicy(dedupe=True, dedupe_window=0)
+
+    assert policy.should_sample_request(request(), {})
+    assert policy.should_sample_request(request(), {})
+
+
+def test_max_payload_bytes():
+    policy = SamplingPolicy(max_payload_bytes=100)
+
+    assert policy.should_sample_request(request(), {})
+    assert not policy.should_sample_request(request("x" * 100), {})
+
+
+def test_status_codes():
+    policy = SamplingPolicy(exclude_status_codes=[429])
+    assert policy.should_report_status(200)
+    assert not policy.should_report_status(429)
+
+    policy = SamplingPolicy(status_codes=[200])
+    assert policy.should_report_status(200)
+    assert not policy.should_report_status(500)
+
+
+def test_reservoir_holds_a_sample_per_prompt():
+    policy = SamplingPolicy(reservoir_size=5, reservoir_interval=3600, seed=1)
+    sent = []
+
+    for i in range(100):
+        policy.offer(tagged("a"), lambda i=i: sent.append(("a", i)))
+    for i in range(3):
+        policy.offer(tagged("b"), lambda i=i: sent.append(("b", i)))
+    assert sent == []
+
+    policy.flush()
+    assert len([s for s in sent if s[0] == "a"]) == 5
+    assert [s for s in sent if s[0] == "b"] == [("b", 0), ("b", 1), ("b", 2)]
+
+
+def test_reservoir_sends_when_interval_ends():
+    policy = SamplingPolicy(reservoir_size=1, reservoir_interval=0.05)
+    released = threading.Event()
+    sent = []
+
+    def send():
+        sent.append(1)
+        released.set()
+
+    # Nothing else is offered, so only the timer can release the sample
+    policy.offer({}, send)
+    assert sent == []
+    assert released.wait(timeout=5)
+    assert sent == [1]
+
+
+def test_unsampled_calls_are_not_serialized(monkeypatch):
+    serialized = []
+    get_chat_completion_json = openai_sync_wrapper.get_chat_completion_json
+
+    def counting_get_chat_completion_json(completion):
+        serialized.append(completion)
+        return get_chat_completion_json(completion)
+
+    monkeypatch.setattr(
+        openai_sync_wrapper,
+        "get_chat_completion_json",
+        counting_get_chat_completion_json,
+    )
+
+    reported = []
+    client = OpenAI(
+        api_key="test-key",
+        base_url="https://openai.test/v1",
+        http_client=httpx.Client(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json=completion_payload)
+            )
+        ),
+        openpipe={
+            "api_key": "test-key",
+            "background_reporting": False,
+            "sampling": {"prompt_rates": {"skipped": 0}},
+        },
+    )
+    client.openpipe_reporting_client.report = lambda **kwargs: reported.append(kwargs)
+
+    for prompt_id in ["skipped", "kept", "skipped"]:
+        completion = client.chat.completions.create(
+            **request(), openpipe=tagged(prompt_id)
+        )
+        assert completion.choices[0].message.content == "1, 2, 3"
+
+    assert len(serialized) == 1
+    assert [r["tags"]["prompt_id"] for r in reported] == ["kept"]
+
+
+def async_client(reported, sampling):
+    client = AsyncOpenAI(
+        api_key="test-key",
+        base_url="https://openai.test/v1",
+        http_client=httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json=completion_payload)
+            )
+        ),
+        openpipe={"api_key": "test-key", "sampling": sampling},
+    )
+
+    async def report(**kwargs):
+        reported.append(kwargs)
+
+    client.openpipe_reporting_client.report = report
+    return client
+
+
+async def test_async_flush_reports_reservoirs():
+    reported = []
+    client = async_client(reported, {"reservoir_size": 5, "reservoir_interval": 3600})
+
+    for _ in range(3):
+        await client.chat.completions.create(**request(), openpipe=tagged("a"))
+    await asyncio.sleep(0)
+    assert reported == []
+
+    await client.flush()
+    assert len(reported) == 3
+
+
+async def test_async_reservoirs_are_released_on_the_loop_by_the_timer():
+    reported = []
+    client = async_client(reported, {"reservoir_size": 5, "reservoir_interval": 0.05})
+
+    await client.chat.completions.create(**request(), openpipe=tagged("a"))
+    for _ in range(100):
+        if reported:
+            break
+        await asyncio.sleep(0.05)
+    assert len(reported) == 1
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from . import OpenAI, AsyncOpenAI, OpenAIError
+
+completion_payload = {
+    "id": "chatcmpl-123",
+    "object": "chat.completion",
+    "created": 1704449593,
+    "model": "gpt-3.5-turbo-0613",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": "positive"},
+            "finish_reason": "stop",
+        }
+    ],
+}
+
+request = {
+    "model": "gpt-3.5-turbo",
+    "messages": [{"role": "system", "content": "classify: this is good"}],
+    "temperature": 0,
+}
+
+
+def report_handler(reported):
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        calls = body["calls"] if "calls" in body else [body]
+        reported.extend(calls)
+        return httpx.Response(
+            200,
+            json={"status": "ok", "results": [{"index": 0, "status": "ok"}]},
+        )
+
+    return handler
+
+
+def test_sync_threads_share_one_call():
+    upstream = []
+    lock = threading.Lock()
+
+    def openai_handler(request: httpx.Request) -> httpx.Response:
+        with lock:
+            upstream.append(request)
+        time.sleep(0.3)
+        return httpx.Response(200, json=completion_payload)
+
+    reported = []
+    client = OpenAI(
+        api_key="test-key",
+        base_url="https://openai.test/v1",
+        http_client=httpx.Client(transport=httpx.MockTransport(openai_handler)),
+        openpipe={"api_key": "test-key", "single_flight": True},
+    )
+    client.openpipe_reporting_client.base_client._client_wrapper.httpx_client = (
+        httpx.Client(transport=httpx.MockTransport(report_handler(reported)))
+    )
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        completions = list(
+            executor.map(lambda _: client.chat.completions.create(**request), range(10))
+        )
+
+    assert client.flush(timeout=5)
+    assert len(upstream) == 1
+    assert len(reported) == 1
+    assert all(c.choices[0].message.content == "positive" for c in completions)
+    # Every caller gets its own completion object
+    assert len({id(c) for c in completions}) == 10
+    completions[0].choices[0].message.content = "changed"
+    assert completions[1].choices[0].message.content == "positive"
+
+    # Once the shared call has finished, new requests make their own call
+    client.chat.completions.create(**request)
+    assert len(upstream) == 2
+
+
+async def test_async_coroutines_share_one_call():
+    upstream = []
+
+    async def openai_handler(request: httpx.Request) -> httpx.Response:
+        upstream.append(request)
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, json=completion_payload)
+
+    reported = []
+    client = AsyncOpenAI(
+        api_key="test-key",
+        base_url="https://openai.test/v1",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(openai_handler)),
+        openpipe={"api_key": "test-key", "single_flight": True},
+    )
+    client.openpipe_reporting_client.base_client._client_wrapper.httpx_client = (
+        httpx.AsyncClient(transport=httpx.MockTransport(report_handler(reported)))
+    )
+
+    completions = await asyncio.gather(
+        *[client.chat.completions.create(**request) for _ in range(20)],
+        client.chat.completions.create(**{**request, "temperature": 1}),
+    )
+    await client.flush()
+
+    assert len(upstream) == 2
+    assert len(reported) == 2
+    assert all(c.choices[0].message.content == "positive" for c in completions)
+    assert len({id(c) for c in completions}) == 21
+
+
+async def test_async_errors_are_shared():
+    upstream = []
+
+    async def openai_handler(request: httpx.Request) -> httpx.Response:
+        upstream.append(request)
+        await asyncio.sleep(0.1)
+        return httpx.Response(400, json={"error": {"message": "bad request"}})
+
+    client = AsyncOpenAI(
+        api_key="test-key",
+        base_url="https://openai.test/v1",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(openai_handler)),
+        openpipe={"single_flight": True},
+    )
+
+    results = await asyncio.gather(
+        *[client.chat.completions.create(**request) for _ in range(5)],
+        return_exceptions=True,
+    )
+
+    assert len(upstream) == 1
+    assert all(isinstance(r, OpenAIError) for r in results)
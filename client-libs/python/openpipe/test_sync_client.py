@@ -47,6 +47,8 @@ def test_sync_content():
     if not TEST_LAST_LOGGED:
         return
 
+    client.flush()
+
     last_logged = (
         client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
     )
@@ -68,6 +70,8 @@ def test_sync_content_mistral():
     if not TEST_LAST_LOGGED:
         return
 
+    client.flush()
+
     time.sleep(0.1)
 
     last_logged = (
@@ -92,6 +96,8 @@ def test_sync_function_call():
     if not TEST_LAST_LOGGED:
         return
 
+    client.flush()
+
     last_logged = (
         client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
     )
@@ -122,6 +128,8 @@ def test_sync_function_call_mistral():
     if not TEST_LAST_LOGGED:
         return
 
+    client.flush()
+
     last_logged = (
         client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
     )
@@ -157,6 +165,8 @@ def test_sync_tool_calls():
     if not TEST_LAST_LOGGED:
         return
 
+    client.flush()
+
     last_logged = (
         client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
     )
@@ -194,6 +204,8 @@ def test_sync_tool_calls_mistral():
     if not TEST_LAST_LOGGED:
         return
 
+    client.flush()
+
     last_logged = (
         client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
     )
@@ -226,6 +238,8 @@ def test_sync_streaming_content():
     if not TEST_LAST_LOGGED:
         return
 
+    client.flush()
+
     time.sleep(0.1)
 
     last_logged = (
@@ -255,6 +269,8 @@ def test_sync_streaming_content_ft_35():
     if not TEST_LAST_LOGGED:
         return
 
+    client.flush()
+
     time.sleep(0.1)
 
     last_logged = (
@@ -284,6 +300,8 @@ def test_sync_streaming_content_ft_35_base_sdk():
     if not TEST_LAST_LOGGED:
         return
 
+    client.flush()
+
     last_logged = (
         client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
     )
@@ -308,6 +326,8 @@ def test_sync_streaming_function_call():
     if not TEST_LAST_LOGGED:
         return
 
+    client.flush()
+
     last_logged = (
         client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
     )
@@ -346,6 +366,8 @@ def test_sync_streaming_tool_calls():
     if not TEST_LAST_LOGGED:
         return
 
+    client.flush()
+
     last_logged = (
         client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
     )
@@ -367,6 +389,8 @@ def test_sync_with_tags():
     if not TEST_LAST_LOGGED:
         return
 
+    client.flush()
+
     last_logged = (
         client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
     )
@@ -393,6 +417,8 @@ def test_bad_openai_call():
     if not TEST_LAST_LOGGED:
         return
 
+    client.flush()
+
     last_logged = (
         client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
     )
@@ -416,6 +442,8 @@ def test_bad_openpipe_call():
     if not TEST_LAST_LOGGED:
         return
 
+    client.flush()
+
     last_logged = (
         client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
     )
@@ -449,10 +477,13 @@ def test_bad_openpipe_initialization():
         messages=[{"role": "system", "content": system_content}],
         openpipe={"tags": {"prompt_id": "test_bad_openpipe_initialization"}},
     )
+    bad_client.flush()
 
     if not TEST_LAST_LOGGED:
         return
 
+    client.flush()
+
     last_logged = (
         client.openpipe_reporting_client.base_client.local_testing_only_get_latest_logged_call()
     )
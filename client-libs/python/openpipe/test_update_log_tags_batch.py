@@ -0,0 +1,162 @@
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+from .api_client import UpdateLogTagsBatchRequestUpdatesItem
+from .api_client.core.api_error import ApiError
+from .client import OpenPipe, AsyncOpenPipe
+
+
+def tags_handler(requests, fail_on=None):
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        with lock:
+            requests.append(body)
+        if fail_on is not None and fail_on in [
+            u["completionId"] for u in body["updates"]
+        ]:
+            return httpx.Response(500, json={"message": "failed"})
+        # Every completion ID starting with "missing" matches no logs
+        matched = sum(
+            0 if u["completionId"].startswith("missing") else 1 for u in body["updates"]
+        )
+        return httpx.Response(200, json={"matchedLogs": matched})
+
+    return handler
+
+
+def make_client(handler):
+    op_client = OpenPipe(api_key="test-key", base_url="https://openpipe.test/api/v1")
+    op_client.base_client._client_wrapper.httpx_client = httpx.Client(
+        transport=httpx.MockTransport(handler)
+    )
+    return op_client
+
+
+def test_sends_camel_case_updates():
+    requests = []
+    op_client = make_client(tags_handler(requests))
+
+    resp = op_client.update_log_tags_batch(
+        [
+            ("chatcmpl-1", {"label": "positive", "reviewed": True}),
+            UpdateLogTagsBatchRequestUpdatesItem(
+                completion_id="missing-1", tags={"label": None}
+            ),
+        ]
+    )
+
+    assert resp.matched_logs == 1
+    assert requests == [
+        {
+            "updates": [
+                {
+                    "completionId": "chatcmpl-1",
+                    "tags": {"label": "positive", "reviewed": True},
+                },
+                {"completionId": "missing-1", "tags": {"label": None}},
+            ]
+        }
+    ]
+
+
+def test_splits_updates_into_requests():
+    requests = []
+    progress = []
+    op_client = make_client(tags_handler(requests))
+
+    updates = (
+        (f"chatcmpl-{i}" if i % 10 else f"missing-{i}", {"label": "x"})
+        for i in range(2500)
+    )
+    resp = op_client.update_log_tags_batch(
+        updates,
+        max_parallelism=1,
+        on_progress=lambda sent, matched: progress.append((sent, matched)),
+    )
+
+    assert [len(r["updates"]) for r in requests] == [1000, 1000, 500]
+    assert resp.matched_logs == 2250
+    assert progress == [(1000, 900), (2000, 1800), (2500, 2250)]
+
+
+def test_splits_large_updates_by_size():
+    requests = []
+    op_client = make_client(tags_handler(requests))
+
+    resp = op_client.update_log_tags_batch(
+        (f"chatcmpl-{i}", {"note": "x" * 10000}) for i in range(200)
+    )
+
+    assert resp.matched_logs == 200
+    assert sum(len(r["updates"]) for r in requests) == 200
+    assert all(len(json.dumps(r)) < 512 * 1024 for r in requests)
+    assert len(requests) > 1
+
+
+def test_limits_parallelism():
+    lock = threading.Lock()
+    # Currently in flight, most in flight at once, started
+    in_flight = [0, 0, 0]
+    # Holds the first requests until all 3 allowed ones are in flight, so the
+    # test doesn't depend on them overlapping by chance
+    barrier = threading.Barrier(3, timeout=5)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+            in_flight[2] += 1
+            started = in_flight[2]
+        if started <= 3:
+            barrier.wait()
+        time.sleep(0.1)
+        with lock:
+            in_flight[0] -= 1
+        body = json.loads(request.content)
+        return httpx.Response(200, json={"matchedLogs": len(body["updates"])})
+
+    op_client = make_client(handler)
+
+    resp = op_client.update_log_tags_batch(
+        ((f"chatcmpl-{i}", {"label": "x"}) for i in range(10000)), max_parallelism=3
+    )
+
+    assert resp.matched_logs == 10000
+    assert in_flight[1] == 3
+
+
+def test_stops_after_a_failed_request():
+    requests = []
+    op_client = make_client(tags_handler(requests, fail_on="chatcmpl-0"))
+
+    with pytest.raises(ApiError):
+        op_client.update_log_tags_batch(
+            ((f"chatcmpl-{i}", {"label": "x"}) for i in range(100000)),
+            max_parallelism=2,
+        )
+
+    assert len(requests) < 100
+
+
+async def test_async_update_log_tags_batch():
+    requests = []
+    op_client = AsyncOpenPipe(
+        api_key="test-key", base_url="https://openpipe.test/api/v1"
+    )
+    op_client.base_client._client_wrapper.httpx_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(tags_handler(requests))
+    )
+
+    resp = await op_client.update_log_tags_batch(
+        [(f"chatcmpl-{i}", {"label": "x"}) for i in range(2500)] + [("missing", {})],
+        max_parallelism=2,
+    )
+
+    assert resp.matched_logs == 2500
+    assert sorted(len(r["updates"]) for r in requests) == [501, 1000, 1000]
@@ -0,0 +1,143 @@
+"""
+Rewrites the client generated by Fern in openpipe/api_client so that its types
+are imported on first use rather than all at once, since importing every type
+up front is a large part of the time taken by `import openpipe`. Run after every
+`fern generate`; scripts/codegen-clients.ts in the app does so.
+
+- The `__init__.py` of api_client and api_client/types resolve their exports
+  through a module `__getattr__`. The generated imports are kept under
+  TYPE_CHECKING for type checkers.
+- api_client/client.py only imports the chat completion types for type
+  checking, and imports the response type when a completion is created.
+
+Files that were already rewritten are left as they are.
+
+Usage: python scripts/lazy_api_client.py
+"""
+
+import ast
+import os
+import re
+from typing import Callable, Dict, List, Tuple
+
+API_CLIENT_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(__file__), "..", "openpipe", "api_client")
+)
+HEADER = "# This file was auto-generated by Fern from our API Definition.\n"
+
+LAZY_COMMENT = """\
+# Submodules are only imported when one of their exports is first used, since
+# importing every type up front is a large part of the time taken by `import openpipe`.
+"""
+
+LAZY_FUNCTIONS = """
+
+def __getattr__(name: str) -> typing.Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted([*globals(), *_EXPORTS])
+"""
+
+# Types the generated client only needs when creating a chat completion
+DEFERRED_TYPES_PREFIX = "from .types.create_chat_completion_"
+DEFERRED_TYPES_COMMENT = """\
+    # Only imported when creating a chat completion, since these types make up
+    # half of the time taken to import the client
+"""
+COMPLETION_RESPONSE_IMPORT = (
+    "from .types.create_chat_completion_response import CreateChatCompletionResponse"
+)
+
+
+def make_package_lazy(source: str) -> str:
+    """Rewrites the eager imports of a generated `__init__.py` into a lazy module."""
+    if "_EXPORTS" in source:
+        return source
+    if not source.startswith(HEADER):
+        raise ValueError("Not a file generated by Fern")
+
+    body = source[len(HEADER) :].lstrip("\n")
+    all_start = body.index("\n__all__ = [")
+    imports, exports = body[:all_start].strip("\n"), body[all_start:]
+
+    modules: Dict[str, str] = {}
+    for node in ast.parse(imports).body:
+        if not isinstance(node, ast.ImportFrom):
+            raise ValueError(f"Unexpected statement on line {node.lineno}")
+        for alias in node.names:
+            modules[alias.asname or alias.name] = "." * node.level + (node.module or "")
+
+    indented = "\n".join(
+        f"    {line}" if line else line for line in imports.split("\n")
+    )
+    export_lines = "\n".join(
+        f'    "{name}": "{module}",' for name, module in modules.items()
+    )
+    return (
+        f"{HEADER}\n{LAZY_COMMENT}\nimport importlib\nimport typing\n\n"
+        f"if typing.TYPE_CHECKING:\n{indented}\n\n"
+        f"_EXPORTS = {{\n{export_lines}\n}}\n"
+        f"{LAZY_FUNCTIONS}\n{exports}"
+    )
+
+
+def defer_completion_types(source: str) -> str:
+    """Moves the chat completion imports of the generated client under TYPE_CHECKING."""
+    if "if typing.TYPE_CHECKING:" in source:
+        return source
+    if not source.startswith(HEADER):
+        raise ValueError("Not a file generated by Fern")
+
+    lines = source[len(HEADER) :].split("\n")
+    deferred = [line for line in lines if line.startswith(DEFERRED_TYPES_PREFIX)]
+    lines = [line for line in lines if not line.startswith(DEFERRED_TYPES_PREFIX)]
+    last_import = max(
+        i for i, line in enumerate(lines) if line.startswith("from .types.")
+    )
+    block = [
+        "",
+        "if typing.TYPE_CHECKING:",
+        *DEFERRED_TYPES_COMMENT.rstrip("\n").split("\n"),
+    ]
+    block += [f"    {line}" for line in deferred]
+    lines[last_import + 1 : last_import + 1] = block
+
+    body = "\n".join(lines)
+    # The annotations of the deferred types are only evaluated by type checkers
+    body = re.sub(
+        r"^( +)(return pydantic\.parse_obj_as\(CreateChatCompletionResponse,)",
+        rf"\1{COMPLETION_RESPONSE_IMPORT}\n\n\1\2",
+        body,
+        flags=re.MULTILINE,
+    )
+    return f"{HEADER}\nfrom __future__ import annotations\n{body}"
+
+
+REWRITES: List[Tuple[str, Callable[[str], str]]] = [
+    ("__init__.py", make_package_lazy),
+    (os.path.join("types", "__init__.py"), make_package_lazy),
+    ("client.py", defer_completion_types),
+]
+
+
+def main() -> None:
+    for path, rewrite in REWRITES:
+        full_path = os.path.join(API_CLIENT_DIR, path)
+        with open(full_path) as f:
+            source = f.read()
+        rewritten = rewrite(source)
+        if rewritten != source:
+            with open(full_path, "w") as f:
+                f.write(rewritten)
+            print(f"Rewrote {full_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -290,6 +290,59 @@ export class DefaultService {
             mediaType: 'application/json',
         });
     }
+    /**
+     * Report up to 500 API calls in a single request. Each call is recorded independently and its outcome is returned in `results`, in the same order as `calls`.
+     * @param requestBody
+     * @returns any Successful response
+     * @throws ApiError
+     */
+    public reportBatch(
+        requestBody: {
+            calls: Array<{
+                /**
+                 * Unix timestamp in milliseconds
+                 */
+                requestedAt?: number;
+                /**
+                 * Unix timestamp in milliseconds
+                 */
+                receivedAt?: number;
+                /**
+                 * JSON-encoded request payload
+                 */
+                reqPayload?: any;
+                /**
+                 * JSON-encoded response payload
+                 */
+                respPayload?: any;
+                /**
+                 * HTTP status code of response
+                 */
+                statusCode?: number;
+                /**
+                 * User-friendly error message
+                 */
+                errorMessage?: string;
+                /**
+                 * Extra tags to attach to the call for filtering. Eg { "userId": "123", "promptId": "populate-title" }
+                 */
+                tags?: Record<string, (string | number | boolean | 'null' | null)>;
+            }>;
+        },
+    ): CancelablePromise<{
+        results: Array<{
+            index: number;
+            status: ('ok' | 'error');
+            errorMessage?: string;
+        }>;
+    }> {
+        return this.httpRequest.request({
+            method: 'POST',
+            url: '/report/batch',
+            body: requestBody,
+            mediaType: 'application/json',
+        });
+    }
     /**
      * Update tags for logged calls matching the provided filters
      * @param requestBody
@@ -320,6 +373,32 @@ export class DefaultService {
             mediaType: 'application/json',
         });
     }
+    /**
+     * Update tags for up to 1000 logged calls in a single request, each identified by its `completionId`. Updates are applied in order, so later updates to the same call take precedence.
+     * @param requestBody
+     * @returns any Successful response
+     * @throws ApiError
+     */
+    public updateLogTagsBatch(
+        requestBody: {
+            updates: Array<{
+                completionId: string;
+                /**
+                 * Tags to set on the call. Set a tag to null to remove it. Eg { "label": "positive", "reviewed": true }
+                 */
+                tags: Record<string, (string | number | boolean | 'null' | null)>;
+            }>;
+        },
+    ): CancelablePromise<{
+        matchedLogs: number;
+    }> {
+        return this.httpRequest.request({
+            method: 'POST',
+            url: '/logs/update-tags/batch',
+            body: requestBody,
+            mediaType: 'application/json',
+        });
+    }
     /**
      * Get the latest logged call (only for local testing)
      * @returns any Successful response
@@ -0,0 +1,434 @@
+import hashlib
+import logging
+import math
+import os
+import posixpath
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+MB = 1024 * 1024
+
+# Files larger than this are transferred in parts
+MULTIPART_THRESHOLD = 64 * MB
+MULTIPART_CHUNKSIZE = 64 * MB
+# S3 rejects multipart uploads with more parts than this
+MAX_PARTS = 10000
+# Chunk size boto3 uses by default, for recognizing objects uploaded by other tools
+BOTO3_DEFAULT_CHUNKSIZE = 8 * MB
+
+# Connections shared by every file in a transfer
+MAX_CONNECTIONS = 64
+MAX_FILE_WORKERS = 16
+
+# Parts of S3MultipartWriter uploads, which can be at most 10000 parts long
+STREAM_PART_SIZE = 64 * MB
+STREAM_MAX_CONCURRENCY = 8
+# Bytes between progress log lines of S3MultipartWriter
+STREAM_LOG_INTERVAL = 1024 * MB
+
+
+class S3TransferError(Exception):
+    def __init__(self, failures: Dict[str, Exception]):
+        self.failures = failures
+        first_key, first_error = next(iter(failures.items()))
+        super().__init__(
+            f"{len(failures)} file(s) failed to transfer, "
+            f"first {first_key}: {first_error}"
+        )
+
+
+class TransferStats:
+    def __init__(self):
+        self.files = 0
+        self.skipped = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second"""
+        return self.bytes / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.files} files ({self.bytes / MB:.1f} MB) in {self.seconds:.1f}s, "
+            f"{self.throughput / MB:.1f} MB/s; {self.skipped} unchanged files skipped"
+        )
+
+
+def chunk_size(size: int) -> int:
+    """The part size used for a file, which also determines its ETag."""
+    return max(MULTIPART_CHUNKSIZE, math.ceil(size / MAX_PARTS / MB) * MB)
+
+
+def file_etag(path: str, part_size: Optional[int] = None) -> str:
+    """
+    Computes the ETag S3 gives an unencrypted object uploaded from `path`: the
+    MD5 of its content, or when uploaded in parts of `part_size`, the MD5 of
+    the MD5s of its parts followed by the number of parts.
+    """
+    read_size = part_size or BOTO3_DEFAULT_CHUNKSIZE
+    whole = hashlib.md5()
+    digests = []
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(read_size)
+            if not block:
+                break
+            if part_size is None:
+                whole.update(block)
+            else:
+                digests.append(hashlib.md5(block).digest())
+    if part_size is None:
+        return whole.hexdigest()
+    return f"{hashlib.md5(b''.join(digests)).hexdigest()}-{len(digests)}"
+
+
+def is_unchanged(path: str, size: int, etag: str) -> bool:
+    """Whether the local file at `path` has the content of an object."""
+    if not os.path.isfile(path) or os.path.getsize(path) != size:
+        return False
+    etag = etag.strip('"')
+    if "-" not in etag:
+        return file_etag(path) == etag
+
+    parts = int(etag.split("-")[1])
+    # Try the part sizes that would have produced that many parts
+    for part_size in (chunk_size(size), BOTO3_DEFAULT_CHUNKSIZE):
+        if math.ceil(size / part_size) == parts and file_etag(path, part_size) == etag:
+            return True
+    return False
+
+
+def list_objects(client, bucket: str, prefix: str) -> Dict[str, Tuple[int, str]]:
+    """Lists every object under a prefix, as {key: (size, etag)}."""
+    objects = {}
+    paginator = client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            objects[obj["Key"]] = (obj["Size"], obj["ETag"])
+    return objects
+
+
+def _directory_prefix(prefix: str) -> str:
+    # So that e.g. "models/a:1" doesn't also list "models/a:10"
+    return prefix.rstrip("/") + "/"
+
+
+def _concurrency(sizes: List[int]) -> Tuple[int, int]:
+    """
+    Splits the connections between files transferred at once and parts of each
+    file: many small files are transferred side by side, while a few large
+    files are each split across many connections.
+    """
+    if not sizes:
+        return 1, 1
+    largest = max(max(sizes), 1)
+    file_workers = min(
+        MAX_FILE_WORKERS, len(sizes), max(1, math.ceil(sum(sizes) / largest))
+    )
+    return file_workers, max(1, MAX_CONNECTIONS // file_workers)
+
+
+def _create_client():
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
+        "s3",
+        config=Config(
+            max_pool_connections=MAX_CONNECTIONS + MAX_FILE_WORKERS,
+            retries={"max_attempts": 5, "mode": "adaptive"},
+        ),
+    )
+
+
+def _transfer_config(size: int, max_concurrency: int):
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(
+        multipart_threshold=MULTIPART_THRESHOLD,
+        multipart_chunksize=chunk_size(size),
+        max_concurrency=max_concurrency,
+    )
+
+
+def _run(
+    transfers: List[Tuple[str, int]],
+    transfer,
+    stats: TransferStats,
+) -> None:
+    """
+    Calls `transfer(key, size, max_concurrency)` for each (key, size), largest
+    first so that big files don't start last, and raises S3TransferError if any
+    failed after the others finished.
+    """
+    transfers = sorted(transfers, key=lambda t: t[1], reverse=True)
+    file_workers, per_file = _concurrency([size for _, size in transfers])
+    failures: Dict[str, Exception] = {}
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=file_workers) as executor:
+        futures = {
+            executor.submit(transfer, key, size, per_file): (key, size)
+            for key, size in transfers
+        }
+        for future in as_completed(futures):
+            key, size = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Error transferring {key}: {e}")
+                failures[key] = e
+                continue
+            stats.files += 1
+            stats.bytes += size
+    stats.seconds = time.perf_counter() - started
+
+    if failures:
+        raise S3TransferError(failures)
+
+
+def upload_directory(
+    local_directory: str,
+    destination: str,
+    bucket: str,
+    client=None,
+) -> TransferStats:
+    """
+    Uploads every file under a directory to `destination`, skipping files whose
+    content matches the object already there.
+    """
+    client = client or _create_client()
+    stats = TransferStats()
+
+    existing = list_objects(client, bucket, _directory_prefix(destination))
+    uploads: Dict[str, str] = {}
+    transfers = []
+    for root, _, files in os.walk(local_directory):
+        for filename in files:
+            local_path = os.path.join(root, filename)
+            relative_path = os.path.relpath(local_path, local_directory)
+            key = posixpath.join(destination, *relative_path.split(os.sep))
+            size = os.path.getsize(local_path)
+            if key in existing and is_unchanged(local_path, *existing[key]):
+                stats.skipped += 1
+                continue
+            uploads[key] = local_path
+            transfers.append((key, size))
+
+    def upload(key: str, size: int, max_concurrency: int) -> None:
+        client.upload_file(
+            uploads[key],
+            bucket,
+            key,
+            Config=_transfer_config(size, max_concurrency),
+        )
+
+    _run(transfers, upload, stats)
+    logging.info(f"Uploaded {stats}")
+    return stats
+
+
+def download_directory(
+    bucket: str,
+    s3_prefix: str,
+    local_directory: str,
+    client=None,
+) -> TransferStats:
+    """
+    Downloads every object under a prefix into a directory, skipping files
+    already there with the same content.
+    """
+    client = client or _create_client()
+    stats = TransferStats()
+
+    objects = list_objects(client, bucket, _directory_prefix(s3_prefix))
+    if not objects:
+        raise FileNotFoundError(f"No objects found at s3://{bucket}/{s3_prefix}")
+
+    downloads: Dict[str, str] = {}
+    transfers = []
+    for key, (size, etag) in objects.items():
+        relative_path = key[len(s3_prefix) :].lstrip("/")
+        if not relative_path or key.endswith("/"):
+            # Placeholder objects for directories
+            continue
+        local_path = os.path.join(local_directory, *relative_path.split("/"))
+        if is_unchanged(local_path, size, etag):
+            stats.skipped += 1
+            continue
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        downloads[key] = local_path
+        transfers.append((key, size))
+
+    def download(key: str, size: int, max_concurrency: int) -> None:
+        client.download_file(
+            bucket,
+            key,
+            downloads[key],
+            Config=_transfer_config(size, max_concurrency),
+        )
+
+    _run(transfers, download, stats)
+    logging.info(f"Downloaded {stats}")
+    return stats
+
+
+class S3MultipartWriter:
+    """
+    A write-only file object that streams what is written to it into an S3
+    multipart upload, so data of unknown size can be uploaded without writing
+    it to disk first. Parts are uploaded from background threads while the
+    caller keeps writing; at most `max_concurrency` parts are held in memory.
+
+    The upload is completed when the writer is closed, or aborted if it's
+    closed by an exception in a `with` block or a part fails to upload.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        key: str,
+        client=None,
+        part_size: int = STREAM_PART_SIZE,
+        max_concurrency: int = STREAM_MAX_CONCURRENCY,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ):
+        self.bucket = bucket
+        self.key = key
+        self.client = client or _create_client()
+        self.part_size = part_size
+        self.on_progress = on_progress
+        self.bytes_uploaded = 0
+        self.closed = False
+
+        self._buffer = bytearray()
+        self._position = 0
+        self._parts: List[Future] = []
+        self._slots = threading.Semaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._next_log = STREAM_LOG_INTERVAL
+        self._upload_id = self.client.create_multipart_upload(Bucket=bucket, Key=key)[
+            "UploadId"
+        ]
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("write to closed S3MultipartWriter")
+        self._buffer += data
+        self._position += len(data)
+        while len(self._buffer) >= self.part_size:
+            self._submit_part(bytes(self._buffer[: self.part_size]))
+            del self._buffer[: self.part_size]
+        return len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if self._buffer or not self._parts:
+                self._submit_part(bytes(self._buffer))
+                self._buffer = bytearray()
+            parts = [part.result() for part in self._parts]
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            self.abort()
+            raise
+        finally:
+            self._executor.shutdown(wait=True)
+            self.closed = True
+
+        seconds = time.perf_counter() - self._started
+        logging.info(
+            f"Uploaded s3://{self.bucket}/{self.key} "
+            f"({self.bytes_uploaded / MB:.1f} MB) in {seconds:.1f}s, "
+            f"{self.bytes_uploaded / MB / max(seconds, 1e-9):.1f} MB/s"
+        )
+
+    def abort(self) -> None:
+        """Discards the parts uploaded so far."""
+        if self.closed:
+            return
+        for part in self._parts:
+            part.cancel()
+        self._executor.shutdown(wait=True)
+        self.closed = True
+        self.client.abort_multipart_upload(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+        )
+
+    def __enter__(self) -> "S3MultipartWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    def raise_if_failed(self) -> None:
+        """Raises the error of the first part that failed to upload, if any."""
+        for part in self._parts:
+            if part.done() and not part.cancelled() and part.exception() is not None:
+                raise part.exception()
+
+    def _submit_part(self, data: bytes) -> None:
+        # Surface failed parts as soon as possible rather than on close
+        self.raise_if_failed()
+
+        self._slots.acquire()
+        part_number = len(self._parts) + 1
+        try:
+            self._parts.append(
+                self._executor.submit(self._upload_part, part_number, data)
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _upload_part(self, part_number: int, data: bytes) -> Dict:
+        try:
+            response = self.client.upload_part(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                PartNumber=part_number,
+                Body=data,
+            )
+        finally:
+            self._slots.release()
+
+        with self._lock:
+            self.bytes_uploaded += len(data)
+            uploaded = self.bytes_uploaded
+            should_log = uploaded >= self._next_log
+            if should_log:
+                self._next_log += STREAM_LOG_INTERVAL
+        if should_log:
+            seconds = time.perf_counter() - self._started
+            logging.info(
+                f"Uploaded {uploaded / MB:.1f} MB to s3://{self.bucket}/{self.key}, "
+                f"{uploaded / MB / max(seconds, 1e-9):.1f} MB/s"
+            )
+        if self.on_progress is not None:
+            self.on_progress(uploaded)
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
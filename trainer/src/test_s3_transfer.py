@@ -0,0 +1,182 @@
+import os
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from src.s3_transfer import (
+    S3MultipartWriter,
+    S3TransferError,
+    BOTO3_DEFAULT_CHUNKSIZE,
+    MB,
+    download_directory,
+    list_objects,
+    upload_directory,
+)
+
+BUCKET = "test-bucket"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def write_files(directory, files):
+    for name, content in files.items():
+        path = os.path.join(directory, *name.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+
+
+def test_lists_more_than_one_page_of_objects(s3):
+    # list_objects_v2 returns at most 1000 keys per page
+    for i in range(1001):
+        s3.put_object(Bucket=BUCKET, Key=f"models/a:1/{i:04d}", Body=b"x")
+
+    objects = list_objects(s3, BUCKET, "models/a:1/")
+
+    assert len(objects) == 1001
+    assert objects["models/a:1/1000"][0] == 1
+
+
+def test_prefixes_exclude_siblings(s3, tmp_path):
+    s3.put_object(Bucket=BUCKET, Key="models/a:1/adapter.bin", Body=b"one")
+    s3.put_object(Bucket=BUCKET, Key="models/a:10/adapter.bin", Body=b"ten")
+    s3.put_object(Bucket=BUCKET, Key="models/a:10/extra.bin", Body=b"ten")
+
+    stats = download_directory(BUCKET, "models/a:1", str(tmp_path), client=s3)
+
+    assert stats.files == 1
+    assert os.listdir(tmp_path) == ["adapter.bin"]
+    assert (tmp_path / "adapter.bin").read_bytes() == b"one"
+
+    # Only objects under the prefix itself count as already uploaded
+    write_files(str(tmp_path), {"extra.bin": b"ten"})
+    stats = upload_directory(str(tmp_path), "models/a:1", BUCKET, client=s3)
+    assert (stats.files, stats.skipped) == (1, 1)
+
+
+def test_skips_files_matching_multipart_etags(s3, tmp_path):
+    from boto3.s3.transfer import TransferConfig
+
+    # Uploaded by another tool with boto3's default 8MB parts
+    content = os.urandom(2 * BOTO3_DEFAULT_CHUNKSIZE + MB)
+    source = tmp_path / "source.bin"
+    source.write_bytes(content)
+    s3.upload_file(
+        str(source),
+        BUCKET,
+        "models/a:1/model.bin",
+        Config=TransferConfig(
+            multipart_threshold=BOTO3_DEFAULT_CHUNKSIZE,
+            multipart_chunksize=BOTO3_DEFAULT_CHUNKSIZE,
+        ),
+    )
+    etag = s3.head_object(Bucket=BUCKET, Key="models/a:1/model.bin")["ETag"]
+    assert etag.strip('"').endswith("-3")
+
+    local = tmp_path / "local"
+    write_files(str(local), {"model.bin": content})
+    stats = download_directory(BUCKET, "models/a:1", str(local), client=s3)
+    assert (stats.files, stats.skipped) == (0, 1)
+    stats = upload_directory(str(local), "models/a:1", BUCKET, client=s3)
+    assert (stats.files, stats.skipped) == (0, 1)
+
+    # Same size, different content
+    changed = bytearray(content)
+    changed[-1] ^= 0xFF
+    write_files(str(local), {"model.bin": bytes(changed)})
+    stats = download_directory(BUCKET, "models/a:1", str(local), client=s3)
+    assert (stats.files, stats.skipped) == (1, 0)
+    assert (local / "model.bin").read_bytes() == content
+
+
+def test_failures_are_collected_after_other_files_finish(s3, tmp_path):
+    write_files(
+        str(tmp_path), {"good.bin": b"good", "bad-1.bin": b"bad", "bad-2.bin": b"bad"}
+    )
+    upload_file = s3.upload_file
+
+    def fail_bad_files(path, bucket, key, **kwargs):
+        if "bad" in key:
+            raise ConnectionError(f"can't upload {key}")
+        return upload_file(path, bucket, key, **kwargs)
+
+    s3.upload_file = fail_bad_files
+    with pytest.raises(S3TransferError) as error:
+        upload_directory(str(tmp_path), "models/a:1", BUCKET, client=s3)
+
+    assert sorted(error.value.failures) == [
+        "models/a:1/bad-1.bin",
+        "models/a:1/bad-2.bin",
+    ]
+    assert all(isinstance(e, ConnectionError) for e in error.value.failures.values())
+    assert "2 file(s) failed" in str(error.value)
+    assert list(list_objects(s3, BUCKET, "models/a:1/")) == ["models/a:1/good.bin"]
+
+
+def test_writer_uploads_in_parts(s3):
+    data = os.urandom(12 * MB)
+    progress = []
+    with S3MultipartWriter(
+        BUCKET, "model.zip", client=s3, part_size=5 * MB, on_progress=progress.append
+    ) as upload:
+        for start in range(0, len(data), MB):
+            upload.write(data[start : start + MB])
+        assert upload.tell() == len(data)
+
+    body = s3.get_object(Bucket=BUCKET, Key="model.zip")["Body"].read()
+    assert body == data
+    assert upload.bytes_uploaded == len(data)
+    assert len(progress) == 3 and max(progress) == len(data)
+
+
+def test_writer_uploads_empty_files(s3):
+    with S3MultipartWriter(BUCKET, "empty.zip", client=s3):
+        pass
+
+    assert s3.get_object(Bucket=BUCKET, Key="empty.zip")["Body"].read() == b""
+
+
+def test_writer_aborts_on_exception(s3):
+    with pytest.raises(RuntimeError):
+        with S3MultipartWriter(BUCKET, "model.zip", client=s3, part_size=5 * MB) as w:
+            w.write(os.urandom(6 * MB))
+            raise RuntimeError("merge failed")
+
+    assert "Uploads" not in s3.list_multipart_uploads(Bucket=BUCKET)
+    assert "Contents" not in s3.list_objects_v2(Bucket=BUCKET)
+
+
+def test_writer_surfaces_failed_parts_before_close(s3):
+    upload = S3MultipartWriter(BUCKET, "model.zip", client=s3, part_size=5 * MB)
+    upload_part = s3.upload_part
+
+    def fail_second_part(**kwargs):
+        if kwargs["PartNumber"] == 2:
+            raise ConnectionError("connection reset")
+        return upload_part(**kwargs)
+
+    s3.upload_part = fail_second_part
+    upload.write(os.urandom(10 * MB))
+    upload._parts[-1].exception()
+
+    with pytest.raises(ConnectionError):
+        upload.raise_if_failed()
+    with pytest.raises(ConnectionError):
+        upload.write(os.urandom(5 * MB))
+    with pytest.raises(ConnectionError):
+        upload.close()
+
+    assert upload.closed
+    assert "Uploads" not in s3.list_multipart_uploads(Bucket=BUCKET)
+    assert "Contents" not in s3.list_objects_v2(Bucket=BUCKET)
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from ..shared import (
+    PREPARED_DATASET_CACHE_DIR,
+    logging,
+    prepared_dataset_cache_dir,
+)
+
+# Bump when a change to the training image changes how datasets are prepared
+CACHE_VERSION = 1
+
+# Settings that change the tokenized, packed dataset axolotl prepares
+CACHE_KEY_FIELDS = [
+    "base_model",
+    "base_model_config",
+    "tokenizer_type",
+    "special_tokens",
+    "sequence_len",
+    "sample_packing",
+    "eval_sample_packing",
+    "pad_to_sequence_len",
+    "train_on_inputs",
+    "val_set_size",
+]
+
+# Written once a prepared dataset is complete; its mtime is when it was last used
+COMPLETE_MARKER = ".complete"
+
+MAX_CACHE_BYTES = 200 * 1024**3
+MAX_ENTRY_AGE = 30 * 24 * 60 * 60
+# Entries still being prepared (possibly by another run) are left alone this long
+MAX_INCOMPLETE_AGE = 24 * 60 * 60
+
+
+def file_sha256(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(8 * 1024 * 1024), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def prepared_dataset_key(dataset_sha256: str, config: Dict[str, Any]) -> str:
+    """
+    Derives the cache key of a prepared dataset from the content of the
+    training file and the settings its preparation depends on.
+    """
+    key = {
+        "version": CACHE_VERSION,
+        "dataset": dataset_sha256,
+        "dataset_types": [dataset["type"] for dataset in config["datasets"]],
+        **{field: config.get(field) for field in CACHE_KEY_FIELDS},
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def lookup_prepared_dataset(
+    dataset_path: str, config: Dict[str, Any], dataset_sha256: Optional[str] = None
+) -> Tuple[str, bool]:
+    """
+    Returns the directory to use as axolotl's `dataset_prepared_path` for a
+    dataset and config, and whether a complete prepared dataset is already
+    there.
+    """
+    cache_key = prepared_dataset_key(
+        dataset_sha256 or file_sha256(dataset_path), config
+    )
+    path = prepared_dataset_cache_dir(cache_key)
+    marker = os.path.join(path, COMPLETE_MARKER)
+    if os.path.exists(marker):
+        os.utime(marker)
+        logging.info(f"Prepared dataset cache hit: {cache_key}")
+        return path, True
+
+    logging.info(f"Prepared dataset cache miss: {cache_key}")
+    # Clear out what an interrupted run may have left behind
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+    return path, False
+
+
+def mark_prepared_dataset_complete(path: str) -> None:
+    with open(os.path.join(path, COMPLETE_MARKER), "w"):
+        pass
+
+
+def _directory_size(path: str) -> int:
+    size = 0
+    for root, _, files in os.walk(path):
+        for filename in files:
+            try:
+                size += os.path.getsize(os.path.join(root, filename))
+            except OSError:
+                pass
+    return size
+
+
+def evict_prepared_datasets(
+    max_bytes: int = MAX_CACHE_BYTES,
+    max_age: float = MAX_ENTRY_AGE,
+    keep: Optional[str] = None,
+) -> None:
+    """
+    Deletes prepared datasets that haven't been used in `max_age` seconds, then
+    the least recently used ones until the cache fits in `max_bytes`. `keep` is
+    never deleted.
+    """
+    if not os.path.isdir(PREPARED_DATASET_CACHE_DIR):
+        return
+
+    now = time.time()
+    entries = []
+    for name in os.listdir(PREPARED_DATASET_CACHE_DIR):
+        path = os.path.join(PREPARED_DATASET_CACHE_DIR, name)
+        if path == keep or not os.path.isdir(path):
+            continue
+        marker = os.path.join(path, COMPLETE_MARKER)
+        if os.path.exists(marker):
+            last_used = os.path.getmtime(marker)
+            expired = now - last_used > max_age
+        else:
+            last_used = os.path.getmtime(path)
+            expired = now - last_used > MAX_INCOMPLETE_AGE
+            if not expired:
+                continue
+        entries.append((expired, last_used, path, _directory_size(path)))
+
+    total = sum(entry[3] for entry in entries)
+    if keep is not None and os.path.isdir(keep):
+        total += _directory_size(keep)
+
+    # Expired entries first, then least recently used
+    for expired, _, path, size in sorted(entries, key=lambda e: (not e[0], e[1])):
+        if not expired and total <= max_bytes:
+            break
+        logging.info(f"Evicting prepared dataset {os.path.basename(path)}")
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
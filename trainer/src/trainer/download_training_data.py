@@ -0,0 +1,387 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+from ..shared import logging
+
+CHUNK_SIZE = 16 * 1024 * 1024
+MAX_WORKERS = 8
+MAX_RETRIES = 5
+RETRY_DELAY = 1.0
+TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# Fields every row of the training file needs, as written by trainFineTune.task.ts
+REQUIRED_FIELDS = ("instruction", "output")
+# Upper bounds of the token length histogram buckets
+HISTOGRAM_BUCKETS = [2**i for i in range(6, 17)]
+# Rows whose fields are tokenized together in one call to `count_tokens`
+TOKENIZE_BATCH_SIZE = 256
+
+
+class TrainingDataError(Exception):
+    pass
+
+
+class TrainingDataStats:
+    def __init__(self):
+        self.rows = 0
+        self.bytes = 0
+        self.sha256 = ""
+        self.seconds = 0.0
+        # Upper bound of each bucket (None for longer rows) -> rows
+        self.token_histogram: Dict[Optional[int], int] = {}
+        self.max_tokens = 0
+        self.rows_over_sequence_len = 0
+
+    def __str__(self) -> str:
+        histogram = ", ".join(
+            f"<={bucket}: {self.token_histogram[bucket]}"
+            for bucket in HISTOGRAM_BUCKETS
+            if bucket in self.token_histogram
+        )
+        if None in self.token_histogram:
+            histogram += f", >{HISTOGRAM_BUCKETS[-1]}: {self.token_histogram[None]}"
+        summary = (
+            f"{self.rows} rows ({self.bytes / 1024**2:.1f} MB) in {self.seconds:.1f}s"
+        )
+        if self.token_histogram:
+            summary += (
+                f", max {self.max_tokens} tokens, "
+                f"{self.rows_over_sequence_len} rows over sequence_len. "
+                f"Token lengths: {histogram}"
+            )
+        return summary
+
+
+class _RowValidator:
+    """
+    Checks a JSONL file row by row as its bytes arrive in order, hashing it and
+    collecting stats along the way. Rows are tokenized in batches, since
+    tokenizers are much faster on a list of texts than one text at a time.
+    """
+
+    def __init__(
+        self,
+        required_fields: Sequence[str],
+        count_tokens: Optional[Callable[[List[str]], List[int]]],
+        sequence_len: Optional[int],
+    ):
+        self.required_fields = required_fields
+        self.count_tokens = count_tokens
+        self.sequence_len = sequence_len
+        self.stats = TrainingDataStats()
+        self.md5 = hashlib.md5()
+        self._sha256 = hashlib.sha256()
+        self._remainder = b""
+        # Fields of the rows waiting to be tokenized, in order
+        self._untokenized: List[str] = []
+
+    def feed(self, data: bytes) -> None:
+        self.md5.update(data)
+        self._sha256.update(data)
+        self.stats.bytes += len(data)
+        lines = (self._remainder + data).split(b"\n")
+        self._remainder = lines.pop()
+        for line in lines:
+            self._validate(line)
+
+    def finish(self) -> TrainingDataStats:
+        if self._remainder.strip():
+            self._validate(self._remainder)
+        self._tokenize()
+        if self.stats.rows == 0:
+            raise TrainingDataError("Training data has no rows")
+        self.stats.sha256 = self._sha256.hexdigest()
+        return self.stats
+
+    def _validate(self, line: bytes) -> None:
+        if not line.strip():
+            return
+        row_number = self.stats.rows + 1
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            raise TrainingDataError(f"Row {row_number} is not valid JSON: {e}")
+        if not isinstance(row, dict):
+            raise TrainingDataError(f"Row {row_number} is not an object")
+        for field in self.required_fields:
+            if not isinstance(row.get(field), str):
+                raise TrainingDataError(
+                    f"Row {row_number} is missing the string field {field!r}"
+                )
+        self.stats.rows = row_number
+
+        if self.count_tokens is None:
+            return
+        self._untokenized.extend(row[field] for field in self.required_fields)
+        if len(self._untokenized) >= TOKENIZE_BATCH_SIZE * len(self.required_fields):
+            self._tokenize()
+
+    def _tokenize(self) -> None:
+        if not self._untokenized:
+            return
+        counts = self.count_tokens(self._untokenized)
+        self._untokenized = []
+        fields = len(self.required_fields)
+        for start in range(0, len(counts), fields):
+            tokens = sum(counts[start : start + fields])
+            bucket = next((b for b in HISTOGRAM_BUCKETS if tokens <= b), None)
+            self.stats.token_histogram[bucket] = (
+                self.stats.token_histogram.get(bucket, 0) + 1
+            )
+            self.stats.max_tokens = max(self.stats.max_tokens, tokens)
+            if self.sequence_len is not None and tokens > self.sequence_len:
+                self.stats.rows_over_sequence_len += 1
+
+
+def _expected_md5(response: httpx.Response) -> Optional[str]:
+    # Azure returns the MD5 of the whole blob on range requests in its own header
+    content_md5 = response.headers.get("x-ms-blob-content-md5")
+    if content_md5 is None and response.status_code == 200:
+        content_md5 = response.headers.get("content-md5")
+    if content_md5 is None:
+        return None
+    return base64.b64decode(content_md5).hex()
+
+
+def _load_state(state_path: str, etag: Optional[str], size: int) -> List[int]:
+    """Returns the chunks a previous attempt finished downloading, if any."""
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if etag is None or state.get("etag") != etag or state.get("size") != size:
+        return []
+    return state["chunks"]
+
+
+class _ChunkedDownload:
+    def __init__(
+        self,
+        client: httpx.Client,
+        url: str,
+        part_path: str,
+        size: int,
+        etag: Optional[str],
+        chunk_size: int,
+    ):
+        self.client = client
+        self.url = url
+        self.part_path = part_path
+        self.state_path = part_path + ".json"
+        self.size = size
+        self.etag = etag
+        self.chunk_size = chunk_size
+        self.chunk_count = -(-size // chunk_size)
+
+        self.done = set()
+        if os.path.exists(part_path) and os.path.getsize(part_path) == size:
+            self.done.update(_load_state(self.state_path, etag, size))
+        self.failed = threading.Event()
+        self._frontier = 0
+        self._lock = threading.Lock()
+        self._progress = threading.Condition(self._lock)
+
+        if not self.done:
+            with open(part_path, "wb") as f:
+                f.truncate(size)
+        self._advance_frontier()
+        if self.done:
+            logging.info(f"Resuming download, {len(self.done)} chunks already done")
+
+    def frontier(self) -> int:
+        """Bytes from the start of the file that have all been downloaded."""
+        return min(self._frontier * self.chunk_size, self.size)
+
+    def wait_for(self, offset: int) -> int:
+        """Blocks until the frontier is past `offset` or the download failed."""
+        with self._progress:
+            self._progress.wait_for(
+                lambda: self.frontier() > offset or self.failed.is_set()
+            )
+            return self.frontier()
+
+    def fetch(self, chunk: int) -> None:
+        start = chunk * self.chunk_size
+        end = min(start + self.chunk_size, self.size)
+        received = 0
+        for attempt in range(MAX_RETRIES + 1):
+            if self.failed.is_set():
+                return
+            headers = {"Range": f"bytes={start + received}-{end - 1}"}
+            if self.etag is not None:
+                # Fail rather than mix chunks of two versions of the file
+                headers["If-Match"] = self.etag
+            try:
+                with self.client.stream("GET", self.url, headers=headers) as response:
+                    if response.status_code == 412:
+                        raise TrainingDataError(
+                            "Training data changed while downloading"
+                        )
+                    if response.status_code != 206:
+                        response.read()
+                        response.raise_for_status()
+                        raise TrainingDataError(
+                            f"Expected a range response, got {response.status_code}"
+                        )
+                    with open(self.part_path, "r+b") as f:
+                        f.seek(start + received)
+                        for data in response.iter_bytes():
+                            if self.failed.is_set():
+                                return
+                            f.write(data[: end - start - received])
+                            received += len(data)
+                if received < end - start:
+                    raise httpx.ReadError("Connection closed before the chunk ended")
+                break
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                client_error = (
+                    isinstance(e, httpx.HTTPStatusError)
+                    and e.response.status_code < 500
+                )
+                if attempt == MAX_RETRIES or client_error:
+                    raise
+                logging.warning(f"Retrying chunk {chunk} from byte {received}: {e}")
+                time.sleep(RETRY_DELAY * 2**attempt)
+
+        with self._progress:
+            self.done.add(chunk)
+            self._advance_frontier()
+            self._save_state()
+            self._progress.notify_all()
+
+    def fail(self) -> None:
+        self.failed.set()
+        with self._progress:
+            self._progress.notify_all()
+
+    def _advance_frontier(self) -> None:
+        while self._frontier in self.done:
+            self._frontier += 1
+
+    def _save_state(self) -> None:
+        if self.etag is None:
+            return
+        with open(self.state_path, "w") as f:
+            json.dump(
+                {"etag": self.etag, "size": self.size, "chunks": sorted(self.done)}, f
+            )
+
+
+def download_training_data(
+    url: str,
+    path: str,
+    count_tokens: Optional[Callable[[List[str]], List[int]]] = None,
+    sequence_len: Optional[int] = None,
+    required_fields: Sequence[str] = REQUIRED_FIELDS,
+    chunk_size: int = CHUNK_SIZE,
+    max_workers: int = MAX_WORKERS,
+) -> TrainingDataStats:
+    """
+    Downloads a JSONL training file to `path`, validating its rows while it
+    downloads so a malformed file fails within seconds rather than once training
+    starts. Chunks are fetched in parallel with ranged requests when the server
+    supports them, each one retried from where it stopped; the progress of
+    an interrupted download is kept next to `path` and resumed by the next call.
+    The file is checked against the MD5 the server reports, when it reports one.
+
+    Returns the row count, token length histogram (when `count_tokens` is
+    given) and SHA-256 of the file. `count_tokens` is called with a batch of
+    texts and returns the number of tokens in each.
+    """
+    started = time.perf_counter()
+    part_path = path + ".part"
+    validator = _RowValidator(required_fields, count_tokens, sequence_len)
+
+    with httpx.Client(timeout=TIMEOUT, follow_redirects=True) as client:
+        with client.stream("GET", url, headers={"Range": "bytes=0-0"}) as probe:
+            if probe.status_code == 206:
+                probe.read()
+                size = int(probe.headers["content-range"].rsplit("/", 1)[1])
+                etag = probe.headers.get("etag")
+                expected_md5 = _expected_md5(probe)
+            else:
+                probe.raise_for_status()
+                # No range support, so download in one stream
+                logging.info("Server doesn't support ranges, downloading in one stream")
+                expected_md5 = _expected_md5(probe)
+                with open(part_path, "wb") as f:
+                    for data in probe.iter_bytes():
+                        validator.feed(data)
+                        f.write(data)
+                size = None
+
+        if size is not None:
+            _download_chunks(
+                client, url, part_path, size, etag, chunk_size, max_workers, validator
+            )
+
+    stats = validator.finish()
+    if expected_md5 is not None and validator.md5.hexdigest() != expected_md5:
+        os.remove(part_path)
+        raise TrainingDataError(
+            f"Checksum mismatch: expected MD5 {expected_md5}, "
+            f"got {validator.md5.hexdigest()}"
+        )
+    os.replace(part_path, path)
+    if os.path.exists(part_path + ".json"):
+        os.remove(part_path + ".json")
+
+    stats.seconds = time.perf_counter() - started
+    logging.info(f"Downloaded training data: {stats}")
+    return stats
+
+
+def _download_chunks(
+    client: httpx.Client,
+    url: str,
+    part_path: str,
+    size: int,
+    etag: Optional[str],
+    chunk_size: int,
+    max_workers: int,
+    validator: _RowValidator,
+) -> None:
+    download = _ChunkedDownload(client, url, part_path, size, etag, chunk_size)
+    pending = [c for c in range(download.chunk_count) if c not in download.done]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(download.fetch, chunk) for chunk in pending]
+        for future in futures:
+            future.add_done_callback(
+                lambda f: (
+                    download.fail()
+                    if f.cancelled() or f.exception() is not None
+                    else None
+                )
+            )
+
+        # Validate the start of the file while the rest downloads
+        try:
+            # Unbuffered, so nothing past the frontier is read ahead of the workers
+            with open(part_path, "rb", buffering=0) as f:
+                offset = 0
+                while offset < size:
+                    frontier = download.wait_for(offset)
+                    if download.failed.is_set():
+                        break
+                    while offset < frontier:
+                        data = f.read(min(chunk_size, frontier - offset))
+                        validator.feed(data)
+                        offset += len(data)
+        except BaseException:
+            download.fail()
+            for future in futures:
+                future.cancel()
+            raise
+
+        for future in futures:
+            future.result()
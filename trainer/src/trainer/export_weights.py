@@ -4,9 +4,12 @@ from ..api_client.models.report_model_export_complete_json_body import (
 import modal
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 from .base import stub
+from .merge_lora import merge_lora_shards, base_model_dir
 from ..shared import lora_s3_path, logging, download_directory_from_s3
+from ..s3_transfer import S3MultipartWriter
 from ..api import client
 
 from ..api_client.api.default import get_model_export_info, report_model_export_complete
@@ -16,14 +19,13 @@ from ..api_client.api.default import get_model_export_info, report_model_export_
     volumes={"/models": stub.volume},
     timeout=60 * 60 * 4,
     secrets=[modal.Secret.from_name("openpipe")],
-    memory=100000,
+    # The merge holds one shard of the base model in memory at a time
+    memory=32768,
 )
 async def do_export_weights(export_id: str, base_url: str):
-    from transformers import AutoModelForCausalLM, AutoTokenizer
-    from peft import PeftModel
+    from transformers import AutoTokenizer
     import zipfile
     import boto3
-    import torch
 
     logging.info(f"Beginning export process for model {export_id}")
     api_client = client(base_url)
@@ -51,49 +53,64 @@ async def do_export_weights(export_id: str, base_url: str):
 
     logging.info(f"Model downloaded to {lora_dir}")
 
-    logging.info("Loading model")
-    model = AutoModelForCausalLM.from_pretrained(
-        model_info.base_model,
-    )
     tokenizer = AutoTokenizer.from_pretrained(
         model_info.base_model,
     )
 
-    model = PeftModel.from_pretrained(model, lora_dir)
-
-    logging.info("Merging model")
+    logging.info(
+        f"Merging model as {model_info.weights_format} and uploading to "
+        f"s3://{model_info.s_3_bucket_name}/{model_info.s_3_key}"
+    )
     merged_dir = tempfile.mkdtemp()
-    model = model.merge_and_unload()
-
-    if model_info.weights_format == "bf16":
-        logging.info("Converting model to bf16")
-        model = model.bfloat16()
-    elif model_info.weights_format == "fp16":
-        logging.info("Converting model to fp16")
-        model = model.half()
-    else: # fp32
-        logging.info("Converting model to fp32")
-        model = model.float()
-
-    model.save_pretrained(merged_dir)
-    tokenizer.save_pretrained(merged_dir)
-
-    logging.info("Model successfully merged")
-
-    out_file = tempfile.mktemp(suffix=".zip")
-    with zipfile.ZipFile(out_file, "w", zipfile.ZIP_STORED) as zipf:
+    # Merged files are added to a zip that's streamed straight into a multipart
+    # upload, so merging, zipping and uploading overlap and the zip is never
+    # written to disk.
+    with S3MultipartWriter(
+        model_info.s_3_bucket_name, model_info.s_3_key
+    ) as upload, ThreadPoolExecutor(max_workers=1) as zipper:
+        zipf = zipfile.ZipFile(upload, "w", zipfile.ZIP_STORED)
+        zipping = {}
+
+        def add_to_zip(name: str):
+            file_path = os.path.join(merged_dir, name)
+            zipf.write(file_path, name)
+            # Shards are large and no longer needed once they're in the upload
+            os.remove(file_path)
+
+        def on_file_written(name: str):
+            # Stop merging as soon as a file fails to be zipped or uploaded,
+            # rather than after every shard has been merged
+            try:
+                upload.raise_if_failed()
+                for future in zipping.values():
+                    if future.done() and not future.cancelled():
+                        future.result()
+            except BaseException:
+                for future in zipping.values():
+                    future.cancel()
+                raise
+            zipping[name] = zipper.submit(add_to_zip, name)
+
+        merge_lora_shards(
+            base_model_dir=base_model_dir(model_info.base_model),
+            lora_dir=lora_dir,
+            output_dir=merged_dir,
+            weights_format=model_info.weights_format,
+            on_file_written=on_file_written,
+        )
+        tokenizer.save_pretrained(merged_dir)
         for file in os.listdir(merged_dir):
-            file_path = os.path.join(merged_dir, file)
-            if os.path.isfile(file_path):
-                zipf.write(file_path, file)
+            if file not in zipping and os.path.isfile(os.path.join(merged_dir, file)):
+                on_file_written(file)
 
-    logging.info("Model successfully zipped")
+        logging.info("Model successfully merged")
+        for future in zipping.values():
+            future.result()
+        zipf.close()
 
-    # Upload to S3
-    s3_client = boto3.client("s3")
-
-    s3_client.upload_file(out_file, model_info.s_3_bucket_name, model_info.s_3_key)
+    logging.info("Model successfully zipped and uploaded to S3")
 
+    s3_client = boto3.client("s3")
     s3_client.put_object_acl(
         ACL="public-read", Bucket=model_info.s_3_bucket_name, Key=model_info.s_3_key
     )
@@ -26,12 +26,14 @@ with image.imports():
 def train(fine_tune_id: str, base_url: str):
     from .train import do_train
 
-    do_train(fine_tune_id, base_url)
-
-    # Save the model to the cache volume
-    logging.info("Persisting model cache")
-    stub.volume.commit()
-    logging.info("Cache persisted")
+    try:
+        do_train(fine_tune_id, base_url)
+    finally:
+        # Save the model, and the prepared dataset even if training failed so
+        # that a retry can reuse it, to the cache volume
+        logging.info("Persisting model cache")
+        stub.volume.commit()
+        logging.info("Cache persisted")
 
     return {"status": "done"}
 
@@ -0,0 +1,198 @@
+import json
+import os
+import re
+import shutil
+from typing import Callable, Dict, Optional, Tuple
+
+from ..shared import logging
+
+WEIGHTS_NAME = "model.safetensors"
+WEIGHTS_INDEX_NAME = "model.safetensors.index.json"
+ADAPTER_WEIGHTS_NAMES = ["adapter_model.safetensors", "adapter_model.bin"]
+# Files copied as is from the base model, besides config.json
+COPIED_FILES = ["generation_config.json"]
+
+
+def weights_dtype(weights_format: str):
+    import torch
+
+    if weights_format == "bf16":
+        return torch.bfloat16
+    elif weights_format == "fp16":
+        return torch.float16
+    return torch.float32
+
+
+def _load_adapter(lora_dir: str) -> Dict:
+    for name in ADAPTER_WEIGHTS_NAMES:
+        path = os.path.join(lora_dir, name)
+        if not os.path.exists(path):
+            continue
+        if name.endswith(".safetensors"):
+            from safetensors.torch import load_file
+
+            return load_file(path)
+
+        import torch
+
+        return torch.load(path, map_location="cpu")
+    raise FileNotFoundError(f"No adapter weights found in {lora_dir}")
+
+
+def _lora_alpha(adapter_config: Dict, module: str) -> float:
+    # Same matching as PEFT: the first pattern the module name ends with
+    for pattern, alpha in (adapter_config.get("alpha_pattern") or {}).items():
+        if re.match(rf".*\.{pattern}$", module):
+            return alpha
+    return adapter_config["lora_alpha"]
+
+
+def load_lora_deltas(lora_dir: str) -> Tuple[Dict, Dict]:
+    """
+    Reads a PEFT LoRA adapter, returning the factors of each weight it changes
+    as {base weight name: (A, B, scale, transpose)}, and the weights it replaces
+    outright (its modules_to_save) as {base weight name: tensor}.
+    """
+    with open(os.path.join(lora_dir, "adapter_config.json")) as f:
+        adapter_config = json.load(f)
+    if adapter_config.get("use_dora"):
+        raise ValueError("DoRA adapters can't be merged shard by shard")
+
+    factors: Dict[str, Dict[str, object]] = {}
+    replaced = {}
+    for key, tensor in _load_adapter(lora_dir).items():
+        # e.g. base_model.model.model.layers.0.self_attn.q_proj.lora_A.weight
+        name = key.removeprefix("base_model.model.")
+        match = re.match(r"(.+)\.lora_(embedding_)?([AB])(\.weight)?$", name)
+        if match is None:
+            # PEFT saves modules_to_save as e.g. lm_head.modules_to_save.weight
+            replaced[name.replace(".modules_to_save.", ".")] = tensor
+            continue
+        module, embedding, factor, _ = match.groups()
+        factors.setdefault(module, {"embedding": bool(embedding)})[factor] = tensor
+
+    deltas = {}
+    for module, parts in factors.items():
+        lora_a, lora_b = parts["A"], parts["B"]
+        rank = lora_a.shape[0]
+        # Embedding adapters store A as (r, num_embeddings), so B @ A is transposed
+        transpose = parts["embedding"] or adapter_config.get("fan_in_fan_out", False)
+        alpha = _lora_alpha(adapter_config, module)
+        if adapter_config.get("use_rslora"):
+            scale = alpha / rank**0.5
+        else:
+            scale = alpha / rank
+        deltas[f"{module}.weight"] = (lora_a, lora_b, scale, transpose)
+    return deltas, replaced
+
+
+def _merge_tensor(weight, delta, dtype):
+    lora_a, lora_b, scale, transpose = delta
+    update = (lora_b.float() @ lora_a.float()) * scale
+    if transpose:
+        update = update.T
+    return (weight.float() + update).to(dtype)
+
+
+def merge_lora_shards(
+    base_model_dir: str,
+    lora_dir: str,
+    output_dir: str,
+    weights_format: str,
+    on_file_written: Optional[Callable[[str], None]] = None,
+) -> None:
+    """
+    Merges a LoRA adapter into the safetensors weights of its base model, one
+    shard at a time. Each base shard is memory-mapped, the targeted tensors get
+    B @ A * alpha / r added, every floating point tensor is cast to
+    `weights_format`, and the shard is written before the next is read, so
+    memory use is bounded by the largest shard rather than the model.
+
+    `on_file_written` is called with the name of each file once it's been
+    written to `output_dir`, so the files can be processed as the merge goes.
+    """
+    written = on_file_written or (lambda name: None)
+    from safetensors import safe_open
+    from safetensors.torch import save_file
+
+    dtype = weights_dtype(weights_format)
+    deltas, replaced = load_lora_deltas(lora_dir)
+
+    index_path = os.path.join(base_model_dir, WEIGHTS_INDEX_NAME)
+    if os.path.exists(index_path):
+        with open(index_path) as f:
+            index = json.load(f)
+        shards = sorted(set(index["weight_map"].values()))
+    elif os.path.exists(os.path.join(base_model_dir, WEIGHTS_NAME)):
+        index = None
+        shards = [WEIGHTS_NAME]
+    else:
+        raise FileNotFoundError(f"No safetensors weights found in {base_model_dir}")
+
+    # Check the adapter against the base model before merging anything
+    if index is not None:
+        base_weights = set(index["weight_map"])
+    else:
+        with safe_open(
+            os.path.join(base_model_dir, WEIGHTS_NAME), framework="pt", device="cpu"
+        ) as f:
+            base_weights = set(f.keys())
+    unused = (set(deltas) | set(replaced)) - base_weights
+    if unused:
+        raise ValueError(
+            f"Adapter weights not found in the base model: {sorted(unused)[:5]}"
+        )
+
+    os.makedirs(output_dir, exist_ok=True)
+    total_size = 0
+    for i, shard in enumerate(shards):
+        tensors = {}
+        with safe_open(
+            os.path.join(base_model_dir, shard), framework="pt", device="cpu"
+        ) as f:
+            metadata = f.metadata()
+            for name in f.keys():
+                if name in replaced:
+                    tensor = replaced[name]
+                else:
+                    tensor = f.get_tensor(name)
+                if name in deltas:
+                    tensor = _merge_tensor(tensor, deltas[name], dtype)
+                elif tensor.is_floating_point():
+                    tensor = tensor.to(dtype)
+                tensors[name] = tensor.contiguous()
+                total_size += tensor.numel() * tensor.element_size()
+
+        save_file(tensors, os.path.join(output_dir, shard), metadata=metadata)
+        del tensors
+        logging.info(f"Merged shard {i + 1}/{len(shards)}: {shard}")
+        written(shard)
+
+    if index is not None:
+        index["metadata"] = {**index.get("metadata", {}), "total_size": total_size}
+        with open(os.path.join(output_dir, WEIGHTS_INDEX_NAME), "w") as f:
+            json.dump(index, f, indent=2)
+        written(WEIGHTS_INDEX_NAME)
+
+    with open(os.path.join(base_model_dir, "config.json")) as f:
+        config = json.load(f)
+    config["torch_dtype"] = str(dtype).removeprefix("torch.")
+    with open(os.path.join(output_dir, "config.json"), "w") as f:
+        json.dump(config, f, indent=2)
+    written("config.json")
+    for name in COPIED_FILES:
+        path = os.path.join(base_model_dir, name)
+        if os.path.exists(path):
+            shutil.copy(path, os.path.join(output_dir, name))
+            written(name)
+
+
+def base_model_dir(base_model: str, revision: Optional[str] = None) -> str:
+    """Downloads (or finds in the cache) the files of a base model needed to merge it."""
+    from huggingface_hub import snapshot_download
+
+    return snapshot_download(
+        base_model,
+        revision=revision,
+        allow_patterns=["*.json", "*.safetensors"],
+    )
@@ -0,0 +1,203 @@
+import base64
+import hashlib
+import http.server
+import json
+import os
+import threading
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+import src.trainer.download_training_data as download_module
+from src.trainer.download_training_data import (
+    TrainingDataError,
+    download_training_data,
+)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def training_data(rows: int) -> bytes:
+    lines = [
+        json.dumps({"instruction": "x" * (i % 500 + 1), "output": "y" * (i % 300 + 1)})
+        for i in range(rows)
+    ]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class Server(http.server.ThreadingHTTPServer):
+    """Serves `body` like Azure blob storage, with ways to make it misbehave."""
+
+    def __init__(self, body: bytes):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.body = body
+        self.etag = '"v1"'
+        self.ranges = True
+        # Every nth ranged response is cut off halfway through
+        self.drop_every = None
+        # Ranged requests starting at or past this offset get a 404
+        self.missing_from = None
+        # (body, etag) the file is replaced with once the first byte was requested
+        self.next_version = None
+        self.requested = []
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/train.jsonl"
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    server: Server
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        body = server.body
+        md5 = base64.b64encode(hashlib.md5(body).digest()).decode()
+        requested = self.headers.get("Range")
+        if not server.ranges or requested is None:
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Content-MD5", md5)
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        start, end = (int(n) for n in requested.split("=")[1].split("-"))
+        with server._lock:
+            server.requested.append(start)
+            count = len(server.requested)
+        if_match = self.headers.get("If-Match")
+        if if_match is not None and if_match != server.etag:
+            self.send_error(412)
+            return
+        if server.missing_from is not None and start >= server.missing_from:
+            self.send_error(404)
+            return
+
+        chunk = body[start : end + 1]
+        self.send_response(206)
+        self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+        self.send_header("Content-Length", str(len(chunk)))
+        self.send_header("ETag", server.etag)
+        self.send_header("x-ms-blob-content-md5", md5)
+        self.end_headers()
+        if server.drop_every and count % server.drop_every == 0 and len(chunk) > 1:
+            self.wfile.write(chunk[: len(chunk) // 2])
+            self.wfile.flush()
+            self.connection.shutdown(2)
+            return
+        self.wfile.write(chunk)
+        if server.next_version is not None and (start, end) == (0, 0):
+            server.body, server.etag = server.next_version
+            server.next_version = None
+
+
+@pytest.fixture
+def server():
+    server = Server(training_data(5000))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(download_module, "RETRY_DELAY", 0.01)
+
+
+def count_chars(texts):
+    return [len(text) for text in texts]
+
+
+def test_ranged_download_survives_dropped_connections(server, tmp_path):
+    server.drop_every = 5
+    path = str(tmp_path / "train.jsonl")
+    calls = []
+
+    def count_tokens(texts):
+        calls.append(len(texts))
+        return count_chars(texts)
+
+    stats = download_training_data(
+        server.url,
+        path,
+        count_tokens=count_tokens,
+        sequence_len=600,
+        chunk_size=CHUNK_SIZE,
+    )
+
+    with open(path, "rb") as f:
+        assert f.read() == server.body
+    assert stats.rows == 5000
+    assert stats.sha256 == hashlib.sha256(server.body).hexdigest()
+    assert len(set(server.requested)) > len(server.body) // CHUNK_SIZE
+    # Rows are tokenized in batches rather than one field at a time
+    assert len(calls) < 50
+    rows = [json.loads(line) for line in server.body.splitlines()]
+    lengths = [len(row["instruction"]) + len(row["output"]) for row in rows]
+    assert stats.max_tokens == max(lengths)
+    assert stats.rows_over_sequence_len == sum(n > 600 for n in lengths)
+    assert sum(stats.token_histogram.values()) == 5000
+    assert not os.path.exists(path + ".part")
+    assert not os.path.exists(path + ".part.json")
+
+
+def test_downloads_in_one_stream_without_range_support(server, tmp_path):
+    server.ranges = False
+    path = str(tmp_path / "train.jsonl")
+
+    stats = download_training_data(server.url, path, chunk_size=CHUNK_SIZE)
+
+    with open(path, "rb") as f:
+        assert f.read() == server.body
+    assert stats.rows == 5000
+
+
+def test_resumes_interrupted_downloads(server, tmp_path):
+    path = str(tmp_path / "train.jsonl")
+    server.missing_from = len(server.body) // 2
+
+    with pytest.raises(httpx.HTTPStatusError):
+        download_training_data(server.url, path, chunk_size=CHUNK_SIZE, max_workers=1)
+    assert os.path.exists(path + ".part.json")
+
+    server.missing_from = None
+    server.requested.clear()
+    stats = download_training_data(server.url, path, chunk_size=CHUNK_SIZE)
+
+    with open(path, "rb") as f:
+        assert f.read() == server.body
+    assert stats.rows == 5000
+    # Only the probe and the chunks that weren't finished are requested again
+    fetched = [start for start in server.requested if start > 0]
+    assert fetched and min(fetched) >= CHUNK_SIZE
+    assert len(fetched) < len(server.body) // CHUNK_SIZE
+
+
+def test_invalid_rows_fail_with_their_row_number(server, tmp_path):
+    body = bytearray(server.body)
+    start = body.index(b"\n", len(body) // 2) + 1
+    body[start : start + 5] = b"}}}}}"
+    server.body = bytes(body)
+
+    row_number = server.body[:start].count(b"\n") + 1
+    with pytest.raises(TrainingDataError, match=f"Row {row_number} is not valid JSON"):
+        download_training_data(
+            server.url, str(tmp_path / "train.jsonl"), chunk_size=CHUNK_SIZE
+        )
+
+
+def test_changes_during_the_download_are_detected(server, tmp_path):
+    server.next_version = (server.body.replace(b"xxxx", b"zzzz"), '"v2"')
+
+    with pytest.raises(TrainingDataError, match="changed while downloading"):
+        download_training_data(
+            server.url, str(tmp_path / "train.jsonl"), chunk_size=CHUNK_SIZE
+        )
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+torch = pytest.importorskip("torch")
+peft = pytest.importorskip("peft")
+transformers = pytest.importorskip("transformers")
+
+from src.trainer.merge_lora import merge_lora_shards, WEIGHTS_INDEX_NAME
+
+
+@pytest.fixture
+def lora_model(tmp_path):
+    """A tiny Llama model saved in several shards, and a LoRA adapter for it."""
+    torch.manual_seed(0)
+    config = transformers.LlamaConfig(
+        vocab_size=128,
+        hidden_size=32,
+        intermediate_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        num_key_value_heads=2,
+        tie_word_embeddings=False,
+    )
+    base_dir = str(tmp_path / "base")
+    transformers.LlamaForCausalLM(config).save_pretrained(
+        base_dir, max_shard_size="20KB", safe_serialization=True
+    )
+
+    lora_config = peft.LoraConfig(
+        r=4,
+        lora_alpha=16,
+        target_modules=["q_proj", "v_proj", "down_proj"],
+        alpha_pattern={"down_proj": 8},
+        modules_to_save=["lm_head"],
+        # Random B factors, so the adapter actually changes the weights
+        init_lora_weights=False,
+    )
+    model = peft.get_peft_model(
+        transformers.LlamaForCausalLM.from_pretrained(base_dir), lora_config
+    )
+    with torch.no_grad():
+        model.base_model.model.lm_head.modules_to_save["default"].weight.add_(1.0)
+    lora_dir = str(tmp_path / "lora")
+    model.save_pretrained(lora_dir, safe_serialization=True)
+    return base_dir, lora_dir, model
+
+
+def test_matches_peft_merge(lora_model, tmp_path):
+    base_dir, lora_dir, model = lora_model
+    assert os.path.exists(os.path.join(base_dir, WEIGHTS_INDEX_NAME))
+
+    output_dir = str(tmp_path / "merged")
+    written = []
+    merge_lora_shards(base_dir, lora_dir, output_dir, "fp32", written.append)
+
+    expected = model.merge_and_unload().state_dict()
+    merged = transformers.LlamaForCausalLM.from_pretrained(output_dir).state_dict()
+    assert merged.keys() == expected.keys()
+    for name, tensor in expected.items():
+        torch.testing.assert_close(merged[name], tensor, msg=name)
+
+    assert WEIGHTS_INDEX_NAME in written and "config.json" in written
+
+
+def test_rejects_adapters_for_other_models_before_merging(lora_model, tmp_path):
+    base_dir, lora_dir, _ = lora_model
+    weights_path = os.path.join(lora_dir, "adapter_model.safetensors")
+
+    from safetensors.torch import load_file, save_file
+
+    weights = load_file(weights_path)
+    weights[
+        "base_model.model.model.layers.9.self_attn.q_proj.lora_A.weight"
+    ] = torch.zeros(4, 32)
+    weights[
+        "base_model.model.model.layers.9.self_attn.q_proj.lora_B.weight"
+    ] = torch.zeros(32, 4)
+    save_file(weights, weights_path)
+
+    output_dir = str(tmp_path / "merged")
+    written = []
+    with pytest.raises(ValueError, match="layers.9.self_attn.q_proj"):
+        merge_lora_shards(base_dir, lora_dir, output_dir, "fp32", written.append)
+    assert written == []
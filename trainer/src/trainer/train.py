@@ -6,13 +6,18 @@ from ..shared import (
     upload_directory_to_s3,
 )
 from .upload_to_fireworks import upload_to_fireworks
+from .download_training_data import download_training_data
+from .dataset_cache import (
+    lookup_prepared_dataset,
+    mark_prepared_dataset_complete,
+    evict_prepared_datasets,
+)
 
 
 import shutil
 import logging
 import os
 import subprocess
-import urllib.request
 import yaml
 
 logging.basicConfig(
@@ -41,10 +46,21 @@ def do_train(fine_tune_id: str, base_url: str):
 
     logging.info(f"Training info: {training_info.to_dict()}")
 
+    config = training_info.training_config
+
     logging.info("Downloading training data")
     training_file = "/tmp/train.jsonl"
 
-    urllib.request.urlretrieve(training_info.training_data_url, training_file)
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(config.base_model)
+    # Validates every row before we start the training subprocess
+    training_data = download_training_data(
+        training_info.training_data_url,
+        training_file,
+        count_tokens=lambda texts: [len(ids) for ids in tokenizer(texts)["input_ids"]],
+        sequence_len=config.sequence_len,
+    )
 
     config_path = "/tmp/training-config.yaml"
     lora_model_path = lora_model_cache_dir(fine_tune_id)
@@ -54,15 +70,35 @@ def do_train(fine_tune_id: str, base_url: str):
     # Clear the lora_model_path and merged_model_path directories
     shutil.rmtree(lora_model_path, ignore_errors=True)
 
-    config = training_info.training_config
     config.datasets[0].path = training_file
     config.output_dir = lora_model_path
 
-    training_yaml = yaml.dump(config.to_dict())
+    config_dict = config.to_dict()
+    # Reuse the dataset axolotl tokenized and packed for an earlier run with the
+    # same data and settings, e.g. a retry or a hyperparameter sweep
+    prepared_dataset_path, prepared = lookup_prepared_dataset(
+        training_file, config_dict, dataset_sha256=training_data.sha256
+    )
+    config_dict["dataset_prepared_path"] = prepared_dataset_path
+    evict_prepared_datasets(keep=prepared_dataset_path)
+
+    training_yaml = yaml.dump(config_dict)
     print(f"Training config:\n{training_yaml}")
     with open(config_path, "w") as f:
         f.write(training_yaml)
 
+    if not prepared:
+        logging.info("Preparing dataset")
+        try:
+            subprocess.run(
+                ["python", "-m", "axolotl.cli.preprocess", config_path],
+                check=True,
+            )
+        except subprocess.CalledProcessError as e:
+            logging.error(f"Dataset preparation failed: {e}")
+            raise e
+        mark_prepared_dataset_complete(prepared_dataset_path)
+
     logging.info("Beginning training")
     try:
         # We have to run this in a subprocess instead of importing axolotl directly